@@ -59,7 +59,7 @@ CREATE TABLE IF NOT EXISTS plano_de_contas (
 
 CREATE TABLE IF NOT EXISTS lancamento (
     id_lancamento INT PRIMARY KEY AUTO_INCREMENT,
-    data_registro DATETIME DEFAULT CURRENT_TIMESTAMP,
+    data_registro DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     valor DECIMAL(15,2) NOT NULL,
     tipo_de_movimentacao ENUM('entrada', 'saida') NOT NULL,
     status_aprovacao ENUM('pendente', 'aprovado', 'rejeitado') DEFAULT 'pendente',
@@ -70,8 +70,35 @@ CREATE TABLE IF NOT EXISTS lancamento (
     descricao TEXT,
     origem ENUM('folha_elenco', 'folha_funcionarios', 'bem', 'manual') NOT NULL,
     id_origem INT,
+    mes_registro CHAR(7) GENERATED ALWAYS AS (DATE_FORMAT(data_registro, '%Y-%m')) STORED,
     FOREIGN KEY (id_direcao) REFERENCES direcao(id_direcao),
     FOREIGN KEY (id_aprovador) REFERENCES direcao(id_direcao),
+    FOREIGN KEY (id_conta) REFERENCES plano_de_contas(id_conta),
+    INDEX idx_lancamento_status_data (status_aprovacao, data_registro),
+    INDEX idx_lancamento_status_mes (status_aprovacao, mes_registro),
+    INDEX idx_lancamento_conta_status_mes (id_conta, status_aprovacao, mes_registro),
+    INDEX idx_lancamento_status_aprovacao (status_aprovacao, data_aprovacao)
+);
+
+-- saldo de caixa mantido pelos triggers de lancamento (linha única)
+CREATE TABLE IF NOT EXISTS saldo_caixa (
+    id_saldo TINYINT PRIMARY KEY,
+    saldo DECIMAL(15,2) NOT NULL DEFAULT 0.00,
+    data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CHECK (id_saldo = 1)
+);
+
+INSERT INTO saldo_caixa (id_saldo, saldo) VALUES (1, 0.00);
+
+-- totais mensais por conta dos lançamentos aprovados, mantidos pelos triggers de lancamento
+CREATE TABLE IF NOT EXISTS resumo_mensal_conta (
+    id_conta INT NOT NULL,
+    mes_registro CHAR(7) NOT NULL,
+    total_lancamentos INT NOT NULL DEFAULT 0,
+    total_entradas DECIMAL(17,2) NOT NULL DEFAULT 0.00,
+    total_saidas DECIMAL(17,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (id_conta, mes_registro),
+    INDEX idx_resumo_mensal_mes (mes_registro),
     FOREIGN KEY (id_conta) REFERENCES plano_de_contas(id_conta)
 );
 
@@ -109,10 +136,13 @@ CREATE TABLE IF NOT EXISTS folha_funcionarios (
     data_pagamento DATE NOT NULL,
     status ENUM('pendente', 'aprovado', 'pago', 'rejeitado') DEFAULT 'pendente',
     data_competencia DATE NOT NULL,
+    valor_bruto DECIMAL(15,2) NOT NULL DEFAULT 0.00,
+    valor_liquido_total DECIMAL(15,2) NOT NULL DEFAULT 0.00,
     id_direcao INT NOT NULL,
     id_lancamento INT,
     FOREIGN KEY (id_direcao) REFERENCES corpo_financeiro(id_direcao),
-    FOREIGN KEY (id_lancamento) REFERENCES lancamento(id_lancamento)
+    FOREIGN KEY (id_lancamento) REFERENCES lancamento(id_lancamento),
+    INDEX idx_folha_funcionarios_direcao_comp (id_direcao, data_competencia, status)
 );
 
 CREATE TABLE IF NOT EXISTS item_folha_f (
@@ -217,10 +247,13 @@ CREATE TABLE IF NOT EXISTS folha_elenco (
     data_pagamento DATE NOT NULL,
     valor_direitos_imagem DECIMAL(15,2) DEFAULT 0.00,
     status ENUM('pendente', 'aprovado', 'pago', 'rejeitado') DEFAULT 'pendente',
+    valor_bruto DECIMAL(15,2) NOT NULL DEFAULT 0.00,
+    valor_liquido_total DECIMAL(15,2) NOT NULL DEFAULT 0.00,
     id_direcao INT NOT NULL,
     id_lancamento INT,
     FOREIGN KEY (id_direcao) REFERENCES corpo_esportivo(id_direcao),
-    FOREIGN KEY (id_lancamento) REFERENCES lancamento(id_lancamento)
+    FOREIGN KEY (id_lancamento) REFERENCES lancamento(id_lancamento),
+    INDEX idx_folha_elenco_direcao_comp (id_direcao, data_competencia, status)
 );
 
 CREATE TABLE IF NOT EXISTS item_folha_e (
@@ -281,7 +314,9 @@ SELECT
     (salario_base + bonus + adicionais - descontos) AS valor_liquido
 FROM item_folha_f;
 
--- View para Totalização da Folha de Elenco (Calcula valor_bruto)
+-- View para Totalização da Folha de Elenco
+-- valor_bruto/valor_liquido_total são mantidos no cabeçalho pelos triggers de item_folha_e,
+-- então a view não agrupa (MERGE) e a busca por id usa a chave primária
 CREATE OR REPLACE VIEW vw_folha_elenco_total AS
 SELECT 
     fe.id_folha_elenco,
@@ -291,13 +326,11 @@ SELECT
     fe.status,
     fe.id_direcao,
     fe.id_lancamento,
-    COALESCE(SUM(ife.salario_base + ife.bonus + ife.direito_imagem + ife.parcela_luvas), 0) AS valor_bruto,
-    COALESCE(SUM(ife.salario_base + ife.bonus + ife.direito_imagem + ife.parcela_luvas - ife.descontos), 0) AS valor_liquido_total
-FROM folha_elenco fe
-LEFT JOIN item_folha_e ife ON fe.id_folha_elenco = ife.id_folha_elenco
-GROUP BY fe.id_folha_elenco, fe.data_competencia, fe.data_pagamento, fe.valor_direitos_imagem, fe.status, fe.id_direcao, fe.id_lancamento;
+    fe.valor_bruto,
+    fe.valor_liquido_total
+FROM folha_elenco fe;
 
--- View para Totalização da Folha de Funcionários (Calcula valor_bruto)
+-- View para Totalização da Folha de Funcionários (totais mantidos pelos triggers de item_folha_f)
 CREATE OR REPLACE VIEW vw_folha_funcionarios_total AS
 SELECT 
     ff.id_folha_funcionarios,
@@ -306,18 +339,18 @@ SELECT
     ff.status,
     ff.id_direcao,
     ff.id_lancamento,
-    COALESCE(SUM(iff.salario_base + iff.bonus + iff.adicionais), 0) AS valor_bruto,
-    COALESCE(SUM(iff.salario_base + iff.bonus + iff.adicionais - iff.descontos), 0) AS valor_liquido_total
-FROM folha_funcionarios ff
-LEFT JOIN item_folha_f iff ON ff.id_folha_funcionarios = iff.id_folha_funcionarios
-GROUP BY ff.id_folha_funcionarios, ff.data_competencia, ff.data_pagamento, ff.status, ff.id_direcao, ff.id_lancamento;
+    ff.valor_bruto,
+    ff.valor_liquido_total
+FROM folha_funcionarios ff;
 
 -- ============================================
--- FUNÇÃO AUXILIAR PARA CÁLCULO DE SALDO
+-- FUNÇÕES AUXILIARES PARA CÁLCULO DE SALDO
 -- ============================================
 
 DELIMITER //
 
+-- Saldo atual lido de saldo_caixa em tempo constante.
+-- A leitura bloqueia a linha (FOR UPDATE) para serializar aprovações concorrentes
 CREATE FUNCTION fn_calcular_saldo_atual()
 RETURNS DECIMAL(15,2)
 DETERMINISTIC
@@ -325,6 +358,22 @@ READS SQL DATA
 BEGIN
     DECLARE v_saldo DECIMAL(15,2);
     
+    SELECT saldo INTO v_saldo
+    FROM saldo_caixa
+    WHERE id_saldo = 1
+    FOR UPDATE;
+    
+    RETURN COALESCE(v_saldo, 0);
+END//
+
+-- Saldo recalculado a partir de todo o histórico (usado na reconstrução e na verificação)
+CREATE FUNCTION fn_calcular_saldo_historico()
+RETURNS DECIMAL(15,2)
+DETERMINISTIC
+READS SQL DATA
+BEGIN
+    DECLARE v_saldo DECIMAL(15,2);
+    
     SELECT COALESCE(SUM(
         CASE 
             WHEN tipo_de_movimentacao = 'entrada' THEN valor
@@ -368,6 +417,133 @@ BEGIN
     END IF;
 END//
 
+-- ============================================
+-- TRIGGERS 1.1 a 1.3: Manutenção do Saldo de Caixa
+-- ============================================
+/* cada lançamento aprovado soma (entrada) ou subtrai (saída) seu valor de saldo_caixa
+na mesma transação; alterações e exclusões desfazem a contribuição antiga */
+CREATE TRIGGER tr_saldo_caixa_insert
+AFTER INSERT ON lancamento
+FOR EACH ROW
+BEGIN
+    IF NEW.status_aprovacao = 'aprovado' THEN
+        UPDATE saldo_caixa
+        SET saldo = saldo + CASE WHEN NEW.tipo_de_movimentacao = 'entrada' THEN NEW.valor ELSE -NEW.valor END
+        WHERE id_saldo = 1;
+    END IF;
+END//
+
+CREATE TRIGGER tr_saldo_caixa_update
+AFTER UPDATE ON lancamento
+FOR EACH ROW
+BEGIN
+    DECLARE v_delta DECIMAL(15,2) DEFAULT 0;
+    
+    IF OLD.status_aprovacao = 'aprovado' THEN
+        SET v_delta = v_delta - CASE WHEN OLD.tipo_de_movimentacao = 'entrada' THEN OLD.valor ELSE -OLD.valor END;
+    END IF;
+    
+    IF NEW.status_aprovacao = 'aprovado' THEN
+        SET v_delta = v_delta + CASE WHEN NEW.tipo_de_movimentacao = 'entrada' THEN NEW.valor ELSE -NEW.valor END;
+    END IF;
+    
+    IF v_delta <> 0 THEN
+        UPDATE saldo_caixa
+        SET saldo = saldo + v_delta
+        WHERE id_saldo = 1;
+    END IF;
+END//
+
+CREATE TRIGGER tr_saldo_caixa_delete
+AFTER DELETE ON lancamento
+FOR EACH ROW
+BEGIN
+    IF OLD.status_aprovacao = 'aprovado' THEN
+        UPDATE saldo_caixa
+        SET saldo = saldo - CASE WHEN OLD.tipo_de_movimentacao = 'entrada' THEN OLD.valor ELSE -OLD.valor END
+        WHERE id_saldo = 1;
+    END IF;
+END//
+
+-- ============================================
+-- TRIGGERS 1.4 a 1.6: Manutenção do Resumo Mensal por Conta
+-- ============================================
+/* aprovar um lançamento é um único upsert em resumo_mensal_conta; alterações em
+lançamentos já aprovados retiram a contribuição antiga antes de somar a nova, e
+linhas que ficam sem lançamentos são removidas */
+CREATE TRIGGER tr_resumo_mensal_insert
+AFTER INSERT ON lancamento
+FOR EACH ROW
+BEGIN
+    IF NEW.status_aprovacao = 'aprovado' THEN
+        INSERT INTO resumo_mensal_conta (id_conta, mes_registro, total_lancamentos, total_entradas, total_saidas)
+        VALUES (
+            NEW.id_conta,
+            DATE_FORMAT(NEW.data_registro, '%Y-%m'),
+            1,
+            CASE WHEN NEW.tipo_de_movimentacao = 'entrada' THEN NEW.valor ELSE 0 END,
+            CASE WHEN NEW.tipo_de_movimentacao = 'saida' THEN NEW.valor ELSE 0 END
+        )
+        ON DUPLICATE KEY UPDATE
+            total_lancamentos = total_lancamentos + 1,
+            total_entradas = total_entradas + VALUES(total_entradas),
+            total_saidas = total_saidas + VALUES(total_saidas);
+    END IF;
+END//
+
+CREATE TRIGGER tr_resumo_mensal_update
+AFTER UPDATE ON lancamento
+FOR EACH ROW
+BEGIN
+    IF OLD.status_aprovacao = 'aprovado' THEN
+        UPDATE resumo_mensal_conta
+        SET total_lancamentos = total_lancamentos - 1,
+            total_entradas = total_entradas - CASE WHEN OLD.tipo_de_movimentacao = 'entrada' THEN OLD.valor ELSE 0 END,
+            total_saidas = total_saidas - CASE WHEN OLD.tipo_de_movimentacao = 'saida' THEN OLD.valor ELSE 0 END
+        WHERE id_conta = OLD.id_conta
+          AND mes_registro = DATE_FORMAT(OLD.data_registro, '%Y-%m');
+        
+        DELETE FROM resumo_mensal_conta
+        WHERE id_conta = OLD.id_conta
+          AND mes_registro = DATE_FORMAT(OLD.data_registro, '%Y-%m')
+          AND total_lancamentos = 0;
+    END IF;
+    
+    IF NEW.status_aprovacao = 'aprovado' THEN
+        INSERT INTO resumo_mensal_conta (id_conta, mes_registro, total_lancamentos, total_entradas, total_saidas)
+        VALUES (
+            NEW.id_conta,
+            DATE_FORMAT(NEW.data_registro, '%Y-%m'),
+            1,
+            CASE WHEN NEW.tipo_de_movimentacao = 'entrada' THEN NEW.valor ELSE 0 END,
+            CASE WHEN NEW.tipo_de_movimentacao = 'saida' THEN NEW.valor ELSE 0 END
+        )
+        ON DUPLICATE KEY UPDATE
+            total_lancamentos = total_lancamentos + 1,
+            total_entradas = total_entradas + VALUES(total_entradas),
+            total_saidas = total_saidas + VALUES(total_saidas);
+    END IF;
+END//
+
+CREATE TRIGGER tr_resumo_mensal_delete
+AFTER DELETE ON lancamento
+FOR EACH ROW
+BEGIN
+    IF OLD.status_aprovacao = 'aprovado' THEN
+        UPDATE resumo_mensal_conta
+        SET total_lancamentos = total_lancamentos - 1,
+            total_entradas = total_entradas - CASE WHEN OLD.tipo_de_movimentacao = 'entrada' THEN OLD.valor ELSE 0 END,
+            total_saidas = total_saidas - CASE WHEN OLD.tipo_de_movimentacao = 'saida' THEN OLD.valor ELSE 0 END
+        WHERE id_conta = OLD.id_conta
+          AND mes_registro = DATE_FORMAT(OLD.data_registro, '%Y-%m');
+        
+        DELETE FROM resumo_mensal_conta
+        WHERE id_conta = OLD.id_conta
+          AND mes_registro = DATE_FORMAT(OLD.data_registro, '%Y-%m')
+          AND total_lancamentos = 0;
+    END IF;
+END//
+
 -- ============================================
 -- TRIGGER 2: Validação de Orçamento ao Aprovar Folha de Elenco
 -- ============================================
@@ -379,28 +555,30 @@ BEGIN
     DECLARE v_total_mes DECIMAL(15,2);
     DECLARE v_valor_bruto DECIMAL(15,2);
     DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
     
     -- Só valida quando status muda de 'pendente' para 'aprovado' ou 'pago'
     IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        -- Intervalo do mês de competência (predicado por faixa, usa o índice)
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
         -- Busca orçamento do corpo esportivo
         SELECT orcamento INTO v_orcamento
         FROM corpo_esportivo
         WHERE id_direcao = NEW.id_direcao;
         
-        -- Calcula valor bruto desta folha
-        SELECT COALESCE(SUM(salario_base + bonus + direito_imagem + parcela_luvas), 0)
-        INTO v_valor_bruto
-        FROM item_folha_e
-        WHERE id_folha_elenco = NEW.id_folha_elenco;
+        -- Valor bruto desta folha (mantido no cabeçalho)
+        SET v_valor_bruto = NEW.valor_bruto;
         
         -- Calcula total já gasto no mês (excluindo a folha atual)
-        SELECT COALESCE(SUM(vfe.valor_bruto), 0) INTO v_total_mes
-        FROM vw_folha_elenco_total vfe
-        INNER JOIN folha_elenco fe ON vfe.id_folha_elenco = fe.id_folha_elenco
+        SELECT COALESCE(SUM(fe.valor_bruto), 0) INTO v_total_mes
+        FROM folha_elenco fe
         WHERE fe.id_direcao = NEW.id_direcao
+          AND fe.data_competencia >= v_inicio_mes
+          AND fe.data_competencia < v_fim_mes
           AND fe.status IN ('aprovado', 'pago')
-          AND MONTH(fe.data_competencia) = MONTH(NEW.data_competencia)
-          AND YEAR(fe.data_competencia) = YEAR(NEW.data_competencia)
           AND fe.id_folha_elenco != NEW.id_folha_elenco;
         
         -- VALIDAÇÃO 1: Verifica se excede orçamento mensal
@@ -429,28 +607,30 @@ BEGIN
     DECLARE v_total_mes DECIMAL(15,2);
     DECLARE v_valor_bruto DECIMAL(15,2);
     DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
     
     -- Só valida quando status muda de 'pendente' para 'aprovado' ou 'pago'
     IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        -- Intervalo do mês de competência (predicado por faixa, usa o índice)
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
         -- Busca orçamento do corpo financeiro
         SELECT orcamento INTO v_orcamento
         FROM corpo_financeiro
         WHERE id_direcao = NEW.id_direcao;
         
-        -- Calcula valor bruto desta folha
-        SELECT COALESCE(SUM(salario_base + bonus + adicionais), 0)
-        INTO v_valor_bruto
-        FROM item_folha_f
-        WHERE id_folha_funcionarios = NEW.id_folha_funcionarios;
+        -- Valor bruto desta folha (mantido no cabeçalho)
+        SET v_valor_bruto = NEW.valor_bruto;
         
         -- Calcula total já gasto no mês (excluindo a folha atual)
-        SELECT COALESCE(SUM(vff.valor_bruto), 0) INTO v_total_mes
-        FROM vw_folha_funcionarios_total vff
-        INNER JOIN folha_funcionarios ff ON vff.id_folha_funcionarios = ff.id_folha_funcionarios
+        SELECT COALESCE(SUM(ff.valor_bruto), 0) INTO v_total_mes
+        FROM folha_funcionarios ff
         WHERE ff.id_direcao = NEW.id_direcao
+          AND ff.data_competencia >= v_inicio_mes
+          AND ff.data_competencia < v_fim_mes
           AND ff.status IN ('aprovado', 'pago')
-          AND MONTH(ff.data_competencia) = MONTH(NEW.data_competencia)
-          AND YEAR(ff.data_competencia) = YEAR(NEW.data_competencia)
           AND ff.id_folha_funcionarios != NEW.id_folha_funcionarios;
         
         -- VALIDAÇÃO 1: Verifica se excede orçamento mensal
@@ -479,22 +659,26 @@ BEGIN
     DECLARE v_total_mes DECIMAL(15,2);
     DECLARE v_percentual DECIMAL(5,2);
     DECLARE v_disponivel DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
     
     -- Só executa quando folha é aprovada ou paga
     IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
         -- Busca orçamento
         SELECT orcamento INTO v_orcamento
         FROM corpo_esportivo
         WHERE id_direcao = NEW.id_direcao;
         
         -- Calcula total do mês (incluindo a folha recém-aprovada)
-        SELECT COALESCE(SUM(vfe.valor_bruto), 0) INTO v_total_mes
-        FROM vw_folha_elenco_total vfe
-        INNER JOIN folha_elenco fe ON vfe.id_folha_elenco = fe.id_folha_elenco
+        SELECT COALESCE(SUM(fe.valor_bruto), 0) INTO v_total_mes
+        FROM folha_elenco fe
         WHERE fe.id_direcao = NEW.id_direcao
-          AND fe.status IN ('aprovado', 'pago')
-          AND MONTH(fe.data_competencia) = MONTH(NEW.data_competencia)
-          AND YEAR(fe.data_competencia) = YEAR(NEW.data_competencia);
+          AND fe.data_competencia >= v_inicio_mes
+          AND fe.data_competencia < v_fim_mes
+          AND fe.status IN ('aprovado', 'pago');
         
         -- Calcula percentual
         SET v_percentual = (v_total_mes / v_orcamento) * 100;
@@ -530,22 +714,26 @@ BEGIN
     DECLARE v_total_mes DECIMAL(15,2);
     DECLARE v_percentual DECIMAL(5,2);
     DECLARE v_disponivel DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
     
     -- Só executa quando folha é aprovada ou paga
     IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
         -- Busca orçamento
         SELECT orcamento INTO v_orcamento
         FROM corpo_financeiro
         WHERE id_direcao = NEW.id_direcao;
         
         -- Calcula total do mês (incluindo a folha recém-aprovada)
-        SELECT COALESCE(SUM(vff.valor_bruto), 0) INTO v_total_mes
-        FROM vw_folha_funcionarios_total vff
-        INNER JOIN folha_funcionarios ff ON vff.id_folha_funcionarios = ff.id_folha_funcionarios
+        SELECT COALESCE(SUM(ff.valor_bruto), 0) INTO v_total_mes
+        FROM folha_funcionarios ff
         WHERE ff.id_direcao = NEW.id_direcao
-          AND ff.status IN ('aprovado', 'pago')
-          AND MONTH(ff.data_competencia) = MONTH(NEW.data_competencia)
-          AND YEAR(ff.data_competencia) = YEAR(NEW.data_competencia);
+          AND ff.data_competencia >= v_inicio_mes
+          AND ff.data_competencia < v_fim_mes
+          AND ff.status IN ('aprovado', 'pago');
         
         -- Calcula percentual
         SET v_percentual = (v_total_mes / v_orcamento) * 100;
@@ -570,6 +758,84 @@ BEGIN
     END IF;
 END//
 
+-- ============================================
+-- TRIGGER 6: Totais da Folha de Elenco
+-- ============================================
+/* mantém valor_bruto e valor_liquido_total de folha_elenco a cada item inserido,
+alterado ou removido (itens com valor nulo não contam, como no SUM da view antiga) */
+CREATE TRIGGER tr_totais_item_folha_e_insert
+AFTER INSERT ON item_folha_e
+FOR EACH ROW
+BEGIN
+    UPDATE folha_elenco
+    SET valor_bruto = valor_bruto + COALESCE(NEW.salario_base + NEW.bonus + NEW.direito_imagem + NEW.parcela_luvas, 0),
+        valor_liquido_total = valor_liquido_total + COALESCE(NEW.salario_base + NEW.bonus + NEW.direito_imagem + NEW.parcela_luvas - NEW.descontos, 0)
+    WHERE id_folha_elenco = NEW.id_folha_elenco;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_e_update
+AFTER UPDATE ON item_folha_e
+FOR EACH ROW
+BEGIN
+    UPDATE folha_elenco
+    SET valor_bruto = valor_bruto - COALESCE(OLD.salario_base + OLD.bonus + OLD.direito_imagem + OLD.parcela_luvas, 0),
+        valor_liquido_total = valor_liquido_total - COALESCE(OLD.salario_base + OLD.bonus + OLD.direito_imagem + OLD.parcela_luvas - OLD.descontos, 0)
+    WHERE id_folha_elenco = OLD.id_folha_elenco;
+    
+    UPDATE folha_elenco
+    SET valor_bruto = valor_bruto + COALESCE(NEW.salario_base + NEW.bonus + NEW.direito_imagem + NEW.parcela_luvas, 0),
+        valor_liquido_total = valor_liquido_total + COALESCE(NEW.salario_base + NEW.bonus + NEW.direito_imagem + NEW.parcela_luvas - NEW.descontos, 0)
+    WHERE id_folha_elenco = NEW.id_folha_elenco;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_e_delete
+AFTER DELETE ON item_folha_e
+FOR EACH ROW
+BEGIN
+    UPDATE folha_elenco
+    SET valor_bruto = valor_bruto - COALESCE(OLD.salario_base + OLD.bonus + OLD.direito_imagem + OLD.parcela_luvas, 0),
+        valor_liquido_total = valor_liquido_total - COALESCE(OLD.salario_base + OLD.bonus + OLD.direito_imagem + OLD.parcela_luvas - OLD.descontos, 0)
+    WHERE id_folha_elenco = OLD.id_folha_elenco;
+END//
+
+-- ============================================
+-- TRIGGER 7: Totais da Folha de Funcionários
+-- ============================================
+CREATE TRIGGER tr_totais_item_folha_f_insert
+AFTER INSERT ON item_folha_f
+FOR EACH ROW
+BEGIN
+    UPDATE folha_funcionarios
+    SET valor_bruto = valor_bruto + COALESCE(NEW.salario_base + NEW.bonus + NEW.adicionais, 0),
+        valor_liquido_total = valor_liquido_total + COALESCE(NEW.salario_base + NEW.bonus + NEW.adicionais - NEW.descontos, 0)
+    WHERE id_folha_funcionarios = NEW.id_folha_funcionarios;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_f_update
+AFTER UPDATE ON item_folha_f
+FOR EACH ROW
+BEGIN
+    UPDATE folha_funcionarios
+    SET valor_bruto = valor_bruto - COALESCE(OLD.salario_base + OLD.bonus + OLD.adicionais, 0),
+        valor_liquido_total = valor_liquido_total - COALESCE(OLD.salario_base + OLD.bonus + OLD.adicionais - OLD.descontos, 0)
+    WHERE id_folha_funcionarios = OLD.id_folha_funcionarios;
+    
+    UPDATE folha_funcionarios
+    SET valor_bruto = valor_bruto + COALESCE(NEW.salario_base + NEW.bonus + NEW.adicionais, 0),
+        valor_liquido_total = valor_liquido_total + COALESCE(NEW.salario_base + NEW.bonus + NEW.adicionais - NEW.descontos, 0)
+    WHERE id_folha_funcionarios = NEW.id_folha_funcionarios;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_f_delete
+AFTER DELETE ON item_folha_f
+FOR EACH ROW
+BEGIN
+    UPDATE folha_funcionarios
+    SET valor_bruto = valor_bruto - COALESCE(OLD.salario_base + OLD.bonus + OLD.adicionais, 0),
+        valor_liquido_total = valor_liquido_total - COALESCE(OLD.salario_base + OLD.bonus + OLD.adicionais - OLD.descontos, 0)
+    WHERE id_folha_funcionarios = OLD.id_folha_funcionarios;
+END//
+
 DELIMITER ;
 
 -- ============================================
@@ -655,10 +921,10 @@ BEGIN
     DECLARE v_data_competencia DATE;
     DECLARE v_id_lancamento INT;
     
-    -- procura o valor bruto calculado da view
+    -- valor bruto mantido no cabeçalho da folha (busca pela chave primária)
     SELECT valor_bruto, data_competencia 
     INTO v_valor, v_data_competencia
-    FROM vw_folha_funcionarios_total
+    FROM folha_funcionarios
     WHERE id_folha_funcionarios = p_id_folha;
     
     /*  atualiza a folha para aprovado ANTES de criar o lançamento
@@ -716,10 +982,10 @@ BEGIN
     DECLARE v_data_competencia DATE;
     DECLARE v_id_lancamento INT;
     
-    -- valor bruto calculado da view
+    -- valor bruto mantido no cabeçalho da folha (busca pela chave primária)
     SELECT valor_bruto, data_competencia 
     INTO v_valor, v_data_competencia
-    FROM vw_folha_elenco_total
+    FROM folha_elenco
     WHERE id_folha_elenco = p_id_folha;
     
 
@@ -763,6 +1029,190 @@ BEGIN
     WHERE id_folha_elenco = p_id_folha;
 END//
 
+-- ============================================
+-- Procedure para aprovar folhas de funcionários em lote
+-- ============================================
+/* p_ids: array JSON de id_folha_funcionarios de folhas pendentes (ex.: '[12, 15, 20]'). Aprova o lote
+inteiro ou nenhuma folha, com os mesmos triggers de sp_aprovar_folha_funcionarios: o UPDATE único
+dispara tr_validar_orcamento_funcionarios (orçamento do mês, contando as folhas do lote já aprovadas
+no mesmo comando, e saldo de caixa) e tr_alerta_orcamento_critico_funcionarios em cada folha; os
+lançamentos entram num INSERT ... SELECT, e tr_validar_saldo_lancamento confere o saldo a cada
+linha. p_aprovadas recebe a quantidade de folhas e p_alertas a de alertas gerados. */
+CREATE PROCEDURE sp_aprovar_folhas_funcionarios_lote(
+    IN p_ids JSON,
+    IN p_id_aprovador INT,
+    IN p_id_conta INT,
+    OUT p_aprovadas INT,
+    OUT p_alertas INT
+)
+BEGIN
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_lote INT DEFAULT 0;
+    DECLARE v_ultimo_alerta INT DEFAULT 0;
+    DECLARE v_primeiro_lancamento INT;
+    
+    SET p_aprovadas = 0;
+    SET p_alertas = 0;
+    
+    -- trava o saldo antes de ler as folhas: aprovações concorrentes esperam o fim do lote
+    SET v_saldo_atual = fn_calcular_saldo_atual();
+    
+    SELECT COUNT(*) INTO v_lote
+    FROM folha_funcionarios f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_funcionarios
+    WHERE f.status = 'pendente'
+    FOR UPDATE;
+    
+    IF v_lote <> JSON_LENGTH(p_ids) THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'ERRO: O lote contém folhas inexistentes ou que não estão pendentes!';
+    END IF;
+    
+    SELECT COALESCE(MAX(id_alerta), 0) INTO v_ultimo_alerta
+    FROM alertas_orcamento;
+    
+    -- aprova o lote; os triggers de update validam e geram os alertas folha a folha
+    UPDATE folha_funcionarios f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_funcionarios
+    SET f.status = 'aprovado';
+    
+    -- lançamentos de saída, como os de sp_aprovar_folha_funcionarios
+    INSERT INTO lancamento (
+        data_registro,
+        valor, 
+        tipo_de_movimentacao, 
+        status_aprovacao, 
+        id_aprovador, 
+        data_aprovacao, 
+        id_direcao, 
+        id_conta, 
+        descricao,
+        origem,
+        id_origem
+    )
+    SELECT
+        f.data_competencia,
+        f.valor_bruto,
+        'saida',
+        'aprovado',
+        p_id_aprovador,
+        NOW(),
+        p_id_aprovador,
+        p_id_conta,
+        CONCAT('Folha de Funcionários - ', DATE_FORMAT(f.data_competencia, '%m/%Y')),
+        'folha_funcionarios',
+        f.id_folha_funcionarios
+    FROM folha_funcionarios f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_funcionarios
+    ORDER BY f.id_folha_funcionarios;
+    
+    SET v_primeiro_lancamento = LAST_INSERT_ID();
+    
+    -- id do lançamento nas folhas (ids a partir do primeiro gerado pelo INSERT acima)
+    UPDATE folha_funcionarios f
+    INNER JOIN lancamento l ON l.id_origem = f.id_folha_funcionarios AND l.origem = 'folha_funcionarios'
+    SET f.id_lancamento = l.id_lancamento
+    WHERE l.id_lancamento >= v_primeiro_lancamento;
+    
+    SET p_aprovadas = v_lote;
+    
+    SELECT COUNT(*) INTO p_alertas
+    FROM alertas_orcamento
+    WHERE id_alerta > v_ultimo_alerta;
+END//
+
+-- ============================================
+-- Procedure para aprovar folhas de elenco em lote
+-- ============================================
+/* p_ids: array JSON de id_folha_elenco de folhas pendentes (ex.: '[12, 15, 20]'). Aprova o lote
+inteiro ou nenhuma folha, com os mesmos triggers de sp_aprovar_folha_elenco: o UPDATE único
+dispara tr_validar_orcamento_elenco (orçamento do mês, contando as folhas do lote já aprovadas
+no mesmo comando, e saldo de caixa) e tr_alerta_orcamento_critico_elenco em cada folha; os
+lançamentos entram num INSERT ... SELECT, e tr_validar_saldo_lancamento confere o saldo a cada
+linha. p_aprovadas recebe a quantidade de folhas e p_alertas a de alertas gerados. */
+CREATE PROCEDURE sp_aprovar_folhas_elenco_lote(
+    IN p_ids JSON,
+    IN p_id_aprovador INT,
+    IN p_id_conta INT,
+    OUT p_aprovadas INT,
+    OUT p_alertas INT
+)
+BEGIN
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_lote INT DEFAULT 0;
+    DECLARE v_ultimo_alerta INT DEFAULT 0;
+    DECLARE v_primeiro_lancamento INT;
+    
+    SET p_aprovadas = 0;
+    SET p_alertas = 0;
+    
+    -- trava o saldo antes de ler as folhas: aprovações concorrentes esperam o fim do lote
+    SET v_saldo_atual = fn_calcular_saldo_atual();
+    
+    SELECT COUNT(*) INTO v_lote
+    FROM folha_elenco f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_elenco
+    WHERE f.status = 'pendente'
+    FOR UPDATE;
+    
+    IF v_lote <> JSON_LENGTH(p_ids) THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'ERRO: O lote contém folhas inexistentes ou que não estão pendentes!';
+    END IF;
+    
+    SELECT COALESCE(MAX(id_alerta), 0) INTO v_ultimo_alerta
+    FROM alertas_orcamento;
+    
+    -- aprova o lote; os triggers de update validam e geram os alertas folha a folha
+    UPDATE folha_elenco f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_elenco
+    SET f.status = 'aprovado';
+    
+    -- lançamentos de saída, como os de sp_aprovar_folha_elenco
+    INSERT INTO lancamento (
+        data_registro,
+        valor, 
+        tipo_de_movimentacao, 
+        status_aprovacao, 
+        id_aprovador, 
+        data_aprovacao, 
+        id_direcao, 
+        id_conta, 
+        descricao,
+        origem,
+        id_origem
+    )
+    SELECT
+        f.data_competencia,
+        f.valor_bruto,
+        'saida',
+        'aprovado',
+        p_id_aprovador,
+        NOW(),
+        p_id_aprovador,
+        p_id_conta,
+        CONCAT('Folha de Elenco - ', DATE_FORMAT(f.data_competencia, '%m/%Y')),
+        'folha_elenco',
+        f.id_folha_elenco
+    FROM folha_elenco f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_elenco
+    ORDER BY f.id_folha_elenco;
+    
+    SET v_primeiro_lancamento = LAST_INSERT_ID();
+    
+    -- id do lançamento nas folhas (ids a partir do primeiro gerado pelo INSERT acima)
+    UPDATE folha_elenco f
+    INNER JOIN lancamento l ON l.id_origem = f.id_folha_elenco AND l.origem = 'folha_elenco'
+    SET f.id_lancamento = l.id_lancamento
+    WHERE l.id_lancamento >= v_primeiro_lancamento;
+    
+    SET p_aprovadas = v_lote;
+    
+    SELECT COUNT(*) INTO p_alertas
+    FROM alertas_orcamento
+    WHERE id_alerta > v_ultimo_alerta;
+END//
+
 -- ============================================
 -- Procedure para aprovar lançamento manual
 -- ============================================
@@ -799,6 +1249,200 @@ BEGIN
     WHERE id_lancamento = p_id_lancamento;
 END//
 
+-- ============================================
+-- Procedure para aprovar lançamentos em lote
+-- ============================================
+/* p_ids: array JSON de id_lancamento (ex.: '[12, 15, 20]'). Os pendentes do lote são
+ordenados por (data_registro, id_lancamento) e o saldo acumulado é calculado numa única
+passada (SUM ... OVER) a partir do saldo de caixa travado. Se alguma saída deixar o saldo
+negativo, nada é aprovado, p_aprovados = 0 e a procedure retorna essas saídas; caso
+contrário todo o lote é aprovado num único UPDATE e p_aprovados recebe a quantidade. */
+CREATE PROCEDURE sp_aprovar_lancamentos_lote(
+    IN p_ids JSON,
+    IN p_id_aprovador INT,
+    OUT p_aprovados INT
+)
+BEGIN
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_lote INT DEFAULT 0;
+    DECLARE v_estouros INT DEFAULT 0;
+    
+    SET p_aprovados = 0;
+    
+    -- trava o saldo e os lançamentos do lote até o fim da transação
+    SET v_saldo_atual = fn_calcular_saldo_atual();
+    
+    SELECT COUNT(*) INTO v_lote
+    FROM lancamento l
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = l.id_lancamento
+    WHERE l.status_aprovacao = 'pendente'
+    FOR UPDATE;
+    
+    DROP TEMPORARY TABLE IF EXISTS tmp_lote_aprovacao;
+    CREATE TEMPORARY TABLE tmp_lote_aprovacao AS
+    SELECT 
+        l.id_lancamento,
+        l.data_registro,
+        l.tipo_de_movimentacao,
+        l.valor,
+        v_saldo_atual + SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE -l.valor END)
+            OVER (ORDER BY l.data_registro, l.id_lancamento) AS saldo_apos
+    FROM lancamento l
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = l.id_lancamento
+    WHERE l.status_aprovacao = 'pendente';
+    
+    SELECT COUNT(*) INTO v_estouros
+    FROM tmp_lote_aprovacao
+    WHERE tipo_de_movimentacao = 'saida' AND saldo_apos < 0;
+    
+    IF v_estouros > 0 THEN
+        SELECT 
+            id_lancamento,
+            data_registro,
+            valor,
+            saldo_apos + valor AS saldo_antes,
+            saldo_apos
+        FROM tmp_lote_aprovacao
+        WHERE tipo_de_movimentacao = 'saida' AND saldo_apos < 0
+        ORDER BY data_registro, id_lancamento;
+    ELSE
+        UPDATE lancamento l
+        INNER JOIN tmp_lote_aprovacao t ON t.id_lancamento = l.id_lancamento
+        SET l.status_aprovacao = 'aprovado',
+            l.id_aprovador = p_id_aprovador,
+            l.data_aprovacao = NOW();
+        
+        SET p_aprovados = ROW_COUNT();
+    END IF;
+    
+    DROP TEMPORARY TABLE IF EXISTS tmp_lote_aprovacao;
+END//
+
+-- ============================================
+-- Procedures do saldo de caixa
+-- ============================================
+
+-- recalcula saldo_caixa a partir do histórico (executar sem aprovações em andamento)
+CREATE PROCEDURE sp_reconstruir_saldo_caixa()
+BEGIN
+    INSERT INTO saldo_caixa (id_saldo, saldo)
+    VALUES (1, fn_calcular_saldo_historico())
+    ON DUPLICATE KEY UPDATE saldo = VALUES(saldo);
+END//
+
+-- compara o saldo mantido com o saldo recalculado do histórico
+CREATE PROCEDURE sp_verificar_saldo_caixa()
+BEGIN
+    DECLARE v_historico DECIMAL(15,2);
+    
+    SET v_historico = fn_calcular_saldo_historico();
+    
+    SELECT 
+        s.saldo AS saldo_mantido,
+        v_historico AS saldo_historico,
+        s.saldo - v_historico AS diferenca,
+        IF(s.saldo = v_historico, 'consistente', 'divergente') AS situacao
+    FROM saldo_caixa s
+    WHERE s.id_saldo = 1;
+END//
+
+-- ============================================
+-- Procedures do resumo mensal por conta
+-- ============================================
+
+-- recalcula resumo_mensal_conta a partir do histórico (executar sem aprovações em andamento)
+CREATE PROCEDURE sp_reconstruir_resumo_mensal()
+BEGIN
+    DELETE FROM resumo_mensal_conta WHERE id_conta > 0;
+    
+    INSERT INTO resumo_mensal_conta (id_conta, mes_registro, total_lancamentos, total_entradas, total_saidas)
+    SELECT 
+        id_conta,
+        mes_registro,
+        COUNT(*),
+        SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE 0 END),
+        SUM(CASE WHEN tipo_de_movimentacao = 'saida' THEN valor ELSE 0 END)
+    FROM lancamento
+    WHERE status_aprovacao = 'aprovado'
+    GROUP BY id_conta, mes_registro;
+END//
+
+-- lista as linhas em que o resumo mantido diverge do histórico (vazio = consistente)
+CREATE PROCEDURE sp_verificar_resumo_mensal()
+BEGIN
+    SELECT 
+        h.id_conta,
+        h.mes_registro,
+        r.total_lancamentos AS lancamentos_mantido,
+        h.total_lancamentos AS lancamentos_historico,
+        r.total_entradas AS entradas_mantido,
+        h.total_entradas AS entradas_historico,
+        r.total_saidas AS saidas_mantido,
+        h.total_saidas AS saidas_historico
+    FROM (
+        SELECT id_conta, mes_registro, COUNT(*) AS total_lancamentos,
+               SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE 0 END) AS total_entradas,
+               SUM(CASE WHEN tipo_de_movimentacao = 'saida' THEN valor ELSE 0 END) AS total_saidas
+        FROM lancamento
+        WHERE status_aprovacao = 'aprovado'
+        GROUP BY id_conta, mes_registro
+    ) h
+    LEFT JOIN resumo_mensal_conta r ON r.id_conta = h.id_conta AND r.mes_registro = h.mes_registro
+    WHERE r.id_conta IS NULL
+       OR r.total_lancamentos <> h.total_lancamentos
+       OR r.total_entradas <> h.total_entradas
+       OR r.total_saidas <> h.total_saidas
+    UNION ALL
+    SELECT 
+        r.id_conta,
+        r.mes_registro,
+        r.total_lancamentos,
+        NULL,
+        r.total_entradas,
+        NULL,
+        r.total_saidas,
+        NULL
+    FROM resumo_mensal_conta r
+    WHERE NOT EXISTS (
+        SELECT 1 FROM lancamento l
+        WHERE l.id_conta = r.id_conta
+          AND l.status_aprovacao = 'aprovado'
+          AND l.mes_registro = r.mes_registro
+    );
+END//
+
+-- ============================================
+-- Procedure de reconstrução dos totais das folhas
+-- ============================================
+
+-- recalcula valor_bruto/valor_liquido_total de todas as folhas a partir dos itens
+CREATE PROCEDURE sp_reconstruir_totais_folha()
+BEGIN
+    UPDATE folha_elenco fe
+    LEFT JOIN (
+        SELECT id_folha_elenco,
+               SUM(salario_base + bonus + direito_imagem + parcela_luvas) AS bruto,
+               SUM(salario_base + bonus + direito_imagem + parcela_luvas - descontos) AS liquido
+        FROM item_folha_e
+        GROUP BY id_folha_elenco
+    ) t ON t.id_folha_elenco = fe.id_folha_elenco
+    SET fe.valor_bruto = COALESCE(t.bruto, 0),
+        fe.valor_liquido_total = COALESCE(t.liquido, 0)
+    WHERE fe.id_folha_elenco > 0;
+    
+    UPDATE folha_funcionarios ff
+    LEFT JOIN (
+        SELECT id_folha_funcionarios,
+               SUM(salario_base + bonus + adicionais) AS bruto,
+               SUM(salario_base + bonus + adicionais - descontos) AS liquido
+        FROM item_folha_f
+        GROUP BY id_folha_funcionarios
+    ) t ON t.id_folha_funcionarios = ff.id_folha_funcionarios
+    SET ff.valor_bruto = COALESCE(t.bruto, 0),
+        ff.valor_liquido_total = COALESCE(t.liquido, 0)
+    WHERE ff.id_folha_funcionarios > 0;
+END//
+
 -- ============================================
 -- Procedures do sistema
 -- ============================================
@@ -870,20 +1514,18 @@ DELIMITER ;
 -- VIEWS PARA CONSULTAS (Compatibilidade)
 -- ============================================
 
--- view de dados públicos
+-- view de dados públicos (lida do resumo mensal mantido, sem reagregar lancamento)
 CREATE OR REPLACE VIEW dados_publicos AS
 SELECT 
     pc.codigo_conta,
     pc.descricao,
     pc.tipo_conta,
-    DATE_FORMAT(l.data_registro, '%Y-%m') AS mes_ano,
-    SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) AS total_entradas,
-    SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END) AS total_saidas,
-    SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE -l.valor END) AS saldo_liquido
-FROM lancamento l
-INNER JOIN plano_de_contas pc ON l.id_conta = pc.id_conta
-WHERE l.status_aprovacao = 'aprovado'
-GROUP BY pc.id_conta, pc.codigo_conta, pc.descricao, pc.tipo_conta, DATE_FORMAT(l.data_registro, '%Y-%m')
+    r.mes_registro AS mes_ano,
+    r.total_entradas,
+    r.total_saidas,
+    r.total_entradas - r.total_saidas AS saldo_liquido
+FROM resumo_mensal_conta r
+INNER JOIN plano_de_contas pc ON r.id_conta = pc.id_conta
 ORDER BY mes_ano DESC, pc.codigo_conta;
 
 -- view de dados privados 
@@ -907,7 +1549,7 @@ INNER JOIN plano_de_contas pc ON l.id_conta = pc.id_conta
 INNER JOIN direcao d ON l.id_direcao = d.id_direcao
 LEFT JOIN direcao aprovador ON l.id_aprovador = aprovador.id_direcao
 WHERE l.status_aprovacao = 'aprovado'
-ORDER BY l.data_registro DESC;
+ORDER BY l.data_registro DESC, l.id_lancamento DESC;
 
 -- view resumo do elenco
 CREATE OR REPLACE VIEW resumo_elenco AS
@@ -165,9 +165,9 @@ extrato completo de cada conta do plano de contas, agrupado
 por mês/ano, mostra quantidade de lançamentos, totais de entradas, saídas e saldo
 do período. Funciona como um extrato para cada conta contábil.
 
-LEFT JOIN entre plano_de_contas e lancamento para garantir que todas as contas
-apareçam. Agrupa por conta e período, contando lançamentos e somando valores separadamente para entradas e saídas. 
-Calcula o saldo considerando entradas como positivas e saídas como negativas. Considera apenas lançamentos aprovados.
+LEFT JOIN entre plano_de_contas e resumo_mensal_conta (totais mensais dos lançamentos
+aprovados, mantidos pelos triggers) para garantir que todas as contas apareçam.
+Calcula o saldo considerando entradas como positivas e saídas como negativas.
 Ordena por período (mais recente) e código da conta.
 
 */
@@ -175,14 +175,13 @@ SELECT
     pc.codigo_conta,
     pc.descricao,
     pc.tipo_conta,
-    DATE_FORMAT(l.data_registro, '%Y-%m') AS mes_ano,
-    COUNT(l.id_lancamento) AS total_lancamentos,
-    SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) AS total_entradas,
-    SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END) AS total_saidas,
-    SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE -l.valor END) AS saldo_periodo
+    r.mes_registro AS mes_ano,
+    COALESCE(r.total_lancamentos, 0) AS total_lancamentos,
+    COALESCE(r.total_entradas, 0) AS total_entradas,
+    COALESCE(r.total_saidas, 0) AS total_saidas,
+    r.total_entradas - r.total_saidas AS saldo_periodo
 FROM plano_de_contas pc
-LEFT JOIN lancamento l ON pc.id_conta = l.id_conta AND l.status_aprovacao = 'aprovado'
-GROUP BY pc.id_conta, pc.codigo_conta, pc.descricao, pc.tipo_conta, DATE_FORMAT(l.data_registro, '%Y-%m')
+LEFT JOIN resumo_mensal_conta r ON pc.id_conta = r.id_conta
 ORDER BY mes_ano DESC, pc.codigo_conta;
 
 
@@ -209,20 +208,19 @@ ORDER BY valor_total_contabil_atual DESC;
 -- 12. CONSULTA: Balanço Mensal Simplificado
 -- ============================================
 /*
-balanço simplificado mensal mostrando total de receitas, despesas e resultado de cada mês, agrupando lançamentos aprovados por mês, 
-separa e soma receitas e despesas, calcula o resultado do periodo.
+balanço simplificado mensal mostrando total de receitas, despesas e resultado de cada mês, somando
+os totais por conta de resumo_mensal_conta (lançamentos aprovados), calcula o resultado do periodo.
 */
 
 SELECT 
-    DATE_FORMAT(data_registro, '%Y-%m') AS mes_ano,
-    YEAR(data_registro) AS ano,
-    MONTH(data_registro) AS mes,
-    SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE 0 END) AS total_receitas,
-    SUM(CASE WHEN tipo_de_movimentacao = 'saida' THEN valor ELSE 0 END) AS total_despesas,
-    SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE -valor END) AS resultado_periodo
-FROM lancamento
-WHERE status_aprovacao = 'aprovado'
-GROUP BY YEAR(data_registro), MONTH(data_registro), DATE_FORMAT(data_registro, '%Y-%m')
+    mes_registro AS mes_ano,
+    CAST(LEFT(mes_registro, 4) AS UNSIGNED) AS ano,
+    CAST(SUBSTRING(mes_registro, 6, 2) AS UNSIGNED) AS mes,
+    SUM(total_entradas) AS total_receitas,
+    SUM(total_saidas) AS total_despesas,
+    SUM(total_entradas - total_saidas) AS resultado_periodo
+FROM resumo_mensal_conta
+GROUP BY mes_registro
 ORDER BY ano DESC, mes DESC;
 
 -- ============================================
@@ -282,17 +280,16 @@ em algum mes atinge 80% do orçamento disponivel.
 */
 
 SELECT 
-    DATE_FORMAT(data_registro, '%Y-%m') AS mes_ano,
-    YEAR(data_registro) AS ano,
-    MONTH(data_registro) AS mes,
-    SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE 0 END) AS total_receitas,
-    SUM(CASE WHEN tipo_de_movimentacao = 'saida' THEN valor ELSE 0 END) AS total_despesas,
-    SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE -valor END) AS resultado_periodo,
-    ABS(SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE -valor END)) AS deficit,
-    CONCAT('R$ ', FORMAT(ABS(SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE -valor END)), 2, 'pt_BR')) AS deficit_formatado
-FROM lancamento
-WHERE status_aprovacao = 'aprovado'
-GROUP BY YEAR(data_registro), MONTH(data_registro), DATE_FORMAT(data_registro, '%Y-%m')
+    mes_registro AS mes_ano,
+    CAST(LEFT(mes_registro, 4) AS UNSIGNED) AS ano,
+    CAST(SUBSTRING(mes_registro, 6, 2) AS UNSIGNED) AS mes,
+    SUM(total_entradas) AS total_receitas,
+    SUM(total_saidas) AS total_despesas,
+    SUM(total_entradas - total_saidas) AS resultado_periodo,
+    ABS(SUM(total_entradas - total_saidas)) AS deficit,
+    CONCAT('R$ ', FORMAT(ABS(SUM(total_entradas - total_saidas)), 2, 'pt_BR')) AS deficit_formatado
+FROM resumo_mensal_conta
+GROUP BY mes_registro
 HAVING resultado_periodo < 0
 ORDER BY ano DESC, mes DESC;
 
@@ -3,6 +3,7 @@ USE gestao_clube;
 SET FOREIGN_KEY_CHECKS = 0;
 
 TRUNCATE TABLE alertas_orcamento;
+TRUNCATE TABLE resumo_mensal_conta;
 TRUNCATE TABLE lancamento;
 TRUNCATE TABLE relatorio_bens;
 TRUNCATE TABLE ativo_imobilizado;
@@ -27,6 +28,9 @@ TRUNCATE TABLE clube;
 
 SET FOREIGN_KEY_CHECKS = 1;
 
+-- TRUNCATE não dispara triggers: zera o saldo mantido junto com o histórico
+CALL sp_reconstruir_saldo_caixa();
+
 -- ============================================
 -- INSERÇÃO DE DADOS
 -- ============================================
@@ -145,7 +149,7 @@ INSERT INTO moveis (id_bem, depreciacao_ano) VALUES
 (6, 15.00),
 (7, 20.00);
 
--- Folhas de Pagamento do Elenco (SEM valor_bruto - calculado via view)
+-- Folhas de Pagamento do Elenco (SEM valor_bruto - mantido pelos triggers dos itens)
 INSERT INTO folha_elenco (data_competencia, data_pagamento, valor_direitos_imagem, status, id_direcao) VALUES
 ('2026-01-01', '2026-01-05', 12000.00, 'pendente', 2),
 ('2026-02-01', '2026-02-05', 12500.00, 'pendente', 2),
@@ -172,7 +176,7 @@ INSERT INTO item_folha_e (salario_base, bonus, direito_imagem, parcela_luvas, de
 (28500.00, 4100.00, 4050.00, 1500.00, 4500.00, 3, 4),
 (20200.00, 2050.00, 2550.00, 1000.00, 2750.00, 3, 5);
 
--- Folhas de Pagamento de Funcionários (SEM valor_bruto - calculado via view)
+-- Folhas de Pagamento de Funcionários (SEM valor_bruto - mantido pelos triggers dos itens)
 INSERT INTO folha_funcionarios (data_pagamento, status, data_competencia, id_direcao) VALUES
 ('2026-01-05', 'pendente', '2026-01-01', 3),
 ('2026-02-05', 'pendente', '2026-02-01', 3),
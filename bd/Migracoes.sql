@@ -0,0 +1,1445 @@
+USE gestao_clube;
+
+/*
+Migrações para bancos já criados com uma versão anterior de Banco.sql.
+Cada bloco é independente e deve ser executado uma única vez, em ordem,
+em janela de manutenção (sem aprovações em andamento).
+Instalações novas não precisam deste arquivo: Banco.sql já contém tudo.
+*/
+
+-- ============================================
+-- 1. MIGRAÇÃO: Saldo de Caixa Mantido
+-- ============================================
+/*
+substitui a soma de todo o histórico de lancamento em fn_calcular_saldo_atual()
+por uma leitura de linha única em saldo_caixa, mantida pelos triggers de
+insert/update/delete em lancamento. Semeia o saldo a partir do histórico e
+confere o resultado com o cálculo antigo (fn_calcular_saldo_historico).
+*/
+
+CREATE TABLE IF NOT EXISTS saldo_caixa (
+    id_saldo TINYINT PRIMARY KEY,
+    saldo DECIMAL(15,2) NOT NULL DEFAULT 0.00,
+    data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CHECK (id_saldo = 1)
+);
+
+DROP FUNCTION IF EXISTS fn_calcular_saldo_atual;
+DROP FUNCTION IF EXISTS fn_calcular_saldo_historico;
+DROP TRIGGER IF EXISTS tr_saldo_caixa_insert;
+DROP TRIGGER IF EXISTS tr_saldo_caixa_update;
+DROP TRIGGER IF EXISTS tr_saldo_caixa_delete;
+DROP PROCEDURE IF EXISTS sp_reconstruir_saldo_caixa;
+DROP PROCEDURE IF EXISTS sp_verificar_saldo_caixa;
+
+DELIMITER //
+
+CREATE FUNCTION fn_calcular_saldo_atual()
+RETURNS DECIMAL(15,2)
+DETERMINISTIC
+READS SQL DATA
+BEGIN
+    DECLARE v_saldo DECIMAL(15,2);
+
+    SELECT saldo INTO v_saldo
+    FROM saldo_caixa
+    WHERE id_saldo = 1
+    FOR UPDATE;
+
+    RETURN COALESCE(v_saldo, 0);
+END//
+
+CREATE FUNCTION fn_calcular_saldo_historico()
+RETURNS DECIMAL(15,2)
+DETERMINISTIC
+READS SQL DATA
+BEGIN
+    DECLARE v_saldo DECIMAL(15,2);
+
+    SELECT COALESCE(SUM(
+        CASE
+            WHEN tipo_de_movimentacao = 'entrada' THEN valor
+            WHEN tipo_de_movimentacao = 'saida' THEN -valor
+            ELSE 0
+        END
+    ), 0) INTO v_saldo
+    FROM lancamento
+    WHERE status_aprovacao = 'aprovado';
+
+    RETURN v_saldo;
+END//
+
+CREATE TRIGGER tr_saldo_caixa_insert
+AFTER INSERT ON lancamento
+FOR EACH ROW
+BEGIN
+    IF NEW.status_aprovacao = 'aprovado' THEN
+        UPDATE saldo_caixa
+        SET saldo = saldo + CASE WHEN NEW.tipo_de_movimentacao = 'entrada' THEN NEW.valor ELSE -NEW.valor END
+        WHERE id_saldo = 1;
+    END IF;
+END//
+
+CREATE TRIGGER tr_saldo_caixa_update
+AFTER UPDATE ON lancamento
+FOR EACH ROW
+BEGIN
+    DECLARE v_delta DECIMAL(15,2) DEFAULT 0;
+
+    IF OLD.status_aprovacao = 'aprovado' THEN
+        SET v_delta = v_delta - CASE WHEN OLD.tipo_de_movimentacao = 'entrada' THEN OLD.valor ELSE -OLD.valor END;
+    END IF;
+
+    IF NEW.status_aprovacao = 'aprovado' THEN
+        SET v_delta = v_delta + CASE WHEN NEW.tipo_de_movimentacao = 'entrada' THEN NEW.valor ELSE -NEW.valor END;
+    END IF;
+
+    IF v_delta <> 0 THEN
+        UPDATE saldo_caixa
+        SET saldo = saldo + v_delta
+        WHERE id_saldo = 1;
+    END IF;
+END//
+
+CREATE TRIGGER tr_saldo_caixa_delete
+AFTER DELETE ON lancamento
+FOR EACH ROW
+BEGIN
+    IF OLD.status_aprovacao = 'aprovado' THEN
+        UPDATE saldo_caixa
+        SET saldo = saldo - CASE WHEN OLD.tipo_de_movimentacao = 'entrada' THEN OLD.valor ELSE -OLD.valor END
+        WHERE id_saldo = 1;
+    END IF;
+END//
+
+CREATE PROCEDURE sp_reconstruir_saldo_caixa()
+BEGIN
+    INSERT INTO saldo_caixa (id_saldo, saldo)
+    VALUES (1, fn_calcular_saldo_historico())
+    ON DUPLICATE KEY UPDATE saldo = VALUES(saldo);
+END//
+
+CREATE PROCEDURE sp_verificar_saldo_caixa()
+BEGIN
+    DECLARE v_historico DECIMAL(15,2);
+
+    SET v_historico = fn_calcular_saldo_historico();
+
+    SELECT
+        s.saldo AS saldo_mantido,
+        v_historico AS saldo_historico,
+        s.saldo - v_historico AS diferenca,
+        IF(s.saldo = v_historico, 'consistente', 'divergente') AS situacao
+    FROM saldo_caixa s
+    WHERE s.id_saldo = 1;
+END//
+
+DELIMITER ;
+
+-- semeia o saldo com o histórico existente e confere com o cálculo antigo
+CALL sp_reconstruir_saldo_caixa();
+CALL sp_verificar_saldo_caixa();
+
+
+-- ============================================
+-- 2. MIGRAÇÃO: Competência Mensal Indexável
+-- ============================================
+/*
+adiciona a coluna gerada lancamento.mes_registro ('AAAA-MM') e os índices compostos
+usados pelos triggers de orçamento, pelas views e pelos balancetes. Os triggers passam
+a filtrar o mês por faixa de datas (data_competencia >= início AND < início + 1 mês),
+predicado que usa idx_folha_*_direcao_comp no lugar de MONTH()/YEAR().
+Os planos de execução resultantes podem ser conferidos com bd/Planos.sql.
+*/
+
+ALTER TABLE lancamento
+    ADD COLUMN mes_registro CHAR(7) GENERATED ALWAYS AS (DATE_FORMAT(data_registro, '%Y-%m')) STORED,
+    ADD INDEX idx_lancamento_status_data (status_aprovacao, data_registro),
+    ADD INDEX idx_lancamento_status_mes (status_aprovacao, mes_registro),
+    ADD INDEX idx_lancamento_conta_status_mes (id_conta, status_aprovacao, mes_registro);
+
+ALTER TABLE folha_elenco
+    ADD INDEX idx_folha_elenco_direcao_comp (id_direcao, data_competencia, status);
+
+ALTER TABLE folha_funcionarios
+    ADD INDEX idx_folha_funcionarios_direcao_comp (id_direcao, data_competencia, status);
+
+DROP TRIGGER IF EXISTS tr_validar_orcamento_elenco;
+DROP TRIGGER IF EXISTS tr_validar_orcamento_funcionarios;
+DROP TRIGGER IF EXISTS tr_alerta_orcamento_critico_elenco;
+DROP TRIGGER IF EXISTS tr_alerta_orcamento_critico_funcionarios;
+
+DELIMITER //
+
+CREATE TRIGGER tr_validar_orcamento_elenco
+BEFORE UPDATE ON folha_elenco
+FOR EACH ROW
+BEGIN
+    DECLARE v_orcamento DECIMAL(15,2);
+    DECLARE v_total_mes DECIMAL(15,2);
+    DECLARE v_valor_bruto DECIMAL(15,2);
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
+    
+    -- Só valida quando status muda de 'pendente' para 'aprovado' ou 'pago'
+    IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        -- Intervalo do mês de competência (predicado por faixa, usa o índice)
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
+        -- Busca orçamento do corpo esportivo
+        SELECT orcamento INTO v_orcamento
+        FROM corpo_esportivo
+        WHERE id_direcao = NEW.id_direcao;
+        
+        -- Calcula valor bruto desta folha
+        SELECT COALESCE(SUM(salario_base + bonus + direito_imagem + parcela_luvas), 0)
+        INTO v_valor_bruto
+        FROM item_folha_e
+        WHERE id_folha_elenco = NEW.id_folha_elenco;
+        
+        -- Calcula total já gasto no mês (excluindo a folha atual)
+        SELECT COALESCE(SUM(ife.salario_base + ife.bonus + ife.direito_imagem + ife.parcela_luvas), 0) INTO v_total_mes
+        FROM folha_elenco fe
+        INNER JOIN item_folha_e ife ON ife.id_folha_elenco = fe.id_folha_elenco
+        WHERE fe.id_direcao = NEW.id_direcao
+          AND fe.data_competencia >= v_inicio_mes
+          AND fe.data_competencia < v_fim_mes
+          AND fe.status IN ('aprovado', 'pago')
+          AND fe.id_folha_elenco != NEW.id_folha_elenco;
+        
+        -- VALIDAÇÃO 1: Verifica se excede orçamento mensal
+        IF (v_total_mes + v_valor_bruto) > v_orcamento THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'ERRO: Orçamento mensal do Corpo Esportivo excedido!';
+        END IF;
+        
+        -- VALIDAÇÃO 2: Verifica se há saldo em caixa
+        SET v_saldo_atual = fn_calcular_saldo_atual();
+        IF v_saldo_atual < v_valor_bruto THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'ERRO: Saldo insuficiente para aprovar esta folha de elenco!';
+        END IF;
+    END IF;
+END//
+
+CREATE TRIGGER tr_validar_orcamento_funcionarios
+BEFORE UPDATE ON folha_funcionarios
+FOR EACH ROW
+BEGIN
+    DECLARE v_orcamento DECIMAL(15,2);
+    DECLARE v_total_mes DECIMAL(15,2);
+    DECLARE v_valor_bruto DECIMAL(15,2);
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
+    
+    -- Só valida quando status muda de 'pendente' para 'aprovado' ou 'pago'
+    IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        -- Intervalo do mês de competência (predicado por faixa, usa o índice)
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
+        -- Busca orçamento do corpo financeiro
+        SELECT orcamento INTO v_orcamento
+        FROM corpo_financeiro
+        WHERE id_direcao = NEW.id_direcao;
+        
+        -- Calcula valor bruto desta folha
+        SELECT COALESCE(SUM(salario_base + bonus + adicionais), 0)
+        INTO v_valor_bruto
+        FROM item_folha_f
+        WHERE id_folha_funcionarios = NEW.id_folha_funcionarios;
+        
+        -- Calcula total já gasto no mês (excluindo a folha atual)
+        SELECT COALESCE(SUM(iff.salario_base + iff.bonus + iff.adicionais), 0) INTO v_total_mes
+        FROM folha_funcionarios ff
+        INNER JOIN item_folha_f iff ON iff.id_folha_funcionarios = ff.id_folha_funcionarios
+        WHERE ff.id_direcao = NEW.id_direcao
+          AND ff.data_competencia >= v_inicio_mes
+          AND ff.data_competencia < v_fim_mes
+          AND ff.status IN ('aprovado', 'pago')
+          AND ff.id_folha_funcionarios != NEW.id_folha_funcionarios;
+        
+        -- VALIDAÇÃO 1: Verifica se excede orçamento mensal
+        IF (v_total_mes + v_valor_bruto) > v_orcamento THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'ERRO: Orçamento mensal do Corpo Financeiro excedido!';
+        END IF;
+        
+        -- VALIDAÇÃO 2: Verifica se há saldo em caixa
+        SET v_saldo_atual = fn_calcular_saldo_atual();
+        IF v_saldo_atual < v_valor_bruto THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'ERRO: Saldo insuficiente para aprovar esta folha de funcionários!';
+        END IF;
+    END IF;
+END//
+
+CREATE TRIGGER tr_alerta_orcamento_critico_elenco
+AFTER UPDATE ON folha_elenco
+FOR EACH ROW
+BEGIN
+    DECLARE v_orcamento DECIMAL(15,2);
+    DECLARE v_total_mes DECIMAL(15,2);
+    DECLARE v_percentual DECIMAL(5,2);
+    DECLARE v_disponivel DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
+    
+    -- Só executa quando folha é aprovada ou paga
+    IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
+        -- Busca orçamento
+        SELECT orcamento INTO v_orcamento
+        FROM corpo_esportivo
+        WHERE id_direcao = NEW.id_direcao;
+        
+        -- Calcula total do mês (incluindo a folha recém-aprovada)
+        SELECT COALESCE(SUM(ife.salario_base + ife.bonus + ife.direito_imagem + ife.parcela_luvas), 0) INTO v_total_mes
+        FROM folha_elenco fe
+        INNER JOIN item_folha_e ife ON ife.id_folha_elenco = fe.id_folha_elenco
+        WHERE fe.id_direcao = NEW.id_direcao
+          AND fe.data_competencia >= v_inicio_mes
+          AND fe.data_competencia < v_fim_mes
+          AND fe.status IN ('aprovado', 'pago');
+        
+        -- Calcula percentual
+        SET v_percentual = (v_total_mes / v_orcamento) * 100;
+        SET v_disponivel = v_orcamento - v_total_mes;
+        
+        -- Gera alerta se >= 80%
+        IF v_percentual >= 80.00 THEN
+            INSERT INTO alertas_orcamento (
+                id_direcao,
+                percentual_usado,
+                valor_disponivel,
+                mensagem
+            ) VALUES (
+                NEW.id_direcao,
+                v_percentual,
+                v_disponivel,
+                CONCAT('ALERTA CRÍTICO: Orçamento do elenco em ', ROUND(v_percentual, 2), 
+                       '% de utilização no mês ', DATE_FORMAT(NEW.data_competencia, '%m/%Y'),
+                       '. Disponível: R$ ', FORMAT(v_disponivel, 2, 'pt_BR'))
+            );
+        END IF;
+    END IF;
+END//
+
+CREATE TRIGGER tr_alerta_orcamento_critico_funcionarios
+AFTER UPDATE ON folha_funcionarios
+FOR EACH ROW
+BEGIN
+    DECLARE v_orcamento DECIMAL(15,2);
+    DECLARE v_total_mes DECIMAL(15,2);
+    DECLARE v_percentual DECIMAL(5,2);
+    DECLARE v_disponivel DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
+    
+    -- Só executa quando folha é aprovada ou paga
+    IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
+        -- Busca orçamento
+        SELECT orcamento INTO v_orcamento
+        FROM corpo_financeiro
+        WHERE id_direcao = NEW.id_direcao;
+        
+        -- Calcula total do mês (incluindo a folha recém-aprovada)
+        SELECT COALESCE(SUM(iff.salario_base + iff.bonus + iff.adicionais), 0) INTO v_total_mes
+        FROM folha_funcionarios ff
+        INNER JOIN item_folha_f iff ON iff.id_folha_funcionarios = ff.id_folha_funcionarios
+        WHERE ff.id_direcao = NEW.id_direcao
+          AND ff.data_competencia >= v_inicio_mes
+          AND ff.data_competencia < v_fim_mes
+          AND ff.status IN ('aprovado', 'pago');
+        
+        -- Calcula percentual
+        SET v_percentual = (v_total_mes / v_orcamento) * 100;
+        SET v_disponivel = v_orcamento - v_total_mes;
+        
+        -- Gera alerta se >= 80%
+        IF v_percentual >= 80.00 THEN
+            INSERT INTO alertas_orcamento (
+                id_direcao,
+                percentual_usado,
+                valor_disponivel,
+                mensagem
+            ) VALUES (
+                NEW.id_direcao,
+                v_percentual,
+                v_disponivel,
+                CONCAT('ALERTA CRÍTICO: Orçamento administrativo em ', ROUND(v_percentual, 2), 
+                       '% de utilização no mês ', DATE_FORMAT(NEW.data_competencia, '%m/%Y'),
+                       '. Disponível: R$ ', FORMAT(v_disponivel, 2, 'pt_BR'))
+            );
+        END IF;
+    END IF;
+END//
+
+DELIMITER ;
+
+CREATE OR REPLACE VIEW dados_publicos AS
+SELECT 
+    pc.codigo_conta,
+    pc.descricao,
+    pc.tipo_conta,
+    l.mes_registro AS mes_ano,
+    SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) AS total_entradas,
+    SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END) AS total_saidas,
+    SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE -l.valor END) AS saldo_liquido
+FROM lancamento l
+INNER JOIN plano_de_contas pc ON l.id_conta = pc.id_conta
+WHERE l.status_aprovacao = 'aprovado'
+GROUP BY pc.id_conta, pc.codigo_conta, pc.descricao, pc.tipo_conta, l.mes_registro
+ORDER BY mes_ano DESC, pc.codigo_conta;
+
+-- ============================================
+-- 3. MIGRAÇÃO: Totais Mantidos nas Folhas
+-- ============================================
+/*
+folha_elenco e folha_funcionarios passam a guardar valor_bruto e valor_liquido_total,
+mantidos pelos triggers de item_folha_e / item_folha_f. As views vw_folha_*_total deixam
+de agrupar (viram MERGE), as procedures de aprovação leem o cabeçalho pela chave primária
+e os triggers de orçamento somam o valor_bruto das folhas do mês sem juntar os itens.
+*/
+
+ALTER TABLE folha_elenco
+    ADD COLUMN valor_bruto DECIMAL(15,2) NOT NULL DEFAULT 0.00 AFTER status,
+    ADD COLUMN valor_liquido_total DECIMAL(15,2) NOT NULL DEFAULT 0.00 AFTER valor_bruto;
+
+ALTER TABLE folha_funcionarios
+    ADD COLUMN valor_bruto DECIMAL(15,2) NOT NULL DEFAULT 0.00 AFTER data_competencia,
+    ADD COLUMN valor_liquido_total DECIMAL(15,2) NOT NULL DEFAULT 0.00 AFTER valor_bruto;
+
+CREATE OR REPLACE VIEW vw_folha_elenco_total AS
+SELECT 
+    fe.id_folha_elenco,
+    fe.data_competencia,
+    fe.data_pagamento,
+    fe.valor_direitos_imagem,
+    fe.status,
+    fe.id_direcao,
+    fe.id_lancamento,
+    fe.valor_bruto,
+    fe.valor_liquido_total
+FROM folha_elenco fe;
+
+CREATE OR REPLACE VIEW vw_folha_funcionarios_total AS
+SELECT 
+    ff.id_folha_funcionarios,
+    ff.data_competencia,
+    ff.data_pagamento,
+    ff.status,
+    ff.id_direcao,
+    ff.id_lancamento,
+    ff.valor_bruto,
+    ff.valor_liquido_total
+FROM folha_funcionarios ff;
+
+DROP TRIGGER IF EXISTS tr_validar_orcamento_elenco;
+DROP TRIGGER IF EXISTS tr_validar_orcamento_funcionarios;
+DROP TRIGGER IF EXISTS tr_alerta_orcamento_critico_elenco;
+DROP TRIGGER IF EXISTS tr_alerta_orcamento_critico_funcionarios;
+DROP TRIGGER IF EXISTS tr_totais_item_folha_e_insert;
+DROP TRIGGER IF EXISTS tr_totais_item_folha_e_update;
+DROP TRIGGER IF EXISTS tr_totais_item_folha_e_delete;
+DROP TRIGGER IF EXISTS tr_totais_item_folha_f_insert;
+DROP TRIGGER IF EXISTS tr_totais_item_folha_f_update;
+DROP TRIGGER IF EXISTS tr_totais_item_folha_f_delete;
+DROP PROCEDURE IF EXISTS sp_aprovar_folha_funcionarios;
+DROP PROCEDURE IF EXISTS sp_aprovar_folha_elenco;
+DROP PROCEDURE IF EXISTS sp_reconstruir_totais_folha;
+
+DELIMITER //
+
+CREATE TRIGGER tr_validar_orcamento_elenco
+BEFORE UPDATE ON folha_elenco
+FOR EACH ROW
+BEGIN
+    DECLARE v_orcamento DECIMAL(15,2);
+    DECLARE v_total_mes DECIMAL(15,2);
+    DECLARE v_valor_bruto DECIMAL(15,2);
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
+    
+    -- Só valida quando status muda de 'pendente' para 'aprovado' ou 'pago'
+    IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        -- Intervalo do mês de competência (predicado por faixa, usa o índice)
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
+        -- Busca orçamento do corpo esportivo
+        SELECT orcamento INTO v_orcamento
+        FROM corpo_esportivo
+        WHERE id_direcao = NEW.id_direcao;
+        
+        -- Valor bruto desta folha (mantido no cabeçalho)
+        SET v_valor_bruto = NEW.valor_bruto;
+        
+        -- Calcula total já gasto no mês (excluindo a folha atual)
+        SELECT COALESCE(SUM(fe.valor_bruto), 0) INTO v_total_mes
+        FROM folha_elenco fe
+        WHERE fe.id_direcao = NEW.id_direcao
+          AND fe.data_competencia >= v_inicio_mes
+          AND fe.data_competencia < v_fim_mes
+          AND fe.status IN ('aprovado', 'pago')
+          AND fe.id_folha_elenco != NEW.id_folha_elenco;
+        
+        -- VALIDAÇÃO 1: Verifica se excede orçamento mensal
+        IF (v_total_mes + v_valor_bruto) > v_orcamento THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'ERRO: Orçamento mensal do Corpo Esportivo excedido!';
+        END IF;
+        
+        -- VALIDAÇÃO 2: Verifica se há saldo em caixa
+        SET v_saldo_atual = fn_calcular_saldo_atual();
+        IF v_saldo_atual < v_valor_bruto THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'ERRO: Saldo insuficiente para aprovar esta folha de elenco!';
+        END IF;
+    END IF;
+END//
+
+CREATE TRIGGER tr_validar_orcamento_funcionarios
+BEFORE UPDATE ON folha_funcionarios
+FOR EACH ROW
+BEGIN
+    DECLARE v_orcamento DECIMAL(15,2);
+    DECLARE v_total_mes DECIMAL(15,2);
+    DECLARE v_valor_bruto DECIMAL(15,2);
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
+    
+    -- Só valida quando status muda de 'pendente' para 'aprovado' ou 'pago'
+    IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        -- Intervalo do mês de competência (predicado por faixa, usa o índice)
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
+        -- Busca orçamento do corpo financeiro
+        SELECT orcamento INTO v_orcamento
+        FROM corpo_financeiro
+        WHERE id_direcao = NEW.id_direcao;
+        
+        -- Valor bruto desta folha (mantido no cabeçalho)
+        SET v_valor_bruto = NEW.valor_bruto;
+        
+        -- Calcula total já gasto no mês (excluindo a folha atual)
+        SELECT COALESCE(SUM(ff.valor_bruto), 0) INTO v_total_mes
+        FROM folha_funcionarios ff
+        WHERE ff.id_direcao = NEW.id_direcao
+          AND ff.data_competencia >= v_inicio_mes
+          AND ff.data_competencia < v_fim_mes
+          AND ff.status IN ('aprovado', 'pago')
+          AND ff.id_folha_funcionarios != NEW.id_folha_funcionarios;
+        
+        -- VALIDAÇÃO 1: Verifica se excede orçamento mensal
+        IF (v_total_mes + v_valor_bruto) > v_orcamento THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'ERRO: Orçamento mensal do Corpo Financeiro excedido!';
+        END IF;
+        
+        -- VALIDAÇÃO 2: Verifica se há saldo em caixa
+        SET v_saldo_atual = fn_calcular_saldo_atual();
+        IF v_saldo_atual < v_valor_bruto THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'ERRO: Saldo insuficiente para aprovar esta folha de funcionários!';
+        END IF;
+    END IF;
+END//
+
+CREATE TRIGGER tr_alerta_orcamento_critico_elenco
+AFTER UPDATE ON folha_elenco
+FOR EACH ROW
+BEGIN
+    DECLARE v_orcamento DECIMAL(15,2);
+    DECLARE v_total_mes DECIMAL(15,2);
+    DECLARE v_percentual DECIMAL(5,2);
+    DECLARE v_disponivel DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
+    
+    -- Só executa quando folha é aprovada ou paga
+    IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
+        -- Busca orçamento
+        SELECT orcamento INTO v_orcamento
+        FROM corpo_esportivo
+        WHERE id_direcao = NEW.id_direcao;
+        
+        -- Calcula total do mês (incluindo a folha recém-aprovada)
+        SELECT COALESCE(SUM(fe.valor_bruto), 0) INTO v_total_mes
+        FROM folha_elenco fe
+        WHERE fe.id_direcao = NEW.id_direcao
+          AND fe.data_competencia >= v_inicio_mes
+          AND fe.data_competencia < v_fim_mes
+          AND fe.status IN ('aprovado', 'pago');
+        
+        -- Calcula percentual
+        SET v_percentual = (v_total_mes / v_orcamento) * 100;
+        SET v_disponivel = v_orcamento - v_total_mes;
+        
+        -- Gera alerta se >= 80%
+        IF v_percentual >= 80.00 THEN
+            INSERT INTO alertas_orcamento (
+                id_direcao,
+                percentual_usado,
+                valor_disponivel,
+                mensagem
+            ) VALUES (
+                NEW.id_direcao,
+                v_percentual,
+                v_disponivel,
+                CONCAT('ALERTA CRÍTICO: Orçamento do elenco em ', ROUND(v_percentual, 2), 
+                       '% de utilização no mês ', DATE_FORMAT(NEW.data_competencia, '%m/%Y'),
+                       '. Disponível: R$ ', FORMAT(v_disponivel, 2, 'pt_BR'))
+            );
+        END IF;
+    END IF;
+END//
+
+CREATE TRIGGER tr_alerta_orcamento_critico_funcionarios
+AFTER UPDATE ON folha_funcionarios
+FOR EACH ROW
+BEGIN
+    DECLARE v_orcamento DECIMAL(15,2);
+    DECLARE v_total_mes DECIMAL(15,2);
+    DECLARE v_percentual DECIMAL(5,2);
+    DECLARE v_disponivel DECIMAL(15,2);
+    DECLARE v_inicio_mes DATE;
+    DECLARE v_fim_mes DATE;
+    
+    -- Só executa quando folha é aprovada ou paga
+    IF NEW.status IN ('aprovado', 'pago') AND OLD.status = 'pendente' THEN
+        SET v_inicio_mes = NEW.data_competencia - INTERVAL (DAYOFMONTH(NEW.data_competencia) - 1) DAY;
+        SET v_fim_mes = v_inicio_mes + INTERVAL 1 MONTH;
+        
+        -- Busca orçamento
+        SELECT orcamento INTO v_orcamento
+        FROM corpo_financeiro
+        WHERE id_direcao = NEW.id_direcao;
+        
+        -- Calcula total do mês (incluindo a folha recém-aprovada)
+        SELECT COALESCE(SUM(ff.valor_bruto), 0) INTO v_total_mes
+        FROM folha_funcionarios ff
+        WHERE ff.id_direcao = NEW.id_direcao
+          AND ff.data_competencia >= v_inicio_mes
+          AND ff.data_competencia < v_fim_mes
+          AND ff.status IN ('aprovado', 'pago');
+        
+        -- Calcula percentual
+        SET v_percentual = (v_total_mes / v_orcamento) * 100;
+        SET v_disponivel = v_orcamento - v_total_mes;
+        
+        -- Gera alerta se >= 80%
+        IF v_percentual >= 80.00 THEN
+            INSERT INTO alertas_orcamento (
+                id_direcao,
+                percentual_usado,
+                valor_disponivel,
+                mensagem
+            ) VALUES (
+                NEW.id_direcao,
+                v_percentual,
+                v_disponivel,
+                CONCAT('ALERTA CRÍTICO: Orçamento administrativo em ', ROUND(v_percentual, 2), 
+                       '% de utilização no mês ', DATE_FORMAT(NEW.data_competencia, '%m/%Y'),
+                       '. Disponível: R$ ', FORMAT(v_disponivel, 2, 'pt_BR'))
+            );
+        END IF;
+    END IF;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_e_insert
+AFTER INSERT ON item_folha_e
+FOR EACH ROW
+BEGIN
+    UPDATE folha_elenco
+    SET valor_bruto = valor_bruto + COALESCE(NEW.salario_base + NEW.bonus + NEW.direito_imagem + NEW.parcela_luvas, 0),
+        valor_liquido_total = valor_liquido_total + COALESCE(NEW.salario_base + NEW.bonus + NEW.direito_imagem + NEW.parcela_luvas - NEW.descontos, 0)
+    WHERE id_folha_elenco = NEW.id_folha_elenco;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_e_update
+AFTER UPDATE ON item_folha_e
+FOR EACH ROW
+BEGIN
+    UPDATE folha_elenco
+    SET valor_bruto = valor_bruto - COALESCE(OLD.salario_base + OLD.bonus + OLD.direito_imagem + OLD.parcela_luvas, 0),
+        valor_liquido_total = valor_liquido_total - COALESCE(OLD.salario_base + OLD.bonus + OLD.direito_imagem + OLD.parcela_luvas - OLD.descontos, 0)
+    WHERE id_folha_elenco = OLD.id_folha_elenco;
+    
+    UPDATE folha_elenco
+    SET valor_bruto = valor_bruto + COALESCE(NEW.salario_base + NEW.bonus + NEW.direito_imagem + NEW.parcela_luvas, 0),
+        valor_liquido_total = valor_liquido_total + COALESCE(NEW.salario_base + NEW.bonus + NEW.direito_imagem + NEW.parcela_luvas - NEW.descontos, 0)
+    WHERE id_folha_elenco = NEW.id_folha_elenco;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_e_delete
+AFTER DELETE ON item_folha_e
+FOR EACH ROW
+BEGIN
+    UPDATE folha_elenco
+    SET valor_bruto = valor_bruto - COALESCE(OLD.salario_base + OLD.bonus + OLD.direito_imagem + OLD.parcela_luvas, 0),
+        valor_liquido_total = valor_liquido_total - COALESCE(OLD.salario_base + OLD.bonus + OLD.direito_imagem + OLD.parcela_luvas - OLD.descontos, 0)
+    WHERE id_folha_elenco = OLD.id_folha_elenco;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_f_insert
+AFTER INSERT ON item_folha_f
+FOR EACH ROW
+BEGIN
+    UPDATE folha_funcionarios
+    SET valor_bruto = valor_bruto + COALESCE(NEW.salario_base + NEW.bonus + NEW.adicionais, 0),
+        valor_liquido_total = valor_liquido_total + COALESCE(NEW.salario_base + NEW.bonus + NEW.adicionais - NEW.descontos, 0)
+    WHERE id_folha_funcionarios = NEW.id_folha_funcionarios;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_f_update
+AFTER UPDATE ON item_folha_f
+FOR EACH ROW
+BEGIN
+    UPDATE folha_funcionarios
+    SET valor_bruto = valor_bruto - COALESCE(OLD.salario_base + OLD.bonus + OLD.adicionais, 0),
+        valor_liquido_total = valor_liquido_total - COALESCE(OLD.salario_base + OLD.bonus + OLD.adicionais - OLD.descontos, 0)
+    WHERE id_folha_funcionarios = OLD.id_folha_funcionarios;
+    
+    UPDATE folha_funcionarios
+    SET valor_bruto = valor_bruto + COALESCE(NEW.salario_base + NEW.bonus + NEW.adicionais, 0),
+        valor_liquido_total = valor_liquido_total + COALESCE(NEW.salario_base + NEW.bonus + NEW.adicionais - NEW.descontos, 0)
+    WHERE id_folha_funcionarios = NEW.id_folha_funcionarios;
+END//
+
+CREATE TRIGGER tr_totais_item_folha_f_delete
+AFTER DELETE ON item_folha_f
+FOR EACH ROW
+BEGIN
+    UPDATE folha_funcionarios
+    SET valor_bruto = valor_bruto - COALESCE(OLD.salario_base + OLD.bonus + OLD.adicionais, 0),
+        valor_liquido_total = valor_liquido_total - COALESCE(OLD.salario_base + OLD.bonus + OLD.adicionais - OLD.descontos, 0)
+    WHERE id_folha_funcionarios = OLD.id_folha_funcionarios;
+END//
+
+CREATE PROCEDURE sp_aprovar_folha_funcionarios(
+    IN p_id_folha INT,
+    IN p_id_aprovador INT,
+    IN p_id_conta INT
+)
+BEGIN
+    DECLARE v_valor DECIMAL(15,2);
+    DECLARE v_data_competencia DATE;
+    DECLARE v_id_lancamento INT;
+    
+    -- valor bruto mantido no cabeçalho da folha (busca pela chave primária)
+    SELECT valor_bruto, data_competencia 
+    INTO v_valor, v_data_competencia
+    FROM folha_funcionarios
+    WHERE id_folha_funcionarios = p_id_folha;
+    
+    /*  atualiza a folha para aprovado ANTES de criar o lançamento
+    garante que o trigger de update seja disparado com as validações */
+    UPDATE folha_funcionarios
+    SET status = 'aprovado'
+    WHERE id_folha_funcionarios = p_id_folha;
+    
+    -- cria o lançamento
+    INSERT INTO lancamento (
+        data_registro,
+        valor, 
+        tipo_de_movimentacao, 
+        status_aprovacao, 
+        id_aprovador, 
+        data_aprovacao, 
+        id_direcao, 
+        id_conta, 
+        descricao,
+        origem,
+        id_origem
+    ) VALUES (
+        v_data_competencia,
+        v_valor,
+        'saida',
+        'aprovado',
+        p_id_aprovador,
+        NOW(),
+        p_id_aprovador,
+        p_id_conta,
+        CONCAT('Folha de Funcionários - ', DATE_FORMAT(v_data_competencia, '%m/%Y')),
+        'folha_funcionarios',
+        p_id_folha
+    );
+    
+    SET v_id_lancamento = LAST_INSERT_ID();
+    
+    -- atualiza o id do lancamento na folha
+    UPDATE folha_funcionarios
+    SET id_lancamento = v_id_lancamento
+    WHERE id_folha_funcionarios = p_id_folha;
+END//
+
+CREATE PROCEDURE sp_aprovar_folha_elenco(
+    IN p_id_folha INT,
+    IN p_id_aprovador INT,
+    IN p_id_conta INT
+)
+BEGIN
+    DECLARE v_valor DECIMAL(15,2);
+    DECLARE v_data_competencia DATE;
+    DECLARE v_id_lancamento INT;
+    
+    -- valor bruto mantido no cabeçalho da folha (busca pela chave primária)
+    SELECT valor_bruto, data_competencia 
+    INTO v_valor, v_data_competencia
+    FROM folha_elenco
+    WHERE id_folha_elenco = p_id_folha;
+    
+
+    -- mesmo de antes para o elenco
+    UPDATE folha_elenco
+    SET status = 'aprovado'
+    WHERE id_folha_elenco = p_id_folha;
+    
+    -- cria o lançamento pós aprovação
+    INSERT INTO lancamento (
+        data_registro,
+        valor, 
+        tipo_de_movimentacao, 
+        status_aprovacao, 
+        id_aprovador, 
+        data_aprovacao, 
+        id_direcao, 
+        id_conta, 
+        descricao,
+        origem,
+        id_origem
+    ) VALUES (
+        v_data_competencia,
+        v_valor,
+        'saida',
+        'aprovado',
+        p_id_aprovador,
+        NOW(),
+        p_id_aprovador,
+        p_id_conta,
+        CONCAT('Folha de Elenco - ', DATE_FORMAT(v_data_competencia, '%m/%Y')),
+        'folha_elenco',
+        p_id_folha
+    );
+    
+    SET v_id_lancamento = LAST_INSERT_ID();
+    
+    -- atualiza o id do lancamento na folha
+    UPDATE folha_elenco
+    SET id_lancamento = v_id_lancamento
+    WHERE id_folha_elenco = p_id_folha;
+END//
+
+CREATE PROCEDURE sp_reconstruir_totais_folha()
+BEGIN
+    UPDATE folha_elenco fe
+    LEFT JOIN (
+        SELECT id_folha_elenco,
+               SUM(salario_base + bonus + direito_imagem + parcela_luvas) AS bruto,
+               SUM(salario_base + bonus + direito_imagem + parcela_luvas - descontos) AS liquido
+        FROM item_folha_e
+        GROUP BY id_folha_elenco
+    ) t ON t.id_folha_elenco = fe.id_folha_elenco
+    SET fe.valor_bruto = COALESCE(t.bruto, 0),
+        fe.valor_liquido_total = COALESCE(t.liquido, 0)
+    WHERE fe.id_folha_elenco > 0;
+    
+    UPDATE folha_funcionarios ff
+    LEFT JOIN (
+        SELECT id_folha_funcionarios,
+               SUM(salario_base + bonus + adicionais) AS bruto,
+               SUM(salario_base + bonus + adicionais - descontos) AS liquido
+        FROM item_folha_f
+        GROUP BY id_folha_funcionarios
+    ) t ON t.id_folha_funcionarios = ff.id_folha_funcionarios
+    SET ff.valor_bruto = COALESCE(t.bruto, 0),
+        ff.valor_liquido_total = COALESCE(t.liquido, 0)
+    WHERE ff.id_folha_funcionarios > 0;
+END//
+
+DELIMITER ;
+
+-- semeia os totais com os itens já existentes
+CALL sp_reconstruir_totais_folha();
+
+
+-- ============================================
+-- 4. MIGRAÇÃO: Resumo Mensal por Conta
+-- ============================================
+/*
+cria resumo_mensal_conta (totais mensais por conta dos lançamentos aprovados), mantido
+por triggers de insert/update/delete em lancamento. dados_publicos e as Consultas 10, 12
+e 14 passam a ler o resumo em vez de reagregar o histórico. Semeia a tabela a partir do
+histórico e confere o resultado (sp_verificar_resumo_mensal deve retornar vazio).
+*/
+
+-- lançamentos sem data de registro não têm mês no resumo: recebem a data de aprovação (ou a atual)
+-- e a coluna passa a ser obrigatória, como em bd/Banco.sql
+UPDATE lancamento
+SET data_registro = COALESCE(data_aprovacao, CURRENT_TIMESTAMP)
+WHERE data_registro IS NULL;
+
+ALTER TABLE lancamento
+    MODIFY data_registro DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+CREATE TABLE IF NOT EXISTS resumo_mensal_conta (
+    id_conta INT NOT NULL,
+    mes_registro CHAR(7) NOT NULL,
+    total_lancamentos INT NOT NULL DEFAULT 0,
+    total_entradas DECIMAL(17,2) NOT NULL DEFAULT 0.00,
+    total_saidas DECIMAL(17,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (id_conta, mes_registro),
+    INDEX idx_resumo_mensal_mes (mes_registro),
+    FOREIGN KEY (id_conta) REFERENCES plano_de_contas(id_conta)
+);
+
+DROP TRIGGER IF EXISTS tr_resumo_mensal_insert;
+DROP TRIGGER IF EXISTS tr_resumo_mensal_update;
+DROP TRIGGER IF EXISTS tr_resumo_mensal_delete;
+DROP PROCEDURE IF EXISTS sp_reconstruir_resumo_mensal;
+DROP PROCEDURE IF EXISTS sp_verificar_resumo_mensal;
+
+DELIMITER //
+
+CREATE TRIGGER tr_resumo_mensal_insert
+AFTER INSERT ON lancamento
+FOR EACH ROW
+BEGIN
+    IF NEW.status_aprovacao = 'aprovado' THEN
+        INSERT INTO resumo_mensal_conta (id_conta, mes_registro, total_lancamentos, total_entradas, total_saidas)
+        VALUES (
+            NEW.id_conta,
+            DATE_FORMAT(NEW.data_registro, '%Y-%m'),
+            1,
+            CASE WHEN NEW.tipo_de_movimentacao = 'entrada' THEN NEW.valor ELSE 0 END,
+            CASE WHEN NEW.tipo_de_movimentacao = 'saida' THEN NEW.valor ELSE 0 END
+        )
+        ON DUPLICATE KEY UPDATE
+            total_lancamentos = total_lancamentos + 1,
+            total_entradas = total_entradas + VALUES(total_entradas),
+            total_saidas = total_saidas + VALUES(total_saidas);
+    END IF;
+END//
+
+CREATE TRIGGER tr_resumo_mensal_update
+AFTER UPDATE ON lancamento
+FOR EACH ROW
+BEGIN
+    IF OLD.status_aprovacao = 'aprovado' THEN
+        UPDATE resumo_mensal_conta
+        SET total_lancamentos = total_lancamentos - 1,
+            total_entradas = total_entradas - CASE WHEN OLD.tipo_de_movimentacao = 'entrada' THEN OLD.valor ELSE 0 END,
+            total_saidas = total_saidas - CASE WHEN OLD.tipo_de_movimentacao = 'saida' THEN OLD.valor ELSE 0 END
+        WHERE id_conta = OLD.id_conta
+          AND mes_registro = DATE_FORMAT(OLD.data_registro, '%Y-%m');
+        
+        DELETE FROM resumo_mensal_conta
+        WHERE id_conta = OLD.id_conta
+          AND mes_registro = DATE_FORMAT(OLD.data_registro, '%Y-%m')
+          AND total_lancamentos = 0;
+    END IF;
+    
+    IF NEW.status_aprovacao = 'aprovado' THEN
+        INSERT INTO resumo_mensal_conta (id_conta, mes_registro, total_lancamentos, total_entradas, total_saidas)
+        VALUES (
+            NEW.id_conta,
+            DATE_FORMAT(NEW.data_registro, '%Y-%m'),
+            1,
+            CASE WHEN NEW.tipo_de_movimentacao = 'entrada' THEN NEW.valor ELSE 0 END,
+            CASE WHEN NEW.tipo_de_movimentacao = 'saida' THEN NEW.valor ELSE 0 END
+        )
+        ON DUPLICATE KEY UPDATE
+            total_lancamentos = total_lancamentos + 1,
+            total_entradas = total_entradas + VALUES(total_entradas),
+            total_saidas = total_saidas + VALUES(total_saidas);
+    END IF;
+END//
+
+CREATE TRIGGER tr_resumo_mensal_delete
+AFTER DELETE ON lancamento
+FOR EACH ROW
+BEGIN
+    IF OLD.status_aprovacao = 'aprovado' THEN
+        UPDATE resumo_mensal_conta
+        SET total_lancamentos = total_lancamentos - 1,
+            total_entradas = total_entradas - CASE WHEN OLD.tipo_de_movimentacao = 'entrada' THEN OLD.valor ELSE 0 END,
+            total_saidas = total_saidas - CASE WHEN OLD.tipo_de_movimentacao = 'saida' THEN OLD.valor ELSE 0 END
+        WHERE id_conta = OLD.id_conta
+          AND mes_registro = DATE_FORMAT(OLD.data_registro, '%Y-%m');
+        
+        DELETE FROM resumo_mensal_conta
+        WHERE id_conta = OLD.id_conta
+          AND mes_registro = DATE_FORMAT(OLD.data_registro, '%Y-%m')
+          AND total_lancamentos = 0;
+    END IF;
+END//
+
+CREATE PROCEDURE sp_reconstruir_resumo_mensal()
+BEGIN
+    DELETE FROM resumo_mensal_conta WHERE id_conta > 0;
+    
+    INSERT INTO resumo_mensal_conta (id_conta, mes_registro, total_lancamentos, total_entradas, total_saidas)
+    SELECT 
+        id_conta,
+        mes_registro,
+        COUNT(*),
+        SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE 0 END),
+        SUM(CASE WHEN tipo_de_movimentacao = 'saida' THEN valor ELSE 0 END)
+    FROM lancamento
+    WHERE status_aprovacao = 'aprovado'
+    GROUP BY id_conta, mes_registro;
+END//
+
+CREATE PROCEDURE sp_verificar_resumo_mensal()
+BEGIN
+    SELECT 
+        h.id_conta,
+        h.mes_registro,
+        r.total_lancamentos AS lancamentos_mantido,
+        h.total_lancamentos AS lancamentos_historico,
+        r.total_entradas AS entradas_mantido,
+        h.total_entradas AS entradas_historico,
+        r.total_saidas AS saidas_mantido,
+        h.total_saidas AS saidas_historico
+    FROM (
+        SELECT id_conta, mes_registro, COUNT(*) AS total_lancamentos,
+               SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE 0 END) AS total_entradas,
+               SUM(CASE WHEN tipo_de_movimentacao = 'saida' THEN valor ELSE 0 END) AS total_saidas
+        FROM lancamento
+        WHERE status_aprovacao = 'aprovado'
+        GROUP BY id_conta, mes_registro
+    ) h
+    LEFT JOIN resumo_mensal_conta r ON r.id_conta = h.id_conta AND r.mes_registro = h.mes_registro
+    WHERE r.id_conta IS NULL
+       OR r.total_lancamentos <> h.total_lancamentos
+       OR r.total_entradas <> h.total_entradas
+       OR r.total_saidas <> h.total_saidas
+    UNION ALL
+    SELECT 
+        r.id_conta,
+        r.mes_registro,
+        r.total_lancamentos,
+        NULL,
+        r.total_entradas,
+        NULL,
+        r.total_saidas,
+        NULL
+    FROM resumo_mensal_conta r
+    WHERE NOT EXISTS (
+        SELECT 1 FROM lancamento l
+        WHERE l.id_conta = r.id_conta
+          AND l.status_aprovacao = 'aprovado'
+          AND l.mes_registro = r.mes_registro
+    );
+END//
+
+DELIMITER ;
+
+CALL sp_reconstruir_resumo_mensal();
+CALL sp_verificar_resumo_mensal();
+
+-- view de dados públicos (lida do resumo mensal mantido, sem reagregar lancamento)
+CREATE OR REPLACE VIEW dados_publicos AS
+SELECT 
+    pc.codigo_conta,
+    pc.descricao,
+    pc.tipo_conta,
+    r.mes_registro AS mes_ano,
+    r.total_entradas,
+    r.total_saidas,
+    r.total_entradas - r.total_saidas AS saldo_liquido
+FROM resumo_mensal_conta r
+INNER JOIN plano_de_contas pc ON r.id_conta = pc.id_conta
+ORDER BY mes_ano DESC, pc.codigo_conta;
+
+-- ============================================
+-- 5. MIGRAÇÃO: Ordem Total em Dados Privados
+-- ============================================
+/*
+dados_privados passa a ordenar por (data_registro, id_lancamento). A grade da interface
+pagina essa view por chave (WHERE data_registro < ? OR (data_registro = ? AND id_lancamento < ?)),
+o que exige desempate único; o índice (status_aprovacao, data_registro) já carrega o id.
+*/
+
+CREATE OR REPLACE VIEW dados_privados AS
+SELECT 
+    l.id_lancamento,
+    l.data_registro,
+    l.valor,
+    l.tipo_de_movimentacao,
+    l.descricao,
+    l.origem,
+    l.id_origem,
+    l.status_aprovacao,
+    pc.codigo_conta,
+    pc.descricao AS conta_descricao,
+    d.nome AS responsavel_lancamento,
+    aprovador.nome AS nome_aprovador,
+    l.data_aprovacao
+FROM lancamento l
+INNER JOIN plano_de_contas pc ON l.id_conta = pc.id_conta
+INNER JOIN direcao d ON l.id_direcao = d.id_direcao
+LEFT JOIN direcao aprovador ON l.id_aprovador = aprovador.id_direcao
+WHERE l.status_aprovacao = 'aprovado'
+ORDER BY l.data_registro DESC, l.id_lancamento DESC;
+
+-- ============================================
+-- 6. MIGRAÇÃO: Aprovação de Lançamentos em Lote
+-- ============================================
+/*
+sp_aprovar_lancamentos_lote valida o impacto acumulado de um lote de lançamentos pendentes
+sobre o saldo de caixa numa única passada e aprova o lote inteiro ou nenhum.
+*/
+
+DROP PROCEDURE IF EXISTS sp_aprovar_lancamentos_lote;
+
+DELIMITER //
+
+CREATE PROCEDURE sp_aprovar_lancamentos_lote(
+    IN p_ids JSON,
+    IN p_id_aprovador INT,
+    OUT p_aprovados INT
+)
+BEGIN
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_lote INT DEFAULT 0;
+    DECLARE v_estouros INT DEFAULT 0;
+    
+    SET p_aprovados = 0;
+    
+    -- trava o saldo e os lançamentos do lote até o fim da transação
+    SET v_saldo_atual = fn_calcular_saldo_atual();
+    
+    SELECT COUNT(*) INTO v_lote
+    FROM lancamento l
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = l.id_lancamento
+    WHERE l.status_aprovacao = 'pendente'
+    FOR UPDATE;
+    
+    DROP TEMPORARY TABLE IF EXISTS tmp_lote_aprovacao;
+    CREATE TEMPORARY TABLE tmp_lote_aprovacao AS
+    SELECT 
+        l.id_lancamento,
+        l.data_registro,
+        l.tipo_de_movimentacao,
+        l.valor,
+        v_saldo_atual + SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE -l.valor END)
+            OVER (ORDER BY l.data_registro, l.id_lancamento) AS saldo_apos
+    FROM lancamento l
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = l.id_lancamento
+    WHERE l.status_aprovacao = 'pendente';
+    
+    SELECT COUNT(*) INTO v_estouros
+    FROM tmp_lote_aprovacao
+    WHERE tipo_de_movimentacao = 'saida' AND saldo_apos < 0;
+    
+    IF v_estouros > 0 THEN
+        SELECT 
+            id_lancamento,
+            data_registro,
+            valor,
+            saldo_apos + valor AS saldo_antes,
+            saldo_apos
+        FROM tmp_lote_aprovacao
+        WHERE tipo_de_movimentacao = 'saida' AND saldo_apos < 0
+        ORDER BY data_registro, id_lancamento;
+    ELSE
+        UPDATE lancamento l
+        INNER JOIN tmp_lote_aprovacao t ON t.id_lancamento = l.id_lancamento
+        SET l.status_aprovacao = 'aprovado',
+            l.id_aprovador = p_id_aprovador,
+            l.data_aprovacao = NOW();
+        
+        SET p_aprovados = ROW_COUNT();
+    END IF;
+    
+    DROP TEMPORARY TABLE IF EXISTS tmp_lote_aprovacao;
+END//
+
+DELIMITER ;
+
+
+-- ============================================
+-- 7. MIGRAÇÃO: Token de Mudança dos Snapshots
+-- ============================================
+/*
+Os snapshots locais das views dos perfis (src/snapshot.py) são revalidados com
+MAX(data_aprovacao) dos lançamentos aprovados; o índice responde a leitura com
+um único acesso ao fim do intervalo status_aprovacao = 'aprovado'.
+*/
+
+ALTER TABLE lancamento
+    ADD INDEX idx_lancamento_status_aprovacao (status_aprovacao, data_aprovacao);
+
+-- ============================================
+-- 8. MIGRAÇÃO: Data de Registro Obrigatória e Catálogo do Resumo Mensal
+-- ============================================
+/*
+resumo_mensal_conta tem mes_registro NOT NULL: um lançamento aprovado sem data_registro
+faria os triggers de resumo falharem. Bancos que já aplicaram a migração 4 antes deste
+passo recebem aqui o preenchimento e a restrição NOT NULL (sem efeito onde já foram aplicados).
+
+Atualiza também o catálogo da interface (queries_sistema, criado fora destes scripts):
+as Consultas 10, 12 e 14 passam a ter o SQL de bd/Consultas.sql, que lê resumo_mensal_conta.
+*/
+
+-- lançamentos sem data de registro não têm mês no resumo: recebem a data de aprovação (ou a atual)
+-- e a coluna passa a ser obrigatória, como em bd/Banco.sql
+UPDATE lancamento
+SET data_registro = COALESCE(data_aprovacao, CURRENT_TIMESTAMP)
+WHERE data_registro IS NULL;
+
+ALTER TABLE lancamento
+    MODIFY data_registro DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+DROP PROCEDURE IF EXISTS sp_migracao_catalogo_resumo;
+
+DELIMITER //
+
+CREATE PROCEDURE sp_migracao_catalogo_resumo()
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.tables
+               WHERE table_schema = DATABASE() AND table_name = 'queries_sistema') THEN
+        UPDATE queries_sistema SET sql_query = 'SELECT 
+    pc.codigo_conta,
+    pc.descricao,
+    pc.tipo_conta,
+    r.mes_registro AS mes_ano,
+    COALESCE(r.total_lancamentos, 0) AS total_lancamentos,
+    COALESCE(r.total_entradas, 0) AS total_entradas,
+    COALESCE(r.total_saidas, 0) AS total_saidas,
+    r.total_entradas - r.total_saidas AS saldo_periodo
+FROM plano_de_contas pc
+LEFT JOIN resumo_mensal_conta r ON pc.id_conta = r.id_conta
+ORDER BY mes_ano DESC, pc.codigo_conta'
+        WHERE id_query = 10;
+        UPDATE queries_sistema SET sql_query = 'SELECT 
+    mes_registro AS mes_ano,
+    CAST(LEFT(mes_registro, 4) AS UNSIGNED) AS ano,
+    CAST(SUBSTRING(mes_registro, 6, 2) AS UNSIGNED) AS mes,
+    SUM(total_entradas) AS total_receitas,
+    SUM(total_saidas) AS total_despesas,
+    SUM(total_entradas - total_saidas) AS resultado_periodo
+FROM resumo_mensal_conta
+GROUP BY mes_registro
+ORDER BY ano DESC, mes DESC'
+        WHERE id_query = 12;
+        UPDATE queries_sistema SET sql_query = 'SELECT 
+    mes_registro AS mes_ano,
+    CAST(LEFT(mes_registro, 4) AS UNSIGNED) AS ano,
+    CAST(SUBSTRING(mes_registro, 6, 2) AS UNSIGNED) AS mes,
+    SUM(total_entradas) AS total_receitas,
+    SUM(total_saidas) AS total_despesas,
+    SUM(total_entradas - total_saidas) AS resultado_periodo,
+    ABS(SUM(total_entradas - total_saidas)) AS deficit,
+    CONCAT(''R$ '', FORMAT(ABS(SUM(total_entradas - total_saidas)), 2, ''pt_BR'')) AS deficit_formatado
+FROM resumo_mensal_conta
+GROUP BY mes_registro
+HAVING resultado_periodo < 0
+ORDER BY ano DESC, mes DESC'
+        WHERE id_query = 14;
+    END IF;
+END//
+
+DELIMITER ;
+
+CALL sp_migracao_catalogo_resumo();
+DROP PROCEDURE sp_migracao_catalogo_resumo;
+
+
+-- ============================================
+-- 9. MIGRAÇÃO: Aprovação de Folhas em Lote
+-- ============================================
+/*
+sp_aprovar_folhas_elenco_lote e sp_aprovar_folhas_funcionarios_lote aprovam um lote de folhas
+pendentes (src/folha_lote.py) com um UPDATE e um INSERT ... SELECT por tipo, passando pelos
+mesmos triggers de orçamento, saldo e alerta que sp_aprovar_folha_*.
+*/
+
+DROP PROCEDURE IF EXISTS sp_aprovar_folhas_funcionarios_lote;
+DROP PROCEDURE IF EXISTS sp_aprovar_folhas_elenco_lote;
+
+DELIMITER //
+
+CREATE PROCEDURE sp_aprovar_folhas_funcionarios_lote(
+    IN p_ids JSON,
+    IN p_id_aprovador INT,
+    IN p_id_conta INT,
+    OUT p_aprovadas INT,
+    OUT p_alertas INT
+)
+BEGIN
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_lote INT DEFAULT 0;
+    DECLARE v_ultimo_alerta INT DEFAULT 0;
+    DECLARE v_primeiro_lancamento INT;
+    
+    SET p_aprovadas = 0;
+    SET p_alertas = 0;
+    
+    -- trava o saldo antes de ler as folhas: aprovações concorrentes esperam o fim do lote
+    SET v_saldo_atual = fn_calcular_saldo_atual();
+    
+    SELECT COUNT(*) INTO v_lote
+    FROM folha_funcionarios f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_funcionarios
+    WHERE f.status = 'pendente'
+    FOR UPDATE;
+    
+    IF v_lote <> JSON_LENGTH(p_ids) THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'ERRO: O lote contém folhas inexistentes ou que não estão pendentes!';
+    END IF;
+    
+    SELECT COALESCE(MAX(id_alerta), 0) INTO v_ultimo_alerta
+    FROM alertas_orcamento;
+    
+    -- aprova o lote; os triggers de update validam e geram os alertas folha a folha
+    UPDATE folha_funcionarios f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_funcionarios
+    SET f.status = 'aprovado';
+    
+    -- lançamentos de saída, como os de sp_aprovar_folha_funcionarios
+    INSERT INTO lancamento (
+        data_registro,
+        valor, 
+        tipo_de_movimentacao, 
+        status_aprovacao, 
+        id_aprovador, 
+        data_aprovacao, 
+        id_direcao, 
+        id_conta, 
+        descricao,
+        origem,
+        id_origem
+    )
+    SELECT
+        f.data_competencia,
+        f.valor_bruto,
+        'saida',
+        'aprovado',
+        p_id_aprovador,
+        NOW(),
+        p_id_aprovador,
+        p_id_conta,
+        CONCAT('Folha de Funcionários - ', DATE_FORMAT(f.data_competencia, '%m/%Y')),
+        'folha_funcionarios',
+        f.id_folha_funcionarios
+    FROM folha_funcionarios f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_funcionarios
+    ORDER BY f.id_folha_funcionarios;
+    
+    SET v_primeiro_lancamento = LAST_INSERT_ID();
+    
+    -- id do lançamento nas folhas (ids a partir do primeiro gerado pelo INSERT acima)
+    UPDATE folha_funcionarios f
+    INNER JOIN lancamento l ON l.id_origem = f.id_folha_funcionarios AND l.origem = 'folha_funcionarios'
+    SET f.id_lancamento = l.id_lancamento
+    WHERE l.id_lancamento >= v_primeiro_lancamento;
+    
+    SET p_aprovadas = v_lote;
+    
+    SELECT COUNT(*) INTO p_alertas
+    FROM alertas_orcamento
+    WHERE id_alerta > v_ultimo_alerta;
+END//
+
+CREATE PROCEDURE sp_aprovar_folhas_elenco_lote(
+    IN p_ids JSON,
+    IN p_id_aprovador INT,
+    IN p_id_conta INT,
+    OUT p_aprovadas INT,
+    OUT p_alertas INT
+)
+BEGIN
+    DECLARE v_saldo_atual DECIMAL(15,2);
+    DECLARE v_lote INT DEFAULT 0;
+    DECLARE v_ultimo_alerta INT DEFAULT 0;
+    DECLARE v_primeiro_lancamento INT;
+    
+    SET p_aprovadas = 0;
+    SET p_alertas = 0;
+    
+    -- trava o saldo antes de ler as folhas: aprovações concorrentes esperam o fim do lote
+    SET v_saldo_atual = fn_calcular_saldo_atual();
+    
+    SELECT COUNT(*) INTO v_lote
+    FROM folha_elenco f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_elenco
+    WHERE f.status = 'pendente'
+    FOR UPDATE;
+    
+    IF v_lote <> JSON_LENGTH(p_ids) THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'ERRO: O lote contém folhas inexistentes ou que não estão pendentes!';
+    END IF;
+    
+    SELECT COALESCE(MAX(id_alerta), 0) INTO v_ultimo_alerta
+    FROM alertas_orcamento;
+    
+    -- aprova o lote; os triggers de update validam e geram os alertas folha a folha
+    UPDATE folha_elenco f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_elenco
+    SET f.status = 'aprovado';
+    
+    -- lançamentos de saída, como os de sp_aprovar_folha_elenco
+    INSERT INTO lancamento (
+        data_registro,
+        valor, 
+        tipo_de_movimentacao, 
+        status_aprovacao, 
+        id_aprovador, 
+        data_aprovacao, 
+        id_direcao, 
+        id_conta, 
+        descricao,
+        origem,
+        id_origem
+    )
+    SELECT
+        f.data_competencia,
+        f.valor_bruto,
+        'saida',
+        'aprovado',
+        p_id_aprovador,
+        NOW(),
+        p_id_aprovador,
+        p_id_conta,
+        CONCAT('Folha de Elenco - ', DATE_FORMAT(f.data_competencia, '%m/%Y')),
+        'folha_elenco',
+        f.id_folha_elenco
+    FROM folha_elenco f
+    INNER JOIN JSON_TABLE(p_ids, '$[*]' COLUMNS (id INT PATH '$')) lote ON lote.id = f.id_folha_elenco
+    ORDER BY f.id_folha_elenco;
+    
+    SET v_primeiro_lancamento = LAST_INSERT_ID();
+    
+    -- id do lançamento nas folhas (ids a partir do primeiro gerado pelo INSERT acima)
+    UPDATE folha_elenco f
+    INNER JOIN lancamento l ON l.id_origem = f.id_folha_elenco AND l.origem = 'folha_elenco'
+    SET f.id_lancamento = l.id_lancamento
+    WHERE l.id_lancamento >= v_primeiro_lancamento;
+    
+    SET p_aprovadas = v_lote;
+    
+    SELECT COUNT(*) INTO p_alertas
+    FROM alertas_orcamento
+    WHERE id_alerta > v_ultimo_alerta;
+END//
+
+DELIMITER ;
@@ -0,0 +1,111 @@
+USE gestao_clube;
+
+/*
+Planos de execução das consultas usadas pelos triggers de orçamento, pelas views
+e pelos balancetes. Executar após Banco.sql + Dados.sql (ou após as migrações)
+e conferir as colunas type/key de cada EXPLAIN: nenhuma das linhas sobre
+lancamento, folha_elenco ou folha_funcionarios deve aparecer com type = ALL.
+
+Os comentários indicam o acesso esperado com os índices de Banco.sql. Com poucas
+linhas (Dados.sql) o otimizador pode preferir varredura completa por custo; gere
+volume antes de comparar os planos.
+
+NÃO VERIFICADO: os comentários "esperado" foram escritos a partir dos índices e
+ainda não conferidos com a saída do EXPLAIN de um banco com volume; nenhuma saída
+de EXPLAIN acompanha este arquivo. Para capturar os planos no banco dos benchmarks
+(gestao_clube_bench) e compará-los com o esperado (sai com código 1 se algum divergir):
+
+    python -m benchmarks.gerador --recriar --lancamentos 100k
+    python -m benchmarks.planos --saida planos.json
+
+Até o planos.json de um banco carregado ser anexado, a ausência de varreduras
+completas é só a expectativa acima.
+*/
+
+-- ============================================
+-- 1. Total do mês nos triggers de orçamento (elenco)
+-- ============================================
+-- esperado: fe type=range key=idx_folha_elenco_direcao_comp
+EXPLAIN
+SELECT COALESCE(SUM(fe.valor_bruto), 0)
+FROM folha_elenco fe
+WHERE fe.id_direcao = 2
+  AND fe.data_competencia >= '2026-01-01'
+  AND fe.data_competencia < '2026-02-01'
+  AND fe.status IN ('aprovado', 'pago')
+  AND fe.id_folha_elenco != 1;
+
+-- ============================================
+-- 2. Total do mês nos triggers de orçamento (funcionários)
+-- ============================================
+-- esperado: ff type=range key=idx_folha_funcionarios_direcao_comp
+EXPLAIN
+SELECT COALESCE(SUM(ff.valor_bruto), 0)
+FROM folha_funcionarios ff
+WHERE ff.id_direcao = 3
+  AND ff.data_competencia >= '2026-01-01'
+  AND ff.data_competencia < '2026-02-01'
+  AND ff.status IN ('aprovado', 'pago')
+  AND ff.id_folha_funcionarios != 1;
+
+-- ============================================
+-- 2.1 Valor bruto lido pelas procedures de aprovação
+-- ============================================
+-- esperado: type=const key=PRIMARY (sem tabela derivada da view)
+EXPLAIN SELECT valor_bruto, data_competencia FROM vw_folha_elenco_total WHERE id_folha_elenco = 1;
+
+-- ============================================
+-- 3. Dados Públicos
+-- ============================================
+-- esperado: r type=ALL sobre resumo_mensal_conta (uma linha por conta e mês), pc type=eq_ref key=PRIMARY
+EXPLAIN SELECT * FROM dados_publicos;
+
+-- ============================================
+-- 4. Dados Privados
+-- ============================================
+-- esperado: l type=ref key=idx_lancamento_status_data (ordenação pelo índice, sem filesort)
+EXPLAIN SELECT * FROM dados_privados;
+
+-- ============================================
+-- 4.1 Dados Privados: página seguinte (paginação por chave da interface)
+-- ============================================
+-- esperado: l type=range key=idx_lancamento_status_data, lê apenas LIMIT + 1 linhas (sem filesort)
+EXPLAIN
+SELECT * FROM dados_privados
+WHERE (data_registro < '2026-01-15 00:00:00')
+   OR (data_registro = '2026-01-15 00:00:00' AND id_lancamento < 500)
+ORDER BY data_registro DESC, id_lancamento DESC
+LIMIT 201;
+
+-- ============================================
+-- 5. Consulta 10: Movimentação por Conta e Período
+-- ============================================
+-- esperado: r type=ref key=PRIMARY (sem acesso a lancamento)
+EXPLAIN
+SELECT
+    pc.codigo_conta,
+    r.mes_registro AS mes_ano,
+    COALESCE(r.total_lancamentos, 0) AS total_lancamentos
+FROM plano_de_contas pc
+LEFT JOIN resumo_mensal_conta r ON pc.id_conta = r.id_conta;
+
+-- ============================================
+-- 6. Consultas 12 e 14: Balanço Mensal
+-- ============================================
+-- esperado: type=index key=idx_resumo_mensal_mes (GROUP BY na ordem do índice, sem acesso a lancamento)
+EXPLAIN
+SELECT
+    mes_registro AS mes_ano,
+    SUM(total_entradas - total_saidas) AS resultado_periodo
+FROM resumo_mensal_conta
+GROUP BY mes_registro;
+
+-- ============================================
+-- 7. Consulta 13: Resumo Trimestral
+-- ============================================
+-- esperado: l type=range key=idx_lancamento_status_data (apenas os últimos 3 meses)
+EXPLAIN
+SELECT COUNT(*)
+FROM lancamento l
+WHERE l.status_aprovacao = 'aprovado'
+    AND l.data_registro >= DATE_SUB(CURDATE(), INTERVAL 3 MONTH);
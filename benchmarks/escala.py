@@ -0,0 +1,361 @@
+"""
+Benchmark de escala: tempo de cada view de bd/Banco.sql, de cada consulta de bd/Consultas.sql e de cada
+procedure de aprovação, gravado em JSON para acompanhar regressões.
+
+Uso:
+  python -m benchmarks.escala [--repeticoes 3] [--saida resultados.json]
+      mede o banco dos benchmarks, na escala em que estiver
+  python -m benchmarks.escala --recriar --escalas 10k 100k 1m [--semente 42]
+      para cada escala recria o banco dos benchmarks (bd/Banco.sql + bd/Dados.sql),
+      gera os dados com benchmarks.gerador e mede
+  python -m benchmarks.escala --comparar base.json [--tolerancia 0.2]
+      além de medir, aponta os itens mais lentos que na base (sai com código 1 se houver)
+
+Tudo roda no banco dos benchmarks (--banco, padrão gestao_clube_bench: o DB_CONFIG com outro database);
+o banco da aplicação é recusado, e os scripts de bd/ são executados com o nome do banco trocado.
+
+Views e consultas são lidas por completo (cursor sem buffer, linhas descartadas); as procedures rodam
+sobre registros pendentes criados na própria transação, que termina em ROLLBACK.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import mysql.connector
+
+from src.banco import DatabaseManager
+from src import folha
+from benchmarks import gerador
+
+BD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bd')
+TABELAS_ESCALA = ['lancamento', 'elenco', 'funcionarios', 'folha_elenco', 'folha_funcionarios',
+                  'item_folha_e', 'item_folha_f', 'bens', 'alertas_orcamento']
+
+# nome do banco nos DROP/CREATE DATABASE e USE dos scripts de bd/
+BANCO_SCRIPTS = 'gestao_clube'
+
+# competência sem folhas aprovadas, para que o orçamento do mês não barre as aprovações medidas
+COMPETENCIA_BENCH = '2099-01-01'
+
+
+# ==================== SCRIPTS SQL ====================
+
+def dividir_script(texto):
+    """Comandos de um script no formato do cliente mysql (DELIMITER, comentários -- e /* */, aspas),
+    sem os comentários e sem o delimitador."""
+    comandos, atual = [], []
+    delimitador = ';'
+    i, n = 0, len(texto)
+    inicio_linha = True
+    while i < n:
+        if inicio_linha:
+            m = re.match(r'[ \t]*DELIMITER[ \t]+(\S+)[ \t]*(\r?\n|$)', texto[i:], re.IGNORECASE)
+            if m:
+                delimitador = m.group(1)
+                i += m.end()
+                continue
+        c = texto[i]
+        inicio_linha = c == '\n'
+        if texto.startswith('--', i) and (i + 2 >= n or texto[i + 2] in ' \t\r\n'):
+            fim = texto.find('\n', i)
+            i = n if fim < 0 else fim
+            continue
+        if texto.startswith('/*', i):
+            fim = texto.find('*/', i + 2)
+            i = n if fim < 0 else fim + 2
+            atual.append(' ')
+            continue
+        if c in ("'", '"', '`'):
+            j = i + 1
+            while j < n and texto[j] != c:
+                j += 2 if texto[j] == '\\' else 1
+            atual.append(texto[i:j + 1])
+            i = j + 1
+            continue
+        if texto.startswith(delimitador, i):
+            comando = ''.join(atual).strip()
+            if comando:
+                comandos.append(comando)
+            atual = []
+            i += len(delimitador)
+            continue
+        atual.append(c)
+        i += 1
+    comando = ''.join(atual).strip()
+    if comando:
+        comandos.append(comando)
+    return comandos
+
+
+def trocar_banco(texto, banco):
+    """O script com `banco` no lugar de gestao_clube nos DROP/CREATE DATABASE e USE."""
+    return re.sub(rf'^([ \t]*(?:DROP\s+DATABASE\s+IF\s+EXISTS|CREATE\s+DATABASE|USE)\s+){BANCO_SCRIPTS}\b',
+                  lambda m: m.group(1) + banco, texto, flags=re.MULTILINE | re.IGNORECASE)
+
+
+def executar_script(conn, caminho, banco=None):
+    """Executa o script; com `banco`, no banco indicado em vez de gestao_clube (ver trocar_banco)."""
+    cursor = conn.cursor()
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            texto = f.read()
+        for comando in dividir_script(trocar_banco(texto, banco) if banco else texto):
+            cursor.execute(comando)
+            if cursor.with_rows:
+                cursor.fetchall()
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def views_do_banco(caminho=os.path.join(BD, 'Banco.sql')):
+    with open(caminho, encoding='utf-8') as f:
+        return re.findall(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+(\w+)', f.read(), re.IGNORECASE)
+
+
+def consultas_do_arquivo(caminho=os.path.join(BD, 'Consultas.sql')):
+    """[(nome, sql)] na ordem do arquivo, pelos cabeçalhos '-- N. CONSULTA: título'."""
+    with open(caminho, encoding='utf-8') as f:
+        texto = f.read()
+    partes = re.split(r'^--\s*(\d+)\.\s*CONSULTA:\s*(.+?)\s*$', texto, flags=re.MULTILINE)
+    consultas = []
+    for numero, titulo, corpo in zip(partes[1::3], partes[2::3], partes[3::3]):
+        for sql in dividir_script(corpo):
+            if re.match(r'(SELECT|WITH)\b', sql, re.IGNORECASE):
+                consultas.append((f"consulta_{numero} ({titulo})", sql))
+    return consultas
+
+
+# ==================== MEDIÇÕES ====================
+
+def _ler_tudo(db, sql):
+    """Executa e consome todas as linhas sem guardá-las; retorna a quantidade."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql)
+            linhas = 0
+            for _ in cursor:
+                linhas += 1
+            return linhas
+        finally:
+            cursor.close()
+
+
+def _medir(fn, repeticoes):
+    tempos, extra = [], None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        extra = fn()
+        tempos.append(time.perf_counter() - inicio)
+    return {'mediana_s': statistics.median(tempos), 'min_s': min(tempos), 'max_s': max(tempos),
+            'repeticoes': repeticoes, 'linhas': extra}
+
+
+def _em_rollback(db, preparar, medir):
+    """preparar(cursor) cria os pendentes (fora do tempo); medir(cursor, dados) é cronometrado; tudo é desfeito."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            dados = preparar(cursor)
+            inicio = time.perf_counter()
+            medir(cursor, dados)
+            return time.perf_counter() - inicio
+        finally:
+            conn.rollback()
+            cursor.close()
+
+
+def _folha_elenco_pendente(cursor):
+    cursor.execute("SELECT id_elenco FROM elenco ORDER BY id_elenco")
+    ids = [r[0] for r in cursor.fetchall()]
+    cursor.execute("""
+        INSERT INTO folha_elenco (data_competencia, data_pagamento, valor_direitos_imagem, status, id_direcao)
+        VALUES (%s, %s, 0, 'pendente', %s)
+    """, (COMPETENCIA_BENCH, COMPETENCIA_BENCH, gerador.ESPORTIVO))
+    id_folha = cursor.lastrowid
+    # valores simbólicos: o que importa é a quantidade de itens, não estourar o orçamento
+    folha.inserir_itens_elenco(cursor, id_folha, [
+        {'id_elenco': i, 'salario_base': 1.0, 'bonus': 0.0, 'direito_imagem': 0.0, 'parcela_luvas': 0.0,
+         'descontos': 0.0} for i in ids])
+    return id_folha
+
+
+def _folha_funcionarios_pendente(cursor):
+    cursor.execute("SELECT id_funcionario FROM funcionarios ORDER BY id_funcionario")
+    ids = [r[0] for r in cursor.fetchall()]
+    cursor.execute("""
+        INSERT INTO folha_funcionarios (data_competencia, data_pagamento, status, id_direcao)
+        VALUES (%s, %s, 'pendente', %s)
+    """, (COMPETENCIA_BENCH, COMPETENCIA_BENCH, gerador.FINANCEIRO))
+    id_folha = cursor.lastrowid
+    folha.inserir_itens_funcionarios(cursor, id_folha, [
+        {'id_funcionario': i, 'salario_base': 1.0, 'bonus': 0.0, 'descontos': 0.0, 'adicionais': 0.0} for i in ids])
+    return id_folha
+
+
+def _bem_pendente(cursor):
+    cursor.execute("""
+        INSERT INTO bens (data_aquisicao, nome_item, valor_aquisicao, localizacao, id_direcao, status_aprovacao)
+        VALUES (%s, 'Benchmark', 1.00, 'Sede', %s, 'pendente')
+    """, (COMPETENCIA_BENCH, gerador.FINANCEIRO))
+    return cursor.lastrowid
+
+
+def _lancamentos_pendentes(cursor, n):
+    linhas = [(COMPETENCIA_BENCH, 1.00, 'entrada' if i % 2 else 'saida', gerador.DIRETIVO,
+               gerador.CONTA_ADMINISTRATIVA) for i in range(n)]
+    for i in range(0, n, folha.TAMANHO_LOTE):
+        cursor.executemany("""
+            INSERT INTO lancamento (data_registro, valor, tipo_de_movimentacao, status_aprovacao, id_direcao,
+                                    id_conta, descricao, origem)
+            VALUES (%s, %s, %s, 'pendente', %s, %s, 'Benchmark', 'manual')
+        """, linhas[i:i + folha.TAMANHO_LOTE])
+    cursor.execute("SELECT id_lancamento FROM lancamento WHERE descricao = 'Benchmark' AND status_aprovacao = 'pendente' "
+                   "ORDER BY id_lancamento DESC LIMIT %s", (n,))
+    return [r[0] for r in cursor.fetchall()]
+
+
+def _call(cursor, sql, params):
+    cursor.execute(sql, params)
+    if cursor.with_rows:
+        cursor.fetchall()
+
+
+def procedures(tamanho_lote):
+    """{nome: (preparar, medir)} das procedures de aprovação."""
+    d = gerador.DIRETIVO
+    return {
+        'sp_aprovar_folha_elenco': (
+            _folha_elenco_pendente,
+            lambda c, id_folha: _call(c, "CALL sp_aprovar_folha_elenco(%s, %s, 8)", (id_folha, d))),
+        'sp_aprovar_folha_funcionarios': (
+            _folha_funcionarios_pendente,
+            lambda c, id_folha: _call(c, "CALL sp_aprovar_folha_funcionarios(%s, %s, 9)", (id_folha, d))),
+        'sp_aprovar_folha_elenco_automatica': (
+            lambda c: None,
+            lambda c, _: _call(c, "CALL sp_aprovar_folha_elenco_automatica(%s, %s, 0, 0, %s, 8)",
+                               (COMPETENCIA_BENCH, COMPETENCIA_BENCH, gerador.ESPORTIVO))),
+        'sp_aprovar_folha_funcionarios_automatica': (
+            lambda c: None,
+            lambda c, _: _call(c, "CALL sp_aprovar_folha_funcionarios_automatica(%s, %s, 0, %s, 9)",
+                               (COMPETENCIA_BENCH, COMPETENCIA_BENCH, gerador.FINANCEIRO))),
+        'sp_aprovar_bem': (
+            _bem_pendente,
+            lambda c, id_bem: _call(c, "CALL sp_aprovar_bem(%s, %s, 4)", (id_bem, d))),
+        'sp_aprovar_lancamento_manual': (
+            lambda c: _lancamentos_pendentes(c, 1)[0],
+            lambda c, id_lanc: _call(c, "CALL sp_aprovar_lancamento_manual(%s, %s)", (id_lanc, d))),
+        f'sp_aprovar_lancamentos_lote ({tamanho_lote})': (
+            lambda c: _lancamentos_pendentes(c, tamanho_lote),
+            lambda c, ids: _call(c, "CALL sp_aprovar_lancamentos_lote(%s, %s, @aprovados)", (json.dumps(ids), d))),
+    }
+
+
+def tamanhos(db):
+    return {t: db.run_query(f"SELECT COUNT(*) FROM {t}", usar_cache=False)[1][0][0] for t in TABELAS_ESCALA}
+
+
+def medir_banco(db, repeticoes=3, tamanho_lote=1000, progresso=print):
+    resultado = {'tamanhos': tamanhos(db), 'views': {}, 'consultas': {}, 'procedures': {}}
+    for view in views_do_banco():
+        resultado['views'][view] = _medir(lambda: _ler_tudo(db, f"SELECT * FROM {view}"), repeticoes)
+        progresso(f"  view {view}: {resultado['views'][view]['mediana_s']:.4f}s")
+    for nome, sql in consultas_do_arquivo():
+        resultado['consultas'][nome] = _medir(lambda: _ler_tudo(db, sql), repeticoes)
+        progresso(f"  {nome}: {resultado['consultas'][nome]['mediana_s']:.4f}s")
+    for nome, (preparar, medir) in procedures(tamanho_lote).items():
+        tempos = [_em_rollback(db, preparar, medir) for _ in range(repeticoes)]
+        resultado['procedures'][nome] = {'mediana_s': statistics.median(tempos), 'min_s': min(tempos),
+                                         'max_s': max(tempos), 'repeticoes': repeticoes, 'linhas': None}
+        progresso(f"  {nome}: {resultado['procedures'][nome]['mediana_s']:.4f}s")
+    return resultado
+
+
+def recriar_banco(banco=gerador.BANCO_BENCH):
+    """Apaga e recria `banco` com bd/Banco.sql e bd/Dados.sql numa conexão própria (o banco ainda pode não
+    existir). Recusa o banco da aplicação (gerador.config_bench)."""
+    config = {k: v for k, v in gerador.config_bench(banco).items() if k != 'database'}
+    conn = mysql.connector.connect(**config)
+    try:
+        executar_script(conn, os.path.join(BD, 'Banco.sql'), banco)
+        executar_script(conn, os.path.join(BD, 'Dados.sql'), banco)
+    finally:
+        conn.close()
+
+
+def comparar(atual, base, tolerancia):
+    """[(escala, grupo, item, base_s, atual_s)] dos itens com mediana acima de base * (1 + tolerancia)."""
+    regressoes = []
+    for escala, medicao in atual['escalas'].items():
+        anterior = base.get('escalas', {}).get(escala)
+        if not anterior:
+            continue
+        for grupo in ('views', 'consultas', 'procedures'):
+            for item, r in medicao[grupo].items():
+                b = anterior.get(grupo, {}).get(item)
+                if b and r['mediana_s'] > b['mediana_s'] * (1 + tolerancia):
+                    regressoes.append((escala, grupo, item, b['mediana_s'], r['mediana_s']))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--banco', default=gerador.BANCO_BENCH,
+                        help=f"banco dos benchmarks (padrão: {gerador.BANCO_BENCH}; o da aplicação é recusado)")
+    parser.add_argument('--recriar', action='store_true', help="recria o banco e gera os dados de cada escala")
+    parser.add_argument('--escalas', type=gerador.escala, nargs='+', default=[gerador.escala('10k')])
+    parser.add_argument('--meses', type=int, default=36)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--lote', type=int, default=1000, help="lançamentos por chamada de sp_aprovar_lancamentos_lote")
+    parser.add_argument('--saida', default=None, help="arquivo JSON (padrão: benchmarks/resultados/escala-<data>.json)")
+    parser.add_argument('--comparar', default=None, help="JSON de uma execução anterior")
+    parser.add_argument('--tolerancia', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    config = gerador.config_bench(args.banco)
+
+    relatorio = {'banco': args.banco, 'data': datetime.now().isoformat(timespec='seconds'), 'semente': args.semente,
+                 'repeticoes': args.repeticoes, 'escalas': {}}
+    escalas = args.escalas if args.recriar else [None]
+    for n in escalas:
+        if n is not None:
+            print(f"Escala {n}: recriando o banco e gerando os dados...")
+            recriar_banco(args.banco)
+        db = DatabaseManager(config, workers=0)
+        try:
+            relatorio.setdefault('versao_servidor', db.run_query("SELECT VERSION()")[1][0][0])
+            if n is not None:
+                inicio = time.perf_counter()
+                gerador.Gerador(db, n, args.meses, semente=args.semente).gerar()
+                print(f"  dados gerados em {time.perf_counter() - inicio:.1f}s")
+            medicao = medir_banco(db, args.repeticoes, args.lote)
+        finally:
+            db.close()
+        chave = str(medicao['tamanhos']['lancamento'] if n is None else n)
+        relatorio['escalas'][chave] = medicao
+
+    saida = args.saida or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados',
+                                       f"escala-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"Resultados em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            regressoes = comparar(relatorio, json.load(f), args.tolerancia)
+        for escala, grupo, item, antes, agora in regressoes:
+            print(f"REGRESSÃO [{escala}] {grupo}/{item}: {antes:.4f}s -> {agora:.4f}s")
+        if regressoes:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
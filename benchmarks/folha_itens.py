@@ -0,0 +1,69 @@
+"""
+Benchmark: gravação dos itens de uma folha de elenco, um INSERT por item x INSERT em lote (executemany).
+
+Uso: python -m benchmarks.folha_itens [--tamanhos 50 500 5000] [--repeticoes 3]
+
+Cada rodada cria uma folha pendente, grava N itens (reaproveitando os atletas existentes) e faz
+ROLLBACK, então o banco não é alterado. Requer o banco gestao_clube com ao menos um atleta em elenco.
+"""
+import argparse
+import statistics
+import time
+
+from src.banco import DB_CONFIG, DatabaseManager
+from src import folha
+
+
+def _itens(ids_elenco, n):
+    return [{'id_elenco': ids_elenco[i % len(ids_elenco)], 'salario_base': 10000.0 + i, 'bonus': 500.0,
+             'direito_imagem': 0.0, 'parcela_luvas': 0.0, 'descontos': 100.0} for i in range(n)]
+
+
+def _um_a_um(cursor, id_folha, itens):
+    for linha in folha.linhas_itens_elenco(id_folha, itens):
+        cursor.execute(folha.SQL_ITEM_ELENCO, linha)
+
+
+def _em_lote(cursor, id_folha, itens):
+    folha.inserir_itens_elenco(cursor, id_folha, itens)
+
+
+def _rodada(db, gravar, itens):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO folha_elenco (data_competencia, data_pagamento, valor_direitos_imagem, status, id_direcao)
+                VALUES (CURDATE(), CURDATE(), 0, 'pendente', 2)
+            """)
+            id_folha = cursor.lastrowid
+            inicio = time.perf_counter()
+            gravar(cursor, id_folha, itens)
+            return time.perf_counter() - inicio
+        finally:
+            conn.rollback()
+            cursor.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(DB_CONFIG, workers=0)
+    cols, rows = db.run_query("SELECT id_elenco FROM elenco ORDER BY id_elenco")
+    ids_elenco = [r[0] for r in rows or []]
+    if not ids_elenco:
+        raise SystemExit("elenco vazio: carregue bd/Dados.sql antes do benchmark")
+
+    print(f"{'itens':>6} | {'um a um (s)':>12} | {'em lote (s)':>12} | {'ganho':>6}")
+    for n in args.tamanhos:
+        itens = _itens(ids_elenco, n)
+        um = statistics.median(_rodada(db, _um_a_um, itens) for _ in range(args.repeticoes))
+        lote = statistics.median(_rodada(db, _em_lote, itens) for _ in range(args.repeticoes))
+        print(f"{n:>6} | {um:>12.4f} | {lote:>12.4f} | {um / lote:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
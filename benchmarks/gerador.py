@@ -0,0 +1,389 @@
+"""
+Gerador de dados sintéticos: popula o banco com um histórico de N lançamentos para os benchmarks de escala.
+
+Uso: python -m benchmarks.gerador --lancamentos 100k [--meses 36] [--inicio 2020-01] [--semente 42]
+                                  [--banco gestao_clube_bench] [--recriar]
+
+Grava no banco dos benchmarks (gestao_clube_bench por padrão, o mesmo DB_CONFIG com outro database) e
+recusa o banco da aplicação. --recriar cria esse banco do zero a partir de bd/Banco.sql + bd/Dados.sql.
+
+Roda sobre bd/Banco.sql + bd/Dados.sql (usa as direções 1 a 3 e o plano de contas de Dados.sql) e acrescenta:
+elenco, funcionários (contratados e terceirizados), bens com os subtipos, uma folha de elenco e uma de
+funcionários por mês com todos os itens, e lançamentos manuais até completar N linhas em lancamento.
+A mesma semente e escala geram sempre os mesmos dados.
+
+Tudo passa pelos caminhos normais de escrita (folhas por src/folha.py, bens por sp_aprovar_bem,
+lançamentos manuais em lote), então triggers, saldo de caixa e resumo mensal ficam consistentes.
+Os orçamentos dos corpos esportivo e financeiro são ampliados para comportar as folhas geradas.
+"""
+import argparse
+import math
+import random
+import re
+import time
+from datetime import date, datetime, timedelta
+
+from src.banco import DB_CONFIG, DatabaseManager
+from src import folha
+
+TAMANHO_LOTE = folha.TAMANHO_LOTE
+
+# banco padrão dos benchmarks: o gerador e o --recriar de benchmarks.escala gravam nele (e o --recriar o apaga)
+BANCO_BENCH = 'gestao_clube_bench'
+
+# direções e contas de bd/Dados.sql
+DIRETIVO, ESPORTIVO, FINANCEIRO = 1, 2, 3
+CONTA_IMOVEIS, CONTA_VEICULOS, CONTA_EQUIPAMENTOS = 2, 3, 4
+CONTA_BILHETERIA, CONTA_PATROCINIO, CONTA_ADMINISTRATIVA = 6, 7, 9
+
+FUNCOES = [('Goleiro', 3), ('Zagueiro', 6), ('Lateral Direito', 3), ('Lateral Esquerdo', 3),
+           ('Volante', 4), ('Meio-Campo', 6), ('Ponta', 4), ('Atacante', 5)]
+SETORES = [('Administrativo', 'Assistente Administrativo', 5), ('TI', 'Analista de Sistemas', 2),
+           ('Marketing', 'Analista de Marketing', 2), ('Infraestrutura', 'Auxiliar de Manutenção', 4),
+           ('Saúde', 'Fisioterapeuta', 2), ('Base', 'Treinador das Categorias de Base', 2)]
+DESPESAS = ['Manutenção do Estádio', 'Energia Elétrica', 'Viagem da Delegação', 'Material Esportivo',
+            'Serviços de Segurança', 'Alimentação', 'Taxas de Federação', 'Consultoria Jurídica']
+STATUS_MANUAIS = [('aprovado', 90), ('pendente', 7), ('rejeitado', 3)]
+
+
+def config_bench(banco=BANCO_BENCH):
+    """DB_CONFIG apontando para o banco dos benchmarks; recusa o banco da aplicação."""
+    if not re.fullmatch(r'\w+', banco or ''):
+        raise SystemExit(f"nome de banco inválido: {banco!r}")
+    if banco == DB_CONFIG['database']:
+        raise SystemExit(f"recusado: {banco} é o banco da aplicação; os benchmarks usam um banco próprio "
+                         f"(padrão: {BANCO_BENCH})")
+    return dict(DB_CONFIG, database=banco)
+
+
+def escala(texto):
+    """'10k', '2.5m' ou '100000' -> quantidade de linhas."""
+    texto = str(texto).strip().lower()
+    fator = {'k': 1_000, 'm': 1_000_000}.get(texto[-1:], 1)
+    return int(float(texto.rstrip('km')) * fator)
+
+
+def dimensoes(lancamentos, meses):
+    """Tamanhos das tabelas de cadastro para a escala (crescem com o volume, dentro de limites plausíveis)."""
+    elenco = max(30, min(2000, lancamentos // 2000))
+    funcionarios = max(20, min(5000, lancamentos // 1000))
+    bens = max(10, min(20000, lancamentos // 500))
+    manuais = max(0, lancamentos - 2 * meses - bens)
+    return {'elenco': elenco, 'funcionarios': funcionarios, 'bens': bens, 'meses': meses, 'manuais': manuais}
+
+
+def _escolher(rng, pesos):
+    return rng.choices([p[0] for p in pesos], weights=[p[-1] for p in pesos])[0]
+
+
+def _lognormal(rng, mediana, sigma, minimo=0.0, maximo=None):
+    valor = max(minimo, rng.lognormvariate(math.log(mediana), sigma))
+    return round(min(valor, maximo) if maximo else valor, 2)
+
+
+def _meses(inicio, n):
+    ano, mes = inicio
+    for _ in range(n):
+        yield date(ano, mes, 1)
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+
+
+class Gerador:
+    def __init__(self, db, lancamentos, meses=36, inicio=(2020, 1), semente=42):
+        self.db = db
+        self.rng = random.Random(semente)
+        self.semente = semente
+        self.dim = dimensoes(lancamentos, meses)
+        self.inicio = inicio
+        self.contagem = {}
+
+    # ---------- utilitários ----------
+
+    def _executar_lotes(self, sql, linhas):
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for i in range(0, len(linhas), TAMANHO_LOTE):
+                    cursor.executemany(sql, linhas[i:i + TAMANHO_LOTE])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def _um(self, sql, params=None):
+        cols, linhas = self.db.run_query(sql, params, usar_cache=False)
+        return linhas[0][0] if linhas else None
+
+    def _contar(self, tabela, n):
+        self.contagem[tabela] = self.contagem.get(tabela, 0) + n
+
+    # ---------- cadastros ----------
+
+    def gerar_elenco(self):
+        rng = self.rng
+        linhas, salarios = [], []
+        for i in range(self.dim['elenco']):
+            salario = _lognormal(rng, 15000, 0.8, 3000, 900000)
+            salarios.append(salario)
+            inicio = date(self.inicio[0] - rng.randint(0, 4), rng.randint(1, 12), 1)
+            fim = date(inicio.year + rng.randint(1, 5), rng.choice([6, 12]), 30 if rng.random() < 0.5 else 1)
+            linhas.append((f"Atleta {self.semente}-{i + 1}", round(salario * rng.uniform(30, 120), 2),
+                           _escolher(rng, FUNCOES), inicio, fim, round(salario * rng.uniform(0, 3), 2), inicio,
+                           ESPORTIVO))
+        self._executar_lotes("""
+            INSERT INTO elenco (nome_jogador, multa, funcao, inicio_contrato, fim_contrato, luvas,
+                                passe_data_contrato, id_direcao)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, linhas)
+        self._contar('elenco', len(linhas))
+        cols, ids = self.db.run_query("SELECT id_elenco FROM elenco ORDER BY id_elenco DESC LIMIT %s",
+                                      (len(linhas),), usar_cache=False)
+        # id -> (salário mensal, luvas do contrato), na ordem de inserção
+        self.salarios_elenco = {id_elenco: (salario, linha[5])
+                                for (id_elenco,), salario, linha in zip(reversed(ids), salarios, linhas)}
+
+    def gerar_funcionarios(self):
+        rng = self.rng
+        base = self._um("SELECT COUNT(*) FROM funcionarios") or 0
+        linhas = []
+        for i in range(self.dim['funcionarios']):
+            setor, cargo, _ = SETORES[rng.choices(range(len(SETORES)), weights=[s[2] for s in SETORES])[0]]
+            tipo = 'contratado' if rng.random() < 0.7 else 'terceirizado'
+            linhas.append((f"G{self.semente}-{base + i + 1}", _lognormal(rng, 5000, 0.5, 1500, 60000),
+                           cargo, setor, tipo, FINANCEIRO))
+        self._executar_lotes("""
+            INSERT INTO funcionarios (id_contrato, salario, cargo, setor, tipo_funcionario, id_direcao)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, linhas)
+        cols, ids = self.db.run_query(
+            "SELECT id_funcionario, salario, tipo_funcionario FROM funcionarios ORDER BY id_funcionario DESC LIMIT %s",
+            (len(linhas),), usar_cache=False)
+        ids = list(reversed(ids))
+        contratados, terceirizados = [], []
+        for id_func, salario, tipo in ids:
+            if tipo == 'contratado':
+                admissao = date(self.inicio[0] - rng.randint(0, 10), rng.randint(1, 12), rng.randint(1, 28))
+                contratados.append((id_func, admissao))
+            else:
+                prazo = rng.choice([12, 24, 36])
+                terceirizados.append((id_func, f"Terceirizada {rng.randint(1, 20)}", prazo, round(float(salario) * prazo, 2)))
+        self._executar_lotes("INSERT INTO contratado (id_funcionario, data_admissao) VALUES (%s, %s)", contratados)
+        self._executar_lotes("""
+            INSERT INTO terceirizado (id_funcionario, empresa_contratante, prazo_contrato, valor_contrato_total)
+            VALUES (%s, %s, %s, %s)
+        """, terceirizados)
+        self._contar('funcionarios', len(ids))
+        self.salarios_funcionarios = {id_func: float(salario) for id_func, salario, _ in ids}
+
+    def ajustar_orcamentos(self):
+        """Orçamento mensal com folga de 10% sobre a maior folha possível (gera alertas de 80%, como na vida real)."""
+        elenco = sum(s * 1.35 + luvas / 36 for s, luvas in self.salarios_elenco.values())
+        funcionarios = sum(s * 1.25 for s in self.salarios_funcionarios.values())
+        self.db.run_query("UPDATE corpo_esportivo SET orcamento = GREATEST(orcamento, %s) WHERE id_direcao = %s",
+                          (round(elenco * 1.1, 2), ESPORTIVO))
+        self.db.run_query("UPDATE corpo_financeiro SET orcamento = GREATEST(orcamento, %s) WHERE id_direcao = %s",
+                          (round(funcionarios * 1.1, 2), FINANCEIRO))
+        return elenco + funcionarios
+
+    # ---------- movimento mensal ----------
+
+    def _itens_elenco(self):
+        rng = self.rng
+        itens = []
+        for id_elenco, (salario, luvas) in self.salarios_elenco.items():
+            bruto_extra = salario * rng.uniform(0, 0.15)
+            imagem = salario * rng.uniform(0, 0.2) if salario > 20000 else 0.0
+            itens.append({'id_elenco': id_elenco, 'salario_base': salario, 'bonus': round(bruto_extra, 2),
+                          'direito_imagem': round(imagem, 2), 'parcela_luvas': round(luvas / 36, 2),
+                          'descontos': round(salario * rng.uniform(0.11, 0.275), 2)})
+        return itens
+
+    def _itens_funcionarios(self):
+        rng = self.rng
+        return [{'id_funcionario': id_func, 'salario_base': salario,
+                 'bonus': round(salario * rng.uniform(0, 0.1), 2) if rng.random() < 0.3 else 0.0,
+                 'adicionais': round(salario * rng.uniform(0, 0.15), 2) if rng.random() < 0.2 else 0.0,
+                 'descontos': round(salario * rng.uniform(0.08, 0.2), 2)}
+                for id_func, salario in self.salarios_funcionarios.items()]
+
+    def _bem(self, mes):
+        rng = self.rng
+        r = rng.random()
+        dia = mes + timedelta(days=rng.randint(0, 27))
+        if r < 0.05:
+            return ('imovel', dia, f"Imóvel {rng.randint(1, 9999)}", _lognormal(rng, 800000, 0.7, 100000), CONTA_IMOVEIS)
+        if r < 0.20:
+            return ('automovel', dia, f"Veículo {rng.randint(1, 9999)}", _lognormal(rng, 120000, 0.5, 20000), CONTA_VEICULOS)
+        return ('movel', dia, f"Equipamento {rng.randint(1, 9999)}", _lognormal(rng, 4000, 1.0, 50), CONTA_EQUIPAMENTOS)
+
+    def _gravar_bens(self, bens, pendentes):
+        """Cadastra os bens do mês e aprova por sp_aprovar_bem (os `pendentes` últimos ficam para aprovação)."""
+        rng = self.rng
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for i, (tipo, dia, nome, valor, conta) in enumerate(bens):
+                    cursor.execute("""
+                        INSERT INTO bens (data_aquisicao, nome_item, valor_aquisicao, localizacao, id_direcao, status_aprovacao)
+                        VALUES (%s, %s, %s, %s, %s, 'pendente')
+                    """, (dia, nome, valor, rng.choice(['Estádio', 'Centro de Treinamento', 'Garagem CT', 'Sede']),
+                          FINANCEIRO))
+                    id_bem = cursor.lastrowid
+                    if tipo == 'imovel':
+                        cursor.execute("""
+                            INSERT INTO imoveis (id_bem, endereco, area, tipo_propriedade) VALUES (%s, %s, %s, %s)
+                        """, (id_bem, f"Rua {rng.randint(1, 500)}, {rng.randint(1, 3000)} - Pelotas/RS",
+                              round(rng.uniform(200, 50000), 2), rng.choice(['Terreno', 'Sala Comercial', 'Alojamento'])))
+                    elif tipo == 'automovel':
+                        cursor.execute("""
+                            INSERT INTO automoveis (id_bem, tipo, placa, ano, modelo) VALUES (%s, %s, %s, %s, %s)
+                        """, (id_bem, rng.choice(['Ônibus', 'Van', 'Carro']), f"G{id_bem:09d}"[-10:],
+                              dia.year - rng.randint(0, 8), rng.choice(['Mercedes', 'Renault', 'Fiat', 'Volvo'])))
+                    else:
+                        cursor.execute("INSERT INTO moveis (id_bem, depreciacao_ano) VALUES (%s, %s)",
+                                       (id_bem, rng.choice([10.00, 15.00, 20.00])))
+                    if i < len(bens) - pendentes:
+                        cursor.execute("CALL sp_aprovar_bem(%s, %s, %s)", (id_bem, DIRETIVO, conta))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def _manuais(self, mes, n, despesa_prevista, saldo):
+        """n lançamentos manuais do mês em ordem cronológica; as receitas aprovadas cobrem as despesas com folga.
+        Saídas que deixariam o caixa (saldo no início do mês) negativo ficam pendentes, como o trigger exigiria."""
+        rng = self.rng
+        fim = (mes.replace(day=28) + timedelta(days=4)).replace(day=1)
+        segundos = int((datetime.combine(fim, datetime.min.time()) -
+                        datetime.combine(mes, datetime.min.time())).total_seconds())
+        linhas = []
+        for _ in range(n):
+            quando = datetime.combine(mes, datetime.min.time()) + timedelta(seconds=rng.randrange(segundos))
+            quando = quando.replace(hour=rng.choice(range(8, 20)))
+            status = _escolher(rng, STATUS_MANUAIS)
+            if rng.random() < 0.45:
+                # bilheteria concentrada nos fins de semana; patrocínio em poucas parcelas grandes
+                if quando.weekday() >= 5 or rng.random() < 0.3:
+                    conta, valor, descricao = CONTA_BILHETERIA, _lognormal(rng, 8000, 0.9, 100), 'Receita de Bilheteria'
+                else:
+                    conta, valor, descricao = CONTA_PATROCINIO, _lognormal(rng, 20000, 1.1, 500), 'Receita de Patrocínio'
+                tipo = 'entrada'
+            else:
+                conta, valor, tipo = CONTA_ADMINISTRATIVA, _lognormal(rng, 2500, 1.2, 20), 'saida'
+                descricao = rng.choice(DESPESAS)
+            linhas.append([quando, valor, tipo, status, conta, descricao])
+        linhas.sort(key=lambda l: l[0])
+
+        entradas = sum(l[1] for l in linhas if l[2] == 'entrada' and l[3] == 'aprovado')
+        saidas = sum(l[1] for l in linhas if l[2] == 'saida' and l[3] == 'aprovado') + despesa_prevista
+        if entradas and entradas < saidas * 1.05:
+            # receitas escaladas para cobrir o mês
+            fator = saidas * 1.05 / entradas
+            for l in linhas:
+                if l[2] == 'entrada':
+                    l[1] = round(l[1] * fator, 2)
+        elif not entradas and saidas:
+            linhas.insert(0, [datetime.combine(mes, datetime.min.time()).replace(hour=8),
+                              round(saidas * 1.05, 2), 'entrada', 'aprovado', CONTA_PATROCINIO, 'Aporte de Patrocínio'])
+
+        for l in linhas:
+            if l[3] != 'aprovado':
+                continue
+            if l[2] == 'entrada':
+                saldo += l[1]
+            elif saldo < l[1]:
+                l[3] = 'pendente'
+            else:
+                saldo -= l[1]
+        return [(quando, valor, tipo, status, DIRETIVO if status != 'pendente' else None,
+                 quando if status != 'pendente' else None, DIRETIVO, conta, descricao)
+                for quando, valor, tipo, status, conta, descricao in linhas]
+
+    def gerar_movimento(self, progresso=None):
+        meses = list(_meses(self.inicio, self.dim['meses']))
+        folha_mensal = self.ajustar_orcamentos()
+        por_mes = [self.dim['manuais'] // len(meses)] * len(meses)
+        for i in range(self.dim['manuais'] - sum(por_mes)):
+            por_mes[i] += 1
+        bens_por_mes = [self.dim['bens'] // len(meses)] * len(meses)
+        for i in range(self.dim['bens'] - sum(bens_por_mes)):
+            bens_por_mes[-1 - i] += 1
+
+        # aporte inicial: três meses de despesas
+        self._executar_lotes("""
+            INSERT INTO lancamento (data_registro, valor, tipo_de_movimentacao, status_aprovacao, id_aprovador,
+                                    data_aprovacao, id_direcao, id_conta, descricao, origem)
+            VALUES (%s, %s, 'entrada', 'aprovado', %s, %s, %s, %s, 'Aporte inicial (dados sintéticos)', 'manual')
+        """, [(datetime.combine(meses[0], datetime.min.time()), round(folha_mensal * 3, 2), DIRETIVO,
+               datetime.combine(meses[0], datetime.min.time()), DIRETIVO, CONTA_PATROCINIO)])
+
+        for n, mes in enumerate(meses):
+            bens = [self._bem(mes) for _ in range(bens_por_mes[n])]
+            despesa = folha_mensal + sum(b[3] for b in bens)
+            saldo = float(self._um("SELECT saldo FROM saldo_caixa WHERE id_saldo = 1") or 0)
+            self._executar_lotes("""
+                INSERT INTO lancamento (data_registro, valor, tipo_de_movimentacao, status_aprovacao, id_aprovador,
+                                        data_aprovacao, id_direcao, id_conta, descricao, origem)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'manual')
+            """, self._manuais(mes, por_mes[n], despesa, saldo))
+            self._contar('lancamento (manuais)', por_mes[n])
+
+            pagamento = mes.replace(day=5)
+            itens_e, itens_f = self._itens_elenco(), self._itens_funcionarios()
+            folha.gerar_folha_elenco(self.db, ESPORTIVO, mes, pagamento, itens_e, id_aprovador=DIRETIVO)
+            folha.gerar_folha_funcionarios(self.db, FINANCEIRO, mes, pagamento, itens_f, id_aprovador=DIRETIVO)
+            self._contar('folha_elenco', 1)
+            self._contar('folha_funcionarios', 1)
+            self._contar('item_folha_e', len(itens_e))
+            self._contar('item_folha_f', len(itens_f))
+
+            # o último mês deixa 5% dos bens pendentes de aprovação
+            pendentes = int(len(bens) * 0.05) if n == len(meses) - 1 else 0
+            self._gravar_bens(bens, pendentes)
+            self._contar('bens', len(bens))
+            if progresso:
+                progresso(n + 1, len(meses))
+
+    def gerar(self, progresso=None):
+        self.gerar_elenco()
+        self.gerar_funcionarios()
+        self.gerar_movimento(progresso)
+        return self.contagem
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lancamentos', type=escala, default=escala('10k'),
+                        help="linhas de lancamento a gerar (aceita 10k, 1m, ...)")
+    parser.add_argument('--meses', type=int, default=36, help="meses de histórico (uma folha de cada tipo por mês)")
+    parser.add_argument('--inicio', default='2020-01', help="primeiro mês do histórico (AAAA-MM)")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--banco', default=BANCO_BENCH, help=f"banco dos benchmarks (padrão: {BANCO_BENCH})")
+    parser.add_argument('--recriar', action='store_true', help="recria o banco a partir de bd/Banco.sql + bd/Dados.sql")
+    args = parser.parse_args(argv)
+
+    config = config_bench(args.banco)
+    if args.recriar:
+        from benchmarks.escala import recriar_banco
+        recriar_banco(args.banco)
+    ano, mes = (int(p) for p in args.inicio.split('-'))
+    db = DatabaseManager(config, workers=0)
+    try:
+        gerador = Gerador(db, args.lancamentos, args.meses, (ano, mes), args.semente)
+        print("Dimensões:", ", ".join(f"{k}={v}" for k, v in gerador.dim.items()))
+        inicio = time.perf_counter()
+        contagem = gerador.gerar(lambda n, total: print(f"  mês {n}/{total}", end="\r", flush=True))
+        print()
+        for tabela, n in contagem.items():
+            print(f"{tabela:>22}: {n}")
+        print(f"Concluído em {time.perf_counter() - inicio:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Confere os planos de bd/Planos.sql: executa cada EXPLAIN no banco atual, imprime as linhas do plano
+e compara com o comentário '-- esperado:' do bloco (type/key por alias e 'sem filesort').
+
+Uso:
+  python -m benchmarks.gerador --recriar --lancamentos 100k     (volume para o otimizador preferir os índices)
+  python -m benchmarks.planos [--saida planos.json] [--banco gestao_clube_bench]
+      sai com código 1 se algum plano divergir do esperado
+
+Com a --saida, grava os planos capturados (linhas do EXPLAIN, versão do servidor e tamanhos das tabelas)
+em JSON, para anexar à revisão de uma mudança de índices.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+from src.banco import DatabaseManager
+from benchmarks.escala import BD, TABELAS_ESCALA, dividir_script
+from benchmarks.gerador import BANCO_BENCH, config_bench
+
+_BLOCO = re.compile(r'^--\s*=+\s*\n--\s*(.+?)\s*\n--\s*=+\s*$', re.MULTILINE)
+_ESPERADO = re.compile(r'^--\s*esperado:\s*(.+)$', re.MULTILINE)
+_ACESSO = re.compile(r'(?:\b(\w+)\s+)?type=(\w+)(?:\s+key=(\w+))?')
+
+
+def blocos(caminho=os.path.join(BD, 'Planos.sql')):
+    """[(título, esperado, [EXPLAIN ...])] na ordem do arquivo."""
+    with open(caminho, encoding='utf-8') as f:
+        partes = _BLOCO.split(f.read())
+    resultado = []
+    for titulo, corpo in zip(partes[1::2], partes[2::2]):
+        m = _ESPERADO.search(corpo)
+        comandos = [c for c in dividir_script(corpo) if re.match(r'EXPLAIN\b', c, re.IGNORECASE)]
+        if comandos:
+            resultado.append((titulo, m.group(1) if m else '', comandos))
+    return resultado
+
+
+def divergencias(esperado, linhas):
+    """Diferenças entre o comentário 'esperado' e as linhas do EXPLAIN (dicts com table/type/key/Extra)."""
+    problemas = []
+    for alias, tipo, chave in _ACESSO.findall(esperado):
+        candidatas = [l for l in linhas if not alias or l['table'] == alias]
+        if not candidatas:
+            problemas.append(f"{alias}: ausente do plano")
+        elif not any(l['type'] == tipo and (not chave or l['key'] == chave) for l in candidatas):
+            obtido = ', '.join(f"{l['table']} type={l['type']} key={l['key']}" for l in candidatas)
+            problemas.append(f"esperado {alias or '*'} type={tipo}{f' key={chave}' if chave else ''}; obtido {obtido}")
+    if 'sem filesort' in esperado and any('filesort' in (l['Extra'] or '') for l in linhas):
+        problemas.append("plano usa filesort")
+    return problemas
+
+
+def explicar(db, sql):
+    colunas, linhas = db.run_query(sql, usar_cache=False)
+    return [dict(zip(colunas, l)) for l in linhas or []]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--saida', help="arquivo JSON com os planos capturados")
+    parser.add_argument('--banco', default=BANCO_BENCH, help=f"banco carregado pelo gerador (padrão: {BANCO_BENCH})")
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(config_bench(args.banco), workers=0)
+    try:
+        relatorio = {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'versao_servidor': db.run_query("SELECT VERSION()")[1][0][0],
+            'tamanhos': {t: db.run_query(f"SELECT COUNT(*) FROM {t}", usar_cache=False)[1][0][0]
+                         for t in TABELAS_ESCALA},
+            'planos': [],
+        }
+        falhas = 0
+        for titulo, esperado, comandos in blocos():
+            for sql in comandos:
+                linhas = explicar(db, sql)
+                problemas = divergencias(esperado, linhas)
+                falhas += bool(problemas)
+                print(f"{'OK ' if not problemas else 'DIVERGE'} {titulo}")
+                for l in linhas:
+                    print(f"    {l['table'] or '-':<12} type={l['type'] or '-':<7} key={l['key'] or '-':<38} "
+                          f"rows={l['rows'] or '-':<8} {l['Extra'] or ''}")
+                for p in problemas:
+                    print(f"    ! {p}")
+                relatorio['planos'].append({'titulo': titulo, 'esperado': esperado, 'sql': sql,
+                                            'linhas': linhas, 'divergencias': problemas})
+    finally:
+        db.close()
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2, default=str)
+        print(f"Planos em {args.saida}")
+    print(f"{len(relatorio['planos']) - falhas} de {len(relatorio['planos'])} planos conforme o esperado "
+          f"(lancamento: {relatorio['tamanhos']['lancamento']:,} linhas)")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,19 @@
 """
 Parte visual do sistema: tema, botões, formulários, telas e diálogos.
 """
+import statistics
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime, date
-from mysql.connector import Error
+from tkinter import ttk, messagebox, filedialog
+from collections import deque
+from datetime import date
+from .paginacao import fonte_para_sql, separar_filtros, FonteConsulta, FonteLista
+from .colunas import LIMITE as LIMITE_COLUNAR, ResultadoGrande, TabelaColunar, tabela_da_fonte
+from . import exportacao, relatorios
+# src.servicos (e com ele o driver MySQL) é importado nos métodos que o usam, fora da abertura da janela
+from .snapshot import FonteSnapshot, Snapshots
+from .editor_folha import ALERTA_PERCENTUAL, EditorFolha, formatar
+from .erros import ErroSistema
 
 # ==================== CONFIGURAÇÕES (perfil/corpos/tema) ====================
 PERFIS = {
@@ -28,6 +37,13 @@ SENHA_PARA_CORPO = {
     '3': 'esportivo'
 }
 
+
+
+def mostrar_erro(e):
+    """Callback ao_erro do DatabaseManager: erros de consulta viram diálogo na interface."""
+    messagebox.showerror("Erro", f"Erro na consulta:\n{str(e)[:200]}")
+
+
 # Design System - Tema Profissional
 THEME = {
     'bg_primary': '#0A0E27',
@@ -89,6 +105,345 @@ class ModernEntry(tk.Entry):
         self.placeholder = placeholder
         self.default_fg = THEME['text']
 
+
+class BarraBusca(tk.Frame):
+    """Campo de busca incremental: chama ao_buscar(texto) depois de uma pausa na digitação."""
+
+    ATRASO_MS = 150
+
+    def __init__(self, parent, ao_buscar, bg=THEME['bg_secondary'], **kwargs):
+        super().__init__(parent, bg=bg, **kwargs)
+        self.ao_buscar = ao_buscar
+        self.texto = tk.StringVar()
+        self._agendado = None
+        tk.Label(self, text="🔍", font=('Segoe UI', 11), bg=bg, fg=THEME['text_secondary']).pack(side='left')
+        ModernEntry(self, textvariable=self.texto, width=32).pack(side='left', ipady=4, padx=(5, 10))
+        self.aviso = tk.Label(self, text='', font=('Segoe UI', 9), bg=bg, fg=THEME['text_secondary'])
+        self.aviso.pack(side='left')
+        self.texto.trace_add('write', lambda *_: self._agendar())
+
+    def _agendar(self):
+        if self._agendado is not None:
+            self.after_cancel(self._agendado)
+        self._agendado = self.after(self.ATRASO_MS, self._disparar)
+
+    def _disparar(self):
+        self._agendado = None
+        self.ao_buscar(self.texto.get())
+
+    def limpar(self):
+        """Apaga o texto sem disparar a busca."""
+        self.texto.set('')
+        if self._agendado is not None:
+            self.after_cancel(self._agendado)
+            self._agendado = None
+
+
+class OrdenacaoArvore:
+    """Ordenação por clique no cabeçalho e busca (BarraBusca) para uma ttk.Treeview comum, via tabela
+    colunar (src/colunas.py): as linhas são reordenadas com move() e as que não casam saem com detach().
+    Quem preenche a árvore chama limpar() antes e atualizar() depois."""
+
+    def __init__(self, tree, barra):
+        self.tree = tree
+        self.barra = barra
+        barra.ao_buscar = lambda texto: self.aplicar()
+        self._colunas = list(tree['columns'])
+        self._titulos = [tree.heading(c, 'text') for c in self._colunas]
+        self._iids = []
+        self._tabela = None
+        self._ordem = None
+        self._reordenada = False
+        for i, col in enumerate(self._colunas):
+            tree.heading(col, command=lambda i=i: self.ordenar(i))
+
+    def limpar(self):
+        """Remove todas as linhas, inclusive as escondidas pela busca."""
+        todos = set(self._iids) | set(self.tree.get_children())
+        self.tree.delete(*[i for i in todos if self.tree.exists(i)])
+        self._iids = []
+        self._tabela = None
+
+    def atualizar(self):
+        """Relê as linhas da árvore (depois de preenchê-la) e reaplica ordenação e busca."""
+        self._iids = list(self.tree.get_children())
+        self._tabela = None
+        self.aplicar()
+
+    def alterada(self):
+        """Uma linha mudou no lugar (tree.item): a tabela só é refeita na próxima ordenação ou busca,
+        e a linha não muda de posição até lá."""
+        self._tabela = None
+
+    def ordenar(self, coluna):
+        decrescente = bool(self._ordem and self._ordem[0] == coluna and not self._ordem[1])
+        self._ordem = (coluna, decrescente)
+        for i, col in enumerate(self._colunas):
+            self.tree.heading(col, text=_titulo_ordenado(self._titulos[i], i, self._ordem))
+        self.aplicar()
+
+    def aplicar(self):
+        texto = self.barra.texto.get()
+        if self._ordem is None and not texto.strip() and not self._reordenada:
+            return  # árvore já na ordem de inserção, sem linhas escondidas
+        if self._tabela is None:
+            self._tabela = TabelaColunar(self._colunas, [self.tree.item(i, 'values') for i in self._iids])
+        self._reordenada = self._ordem is not None or bool(texto.strip())
+        self._tabela.ordenar(*(self._ordem or (None,)))
+        self._tabela.buscar(texto)
+        indices = self._tabela.indices()
+        visiveis = set(indices)
+        ocultos = [self._iids[i] for i in range(len(self._iids)) if i not in visiveis]
+        if ocultos:
+            self.tree.detach(*ocultos)
+        for posicao, i in enumerate(indices):
+            self.tree.move(self._iids[i], '', posicao)
+
+
+def _titulo_ordenado(titulo, coluna, ordem):
+    if ordem and ordem[0] == coluna:
+        return f"{titulo} {'▼' if ordem[1] else '▲'}"
+    return titulo
+
+
+class PagedTreeview(tk.Frame):
+    """Treeview que carrega uma fonte paginada (src/paginacao.py) sob demanda.
+
+    Mostra a primeira página já buscada e, ao rolar perto do fim/início, pede a página seguinte/anterior
+    por carregar(fn, on_done, on_error, widget) — que executa fn fora da thread do Tk. Mantém no máximo
+    max_paginas páginas na árvore, descartando as do lado oposto, então a memória não cresce com o resultado.
+
+    Clicar num cabeçalho ordena pela coluna e a barra de busca filtra as linhas, numa tabela colunar em
+    memória (src/colunas.py) montada uma única vez com todas as linhas de `origem` (a fonte recebida);
+    depois disso ordenação e busca não consultam o banco. Resultados grandes demais para a memória
+    (mais de colunas.LIMITE linhas) são ordenados e filtrados no servidor (origem.filtrada(), ver
+    paginacao.FonteFiltrada), buscando só a página exibida.
+    """
+
+    def __init__(self, parent, fonte, primeira, carregar, tamanho_pagina=200, max_paginas=5,
+                 col_width=150, on_total=None, **kwargs):
+        super().__init__(parent, bg=THEME['bg_secondary'], **kwargs)
+        self.fonte = fonte
+        self.origem = fonte
+        self.carregar = carregar
+        self.tamanho_pagina = tamanho_pagina
+        self.max_paginas = max_paginas
+        self.on_total = on_total
+        self._paginas = deque()  # (Pagina, iids na árvore)
+        self._carregando = False
+        self._tabela = None  # TabelaColunar de `origem`, criada na primeira ordenação/busca
+        self._ordem = None   # (índice da coluna, decrescente)
+        self._lendo_tudo = False
+        self._no_servidor = False
+        self._pedido = 0     # descarta páginas filtradas no servidor que chegam fora de ordem
+
+        self.barra = BarraBusca(self, lambda texto: self._aplicar())
+        self.barra.pack(side='top', fill='x', pady=(0, 6))
+        self._scroll_y = ttk.Scrollbar(self, orient='vertical')
+        scroll_x = ttk.Scrollbar(self, orient='horizontal')
+        self.tree = ttk.Treeview(self, columns=fonte.colunas, show='headings',
+                                 yscrollcommand=self._on_scroll, xscrollcommand=scroll_x.set,
+                                 style='Modern.Treeview')
+        self._scroll_y.config(command=self.tree.yview)
+        scroll_x.config(command=self.tree.xview)
+        self._scroll_y.pack(side='right', fill='y')
+        scroll_x.pack(side='bottom', fill='x')
+        self.tree.pack(fill='both', expand=True)
+
+        self.col_width = col_width
+        self._configurar_colunas(fonte.colunas)
+        self._anexar(primeira)
+        self._pedir_total()
+
+    def _pedir_total(self):
+        if self.on_total:
+            fonte = self.fonte
+            # descarta a contagem se a grade já mostra outra fonte (recarregar)
+            self.carregar(fonte.contar, lambda n: self._total(fonte, n), lambda e: None, widget=self)
+
+    def _total(self, fonte, n):
+        if self.fonte is not fonte:  # a grade já mostra outra fonte (recarregar)
+            return
+        if fonte is self.origem and n > LIMITE_COLUNAR and self._filtravel():
+            self._no_servidor = True  # nem tenta montar a tabela colunar
+        self.on_total(n)
+
+    def _filtravel(self):
+        return callable(getattr(self.origem, 'filtrada', None))
+
+    def _configurar_colunas(self, colunas):
+        self.tree.config(columns=colunas)
+        for i, col in enumerate(colunas):
+            self.tree.heading(col, text=_titulo_ordenado(col, i, self._ordem), command=lambda i=i: self._ordenar(i))
+            self.tree.column(col, width=self.col_width, anchor='center')
+
+    def recarregar(self, fonte, primeira, mesma_consulta=True):
+        """Troca a fonte e substitui as linhas no mesmo widget. mesma_consulta=True (dados novos da mesma
+        consulta) mantém rolagem, ordenação e busca; False começa do topo, sem ordenação nem busca."""
+        self.origem = fonte
+        self._tabela = None
+        self._pedido += 1
+        if not mesma_consulta:
+            self._ordem = None
+            self._no_servidor = False
+            self.barra.limpar()
+        if self._ordem is None and not self.barra.texto.get().strip():
+            self._exibir(fonte, primeira, self.tree.yview()[0] if mesma_consulta else 0.0)
+        else:
+            self._aplicar()
+
+    def _ordenar(self, coluna):
+        decrescente = bool(self._ordem and self._ordem[0] == coluna and not self._ordem[1])
+        self._ordem = (coluna, decrescente)
+        for i, col in enumerate(self.fonte.colunas):
+            self.tree.heading(col, text=_titulo_ordenado(col, i, self._ordem))
+        self._aplicar()
+
+    def _aplicar(self):
+        """Exibe `origem` na ordenação e com a busca atuais, a partir da tabela colunar (ou do servidor)."""
+        termo = self.barra.texto.get()
+        if self._no_servidor:
+            self._aplicar_no_servidor(termo)
+            return
+        if self._tabela is None:
+            if self._ordem is not None or termo.strip():
+                self._ler_tudo()
+            return
+        self._tabela.ordenar(*(self._ordem or (None,)))
+        self._tabela.buscar(termo)
+        visao = self._tabela.fonte()
+        self._exibir(visao, visao.primeira(self.tamanho_pagina), 0.0)
+
+    def _ler_tudo(self):
+        # uma única leitura de todas as linhas (num worker); fontes em memória não vão ao banco
+        if self._lendo_tudo:
+            return
+        self._lendo_tudo = True
+        origem = self.origem
+        self.barra.aviso.config(text="carregando todas as linhas...")
+
+        def ok(tabela):
+            self._lendo_tudo = False
+            self.barra.aviso.config(text='')
+            if self.origem is origem:
+                self._tabela = tabela
+            self._aplicar()
+
+        def falhou(e):
+            self._lendo_tudo = False
+            if isinstance(e, ResultadoGrande) and self.origem is origem and self._filtravel():
+                self._no_servidor = True
+                self.barra.aviso.config(text='')
+                self._aplicar()
+                return
+            self.barra.aviso.config(text=str(e)[:120])
+
+        self.carregar(lambda: tabela_da_fonte(origem), ok, falhou, widget=self)
+
+    def _aplicar_no_servidor(self, texto):
+        filtros, termo = separar_filtros(texto, self.origem.colunas)
+        if not filtros and not termo.strip() and self._ordem is None:
+            fonte = self.origem
+        else:
+            try:
+                fonte = self.origem.filtrada(filtros, termo, self._ordem)
+            except ValueError as e:
+                fonte, motivo = None, str(e)
+            else:
+                motivo = "esta consulta não pode ser filtrada no servidor"
+            if fonte is None:
+                self.barra.aviso.config(text=motivo[:120])
+                return
+        self._pedido += 1
+        pedido = self._pedido
+        self.barra.aviso.config(text="filtrando no servidor...")
+
+        def ok(primeira):
+            if pedido == self._pedido:
+                self.barra.aviso.config(text='')
+                self._exibir(fonte, primeira, 0.0)
+
+        def falhou(e):
+            if pedido == self._pedido:
+                self.barra.aviso.config(text=str(e)[:120])
+
+        self.carregar(lambda: fonte.primeira(self.tamanho_pagina), ok, falhou, widget=self)
+
+    def _exibir(self, fonte, primeira, topo):
+        if list(fonte.colunas) != list(self.fonte.colunas):
+            self._configurar_colunas(fonte.colunas)
+        self.fonte = fonte
+        self._carregando = False
+        self.tree.delete(*self.tree.get_children())
+        self._paginas.clear()
+        self._anexar(primeira)
+        self.tree.yview_moveto(topo)
+        self._pedir_total()
+
+    def _on_scroll(self, first, last):
+        self._scroll_y.set(first, last)
+        if self._carregando or not self._paginas:
+            return
+        n = self.tamanho_pagina
+        if float(last) >= 0.9 and self._paginas[-1][0].tem_seguinte:
+            fim = self._paginas[-1][0].fim
+            self._pedir(lambda: self.fonte.seguinte(fim, n), self._anexar)
+        elif float(first) <= 0.1 and self._paginas[0][0].tem_anterior:
+            inicio = self._paginas[0][0].inicio
+            self._pedir(lambda: self.fonte.anterior(inicio, n), self._prefixar)
+
+    def _pedir(self, fn, aplicar):
+        self._carregando = True
+        fonte = self.fonte
+
+        def ok(pagina):
+            if self.fonte is not fonte:
+                return
+            self._carregando = False
+            aplicar(pagina)
+
+        def falhou(e):
+            if self.fonte is not fonte:
+                return
+            self._carregando = False
+            messagebox.showerror("Erro", f"Erro ao carregar página:\n{str(e)[:200]}")
+
+        self.carregar(fn, ok, falhou, widget=self)
+
+    def _reposicionar(self, topo, total):
+        """Mantém a mesma linha no topo da área visível depois de inserir/remover linhas acima dela."""
+        if total:
+            self.tree.yview_moveto(max(0.0, topo) / total)
+
+    def _anexar(self, pagina):
+        if not pagina.linhas:
+            if self._paginas:
+                antiga, iids = self._paginas[-1]
+                self._paginas[-1] = (antiga._replace(tem_seguinte=False), iids)
+            return
+        iids = [self.tree.insert('', 'end', values=row) for row in pagina.linhas]
+        self._paginas.append((pagina, iids))
+        if len(self._paginas) > self.max_paginas:
+            total = len(self.tree.get_children())
+            topo = self.tree.yview()[0] * total
+            _, removidos = self._paginas.popleft()
+            self.tree.delete(*removidos)
+            self._reposicionar(topo - len(removidos), total - len(removidos))
+
+    def _prefixar(self, pagina):
+        if not pagina.linhas:
+            return
+        total = len(self.tree.get_children())
+        topo = self.tree.yview()[0] * total
+        iids = [self.tree.insert('', i, values=row) for i, row in enumerate(pagina.linhas)]
+        self._paginas.appendleft((pagina, iids))
+        total += len(iids)
+        if len(self._paginas) > self.max_paginas:
+            _, removidos = self._paginas.pop()
+            self.tree.delete(*removidos)
+            total -= len(removidos)
+        self._reposicionar(topo + len(iids), total)
+
 # ==================== APLICAÇÃO PRINCIPAL ====================
 class ClubManagementApp:
     """Sistema de Gestão - Interface Profissional (recebe conexão com banco)."""
@@ -104,6 +459,19 @@ class ClubManagementApp:
         self.corpo_atual = None
         self.id_direcao_atual = None
         self.origem_consulta = None
+        self.snapshots = Snapshots(db)
+
+        # consultas em segundo plano: contador de tarefas pendentes e geração da tela atual
+        self._tarefas_pendentes = 0
+        self._tela = 0
+
+        # telas construídas uma vez (chave -> frame) e tempo de construção de cada uma, em segundos
+        self._telas = {}
+        self._tela_atual = None
+        self.tempos_telas = {}
+        self.status_label = tk.Label(self.root, text='', anchor='w', font=('Segoe UI', 9),
+                                     bg=THEME['bg_primary'], fg=THEME['text_secondary'])
+        self.status_label.pack(side='bottom', fill='x', padx=10)
 
         self.container = tk.Frame(self.root, bg=THEME['bg_primary'])
         self.container.pack(fill='both', expand=True)
@@ -133,78 +501,186 @@ class ClubManagementApp:
                  background=[('selected', THEME['accent'])],
                  foreground=[('selected', 'white')])
 
-    def _clear_container(self):
-        for widget in self.container.winfo_children():
-            widget.destroy()
+    # False: reconstrói a tela a cada navegação (comportamento anterior, usado na medição de medir_telas)
+    CACHE_TELAS = True
+
+    def _mostrar_tela(self, chave, construir):
+        """Exibe a tela `chave` e oculta a atual. construir(frame) monta os widgets só na primeira exibição;
+        depois a tela é apenas reexibida e quem chama atualiza o que mudou. Retorna o frame da tela."""
+        self._tela += 1
+        tela = self._telas.get(chave)
+        if tela is None:
+            inicio = time.perf_counter()
+            tela = tk.Frame(self.container, bg=THEME['bg_primary'])
+            construir(tela)
+            self.tempos_telas[chave] = time.perf_counter() - inicio
+            if self.CACHE_TELAS:
+                self._telas[chave] = tela
+        anterior, self._tela_atual = self._tela_atual, tela
+        if anterior is not None and anterior is not tela:
+            if anterior in self._telas.values():
+                anterior.pack_forget()
+            else:
+                anterior.destroy()
+        tela.pack(fill='both', expand=True)
+        return tela
+
+    def _descartar_telas(self):
+        for tela in set(self._telas.values()) | {self._tela_atual}:
+            if tela is not None:
+                tela.destroy()
+        self._telas.clear()
+        self._tela_atual = None
+
+    def medir_telas(self, rodadas=5):
+        """Mede a navegação entre as telas que não consultam o banco (login, seleção de corpo, painéis).
+
+        Cada tela é exibida `rodadas` vezes reconstruindo a cada navegação (antes) e reaproveitando a tela
+        já construída (depois). Retorna {tela: (construção_ms, antes_ms, depois_ms)}, com medianas."""
+        roteiro = [('login', self.show_login), ('seleção de corpo', self.show_corpo_selection)]
+        roteiro += [(f"painel {corpo}", lambda c=corpo: self._entrar_corpo(c)) for corpo in CORPOS]
+        roteiro.append(('análise de dados', self.show_dashboard))
+
+        medianas = {nome: [] for nome, _ in roteiro}
+        construcao = {}
+        for cache in (False, True):
+            self._descartar_telas()
+            self.CACHE_TELAS = cache
+            amostras = {nome: [] for nome, _ in roteiro}
+            for _ in range(rodadas + 1):
+                for nome, mostrar in roteiro:
+                    inicio = time.perf_counter()
+                    mostrar()
+                    self.root.update()
+                    amostras[nome].append((time.perf_counter() - inicio) * 1000)
+            for nome, tempos in amostras.items():
+                if cache:
+                    construcao[nome] = tempos[0]
+                medianas[nome].append(statistics.median(tempos[1:]))  # a 1ª rodada aquece/constrói
+        del self.CACHE_TELAS
+        self._descartar_telas()
+        self.show_login()
+        return {nome: (construcao[nome], *medianas[nome]) for nome, _ in roteiro}
 
-    @staticmethod
-    def _parse_date_br(s):
-        """Converte DD/MM/AAAA para string YYYY-MM-DD. Retorna None se inválido."""
-        try:
-            parts = s.strip().split('/')
-            if len(parts) != 3:
-                return None
-            dia, mes, ano = int(parts[0]), int(parts[1]), int(parts[2])
-            if 1 <= mes <= 12 and 1 <= dia <= 31 and ano > 0:
-                return f"{ano}-{mes:02d}-{dia:02d}"
-        except (ValueError, IndexError):
-            pass
-        return None
-
-    def _tree_selection_dialog(self, title, columns, data, action_text, on_confirm, geometry='900x600'):
-        """Dialog com Treeview e botão de ação. on_confirm(selected_id, dialog) é chamado ao confirmar."""
-        dialog = tk.Toplevel(self.root)
-        dialog.title(title)
-        dialog.configure(bg=THEME['bg_primary'])
-        dialog.geometry(geometry)
-        dialog.transient(self.root)
-        tk.Label(dialog, text=title, font=('Segoe UI', 18, 'bold'),
-                 bg=THEME['bg_primary'], fg=THEME['text']).pack(pady=20)
-        tree_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
-        tree_frame.pack(fill='both', expand=True, padx=20, pady=(0, 20))
-        scroll_y = ttk.Scrollbar(tree_frame, orient='vertical')
-        scroll_x = ttk.Scrollbar(tree_frame, orient='horizontal')
-        tree = ttk.Treeview(tree_frame, columns=columns, show='headings',
-                            yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set, style='Modern.Treeview')
-        scroll_y.config(command=tree.yview)
-        scroll_x.config(command=tree.xview)
-        scroll_y.pack(side='right', fill='y')
-        scroll_x.pack(side='bottom', fill='x')
-        tree.pack(fill='both', expand=True)
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=120, anchor='center')
-        for row in data:
-            tree.insert('', 'end', values=row)
+    # ==================== EXECUÇÃO EM SEGUNDO PLANO ====================
 
-        def do_action():
-            sel = tree.selection()
-            if not sel:
-                messagebox.showwarning("Aviso", "Selecione um item!")
+    POLL_MS = 40
+
+    def _set_busy(self, delta):
+        """Atualiza o estado de ocupado (cursor de espera + barra de status) conforme as tarefas pendentes."""
+        self._tarefas_pendentes += delta
+        ocupado = self._tarefas_pendentes > 0
+        self.root.config(cursor='watch' if ocupado else '')
+        self.status_label.config(text='⏳ Consultando o banco de dados...' if ocupado else '')
+
+    def _aguardar(self, future, on_done, on_error=None, widget=None):
+        """Acompanha um Future do DatabaseManager sem bloquear o Tk (polling com root.after) e chama
+        on_done(resultado) / on_error(exceção) na thread da interface. O resultado é descartado se a tela
+        mudou enquanto a consulta rodava (ou se widget, quando informado, foi destruído)."""
+        tela = self._tela
+        self._set_busy(1)
+
+        def verificar():
+            if not future.done():
+                self.root.after(self.POLL_MS, verificar)
+                return
+            self._set_busy(-1)
+            if widget is not None:
+                if not widget.winfo_exists():
+                    return
+            elif tela != self._tela:
+                return
+            try:
+                resultado = future.result()
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                else:
+                    messagebox.showerror("Erro", f"Erro na consulta:\n{str(e)[:200]}")
                 return
-            item_id = tree.item(sel[0])['values'][0]
-            on_confirm(item_id, dialog)
+            on_done(resultado)
 
-        btn_frame = tk.Frame(dialog, bg=THEME['bg_primary'])
-        btn_frame.pack(pady=20)
-        ModernButton(btn_frame, text=action_text, command=do_action, style='danger').pack(side='left', padx=5)
-        ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy, style='accent').pack(side='left', padx=5)
-        return dialog
+        verificar()
+
+    TAMANHO_PAGINA = 200
+
+    def _em_worker(self, fn, on_done, on_error=None, widget=None):
+        """Executa fn() num worker do banco e entrega o resultado na thread da interface (ver _aguardar)."""
+        self._aguardar(self.db.submit(fn), on_done, on_error, widget=widget)
+
+    def _gravar(self, fn, dialog, erro, sucesso=None, botao=None):
+        """Executa a escrita fn() num worker (ver _em_worker), com `botao` desabilitado enquanto ela roda; na
+        thread da interface mostra `sucesso` (se houver) e fecha o dialog, ou mostra `erro` seguido da exceção."""
+        def concluido(_):
+            if sucesso:
+                messagebox.showinfo("Sucesso", sucesso)
+            dialog.destroy()
+
+        def falhou(e):
+            if botao is not None:
+                botao.config(state='normal')
+            messagebox.showerror("Erro", f"{erro}{e}")
+
+        if botao is not None:
+            botao.config(state='disabled')
+        self._em_worker(fn, concluido, falhou, widget=dialog)
+
+    def _tree_selection_dialog(self, title, fonte, action_text, on_confirm, geometry='900x600',
+                               empty_msg="Nenhum item encontrado!"):
+        """Busca a primeira página de `fonte` (src/paginacao.py) e abre um dialog com a grade paginada e
+        botão de ação; on_confirm(selected_id, dialog) é chamado ao confirmar. Sem linhas, mostra empty_msg."""
+
+        def abrir(primeira):
+            if not primeira.linhas:
+                messagebox.showinfo("Info", empty_msg)
+                return
+            dialog = tk.Toplevel(self.root)
+            dialog.title(title)
+            dialog.configure(bg=THEME['bg_primary'])
+            dialog.geometry(geometry)
+            dialog.transient(self.root)
+            tk.Label(dialog, text=title, font=('Segoe UI', 18, 'bold'),
+                     bg=THEME['bg_primary'], fg=THEME['text']).pack(pady=20)
+            grade = PagedTreeview(dialog, fonte, primeira, self._em_worker,
+                                  tamanho_pagina=self.TAMANHO_PAGINA, col_width=120)
+            grade.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+            tree = grade.tree
+
+            def do_action():
+                sel = tree.selection()
+                if not sel:
+                    messagebox.showwarning("Aviso", "Selecione um item!")
+                    return
+                item_id = tree.item(sel[0])['values'][0]
+                on_confirm(item_id, dialog)
+
+            btn_frame = tk.Frame(dialog, bg=THEME['bg_primary'])
+            btn_frame.pack(pady=20)
+            ModernButton(btn_frame, text=action_text, command=do_action, style='danger').pack(side='left', padx=5)
+            ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy, style='accent').pack(side='left', padx=5)
+
+        self._em_worker(lambda: fonte.primeira(self.TAMANHO_PAGINA), abrir)
 
     def _visualizar(self, query, title, empty_msg):
         """Define origem_consulta, executa query e mostra resultados ou mensagem vazia."""
         self.origem_consulta = 'corpo_dashboard'
-        columns, data = self.db.execute_query(query)
-        if columns and data:
-            self.show_results(columns, data, title)
-        else:
-            messagebox.showinfo("Info", empty_msg)
+        fonte = fonte_para_sql(self.db, query)
+
+        def exibir(primeira):
+            if primeira.linhas:
+                self.show_results(fonte, primeira, title)
+            else:
+                messagebox.showinfo("Info", empty_msg)
+
+        self._em_worker(lambda: fonte.primeira(self.TAMANHO_PAGINA), exibir)
 
     # Menu do dashboard por corpo: (texto_botao, comando, estilo, ícone opcional)
     _MENU_CORPO = {
         'diretivo': [
             ('📊 ANÁLISE DE DADOS', lambda s: s.show_dashboard(), 'accent'),
             ('💰 GERAR LANÇAMENTO', lambda s: s.gerar_lancamento_manual(), 'accent'),
+            ('📥 IMPORTAR LANÇAMENTOS (CSV)', lambda s: s.importar_lancamentos(), 'accent'),
+            ('✅ APROVAR LANÇAMENTOS', lambda s: s.aprovar_lancamentos(), 'success'),
         ],
         'esportivo': [
             ('👥 VISUALIZAR ELENCO', lambda s: s.visualizar_elenco(), 'accent'),
@@ -227,14 +703,18 @@ class ClubManagementApp:
 
     def show_login(self):
         """Tela de login moderna"""
-        self._clear_container()
-
         # Resetar variáveis ao fazer logout
         self.corpo_atual = None
         self.id_direcao_atual = None
         self.origem_consulta = None
 
-        frame = tk.Frame(self.container, bg=THEME['bg_primary'])
+        self._mostrar_tela('login', self._construir_login)
+        self.entry_user.delete(0, 'end')
+        self.entry_pass.delete(0, 'end')
+        self.entry_user.focus()
+
+    def _construir_login(self, tela):
+        frame = tk.Frame(tela, bg=THEME['bg_primary'])
         frame.place(relx=0.5, rely=0.5, anchor='center')
 
         # Logo/Título
@@ -290,7 +770,6 @@ class ClubManagementApp:
             style='accent'
         ).pack(fill='x', ipady=5)
 
-        self.entry_user.focus()
         self.entry_user.bind('<Return>', lambda e: self.entry_pass.focus())
         self.entry_pass.bind('<Return>', lambda e: self._validate_login())
 
@@ -315,9 +794,12 @@ class ClubManagementApp:
 
     def show_corpo_selection(self):
         """CORREÇÃO 3: Seleção simplificada - APENAS SENHA"""
-        self._clear_container()
+        self._mostrar_tela('corpo_selection', self._construir_corpo_selection)
+        self.entry_corpo_pass.delete(0, 'end')
+        self.entry_corpo_pass.focus()
 
-        frame = tk.Frame(self.container, bg=THEME['bg_primary'])
+    def _construir_corpo_selection(self, tela):
+        frame = tk.Frame(tela, bg=THEME['bg_primary'])
         frame.place(relx=0.5, rely=0.5, anchor='center')
 
         tk.Label(
@@ -367,7 +849,6 @@ class ClubManagementApp:
             fg=THEME['text_secondary']
         ).pack(pady=(20, 0))
 
-        self.entry_corpo_pass.focus()
         self.entry_corpo_pass.bind('<Return>', lambda e: self._validate_corpo())
 
     def _validate_corpo(self):
@@ -378,10 +859,7 @@ class ClubManagementApp:
         corpo_nome = SENHA_PARA_CORPO.get(senha)
 
         if corpo_nome:
-            corpo_info = CORPOS[corpo_nome]
-            self.corpo_atual = corpo_nome
-            self.id_direcao_atual = corpo_info['id_direcao']
-            self.show_corpo_dashboard()
+            self._entrar_corpo(corpo_nome)
         else:
             messagebox.showerror(
                 "Erro", 
@@ -394,16 +872,23 @@ class ClubManagementApp:
             self.entry_corpo_pass.delete(0, 'end')
             self.entry_corpo_pass.focus()
 
+    def _entrar_corpo(self, corpo_nome):
+        self.corpo_atual = corpo_nome
+        self.id_direcao_atual = CORPOS[corpo_nome]['id_direcao']
+        self.show_corpo_dashboard()
+
     # ==================== DASHBOARDS ====================
 
     def show_corpo_dashboard(self):
         """Dashboard específico de cada corpo"""
-        self._clear_container()
+        corpo = self.corpo_atual
+        self._mostrar_tela(('corpo', corpo), lambda tela: self._construir_corpo_dashboard(tela, corpo))
 
-        frame = tk.Frame(self.container, bg=THEME['bg_primary'])
+    def _construir_corpo_dashboard(self, tela, corpo):
+        frame = tk.Frame(tela, bg=THEME['bg_primary'])
         frame.place(relx=0.5, rely=0.5, anchor='center')
 
-        corpo_nome = CORPOS[self.corpo_atual]['nome']
+        corpo_nome = CORPOS[corpo]['nome']
 
         tk.Label(
             frame,
@@ -416,15 +901,16 @@ class ClubManagementApp:
         options_frame = tk.Frame(frame, bg=THEME['bg_primary'])
         options_frame.pack()
 
-        for text, cmd, style in self._MENU_CORPO.get(self.corpo_atual, []):
+        for text, cmd, style in self._MENU_CORPO.get(corpo, []):
             ModernButton(options_frame, text=text, command=lambda c=cmd: c(self), style=style, width=35).pack(pady=12)
         ModernButton(options_frame, text="🚪 SAIR", command=self.show_corpo_selection, style='danger', width=35).pack(pady=(30, 0))
 
     def show_dashboard(self):
         """Dashboard de consultas e views"""
-        self._clear_container()
+        self._mostrar_tela('dashboard', self._construir_dashboard)
 
-        frame = tk.Frame(self.container, bg=THEME['bg_primary'])
+    def _construir_dashboard(self, tela):
+        frame = tk.Frame(tela, bg=THEME['bg_primary'])
         frame.place(relx=0.5, rely=0.5, anchor='center')
 
         tk.Label(
@@ -454,6 +940,23 @@ class ClubManagementApp:
             width=30
         ).pack(pady=12)
 
+        ModernButton(
+            options_frame,
+            text="📦 PACOTE DE RELATÓRIOS",
+            command=self.gerar_pacote_relatorios,
+            style='success',
+            width=30
+        ).pack(pady=12)
+
+        if self.db.monitor is not None:
+            ModernButton(
+                options_frame,
+                text="📈 DESEMPENHO",
+                command=self.show_desempenho,
+                style='accent',
+                width=30
+            ).pack(pady=12)
+
         ModernButton(
             options_frame,
             text="⬅ VOLTAR",
@@ -462,23 +965,92 @@ class ClubManagementApp:
             width=30
         ).pack(pady=(30, 0))
 
+    def gerar_pacote_relatorios(self):
+        """Executa todas as consultas e views do catálogo em paralelo (src/relatorios.py) e mostra o tempo
+        de cada uma; com uma pasta escolhida, grava um CSV por resultado."""
+        pasta = filedialog.askdirectory(title="Pasta para salvar os resultados (Cancelar = apenas executar)")
+
+        def gerar():
+            # roda num worker: não toca em widgets
+            pacote = relatorios.gerar_pacote(self.db, relatorios.itens_do_catalogo(self.db))
+            if pasta:
+                relatorios.salvar_pacote(pacote, pasta)
+            return pacote
+
+        def exibir(pacote):
+            colunas = ['Catálogo', 'Id', 'Nome', 'Linhas', 'Tempo (ms)', 'Erro']
+            linhas = [(r['tabela'], r['id'], r['nome'], len(r['linhas'] or []), f"{r['segundos'] * 1000:.1f}",
+                       r['erro'] or '') for r in pacote['itens']]
+            fonte = FonteLista(colunas, linhas)
+            self.origem_consulta = None
+            self.show_results(
+                fonte, fonte.primeira(self.TAMANHO_PAGINA),
+                f"Pacote: {pacote['parede_s']:.1f}s em paralelo ({pacote['soma_itens_s']:.1f}s somando as consultas)"
+            )
+
+        self._em_worker(gerar, exibir)
+
+    def show_desempenho(self):
+        """p50/p95/p99 por consulta executada nesta sessão (MonitorConsultas), do maior tempo total ao menor."""
+        colunas = ['Consulta', 'Execuções', 'Total (s)', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)', 'Máx (ms)',
+                   'Linhas (média)', 'Origem']
+        linhas = [(r['digital'][:200], r['execucoes'], f"{r['total_s']:.3f}", f"{r['p50_ms']:.1f}",
+                   f"{r['p95_ms']:.1f}", f"{r['p99_ms']:.1f}", f"{r['max_ms']:.1f}", f"{r['linhas_media']:.1f}",
+                   ", ".join(r['origens']))
+                  for r in self.db.query_stats()]
+        fonte = FonteLista(colunas, linhas)
+        self.origem_consulta = None
+        self.show_results(fonte, fonte.primeira(self.TAMANHO_PAGINA), "Desempenho das Consultas")
+
     def _show_profile_data(self, view_name):
-        """Exibe dados diretos para perfis não-administrativos"""
+        """Exibe dados diretos para perfis não-administrativos.
+
+        Com snapshot local (src/snapshot.py) a grade abre sem ir ao banco; o token de mudança é conferido
+        em segundo plano e, se mudou, a view é consultada de novo e a grade é atualizada no lugar."""
         self.origem_consulta = 'profile'
-        query = f"SELECT * FROM {view_name};"
-        columns, data = self.db.execute_query(query)
+        title = f"Dados {'Privados' if 'privados' in view_name else 'Públicos'}"
+        local = self.snapshots.ler(view_name)
 
-        if columns and data:
-            title = f"Dados {'Privados' if 'privados' in view_name else 'Públicos'}"
-            self.show_results(columns, data, title)
-        else:
+        def fonte_de(colunas, linhas):
+            return FonteSnapshot(self.db, view_name, colunas, linhas, self.snapshots.limite)
+
+        def sem_dados():
             messagebox.showwarning("Aviso", "Nenhum dado disponível!")
             self.show_login()
 
+        if local is None:
+            def exibir(novo):
+                if not novo[1]:
+                    sem_dados()
+                    return
+                fonte = fonte_de(*novo[:2])
+                self.show_results(fonte, fonte.primeira(self.TAMANHO_PAGINA), title)
+
+            self._em_worker(lambda: self.snapshots.buscar(view_name), exibir)
+            return
+
+        colunas, linhas, token = local
+        fonte = fonte_de(colunas, linhas)
+        grade = self.show_results(fonte, fonte.primeira(self.TAMANHO_PAGINA), title)
+
+        def atualizar(novo):
+            if novo is None or grade.origem is not fonte:  # sem mudança, ou a grade já mostra outra consulta
+                return
+            if not novo[1]:
+                sem_dados()
+                return
+            nova = fonte_de(*novo[:2])
+            grade.recarregar(nova, nova.primeira(self.TAMANHO_PAGINA))
+
+        # snapshot desatualizado continua visível se a revalidação falhar
+        self._em_worker(lambda: self.snapshots.revalidar(view_name, token), atualizar, lambda e: None,
+                        widget=grade)
+
     # ==================== FUNCIONALIDADES CORPO DIRETIVO ====================
 
     def gerar_lancamento_manual(self):
         """Gera um lançamento manual"""
+        from . import servicos
         dialog = tk.Toplevel(self.root)
         dialog.title("Gerar Lançamento Manual")
         dialog.configure(bg=THEME['bg_secondary'])
@@ -527,56 +1099,77 @@ class ClubManagementApp:
         campos['descricao'].pack(fill='x')
 
         def salvar():
-            try:
-                valor = float(campos['valor'].get())
-                tipo = campos['tipo'].get()
-                id_conta = int(campos['conta'].get())
-                descricao = campos['descricao'].get('1.0', 'end').strip()
-
-                query = """
-                INSERT INTO lancamento (valor, tipo_de_movimentacao, status_aprovacao,
-                                      id_direcao, id_conta, descricao, origem, id_aprovador, data_aprovacao)
-                VALUES (%s, %s, 'aprovado', %s, %s, %s, 'manual', 1, NOW());
-                """
-
-                self.db.execute_query(query, (valor, tipo, self.id_direcao_atual,
-                                             id_conta, descricao))
-
-                dialog.destroy()
-            except ValueError:
-                messagebox.showerror("Erro", "Valores inválidos!")
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao criar lançamento: {e}")
+            args = (self.db, campos['valor'].get(), campos['tipo'].get(), campos['conta'].get(),
+                    campos['descricao'].get('1.0', 'end'), self.id_direcao_atual)
+            self._gravar(lambda: servicos.criar_lancamento_manual(*args), dialog,
+                         "Erro ao criar lançamento: ", botao=btn_salvar)
 
         btn_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         btn_frame.pack(pady=20)
 
-        ModernButton(btn_frame, text="SALVAR", command=salvar,
-                    style='success').pack(side='left', padx=5)
+        btn_salvar = ModernButton(btn_frame, text="SALVAR", command=salvar, style='success')
+        btn_salvar.pack(side='left', padx=5)
         ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy,
                     style='danger').pack(side='left', padx=5)
 
+    def importar_lancamentos(self):
+        """Importa lançamentos manuais aprovados de um CSV (valor, tipo, conta, descricao, data opcional)."""
+        from . import servicos
+        arquivo = filedialog.askopenfilename(title="Importar lançamentos",
+                                             filetypes=[('CSV', '*.csv'), ('Todos', '*.*')])
+        if not arquivo:
+            return
+        id_direcao = self.id_direcao_atual
+
+        def concluido(r):
+            if r['estouros']:
+                linhas = "\n".join(
+                    f"linha {n}: saída de R$ {valor:,.2f} com saldo de R$ {antes:,.2f}"
+                    for n, valor, antes, _ in r['estouros'][:15]
+                )
+                mais = f"\n... e mais {len(r['estouros']) - 15}" if len(r['estouros']) > 15 else ""
+                messagebox.showerror(
+                    "Saldo insuficiente",
+                    f"Nada foi importado. {len(r['estouros'])} saída(s) deixariam o caixa negativo:\n{linhas}{mais}"
+                )
+                return
+            texto = f"{r['importados']} lançamento(s) importado(s) em {r['segundos']:.1f}s."
+            if r['rejeitadas']:
+                rejeitadas = "\n".join(f"linha {n}: {motivo}" for n, motivo in r['rejeitadas'][:15])
+                mais = f"\n... e mais {len(r['rejeitadas']) - 15}" if len(r['rejeitadas']) > 15 else ""
+                texto += f"\n\n{len(r['rejeitadas'])} linha(s) rejeitada(s):\n{rejeitadas}{mais}"
+            messagebox.showinfo("Importação", texto)
+
+        def falhou(e):
+            messagebox.showerror("Erro", f"Erro ao importar:\n{str(e)[:200]}")
+
+        self._em_worker(lambda: servicos.importar_lancamentos(self.db, arquivo, id_direcao),
+                        concluido, falhou, widget=self.root)
+
     def aprovar_lancamentos(self):
-        """Aprova lançamentos pendentes"""
+        """Aprova lançamentos pendentes (seleção múltipla, aprovados em lote)"""
         query = """
         SELECT l.id_lancamento, l.data_registro, l.valor, l.tipo_de_movimentacao,
                l.descricao, d.nome as responsavel
         FROM lancamento l
         JOIN direcao d ON l.id_direcao = d.id_direcao
         WHERE l.status_aprovacao = 'pendente'
-        ORDER BY l.data_registro;
+        ORDER BY l.data_registro, l.id_lancamento;
         """
 
-        columns, data = self.db.execute_query(query)
-
-        if not data:
-            messagebox.showinfo("Info", "Não há lançamentos pendentes!")
-            return
+        def exibir(resultado):
+            columns, data = resultado
+            if not data:
+                messagebox.showinfo("Info", "Não há lançamentos pendentes!")
+                return
+            self._show_approval_dialog("Aprovar Lançamentos", columns, data)
 
-        self._show_approval_dialog("Aprovar Lançamentos", columns, data)
+        self._aguardar(self.db.submit(self.db.run_query, query, None, False), exibir)
 
     def _show_approval_dialog(self, title, columns, data):
-        """Dialog para aprovação de lançamentos"""
+        """Dialog para aprovação de lançamentos: aprova todos os selecionados numa única transação
+        (sp_aprovar_lancamentos_lote) ou destaca as saídas que estourariam o caixa."""
+        from . import servicos
         dialog = tk.Toplevel(self.root)
         dialog.title(title)
         dialog.configure(bg=THEME['bg_primary'])
@@ -591,6 +1184,16 @@ class ClubManagementApp:
             fg=THEME['text']
         ).pack(pady=20)
 
+        tk.Label(
+            dialog,
+            text="Selecione um ou mais lançamentos (Ctrl/Shift + clique). O lote é aprovado inteiro ou nada.",
+            font=('Segoe UI', 10),
+            bg=THEME['bg_primary'],
+            fg=THEME['text_secondary']
+        ).pack(pady=(0, 10))
+
+        barra = BarraBusca(dialog, None, bg=THEME['bg_primary'])
+        barra.pack(fill='x', padx=20, pady=(0, 6))
         tree_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         tree_frame.pack(fill='both', expand=True, padx=20, pady=(0, 20))
 
@@ -599,6 +1202,7 @@ class ClubManagementApp:
             tree_frame,
             columns=columns,
             show='headings',
+            selectmode='extended',
             yscrollcommand=scroll_y.set,
             style='Modern.Treeview'
         )
@@ -611,28 +1215,50 @@ class ClubManagementApp:
             tree.heading(col, text=col)
             tree.column(col, width=120, anchor='center')
 
+        tree.tag_configure('estouro', background=THEME['danger'], foreground='white')
         for row in data:
-            tree.insert('', 'end', values=row)
+            tree.insert('', 'end', iid=str(row[0]), values=row)
+        OrdenacaoArvore(tree, barra).atualizar()
 
-        def aprovar_selecionado():
+        def aprovar_selecionados():
             selection = tree.selection()
             if not selection:
-                messagebox.showwarning("Aviso", "Selecione um lançamento!")
+                messagebox.showwarning("Aviso", "Selecione ao menos um lançamento!")
                 return
 
-            item = tree.item(selection[0])
-            id_lanc = item['values'][0]
-
-            query = "UPDATE lancamento SET status_aprovacao = 'aprovado', id_aprovador = %s, data_aprovacao = NOW() WHERE id_lancamento = %s"
-            self.db.execute_query(query, (self.id_direcao_atual, id_lanc))
+            ids = [int(iid) for iid in selection]
+            for iid in tree.get_children():
+                tree.item(iid, tags=())
+
+            def concluido(resultado):
+                aprovados, estouros = resultado
+                if estouros:
+                    for row in estouros:
+                        tree.item(str(row[0]), tags=('estouro',))
+                    linhas = "\n".join(
+                        f"#{row[0]}: saída de R$ {row[2]:,.2f} com saldo de R$ {row[3]:,.2f}" for row in estouros[:15]
+                    )
+                    mais = f"\n... e mais {len(estouros) - 15}" if len(estouros) > 15 else ""
+                    messagebox.showerror(
+                        "Saldo insuficiente",
+                        f"Nenhum lançamento foi aprovado. {len(estouros)} saída(s) deixariam o caixa negativo:\n{linhas}{mais}"
+                    )
+                    return
+                messagebox.showinfo("Sucesso", f"{aprovados} lançamento(s) aprovado(s).")
+                dialog.destroy()
 
-            dialog.destroy()
+            self._aguardar(
+                self.db.submit(servicos.aprovar_lancamentos, self.db, ids, self.id_direcao_atual),
+                concluido, widget=dialog
+            )
 
         btn_frame = tk.Frame(dialog, bg=THEME['bg_primary'])
         btn_frame.pack(pady=20)
 
-        ModernButton(btn_frame, text="APROVAR", command=aprovar_selecionado,
+        ModernButton(btn_frame, text="APROVAR SELECIONADOS", command=aprovar_selecionados,
                     style='success').pack(side='left', padx=5)
+        ModernButton(btn_frame, text="SELECIONAR TODOS", command=lambda: tree.selection_set(tree.get_children()),
+                    style='accent').pack(side='left', padx=5)
         ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy,
                     style='danger').pack(side='left', padx=5)
 
@@ -640,6 +1266,7 @@ class ClubManagementApp:
 
     def adicionar_jogador(self):
         """Adiciona um novo jogador ao elenco"""
+        from . import servicos
         dialog = tk.Toplevel(self.root)
         dialog.title("Adicionar Jogador")
         dialog.configure(bg=THEME['bg_secondary'])
@@ -704,59 +1331,85 @@ class ClubManagementApp:
 
         def salvar():
             try:
-                # Converter datas de DD/MM/AAAA para AAAA-MM-DD
-                data_inicio_br = campos['inicio'].get()
-                data_fim_br = campos['fim'].get()
-                
-                dia_i, mes_i, ano_i = data_inicio_br.split('/')
-                data_inicio = f"{ano_i}-{mes_i}-{dia_i}"
-                
-                dia_f, mes_f, ano_f = data_fim_br.split('/')
-                data_fim = f"{ano_f}-{mes_f}-{dia_f}"
-                
-                query = """
-                INSERT INTO elenco (nome_jogador, funcao, multa, luvas,
-                                   inicio_contrato, fim_contrato, passe_data_contrato, id_direcao)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
-                """
-
-                valores = (
-                    campos['nome'].get(),
-                    campos['funcao'].get(),
-                    float(campos['multa'].get()),
-                    float(campos['luvas'].get()),
-                    data_inicio,
-                    data_fim,
-                    data_inicio,
-                    self.id_direcao_atual
-                )
-
-                self.db.execute_query(query, valores)
-                dialog.destroy()
-            except ValueError as ve:
-                messagebox.showerror("Erro", "Data inválida! Use o formato DD/MM/AAAA")
-            except Exception as e:
+                args = (self.db, campos['nome'].get(), campos['funcao'].get(),
+                        campos['multa'].get(), campos['luvas'].get(),
+                        servicos.data_br(campos['inicio'].get(), 'início do contrato'),
+                        servicos.data_br(campos['fim'].get(), 'fim do contrato'),
+                        self.id_direcao_atual)
+            except ErroSistema as e:
                 messagebox.showerror("Erro", f"Erro ao adicionar jogador: {e}")
+                return
+            self._gravar(lambda: servicos.adicionar_jogador(*args), dialog,
+                         "Erro ao adicionar jogador: ", botao=btn_salvar)
 
         btn_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         btn_frame.pack(pady=20)
 
-        ModernButton(btn_frame, text="SALVAR", command=salvar, style='success').pack(side='left', padx=5)
+        btn_salvar = ModernButton(btn_frame, text="SALVAR", command=salvar, style='success')
+        btn_salvar.pack(side='left', padx=5)
         ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy, style='danger').pack(side='left', padx=5)
 
+    def _mostrar_totais_folha(self, editor, label):
+        """Totais correntes do editor de folha e a utilização do orçamento do mês (cor de alerta a
+        partir de ALERTA_PERCENTUAL, vermelho se a aprovação seria recusada)."""
+        partes = [f"Bruto: R$ {formatar(editor.bruto)}", f"Líquido: R$ {formatar(editor.liquido)}"]
+        if editor.tipo == 'elenco':
+            partes.append(f"Direitos de imagem: R$ {formatar(editor.direitos)}")
+        uso = editor.utilizacao()
+        if uso is not None:
+            partes.append(f"Orçamento do mês: {uso:.1f}% (disponível R$ {formatar(editor.disponivel())})")
+        problemas = editor.problemas()
+        if problemas:
+            cor = THEME['danger']
+        elif uso is not None and uso >= ALERTA_PERCENTUAL:
+            cor = THEME['warning']
+        else:
+            cor = THEME['success']
+        texto = "   ·   ".join(partes) + (f"\nA aprovação seria recusada: {'; '.join(problemas)}" if problemas else "")
+        label.config(text=texto, fg=cor)
+
+    def _acompanhar_orcamento_folha(self, editor, data_comp, dialog, ao_atualizar):
+        """Lê (num worker) o orçamento do mês da competência digitada e relê ao mudar a competência."""
+        from . import servicos
+        id_direcao = self.id_direcao_atual
+        pedida = [None]
+
+        def carregar(_=None):
+            try:
+                competencia = servicos.data_br(data_comp.get(), 'competência')
+            except ErroSistema:
+                return
+            if competencia == pedida[0]:
+                return
+            pedida[0] = competencia
+
+            def pronto(resultado):
+                if pedida[0] == competencia:
+                    editor.definir_orcamento(*resultado)
+                    ao_atualizar()
+
+            self._aguardar(self.db.submit(servicos.orcamento_folha, self.db, editor.tipo, id_direcao, competencia),
+                           pronto, lambda e: None, widget=dialog)
+
+        data_comp.bind('<FocusOut>', carregar, add='+')
+        data_comp.bind('<Return>', carregar, add='+')
+        carregar()
+
     def gerar_folha_elenco(self):
         """Gera folha: lista todos os jogadores; ao clicar pode adicionar bônus, direitos de imagem, parcela das luvas e descontos; gera com salário base + valores informados."""
-        cols, rows = self.db.execute_query("""
-            SELECT e.id_elenco, e.nome_jogador, e.funcao,
-                COALESCE((SELECT ife.salario_base FROM item_folha_e ife WHERE ife.id_elenco = e.id_elenco ORDER BY ife.id_folha_elenco DESC LIMIT 1), 0) AS salario_base
-            FROM elenco e
-            WHERE e.id_direcao = %s AND e.fim_contrato >= CURDATE()
-            ORDER BY e.id_elenco
-        """, (self.id_direcao_atual,))
+        from . import servicos
+        id_direcao = self.id_direcao_atual
+        self._em_worker(lambda: servicos.jogadores_para_folha(self.db, id_direcao), self._editar_folha_elenco,
+                        lambda e: messagebox.showerror("Erro", str(e)))
+
+    def _editar_folha_elenco(self, rows):
+        """Dialog de edição da folha de elenco sobre os atletas lidos por gerar_folha_elenco."""
+        from . import servicos
         if not rows:
             messagebox.showinfo("Info", "Não há jogadores com contrato ativo!")
             return
-        itens = {r[0]: {'salario_base': float(r[3]), 'bonus': 0.0, 'direito_imagem': 0.0, 'parcela_luvas': 0.0, 'descontos': 0.0} for r in rows}
+        editor = EditorFolha('elenco', rows)
+        por_id = {r['id_elenco']: r for r in rows}
 
         dialog = tk.Toplevel(self.root)
         dialog.title("Gerar Folha de Elenco")
@@ -781,6 +1434,8 @@ class ClubManagementApp:
         data_pag.pack(side='left', ipady=6)
         data_pag.insert(0, date.today().strftime('%d/%m/%Y'))
 
+        barra = BarraBusca(dialog, None)
+        barra.pack(fill='x', padx=20, pady=(10, 0))
         list_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         list_frame.pack(fill='both', expand=True, padx=20, pady=10)
         scroll_y = ttk.Scrollbar(list_frame, orient='vertical')
@@ -797,17 +1452,17 @@ class ClubManagementApp:
             tree.heading(c, text=c)
             tree.column(c, width=95, anchor='center')
         tree.column('nome_jogador', width=140)
+        ordenacao = OrdenacaoArvore(tree, barra)
+
+        def valores_linha(id_e):
+            r = por_id[id_e]
+            return (id_e, r['nome_jogador'], r['funcao']) + editor.linha(id_e)
 
         def refresh_tree():
-            tree.delete(*tree.get_children())
+            ordenacao.limpar()
             for r in rows:
-                id_e = r[0]
-                v = itens[id_e]
-                tree.insert('', 'end', values=(
-                    id_e, r[1], r[2],
-                    f"{v['salario_base']:.2f}", f"{v['bonus']:.2f}", f"{v['direito_imagem']:.2f}",
-                    f"{v['parcela_luvas']:.2f}", f"{v['descontos']:.2f}"
-                ), iid=str(id_e))
+                tree.insert('', 'end', values=valores_linha(r['id_elenco']), iid=str(r['id_elenco']))
+            ordenacao.atualizar()
 
         def editar_item():
             sel = tree.selection()
@@ -815,9 +1470,8 @@ class ClubManagementApp:
                 messagebox.showwarning("Aviso", "Selecione um jogador na lista.")
                 return
             id_e = int(sel[0])
-            v = itens[id_e]
-            row_e = next((r for r in rows if r[0] == id_e), None)
-            nome_txt = row_e[1] if row_e else ""
+            v = dict(zip(editor.campos, editor.linha(id_e)))
+            nome_txt = por_id[id_e]['nome_jogador']
             pop = tk.Toplevel(dialog)
             pop.title("Valores da folha")
             pop.configure(bg=THEME['bg_secondary'])
@@ -847,15 +1501,17 @@ class ClubManagementApp:
             e_descontos.insert(0, str(v['descontos']))
             def ok():
                 try:
-                    itens[id_e]['salario_base'] = float(e_sal.get() or 0)
-                    itens[id_e]['bonus'] = float(e_bonus.get() or 0)
-                    itens[id_e]['direito_imagem'] = float(e_di.get() or 0)
-                    itens[id_e]['parcela_luvas'] = float(e_luvas.get() or 0)
-                    itens[id_e]['descontos'] = float(e_descontos.get() or 0)
-                    refresh_tree()
-                    pop.destroy()
-                except ValueError:
-                    messagebox.showerror("Erro", "Use números válidos.")
+                    editor.editar(id_e, {'salario_base': e_sal.get(), 'bonus': e_bonus.get(),
+                                         'direito_imagem': e_di.get(), 'parcela_luvas': e_luvas.get(),
+                                         'descontos': e_descontos.get()})
+                except ErroSistema as e:
+                    messagebox.showerror("Erro", str(e))
+                    return
+                # só a linha editada muda na árvore; os totais já foram atualizados pelo editor
+                tree.item(str(id_e), values=valores_linha(id_e))
+                ordenacao.alterada()
+                mostrar_totais()
+                pop.destroy()
             tk.Frame(pop, bg=THEME['bg_secondary']).pack(fill='x', pady=12)
             ModernButton(pop, text="OK", command=ok, style='success').pack(side='left', padx=20)
             ModernButton(pop, text="Cancelar", command=pop.destroy, style='danger').pack(side='left')
@@ -863,80 +1519,66 @@ class ClubManagementApp:
         tree.bind('<Double-1>', lambda e: editar_item())
 
         def gerar():
-            data_comp_sql = self._parse_date_br(data_comp.get())
-            data_pag_sql = self._parse_date_br(data_pag.get())
-            if not data_comp_sql or not data_pag_sql:
-                messagebox.showerror("Erro", "Datas inválidas. Use DD/MM/AAAA.")
-                return
-            valor_direitos_folha = sum(v['direito_imagem'] for v in itens.values())
             try:
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    try:
-                        cursor.execute("""
-                            INSERT INTO folha_elenco (data_competencia, data_pagamento, valor_direitos_imagem, status, id_direcao)
-                            VALUES (%s, %s, %s, 'pendente', %s)
-                        """, (data_comp_sql, data_pag_sql, valor_direitos_folha, self.id_direcao_atual))
-                        id_folha = cursor.lastrowid
-                        for id_e, v in itens.items():
-                            cursor.execute("""
-                                INSERT INTO item_folha_e (salario_base, bonus, direito_imagem, parcela_luvas, descontos, id_folha_elenco, id_elenco)
-                                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                            """, (v['salario_base'], v['bonus'], v['direito_imagem'], v['parcela_luvas'], v['descontos'], id_folha, id_e))
-                        cursor.execute("CALL sp_aprovar_folha_elenco(%s, %s, %s)", (id_folha, 1, 8))
-                        conn.commit()
-                        cursor.close()
-                        total = sum(v['salario_base'] + v['bonus'] + v['direito_imagem'] + v['parcela_luvas'] - v['descontos'] for v in itens.values())
-                        messagebox.showinfo("Sucesso", f"Folha de elenco gerada e aprovada.\n{len(itens)} jogadores. Total líquido estimado: R$ {total:,.2f}")
-                        dialog.destroy()
-                    except Error as e:
-                        conn.rollback()
-                        cursor.close()
-                        messagebox.showerror("Erro", str(e))
-            except Exception as e:
+                data_comp_sql = servicos.data_br(data_comp.get(), 'competência')
+                data_pag_sql = servicos.data_br(data_pag.get(), 'pagamento')
+            except ErroSistema as e:
+                messagebox.showerror("Erro", str(e))
+                return
+            id_direcao = self.id_direcao_atual
+            valores = editor.valores()
+            total = editor.liquido
+
+            def gravar():
+                # roda num worker: não toca em widgets
+                return servicos.gerar_folha_elenco(self.db, id_direcao, data_comp_sql, data_pag_sql, valores)
+
+            def concluido(_):
+                messagebox.showinfo("Sucesso", f"Folha de elenco gerada e aprovada.\n{len(valores)} jogadores. Total líquido: R$ {formatar(total)}")
+                dialog.destroy()
+
+            def falhou(e):
+                btn_gerar.config(state='normal')
                 messagebox.showerror("Erro", str(e))
 
+            btn_gerar.config(state='disabled')
+            self._aguardar(self.db.submit(gravar), concluido, falhou, widget=dialog)
+
         refresh_tree()
+        totais = tk.Label(dialog, font=('Segoe UI', 10, 'bold'), bg=THEME['bg_secondary'], justify='left')
+        totais.pack(fill='x', padx=20)
+
+        def mostrar_totais():
+            self._mostrar_totais_folha(editor, totais)
+
+        mostrar_totais()
+        self._acompanhar_orcamento_folha(editor, data_comp, dialog, mostrar_totais)
         btn_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         btn_frame.pack(pady=15)
         ModernButton(btn_frame, text="EDITAR ITEM (duplo clique)", command=editar_item, style='accent').pack(side='left', padx=5)
-        ModernButton(btn_frame, text="GERAR FOLHA", command=gerar, style='success').pack(side='left', padx=5)
+        btn_gerar = ModernButton(btn_frame, text="GERAR FOLHA", command=gerar, style='success')
+        btn_gerar.pack(side='left', padx=5)
         ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy, style='danger').pack(side='left', padx=5)
 
     def encerrar_contrato_jogador(self):
         """Encerra contrato: remove atleta e seus dados do banco (item_folha_e, elenco)."""
-        columns, data = self.db.execute_query("""
+        from . import servicos
+        fonte = FonteConsulta(self.db, """
             SELECT id_elenco, nome_jogador, funcao,
                    DATE_FORMAT(fim_contrato, '%d/%m/%Y') as fim_contrato
-            FROM elenco WHERE fim_contrato >= CURDATE() ORDER BY nome_jogador
+            FROM elenco WHERE fim_contrato >= CURDATE() ORDER BY nome_jogador, id_elenco
         """)
-        if not data:
-            messagebox.showinfo("Info", "Não há jogadores com contratos ativos!")
-            return
 
         def on_confirm(item_id, dialog):
             if not messagebox.askyesno("Confirmação", "Remover este atleta e seus dados do banco?"):
                 return
-            try:
-                with self.db.get_connection() as conn:
-                    cur = conn.cursor()
-                    try:
-                        cur.execute("DELETE FROM item_folha_e WHERE id_elenco = %s", (item_id,))
-                        cur.execute("DELETE FROM elenco WHERE id_elenco = %s", (item_id,))
-                        conn.commit()
-                        cur.close()
-                        messagebox.showinfo("Sucesso", "Contrato encerrado e dados do atleta removidos.")
-                        dialog.destroy()
-                    except Error as e:
-                        conn.rollback()
-                        cur.close()
-                        messagebox.showerror("Erro", str(e))
-            except Exception as e:
-                messagebox.showerror("Erro", str(e))
+            self._gravar(lambda: servicos.encerrar_contrato_jogador(self.db, item_id), dialog, "",
+                         "Contrato encerrado e dados do atleta removidos.")
 
         self._tree_selection_dialog(
             "Encerrar Contrato (atleta e dados serão removidos do banco)",
-            columns, data, "ENCERRAR CONTRATO", on_confirm
+            fonte, "ENCERRAR CONTRATO", on_confirm,
+            empty_msg="Não há jogadores com contratos ativos!"
         )
 
     def visualizar_elenco(self):
@@ -947,6 +1589,7 @@ class ClubManagementApp:
 
     def contratar_funcionario(self):
         """Contrata um novo funcionário"""
+        from . import servicos
         dialog = tk.Toplevel(self.root)
         dialog.title("Contratar Funcionário")
         dialog.configure(bg=THEME['bg_secondary'])
@@ -1000,57 +1643,33 @@ class ClubManagementApp:
         campos['tipo'].current(0)
 
         def salvar():
-            try:
-                # Usar uma única conexão para INSERT em funcionarios e contratado (evita FK: LAST_INSERT_ID em outra conexão seria 0)
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    try:
-                        cursor.execute("""
-                            INSERT INTO funcionarios (id_contrato, salario, cargo, setor, tipo_funcionario, id_direcao)
-                            VALUES (%s, %s, %s, %s, %s, %s)
-                        """, (
-                            campos['id_contrato'].get(),
-                            float(campos['salario'].get()),
-                            campos['cargo'].get(),
-                            campos['setor'].get(),
-                            campos['tipo'].get(),
-                            self.id_direcao_atual
-                        ))
-                        id_func = cursor.lastrowid
-                        if campos['tipo'].get() == 'contratado':
-                            data_adm = datetime.now().strftime('%Y-%m-%d')
-                            cursor.execute(
-                                "INSERT INTO contratado (id_funcionario, data_admissao) VALUES (%s, %s)",
-                                (id_func, data_adm)
-                            )
-                        conn.commit()
-                        cursor.close()
-                        dialog.destroy()
-                    except Error as e:
-                        conn.rollback()
-                        cursor.close()
-                        messagebox.showerror("Erro", f"Erro ao contratar funcionário:\n{str(e)}")
-                        return
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao contratar funcionário: {e}")
+            args = (self.db, campos['id_contrato'].get(), campos['salario'].get(), campos['cargo'].get(),
+                    campos['setor'].get(), campos['tipo'].get(), self.id_direcao_atual)
+            self._gravar(lambda: servicos.contratar_funcionario(*args), dialog,
+                         "Erro ao contratar funcionário:\n", botao=btn_salvar)
 
         btn_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         btn_frame.pack(pady=20)
 
-        ModernButton(btn_frame, text="SALVAR", command=salvar, style='success').pack(side='left', padx=5)
+        btn_salvar = ModernButton(btn_frame, text="SALVAR", command=salvar, style='success')
+        btn_salvar.pack(side='left', padx=5)
         ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy, style='danger').pack(side='left', padx=5)
 
     def gerar_folha_funcionarios(self):
         """Gera folha: lista todos os funcionários; ao clicar pode adicionar bônus, descontos e adicionais; gera com salário base + valores informados."""
-        cols, rows = self.db.execute_query("""
-            SELECT id_funcionario, id_contrato, cargo, setor, salario
-            FROM funcionarios WHERE id_direcao = %s ORDER BY id_funcionario
-        """, (self.id_direcao_atual,))
+        from . import servicos
+        id_direcao = self.id_direcao_atual
+        self._em_worker(lambda: servicos.funcionarios_para_folha(self.db, id_direcao), self._editar_folha_funcionarios,
+                        lambda e: messagebox.showerror("Erro", str(e)))
+
+    def _editar_folha_funcionarios(self, rows):
+        """Dialog de edição da folha de funcionários sobre os funcionários lidos por gerar_folha_funcionarios."""
+        from . import servicos
         if not rows:
             messagebox.showinfo("Info", "Não há funcionários cadastrados!")
             return
-        # itens[id_func] = {salario_base, bonus, descontos, adicionais}
-        itens = {r[0]: {'salario_base': float(r[4]), 'bonus': 0.0, 'descontos': 0.0, 'adicionais': 0.0} for r in rows}
+        editor = EditorFolha('funcionarios', rows)
+        por_id = {r['id_funcionario']: r for r in rows}
 
         dialog = tk.Toplevel(self.root)
         dialog.title("Gerar Folha de Funcionários")
@@ -1075,6 +1694,8 @@ class ClubManagementApp:
         data_pag.pack(side='left', ipady=6)
         data_pag.insert(0, date.today().strftime('%d/%m/%Y'))
 
+        barra = BarraBusca(dialog, None)
+        barra.pack(fill='x', padx=20, pady=(10, 0))
         list_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         list_frame.pack(fill='both', expand=True, padx=20, pady=10)
         scroll_y = ttk.Scrollbar(list_frame, orient='vertical')
@@ -1092,16 +1713,17 @@ class ClubManagementApp:
             tree.column(c, width=90, anchor='center')
         tree.column('cargo', width=120)
         tree.column('setor', width=100)
+        ordenacao = OrdenacaoArvore(tree, barra)
+
+        def valores_linha(id_f):
+            r = por_id[id_f]
+            return (id_f, r['id_contrato'], r['cargo'], r['setor']) + editor.linha(id_f)
 
         def refresh_tree():
-            tree.delete(*tree.get_children())
+            ordenacao.limpar()
             for r in rows:
-                id_f = r[0]
-                v = itens[id_f]
-                tree.insert('', 'end', values=(
-                    id_f, r[1], r[2], r[3],
-                    f"{v['salario_base']:.2f}", f"{v['bonus']:.2f}", f"{v['descontos']:.2f}", f"{v['adicionais']:.2f}"
-                ), iid=str(id_f))
+                tree.insert('', 'end', values=valores_linha(r['id_funcionario']), iid=str(r['id_funcionario']))
+            ordenacao.atualizar()
 
         def editar_item():
             sel = tree.selection()
@@ -1109,9 +1731,8 @@ class ClubManagementApp:
                 messagebox.showwarning("Aviso", "Selecione um funcionário na lista.")
                 return
             id_f = int(sel[0])
-            v = itens[id_f]
-            row_f = next((r for r in rows if r[0] == id_f), None)
-            cargo_txt = row_f[2] if row_f else ""
+            v = dict(zip(editor.campos, editor.linha(id_f)))
+            cargo_txt = por_id[id_f]['cargo']
             pop = tk.Toplevel(dialog)
             pop.title("Bônus, descontos e adicionais")
             pop.configure(bg=THEME['bg_secondary'])
@@ -1133,13 +1754,15 @@ class ClubManagementApp:
             e_adicionais.insert(0, str(v['adicionais']))
             def ok():
                 try:
-                    itens[id_f]['bonus'] = float(e_bonus.get() or 0)
-                    itens[id_f]['descontos'] = float(e_descontos.get() or 0)
-                    itens[id_f]['adicionais'] = float(e_adicionais.get() or 0)
-                    refresh_tree()
-                    pop.destroy()
-                except ValueError:
-                    messagebox.showerror("Erro", "Use números válidos.")
+                    editor.editar(id_f, {'bonus': e_bonus.get(), 'descontos': e_descontos.get(),
+                                         'adicionais': e_adicionais.get()})
+                except ErroSistema as e:
+                    messagebox.showerror("Erro", str(e))
+                    return
+                tree.item(str(id_f), values=valores_linha(id_f))
+                ordenacao.alterada()
+                mostrar_totais()
+                pop.destroy()
             tk.Frame(pop, bg=THEME['bg_secondary']).pack(fill='x', pady=15)
             ModernButton(pop, text="OK", command=ok, style='success').pack(side='left', padx=20)
             ModernButton(pop, text="Cancelar", command=pop.destroy, style='danger').pack(side='left')
@@ -1147,47 +1770,50 @@ class ClubManagementApp:
         tree.bind('<Double-1>', lambda e: editar_item())
 
         def gerar():
-            data_comp_sql = self._parse_date_br(data_comp.get())
-            data_pag_sql = self._parse_date_br(data_pag.get())
-            if not data_comp_sql or not data_pag_sql:
-                messagebox.showerror("Erro", "Datas inválidas. Use DD/MM/AAAA.")
-                return
             try:
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    try:
-                        cursor.execute("""
-                            INSERT INTO folha_funcionarios (data_competencia, data_pagamento, status, id_direcao)
-                            VALUES (%s, %s, 'pendente', %s)
-                        """, (data_comp_sql, data_pag_sql, self.id_direcao_atual))
-                        id_folha = cursor.lastrowid
-                        for id_f, v in itens.items():
-                            cursor.execute("""
-                                INSERT INTO item_folha_f (salario_base, bonus, descontos, adicionais, id_folha_funcionarios, id_funcionario)
-                                VALUES (%s, %s, %s, %s, %s, %s)
-                            """, (v['salario_base'], v['bonus'], v['descontos'], v['adicionais'], id_folha, id_f))
-                        cursor.execute("CALL sp_aprovar_folha_funcionarios(%s, %s, %s)", (id_folha, 1, 9))
-                        conn.commit()
-                        cursor.close()
-                        total = sum(v['salario_base'] + v['bonus'] + v['adicionais'] - v['descontos'] for v in itens.values())
-                        messagebox.showinfo("Sucesso", f"Folha de funcionários gerada e aprovada.\n{len(itens)} funcionários. Total líquido estimado: R$ {total:,.2f}")
-                        dialog.destroy()
-                    except Error as e:
-                        conn.rollback()
-                        cursor.close()
-                        messagebox.showerror("Erro", str(e))
-            except Exception as e:
+                data_comp_sql = servicos.data_br(data_comp.get(), 'competência')
+                data_pag_sql = servicos.data_br(data_pag.get(), 'pagamento')
+            except ErroSistema as e:
                 messagebox.showerror("Erro", str(e))
+                return
+            id_direcao = self.id_direcao_atual
+            valores = editor.valores()
+            total = editor.liquido
+
+            def gravar():
+                # roda num worker: não toca em widgets
+                return servicos.gerar_folha_funcionarios(self.db, id_direcao, data_comp_sql, data_pag_sql, valores)
+
+            def concluido(_):
+                messagebox.showinfo("Sucesso", f"Folha de funcionários gerada e aprovada.\n{len(valores)} funcionários. Total líquido: R$ {formatar(total)}")
+                dialog.destroy()
+
+            def falhou(e):
+                btn_gerar.config(state='normal')
+                messagebox.showerror("Erro", str(e))
+
+            btn_gerar.config(state='disabled')
+            self._aguardar(self.db.submit(gravar), concluido, falhou, widget=dialog)
 
         refresh_tree()
+        totais = tk.Label(dialog, font=('Segoe UI', 10, 'bold'), bg=THEME['bg_secondary'], justify='left')
+        totais.pack(fill='x', padx=20)
+
+        def mostrar_totais():
+            self._mostrar_totais_folha(editor, totais)
+
+        mostrar_totais()
+        self._acompanhar_orcamento_folha(editor, data_comp, dialog, mostrar_totais)
         btn_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         btn_frame.pack(pady=15)
         ModernButton(btn_frame, text="EDITAR ITEM (duplo clique)", command=editar_item, style='accent').pack(side='left', padx=5)
-        ModernButton(btn_frame, text="GERAR FOLHA", command=gerar, style='success').pack(side='left', padx=5)
+        btn_gerar = ModernButton(btn_frame, text="GERAR FOLHA", command=gerar, style='success')
+        btn_gerar.pack(side='left', padx=5)
         ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy, style='danger').pack(side='left', padx=5)
 
     def adicionar_bem(self):
         """Adiciona um novo bem patrimonial com aprovação automática"""
+        from . import servicos
         dialog = tk.Toplevel(self.root)
         dialog.title("Adicionar Bem Patrimonial")
         dialog.configure(bg=THEME['bg_secondary'])
@@ -1305,118 +1931,70 @@ class ClubManagementApp:
         atualizar_campos_especificos()
 
         def salvar():
+            tipo = campos['tipo'].get()
+            if tipo == 'imovel':
+                detalhes = {'endereco': campos['endereco'].get(), 'area': campos['area'].get(),
+                            'tipo_propriedade': campos['tipo_prop'].get(),
+                            'depreciacao_ano': campos['depreciacao_imovel'].get()}
+            elif tipo == 'automovel':
+                detalhes = {'tipo': campos['tipo_veiculo'].get(), 'placa': campos['placa'].get(),
+                            'ano': campos['ano'].get(), 'modelo': campos['modelo'].get()}
+            else:
+                detalhes = {'depreciacao_ano': campos['depreciacao'].get()}
             try:
-                data_br = campos['data'].get()
-                dia, mes, ano = data_br.split('/')
-                data_sql = f"{ano}-{mes}-{dia}"
-                tipo = campos['tipo'].get()
-                if tipo == 'imovel':
-                    id_conta = 2
-                elif tipo == 'automovel':
-                    id_conta = 3
-                else:
-                    id_conta = 4
-                # Vice-presidente (id_direcao 1) aprova automaticamente no sistema
-                id_aprovador = 1
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    try:
-                        cursor.execute("""
-                            INSERT INTO bens (data_aquisicao, nome_item, valor_aquisicao, localizacao, id_direcao, status_aprovacao)
-                            VALUES (%s, %s, %s, %s, %s, 'pendente')
-                        """, (data_sql, campos['nome'].get(), float(campos['valor'].get()),
-                              campos['local'].get(), self.id_direcao_atual))
-                        id_bem = cursor.lastrowid
-                        if tipo == 'imovel':
-                            cursor.execute("""
-                                INSERT INTO imoveis (id_bem, endereco, area, tipo_propriedade, depreciacao_ano)
-                                VALUES (%s, %s, %s, %s, %s)
-                            """, (id_bem, campos['endereco'].get(), float(campos['area'].get()),
-                                  campos['tipo_prop'].get(), float(campos['depreciacao_imovel'].get())))
-                        elif tipo == 'automovel':
-                            cursor.execute("""
-                                INSERT INTO automoveis (id_bem, tipo, placa, ano, modelo)
-                                VALUES (%s, %s, %s, %s, %s)
-                            """, (id_bem, campos['tipo_veiculo'].get(), campos['placa'].get(),
-                                  int(campos['ano'].get()), campos['modelo'].get()))
-                        elif tipo == 'movel':
-                            cursor.execute("INSERT INTO moveis (id_bem, depreciacao_ano) VALUES (%s, %s)",
-                                           (id_bem, float(campos['depreciacao'].get())))
-                        cursor.execute("CALL sp_aprovar_bem(%s, %s, %s)", (id_bem, id_aprovador, id_conta))
-                        conn.commit()
-                        cursor.close()
-                        messagebox.showinfo("Sucesso", "Bem adicionado e aprovado automaticamente.")
-                        dialog.destroy()
-                    except Error as e:
-                        conn.rollback()
-                        cursor.close()
-                        messagebox.showerror("Erro", f"Erro ao adicionar bem:\n{str(e)}")
-            except ValueError:
-                messagebox.showerror("Erro", "Dados inválidos! Verifique os valores inseridos.")
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao adicionar bem: {e}")
+                args = (self.db, tipo, campos['nome'].get(), campos['valor'].get(), campos['local'].get(),
+                        servicos.data_br(campos['data'].get(), 'data de aquisição'), self.id_direcao_atual, detalhes)
+            except ErroSistema as e:
+                messagebox.showerror("Erro", f"Erro ao adicionar bem:\n{e}")
+                return
+            # aprovado automaticamente pelo vice-presidente (servicos.ID_APROVADOR)
+            self._gravar(lambda: servicos.registrar_bem(*args), dialog, "Erro ao adicionar bem:\n",
+                         "Bem adicionado e aprovado automaticamente.", botao=btn_salvar)
 
         btn_frame = tk.Frame(dialog, bg=THEME['bg_secondary'])
         btn_frame.pack(pady=20)
 
-        ModernButton(btn_frame, text="SALVAR", command=salvar, style='success').pack(side='left', padx=5)
+        btn_salvar = ModernButton(btn_frame, text="SALVAR", command=salvar, style='success')
+        btn_salvar.pack(side='left', padx=5)
         ModernButton(btn_frame, text="CANCELAR", command=dialog.destroy, style='danger').pack(side='left', padx=5)
 
     def demitir_funcionario(self):
         """Demite um funcionário (remove dados do banco)."""
-        columns, data = self.db.execute_query("""
+        from . import servicos
+        fonte = FonteConsulta(self.db, """
             SELECT id_funcionario, id_contrato, cargo, setor, salario
-            FROM funcionarios WHERE id_direcao = %s ORDER BY id_contrato
+            FROM funcionarios WHERE id_direcao = %s ORDER BY id_contrato, id_funcionario
         """, (self.id_direcao_atual,))
-        if not data:
-            messagebox.showinfo("Info", "Não há funcionários cadastrados!")
-            return
 
         def on_confirm(item_id, dialog):
             if not messagebox.askyesno("Confirmação", "Tem certeza que deseja demitir este funcionário? Os dados do funcionário serão removidos do banco."):
                 return
-            try:
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    try:
-                        cursor.execute("DELETE FROM item_folha_f WHERE id_funcionario = %s", (item_id,))
-                        cursor.execute("DELETE FROM contratado WHERE id_funcionario = %s", (item_id,))
-                        cursor.execute("DELETE FROM terceirizado WHERE id_funcionario = %s", (item_id,))
-                        cursor.execute("DELETE FROM funcionarios WHERE id_funcionario = %s", (item_id,))
-                        conn.commit()
-                        cursor.close()
-                        messagebox.showinfo("Sucesso", "Funcionário demitido e dados removidos do banco.")
-                        dialog.destroy()
-                    except Error as e:
-                        conn.rollback()
-                        cursor.close()
-                        messagebox.showerror("Erro", f"Erro ao demitir:\n{str(e)}")
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao demitir: {e}")
+            self._gravar(lambda: servicos.demitir_funcionario(self.db, item_id), dialog, "Erro ao demitir:\n",
+                         "Funcionário demitido e dados removidos do banco.")
 
-        self._tree_selection_dialog("Demitir Funcionário", columns, data, "DEMITIR", on_confirm)
+        self._tree_selection_dialog("Demitir Funcionário", fonte, "DEMITIR", on_confirm,
+                                    empty_msg="Não há funcionários cadastrados!")
 
     def dar_baixa_bem(self):
         """Dá baixa em um bem"""
-        columns, data = self.db.execute_query("""
+        from . import servicos
+        fonte = FonteConsulta(self.db, """
             SELECT id_bem, nome_item,
                    DATE_FORMAT(data_aquisicao, '%d/%m/%Y') as data_aquisicao,
                    FORMAT(valor_aquisicao, 2, 'pt_BR') as valor,
                    status_aprovacao
             FROM bens
             WHERE id_direcao = %s AND status_aprovacao = 'aprovado'
-            ORDER BY nome_item
+            ORDER BY nome_item, id_bem
         """, (self.id_direcao_atual,))
-        if not data:
-            messagebox.showinfo("Info", "Não há bens aprovados!")
-            return
 
         def on_confirm(item_id, dialog):
-            if messagebox.askyesno("Confirmação", "Tem certeza que deseja dar baixa neste bem?"):
-                self.db.execute_query("UPDATE bens SET status_aprovacao = 'baixado' WHERE id_bem = %s", (item_id,))
-                dialog.destroy()
+            if not messagebox.askyesno("Confirmação", "Tem certeza que deseja dar baixa neste bem?"):
+                return
+            self._gravar(lambda: servicos.dar_baixa_bem(self.db, item_id), dialog, "")
 
-        self._tree_selection_dialog("Dar Baixa em Bem", columns, data, "DAR BAIXA", on_confirm)
+        self._tree_selection_dialog("Dar Baixa em Bem", fonte, "DAR BAIXA", on_confirm,
+                                    empty_msg="Não há bens aprovados!")
 
     def visualizar_funcionarios(self):
         """Visualiza todos os funcionários"""
@@ -1430,10 +2008,27 @@ class ClubManagementApp:
 
     def show_items_list(self, table):
         """Lista de queries/views"""
-        self._clear_container()
         self.origem_consulta = table
+        tela = self._mostrar_tela(('itens', table), lambda t: self._construir_items_list(t, table))
+
+        def falhou(e):
+            messagebox.showerror("Erro", f"Erro na consulta:\n{str(e)[:200]}")
+            self.show_dashboard()
+
+        def recarregar(mudou):
+            if mudou:
+                tela.preencher(self.db.get_items(table))
 
-        main_frame = tk.Frame(self.container, bg=THEME['bg_primary'])
+        # catálogo em memória: a tela abre sem ir ao banco; a versão é conferida em segundo plano quando vencida
+        if self.db.catalogo_carregado(table):
+            tela.preencher(self.db.get_items(table))
+            if self.db.catalogo_vencido(table):
+                self._aguardar(self.db.submit(self.db.verificar_catalogo, table), recarregar, lambda e: None)
+        else:
+            self._aguardar(self.db.submit(self.db.get_items, table), tela.preencher, falhou)
+
+    def _construir_items_list(self, tela, table):
+        main_frame = tk.Frame(tela, bg=THEME['bg_primary'])
         main_frame.pack(fill='both', expand=True, padx=30, pady=30)
 
         header = tk.Frame(main_frame, bg=THEME['bg_primary'])
@@ -1470,37 +2065,55 @@ class ClubManagementApp:
         listbox.pack(side='left', fill='both', expand=True, padx=20, pady=20)
         scrollbar.config(command=listbox.yview)
 
-        columns, data = self.db.get_items(table)
+        items_dict = {}
+        exibidos = []
 
-        if not data:
-            messagebox.showwarning("Aviso", "Nenhum item encontrado!")
-            self.show_dashboard()
-            return
+        def preencher(resultado):
+            columns, data = resultado
+            if not data:
+                messagebox.showwarning("Aviso", "Nenhum item encontrado!")
+                self.show_dashboard()
+                return
+            if data == exibidos:  # tela reexibida: a lista só é refeita se o catálogo mudou
+                return
+            exibidos[:] = data
+            items_dict.clear()
+            items_dict.update((row[1], row[0]) for row in data)
+            listbox.delete(0, 'end')
+            for name in items_dict.keys():
+                listbox.insert('end', f"  {name}")
 
-        items_dict = {row[1]: row[0] for row in data}
+        tela.preencher = preencher
 
-        for name in items_dict.keys():
-            listbox.insert('end', f"  {name}")
+        def executar(item_id):
+            # roda num worker: busca o SQL do item e a primeira página do resultado
+            query_sql = self.db.get_item_sql(table, item_id)
+            if not query_sql:
+                return None
+            fonte = fonte_para_sql(self.db, query_sql)
+            return fonte, fonte.primeira(self.TAMANHO_PAGINA)
 
         def execute_item():
             if not listbox.curselection():
                 messagebox.showwarning("Aviso", "Selecione um item!")
                 return
+            if self._tarefas_pendentes:
+                return
 
             name = listbox.get(listbox.curselection()[0]).strip()
             item_id = items_dict[name]
-            query_sql = self.db.get_item_sql(table, item_id)
-
-            if not query_sql:
-                messagebox.showerror("Erro", "Não foi possível carregar!")
-                return
 
-            columns, data = self.db.execute_query(query_sql)
+            def exibir(resultado):
+                if resultado is None:
+                    messagebox.showerror("Erro", "Não foi possível carregar!")
+                    return
+                fonte, primeira = resultado
+                if fonte.colunas and primeira.linhas:
+                    self.show_results(fonte, primeira, name)
+                else:
+                    messagebox.showinfo("Info", "Nenhum resultado encontrado!")
 
-            if columns and data:
-                self.show_results(columns, data, name)
-            else:
-                messagebox.showinfo("Info", "Nenhum resultado encontrado!")
+            self._aguardar(self.db.submit(executar, item_id), exibir)
 
         listbox.bind('<Double-Button-1>', lambda e: execute_item())
 
@@ -1521,62 +2134,52 @@ class ClubManagementApp:
             style='danger'
         ).pack(side='right')
 
-    def show_results(self, columns, data, title):
-        self._clear_container()
-
-        main_frame = tk.Frame(self.container, bg=THEME['bg_primary'])
+    def show_results(self, fonte, primeira, title):
+        """Grade paginada sobre `fonte` (src/paginacao.py), começando pela página `primeira` já carregada.
+        A tela é construída uma vez; nas seguintes a grade troca de fonte no lugar. Retorna a grade."""
+        tela = self._mostrar_tela('resultados', lambda t: self._construir_results(t, fonte, primeira))
+        tela.titulo.config(text=title)
+        if tela.grade.origem is not fonte:
+            tela.total_label.config(text="Total: calculando...")
+            tela.grade.recarregar(fonte, primeira, mesma_consulta=False)
+        return tela.grade
+
+    def _construir_results(self, tela, fonte, primeira):
+        main_frame = tk.Frame(tela, bg=THEME['bg_primary'])
         main_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
         header = tk.Frame(main_frame, bg=THEME['accent'], height=80)
         header.pack(fill='x')
         header.pack_propagate(False)
 
-        tk.Label(
+        tela.titulo = tk.Label(
             header,
-            text=title,
             font=('Segoe UI', 20, 'bold'),
             bg=THEME['accent'],
             fg='white'
-        ).pack(expand=True)
-
-        tree_frame = tk.Frame(main_frame, bg=THEME['bg_secondary'])
-        tree_frame.pack(fill='both', expand=True, pady=(20, 0))
-
-        scroll_y = ttk.Scrollbar(tree_frame, orient='vertical')
-        scroll_x = ttk.Scrollbar(tree_frame, orient='horizontal')
-
-        tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show='headings',
-            yscrollcommand=scroll_y.set,
-            xscrollcommand=scroll_x.set,
-            style='Modern.Treeview'
         )
-
-        scroll_y.config(command=tree.yview)
-        scroll_x.config(command=tree.xview)
-        scroll_y.pack(side='right', fill='y')
-        scroll_x.pack(side='bottom', fill='x')
-        tree.pack(fill='both', expand=True)
-
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150, anchor='center')
-
-        for row in data:
-            tree.insert('', 'end', values=row)
+        tela.titulo.pack(expand=True)
 
         footer = tk.Frame(main_frame, bg=THEME['bg_primary'])
-        footer.pack(fill='x', pady=(20, 0))
+        footer.pack(side='bottom', fill='x', pady=(20, 0))
 
-        tk.Label(
+        total_label = tk.Label(
             footer,
-            text=f"Total: {len(data)} registro(s)",
+            text="Total: calculando...",
             font=('Segoe UI', 11, 'bold'),
             bg=THEME['bg_primary'],
             fg=THEME['text_secondary']
-        ).pack(side='left')
+        )
+        total_label.pack(side='left')
+        tela.total_label = total_label
+
+        grade = PagedTreeview(
+            main_frame, fonte, primeira, self._em_worker,
+            tamanho_pagina=self.TAMANHO_PAGINA,
+            on_total=lambda n: total_label.config(text=f"Total: {n} registro(s)")
+        )
+        grade.pack(fill='both', expand=True, pady=(20, 0))
+        tela.grade = grade
 
         def go_back():
             if self.origem_consulta == 'profile':
@@ -1597,4 +2200,39 @@ class ClubManagementApp:
             style='danger'
         ).pack(side='right')
 
+        ModernButton(
+            footer,
+            text="💾 EXPORTAR",
+            command=lambda: self._exportar(grade.fonte, tela.titulo.cget('text')),
+            style='accent'
+        ).pack(side='right', padx=(0, 10))
+
+    def _exportar(self, fonte, title):
+        """Grava o resultado inteiro da grade em CSV/JSONL (src/exportacao.py) num worker."""
+        destino = filedialog.asksaveasfilename(
+            title=f"Exportar — {title}",
+            defaultextension='.csv',
+            filetypes=[('CSV', '*.csv'), ('CSV compactado', '*.csv.gz'),
+                       ('JSON por linha', '*.jsonl'), ('JSON por linha compactado', '*.jsonl.gz')]
+        )
+        if not destino:
+            return
+        try:
+            exportacao.formato_do_arquivo(destino)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+
+        def concluido(r):
+            messagebox.showinfo(
+                "Exportação concluída",
+                f"{r['linhas']:,} linha(s) em {r['segundos']:.1f}s ({r['linhas_s']:,.0f} linhas/s)\n{destino}"
+            )
+
+        def falhou(e):
+            messagebox.showerror("Erro", f"Erro ao exportar:\n{str(e)[:200]}")
+
+        self._em_worker(lambda: exportacao.exportar_fonte(self.db, fonte, destino), concluido, falhou,
+                        widget=self.root)
+
 # Ponto de entrada: sistema.py (main e lógica de inicialização)
@@ -0,0 +1,431 @@
+"""
+Cópia colunar em memória dos lançamentos aprovados, para relatórios agregados sem ir ao banco.
+
+Cada lançamento aprovado vira uma posição em colunas paralelas de inteiros: id, data_registro
+(segundos desde 1970, sem fuso), mês (AAAAMM), conta e valor em centavos com sinal (+entrada, -saída).
+atualizar() traz só o que mudou desde a última carga (id acima da marca ou aprovação recente) e confere
+contagem e soma com resumo_mensal_conta/saldo_caixa; se divergirem (lançamento alterado ou excluído),
+recarrega tudo. Os relatórios (balancete, Consultas 12, 13 e 14) são agrupamentos vetorizados e
+conferir() compara cada um com a versão SQL.
+
+Usa numpy quando disponível (agrupamento com bincount, persistência em .npy aberta com mmap);
+sem numpy, as colunas são array('q') e os agrupamentos são laços em Python.
+"""
+import json
+import os
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+try:
+    import numpy as np
+except ImportError:  # opcional
+    np = None
+
+COLUNAS = ('id', 'ts', 'mes', 'conta', 'centavos', 'aprovacao')
+
+_EPOCA = datetime(1970, 1, 1)
+_CENTAVO = Decimal('0.01')
+# ordem do ENUM tipo_conta (ORDER BY de uma coluna ENUM segue a posição na definição)
+_ORDEM_TIPO_CONTA = {'ativo': 0, 'passivo': 1, 'receita': 2, 'despesa': 3, 'patrimonio_liquido': 4}
+
+SQL_CARGA = """
+    SELECT id_lancamento,
+           TIMESTAMPDIFF(SECOND, '1970-01-01', data_registro),
+           CAST(REPLACE(mes_registro, '-', '') AS UNSIGNED),
+           id_conta,
+           CAST(valor * 100 AS SIGNED) * IF(tipo_de_movimentacao = 'entrada', 1, -1),
+           COALESCE(TIMESTAMPDIFF(SECOND, '1970-01-01', data_aprovacao), 0)
+    FROM lancamento
+    WHERE status_aprovacao = 'aprovado'
+"""
+
+# versões SQL dos relatórios, usadas por conferir() (12, 13 e 14 são as de bd/Consultas.sql)
+SQL_RELATORIOS = {
+    'balancete': """
+        SELECT pc.codigo_conta, pc.descricao, pc.tipo_conta,
+               COUNT(l.id_lancamento) AS qtd_lancamentos,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) AS total_entradas,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END) AS total_saidas,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE -l.valor END) AS saldo
+        FROM lancamento l
+        INNER JOIN plano_de_contas pc ON l.id_conta = pc.id_conta
+        WHERE l.status_aprovacao = 'aprovado'
+        GROUP BY pc.id_conta, pc.codigo_conta, pc.descricao, pc.tipo_conta
+        ORDER BY pc.codigo_conta
+    """,
+    'consulta_12': """
+        SELECT mes_registro AS mes_ano,
+               CAST(LEFT(mes_registro, 4) AS UNSIGNED) AS ano,
+               CAST(SUBSTRING(mes_registro, 6, 2) AS UNSIGNED) AS mes,
+               SUM(total_entradas) AS total_receitas,
+               SUM(total_saidas) AS total_despesas,
+               SUM(total_entradas - total_saidas) AS resultado_periodo
+        FROM resumo_mensal_conta
+        GROUP BY mes_registro
+        ORDER BY ano DESC, mes DESC
+    """,
+    'consulta_13': """
+        SELECT pc.tipo_conta, pc.codigo_conta, pc.descricao AS conta,
+               COUNT(l.id_lancamento) AS qtd_lancamentos,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) AS total_entradas,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END) AS total_saidas,
+               (SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) -
+                SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END)) AS saldo_liquido,
+               ROUND((SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) /
+                      NULLIF((SELECT SUM(valor) FROM lancamento WHERE tipo_de_movimentacao = 'entrada'
+                              AND status_aprovacao = 'aprovado'
+                              AND data_registro >= DATE_SUB(CURDATE(), INTERVAL 3 MONTH)), 0)) * 100, 2
+               ) AS percentual_receitas,
+               ROUND((SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END) /
+                      NULLIF((SELECT SUM(valor) FROM lancamento WHERE tipo_de_movimentacao = 'saida'
+                              AND status_aprovacao = 'aprovado'
+                              AND data_registro >= DATE_SUB(CURDATE(), INTERVAL 3 MONTH)), 0)) * 100, 2
+               ) AS percentual_despesas,
+               DATE_FORMAT(MIN(l.data_registro), '%d/%m/%Y') AS primeira_movimentacao,
+               DATE_FORMAT(MAX(l.data_registro), '%d/%m/%Y') AS ultima_movimentacao
+        FROM lancamento l
+        INNER JOIN plano_de_contas pc ON l.id_conta = pc.id_conta
+        WHERE l.status_aprovacao = 'aprovado'
+            AND l.data_registro >= DATE_SUB(CURDATE(), INTERVAL 3 MONTH)
+        GROUP BY pc.tipo_conta, pc.codigo_conta, pc.descricao
+        ORDER BY pc.tipo_conta, saldo_liquido DESC
+    """,
+    'consulta_14': """
+        SELECT mes_registro AS mes_ano,
+               CAST(LEFT(mes_registro, 4) AS UNSIGNED) AS ano,
+               CAST(SUBSTRING(mes_registro, 6, 2) AS UNSIGNED) AS mes,
+               SUM(total_entradas) AS total_receitas,
+               SUM(total_saidas) AS total_despesas,
+               SUM(total_entradas - total_saidas) AS resultado_periodo,
+               ABS(SUM(total_entradas - total_saidas)) AS deficit,
+               CONCAT('R$ ', FORMAT(ABS(SUM(total_entradas - total_saidas)), 2, 'pt_BR')) AS deficit_formatado
+        FROM resumo_mensal_conta
+        GROUP BY mes_registro
+        HAVING resultado_periodo < 0
+        ORDER BY ano DESC, mes DESC
+    """,
+}
+
+# colunas comparadas com tolerância de 0,01: o MySQL arredonda o quociente DECIMAL antes do * 100
+_COLUNAS_PERCENTUAIS = {'percentual_receitas', 'percentual_despesas'}
+
+
+def _reais(centavos):
+    return Decimal(int(centavos)).scaleb(-2)
+
+
+def _data(segundos):
+    return _EPOCA + timedelta(seconds=int(segundos))
+
+
+def _segundos(quando):
+    return int((datetime(quando.year, quando.month, quando.day) - _EPOCA).total_seconds())
+
+
+def _menos_meses(dia, meses):
+    """DATE_SUB(dia, INTERVAL n MONTH): mesmo dia, limitado ao último dia do mês de destino."""
+    total = dia.year * 12 + dia.month - 1 - meses
+    ano, mes = divmod(total, 12)
+    mes += 1
+    proximo = date(ano + (mes == 12), mes % 12 + 1, 1)
+    return date(ano, mes, min(dia.day, (proximo - timedelta(days=1)).day))
+
+
+def _formato_br(valor):
+    """FORMAT(x, 2, 'pt_BR'): milhar com ponto e decimal com vírgula."""
+    return f"{valor:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def _percentual(parte, total):
+    if not total:
+        return None
+    quociente = (Decimal(parte) / Decimal(total)).quantize(Decimal('0.000001'), ROUND_HALF_UP)
+    return (quociente * 100).quantize(_CENTAVO, ROUND_HALF_UP)
+
+
+def _mes_texto(aaaamm):
+    return f"{aaaamm // 100:04d}-{aaaamm % 100:02d}"
+
+
+class Razao:
+    """Lançamentos aprovados em colunas. Não é thread-safe: atualizar() e os relatórios devem rodar
+    na mesma thread (ou sob um lock do chamador)."""
+
+    def __init__(self, db, arquivo=None):
+        self.db = db
+        self.arquivo = arquivo
+        self.marca = 0              # maior id_lancamento carregado
+        self.ultima_aprovacao = 0   # maior data_aprovacao carregada (segundos)
+        self.contas = {}            # id_conta -> (codigo_conta, descricao, tipo_conta)
+        self.ultima_carga = None    # {'novos', 'recarregado', 'segundos'}
+        self._col = self._vazias()
+        if arquivo and os.path.exists(os.path.join(arquivo, 'meta.json')):
+            self._abrir(arquivo)
+
+    # ==================== ARMAZENAMENTO ====================
+
+    @staticmethod
+    def _vazias():
+        if np is not None:
+            return {c: np.zeros(0, dtype=np.int64) for c in COLUNAS}
+        return {c: array('q') for c in COLUNAS}
+
+    def __len__(self):
+        return len(self._col['id'])
+
+    def _anexar(self, linhas):
+        if not linhas:
+            return
+        colunas = list(zip(*linhas))
+        for nome, valores in zip(COLUNAS, colunas):
+            if np is not None:
+                self._col[nome] = np.concatenate((self._col[nome], np.array(valores, dtype=np.int64)))
+            else:
+                self._col[nome].extend(valores)
+        self.marca = max(self.marca, max(colunas[0]))
+        self.ultima_aprovacao = max(self.ultima_aprovacao, max(colunas[5]))
+
+    def salvar(self, arquivo=None):
+        """Grava as colunas (.npy) e a marca em `arquivo` (diretório); a próxima sessão abre com mmap."""
+        if np is None:
+            raise RuntimeError("Persistência da cópia colunar requer numpy")
+        pasta = arquivo or self.arquivo
+        os.makedirs(pasta, exist_ok=True)
+        # grava ao lado e troca: os arquivos antigos podem estar abertos com mmap
+        for nome in COLUNAS:
+            destino = os.path.join(pasta, f"{nome}.npy")
+            with open(destino + '.tmp', 'wb') as f:
+                np.save(f, np.asarray(self._col[nome]))
+            os.replace(destino + '.tmp', destino)
+        with open(os.path.join(pasta, 'meta.json.tmp'), 'w', encoding='utf-8') as f:
+            json.dump({'marca': self.marca, 'ultima_aprovacao': self.ultima_aprovacao, 'linhas': len(self)}, f)
+        os.replace(os.path.join(pasta, 'meta.json.tmp'), os.path.join(pasta, 'meta.json'))
+
+    def _abrir(self, pasta):
+        if np is None:
+            return
+        with open(os.path.join(pasta, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        col = {nome: np.load(os.path.join(pasta, f"{nome}.npy"), mmap_mode='r') for nome in COLUNAS}
+        if any(len(c) != meta['linhas'] for c in col.values()):
+            return  # gravação interrompida: começa do zero
+        self._col = col
+        self.marca = meta['marca']
+        self.ultima_aprovacao = meta['ultima_aprovacao']
+
+    # ==================== CARGA INCREMENTAL ====================
+
+    def atualizar(self):
+        """Traz os lançamentos aprovados novos e confere o total; retorna self.ultima_carga.
+
+        Tudo é lido num único snapshot consistente: novos ids acima da marca e lançamentos antigos
+        aprovados depois da última aprovação vista (pendentes que foram aprovados). Se a contagem ou a
+        soma não baterem com resumo_mensal_conta/saldo_caixa, a cópia é recarregada do zero."""
+        inicio = time.perf_counter()
+        novos, recarregado = 0, False
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                # encerra a transação implícita de leituras anteriores nesta conexão e abre o snapshot
+                cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+                cursor.execute("SELECT id_conta, codigo_conta, descricao, tipo_conta FROM plano_de_contas")
+                self.contas = {r[0]: tuple(r[1:]) for r in cursor.fetchall()}
+
+                if len(self):
+                    cursor.execute(SQL_CARGA + " AND id_lancamento > %s ORDER BY id_lancamento", (self.marca,))
+                    linhas = cursor.fetchall()
+                    cursor.execute(SQL_CARGA + " AND id_lancamento <= %s"
+                                   " AND data_aprovacao >= '1970-01-01' + INTERVAL %s SECOND",
+                                   (self.marca, self.ultima_aprovacao))
+                    linhas += self._sem_repetidos(cursor.fetchall())
+                    self._anexar(linhas)
+                    novos = len(linhas)
+
+                if not len(self) or not self._confere(cursor):
+                    self._col = self._vazias()
+                    self.marca = self.ultima_aprovacao = 0
+                    cursor.execute(SQL_CARGA + " ORDER BY id_lancamento")
+                    linhas = cursor.fetchall()
+                    self._anexar(linhas)
+                    novos, recarregado = len(linhas), True
+            finally:
+                cursor.close()
+                conn.commit()
+        if self.arquivo and np is not None and (novos or recarregado):
+            self.salvar()
+        self.ultima_carga = {'novos': novos, 'recarregado': recarregado, 'segundos': time.perf_counter() - inicio}
+        return self.ultima_carga
+
+    def _sem_repetidos(self, linhas):
+        """Descarta as linhas cujo id já está carregado (aprovadas no mesmo segundo da marca)."""
+        if not linhas:
+            return []
+        ids = [r[0] for r in linhas]
+        if np is not None:
+            ja = set(np.asarray(ids)[np.isin(ids, self._col['id'])].tolist())
+        else:
+            carregados = set(self._col['id'])
+            ja = {i for i in ids if i in carregados}
+        return [r for r in linhas if r[0] not in ja]
+
+    def _confere(self, cursor):
+        cursor.execute("SELECT COALESCE(SUM(total_lancamentos), 0) FROM resumo_mensal_conta")
+        contagem = cursor.fetchone()[0]
+        cursor.execute("SELECT saldo FROM saldo_caixa WHERE id_saldo = 1")
+        linha = cursor.fetchone()
+        saldo = linha[0] if linha else Decimal(0)
+        return int(contagem) == len(self) and Decimal(saldo) == _reais(self._soma(self._col['centavos']))
+
+    # ==================== AGRUPAMENTO ====================
+
+    @staticmethod
+    def _soma(valores):
+        return int(np.sum(valores)) if np is not None else sum(valores)
+
+    def _agrupar(self, chave, mascara=None, extremos=False):
+        """{chave: [quantidade, entradas, saídas (centavos), menor ts, maior ts]} das linhas em `mascara`."""
+        if np is not None:
+            return self._agrupar_np(chave, mascara, extremos)
+        grupos = {}
+        ts, centavos = self._col['ts'], self._col['centavos']
+        for i, k in enumerate(self._col[chave]):
+            if mascara is not None and not mascara[i]:
+                continue
+            g = grupos.get(k)
+            if g is None:
+                g = grupos[k] = [0, 0, 0, ts[i], ts[i]]
+            c = centavos[i]
+            g[0] += 1
+            if c > 0:
+                g[1] += c
+            else:
+                g[2] -= c
+            if extremos:
+                g[3] = min(g[3], ts[i])
+                g[4] = max(g[4], ts[i])
+        return grupos
+
+    def _agrupar_np(self, chave, mascara, extremos):
+        k = np.asarray(self._col[chave])
+        c = np.asarray(self._col['centavos'])
+        ts = np.asarray(self._col['ts'])
+        if mascara is not None:
+            k, c, ts = k[mascara], c[mascara], ts[mascara]
+        if not len(k):
+            return {}
+        base = int(k.min())
+        indice = k - base
+        tamanho = int(indice.max()) + 1
+        # somas em float64 são exatas enquanto cada total ficar abaixo de 2**53 centavos
+        quantidade = np.bincount(indice, minlength=tamanho)
+        entradas = np.rint(np.bincount(indice, weights=np.where(c > 0, c, 0), minlength=tamanho)).astype(np.int64)
+        saidas = np.rint(np.bincount(indice, weights=np.where(c < 0, -c, 0), minlength=tamanho)).astype(np.int64)
+        presentes = np.flatnonzero(quantidade)
+        menor = maior = np.zeros(tamanho, dtype=np.int64)
+        if extremos:
+            menor = np.full(tamanho, np.iinfo(np.int64).max, dtype=np.int64)
+            maior = np.full(tamanho, np.iinfo(np.int64).min, dtype=np.int64)
+            np.minimum.at(menor, indice, ts)
+            np.maximum.at(maior, indice, ts)
+        return {base + int(i): [int(quantidade[i]), int(entradas[i]), int(saidas[i]), int(menor[i]), int(maior[i])]
+                for i in presentes}
+
+    def _desde(self, limite_segundos):
+        ts = self._col['ts']
+        if np is not None:
+            return np.asarray(ts) >= limite_segundos
+        return [t >= limite_segundos for t in ts]
+
+    # ==================== RELATÓRIOS ====================
+    # mesmas colunas e tipos das consultas SQL: (colunas, linhas) como run_query
+
+    def balancete(self):
+        """Totais de todo o histórico aprovado por conta."""
+        grupos = self._agrupar('conta')
+        linhas = []
+        for id_conta, (n, ent, sai, _, _) in grupos.items():
+            codigo, descricao, tipo = self.contas.get(id_conta, (str(id_conta), '', ''))
+            linhas.append((codigo, descricao, tipo, n, _reais(ent), _reais(sai), _reais(ent - sai)))
+        linhas.sort(key=lambda r: r[0])
+        return ['codigo_conta', 'descricao', 'tipo_conta', 'qtd_lancamentos', 'total_entradas', 'total_saidas',
+                'saldo'], linhas
+
+    def _mensal(self):
+        grupos = self._agrupar('mes')
+        linhas = []
+        for mes in sorted(grupos, reverse=True):
+            _, ent, sai, _, _ = grupos[mes]
+            linhas.append((_mes_texto(mes), mes // 100, mes % 100, _reais(ent), _reais(sai), _reais(ent - sai)))
+        return linhas
+
+    def balanco_mensal(self):
+        """Consulta 12: receitas, despesas e resultado de cada mês."""
+        return ['mes_ano', 'ano', 'mes', 'total_receitas', 'total_despesas', 'resultado_periodo'], self._mensal()
+
+    def deficit_mensal(self):
+        """Consulta 14: meses com resultado negativo."""
+        linhas = [r + (abs(r[5]), f"R$ {_formato_br(abs(r[5]))}") for r in self._mensal() if r[5] < 0]
+        return ['mes_ano', 'ano', 'mes', 'total_receitas', 'total_despesas', 'resultado_periodo', 'deficit',
+                'deficit_formatado'], linhas
+
+    def resumo_trimestral(self, hoje=None):
+        """Consulta 13: últimos 3 meses (a partir de `hoje`, padrão a data local) por conta."""
+        limite = _segundos(_menos_meses(hoje or date.today(), 3))
+        grupos = self._agrupar('conta', self._desde(limite), extremos=True)
+        total_ent = sum(g[1] for g in grupos.values())
+        total_sai = sum(g[2] for g in grupos.values())
+        linhas = []
+        for id_conta, (n, ent, sai, menor, maior) in grupos.items():
+            codigo, descricao, tipo = self.contas.get(id_conta, (str(id_conta), '', ''))
+            linhas.append((tipo, codigo, descricao, n, _reais(ent), _reais(sai), _reais(ent - sai),
+                           _percentual(ent, total_ent), _percentual(sai, total_sai),
+                           _data(menor).strftime('%d/%m/%Y'), _data(maior).strftime('%d/%m/%Y')))
+        linhas.sort(key=lambda r: (_ORDEM_TIPO_CONTA.get(r[0], 99), -r[6]))
+        return ['tipo_conta', 'codigo_conta', 'conta', 'qtd_lancamentos', 'total_entradas', 'total_saidas',
+                'saldo_liquido', 'percentual_receitas', 'percentual_despesas', 'primeira_movimentacao',
+                'ultima_movimentacao'], linhas
+
+    # ==================== CONFERÊNCIA ====================
+
+    def conferir(self):
+        """Compara cada relatório com a versão SQL. Retorna [(nome, descrição da divergência)], como
+        manutencao.verificar_resumo_mensal; lista vazia = iguais. A Consulta 13 usa o CURDATE() do servidor."""
+        cols, linhas = self.db.run_query("SELECT CURDATE()", usar_cache=False)
+        hoje = linhas[0][0]
+        relatorios = {
+            'balancete': self.balancete(),
+            'consulta_12': self.balanco_mensal(),
+            'consulta_13': self.resumo_trimestral(hoje),
+            'consulta_14': self.deficit_mensal(),
+        }
+        divergencias = []
+        for nome, (colunas, locais) in relatorios.items():
+            colunas_sql, remotas = self.db.run_query(SQL_RELATORIOS[nome], usar_cache=False)
+            remotas = remotas or []
+            if list(colunas_sql or []) != colunas:
+                divergencias.append((nome, f"colunas diferentes: {colunas} != {colunas_sql}"))
+                continue
+            if len(locais) != len(remotas):
+                divergencias.append((nome, f"{len(locais)} linhas != {len(remotas)} linhas no banco"))
+                continue
+            if nome == 'consulta_13':
+                # empates de saldo_liquido não têm ordem definida no SQL
+                locais = sorted(locais, key=lambda r: r[1])
+                remotas = sorted(remotas, key=lambda r: r[1])
+            for i, (a, b) in enumerate(zip(locais, remotas)):
+                if not _linhas_iguais(colunas, a, b):
+                    divergencias.append((nome, f"linha {i + 1}: {a} != {tuple(b)}"))
+                    break
+        return divergencias
+
+
+def _linhas_iguais(colunas, local, remota):
+    for coluna, a, b in zip(colunas, local, remota):
+        if coluna in _COLUNAS_PERCENTUAIS and a is not None and b is not None:
+            if abs(Decimal(a) - Decimal(b)) > _CENTAVO:
+                return False
+        elif a != b:
+            return False
+    return True
@@ -1,78 +1,504 @@
 """
 Conexão com o banco de dados - pool de conexões e execução de queries.
 """
-import mysql.connector
-from mysql.connector import Error
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from tkinter import messagebox
+from .erros import ErroConexao
+from .cache import ConexaoMonitorada, ResultCache, tabelas_escritas, tabelas_lidas
+from .metricas import ConexaoCronometrada, ponto_de_chamada
 
 # ==================== CONFIGURAÇÃO DO BANCO ====================
 DB_CONFIG = {
     'host': 'localhost',
     'database': 'gestao_clube',
     'user': 'root',
-    'password': '2003',
-    'pool_size': 3,
-    'pool_reset_session': True
+    'password': '2003'
 }
 
+# pool de conexões (ver ConnectionPool)
+POOL_CONFIG = {
+    'min_size': 1,             # conexões abertas já na inicialização
+    'max_size': 5,             # limite de conexões simultâneas
+    'checkout_timeout': 10.0,  # segundos de espera na fila quando todas estão em uso
+    'max_age': 1800.0,         # conexões mais velhas que isso são recicladas ao sair do pool
+    'ping_ocioso': 5.0,        # faz ping antes de entregar se ficou ociosa por mais que isso (0 = sempre)
+    'reset_session': True      # limpa o estado da sessão ao devolver a conexão
+}
+
+# catálogo de consultas/views exibido na interface: tabela -> (coluna id, coluna nome, coluna sql)
+CATALOGO = {
+    'queries_sistema': ('id_query', 'nome_query', 'sql_query'),
+    'views_sistema': ('id_view', 'nome_view', 'sql_view'),
+}
+
+# cache de resultados usado pela interface (ver src/cache.py)
+CACHE_CONFIG = {
+    'max_entries': 128,
+    'ttl': 60.0
+}
+
+# métricas por consulta usadas pela interface (ver src/metricas.py)
+MONITOR_CONFIG = {
+    'limite_lento': 0.5,                          # segundos; acima disso o comando vai para o log
+    'arquivo': 'logs/consultas_lentas.jsonl',     # log rotativo de consultas lentas (JSON por linha)
+    'max_bytes': 5 * 1024 * 1024,
+    'backups': 3,
+    'explain': True,                              # anexa EXPLAIN FORMAT=JSON às leituras lentas
+    'amostras': 1000                              # durações guardadas por impressão digital
+}
+
+
+# ==================== DRIVER ====================
+# mysql.connector leva ~0,1s para importar: é carregado na primeira conexão (na thread que abre o pool),
+# não no import deste módulo. Até lá Error/PoolError são um placeholder que nenhum erro do driver usa.
+
+class Error(Exception):
+    """Substituído por mysql.connector.Error quando o driver é carregado."""
+
+
+PoolError = Error
+mysql = None
+_driver_lock = threading.Lock()
+
+
+def _driver():
+    """Importa o driver na primeira chamada e retorna mysql.connector."""
+    global mysql, Error, PoolError
+    with _driver_lock:
+        if mysql is None:
+            import mysql.connector
+            from mysql.connector import Error
+            from mysql.connector.errors import PoolError
+    return mysql.connector
+
+
+# ==================== POOL DE CONEXÕES ====================
+
+class _ConexaoDoPool:
+    """Conexão emprestada pelo ConnectionPool: close() devolve ao pool em vez de fechar."""
+
+    def __init__(self, pool, entrada):
+        self._pool = pool
+        self._entrada = entrada
+        self._conn = entrada[0]
+
+    def close(self):
+        if self._entrada is not None:
+            entrada, self._entrada = self._entrada, None
+            self._pool.release(entrada)
+
+    def __getattr__(self, nome):
+        return getattr(self._conn, nome)
+
+
+class ConnectionPool:
+    """Pool elástico de conexões MySQL.
+
+    Mantém entre min_size e max_size conexões; quando todas estão em uso, checkout espera na fila
+    até checkout_timeout (depois levanta PoolError). Antes de entregar uma conexão ociosa há mais de
+    ping_ocioso segundos faz ping (conexões mortas por restart ou wait_timeout são substituídas) e
+    recicla as que passaram de max_age. stats() expõe os contadores.
+    """
+
+    def __init__(self, conn_config, min_size=1, max_size=5, checkout_timeout=10.0, max_age=1800.0,
+                 ping_ocioso=5.0, reset_session=True):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Requer 0 <= min_size <= max_size e max_size >= 1")
+        self.conn_config = conn_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_age = max_age
+        self.ping_ocioso = ping_ocioso
+        self.reset_session = reset_session
+
+        self._livres = deque()  # [conexão, criada_em, devolvida_em]
+        self._total = 0
+        self._fechado = False
+        self._cond = threading.Condition()
+        self._metricas = dict.fromkeys(
+            ('checkouts', 'esperas', 'timeouts', 'erros', 'criadas', 'recicladas', 'descartadas'), 0)
+        self._metricas.update(tempo_espera_total=0.0, tempo_espera_max=0.0, em_uso=0)
+
+        for _ in range(min_size):
+            self._livres.append(self._nova())
+            self._total += 1
+
+    def _nova(self):
+        conn = _driver().connect(**self.conn_config)
+        agora = time.monotonic()
+        self._contar('criadas')
+        return [conn, agora, agora]
+
+    def _contar(self, chave):
+        """Incrementa um contador de stats() sob o lock (_nova/_validar rodam fora dele)."""
+        with self._cond:
+            self._metricas[chave] += 1
+
+    @staticmethod
+    def _fechar(conn):
+        try:
+            conn.close()
+        except Error:
+            pass
+
+    def _validar(self, entrada):
+        """Recicla conexões velhas e faz ping nas ociosas; retorna uma entrada utilizável."""
+        conn, criada_em, devolvida_em = entrada
+        agora = time.monotonic()
+        if agora - criada_em > self.max_age:
+            self._fechar(conn)
+            self._contar('recicladas')
+            return self._nova()
+        if agora - devolvida_em >= self.ping_ocioso:
+            try:
+                conn.ping(reconnect=False)
+            except Error:
+                self._fechar(conn)
+                self._contar('descartadas')
+                return self._nova()
+        return entrada
+
+    def get_connection(self):
+        inicio = time.monotonic()
+        prazo = inicio + self.checkout_timeout
+        esperou = False
+        with self._cond:
+            while True:
+                if self._fechado:
+                    raise PoolError("Pool de conexões encerrado")
+                if self._livres:
+                    entrada = self._livres.pop()  # LIFO: reaproveita a conexão usada mais recentemente
+                    break
+                if self._total < self.max_size:
+                    self._total += 1
+                    entrada = None
+                    break
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    self._metricas['timeouts'] += 1
+                    raise PoolError(f"Nenhuma conexão livre após {self.checkout_timeout:.1f}s "
+                                    f"({self.max_size} em uso)")
+                if not esperou:
+                    self._metricas['esperas'] += 1
+                    esperou = True
+                self._cond.wait(restante)
+
+        try:
+            entrada = self._nova() if entrada is None else self._validar(entrada)
+        except Error:
+            with self._cond:
+                self._total -= 1
+                self._metricas['erros'] += 1
+                self._cond.notify()
+            raise
+
+        espera = time.monotonic() - inicio
+        with self._cond:
+            self._metricas['checkouts'] += 1
+            self._metricas['em_uso'] += 1
+            self._metricas['tempo_espera_total'] += espera
+            self._metricas['tempo_espera_max'] = max(self._metricas['tempo_espera_max'], espera)
+        return _ConexaoDoPool(self, entrada)
+
+    def release(self, entrada):
+        conn = entrada[0]
+        descartar = False
+        try:
+            if self.reset_session:
+                conn.reset_session()
+            elif conn.in_transaction:
+                conn.rollback()
+        except Error:
+            descartar = True
+            self._fechar(conn)
+        with self._cond:
+            self._metricas['em_uso'] -= 1
+            if descartar or self._fechado:
+                self._total -= 1
+                self._metricas['erros'] += descartar
+                if not descartar:
+                    self._fechar(conn)
+            else:
+                entrada[2] = time.monotonic()
+                self._livres.append(entrada)
+            self._cond.notify()
+
+    def close(self):
+        """Fecha as conexões livres; as emprestadas são fechadas quando devolvidas."""
+        with self._cond:
+            livres, self._livres = list(self._livres), deque()
+            self._total -= len(livres)
+            self._fechado = True
+            self._cond.notify_all()
+        for conn, _, _ in livres:
+            self._fechar(conn)
+
+    def stats(self):
+        with self._cond:
+            m = dict(self._metricas)
+            m['livres'] = len(self._livres)
+            m['total'] = self._total
+            m['tempo_espera_medio'] = m['tempo_espera_total'] / m['checkouts'] if m['checkouts'] else 0.0
+            return m
+
 
 class DatabaseManager:
-    """Gerenciador otimizado com pool de conexões"""
+    """Gerenciador otimizado com pool de conexões e workers para consultas em segundo plano.
 
-    def __init__(self, config):
-        self.config = config
+    workers=None usa max_size - 1 threads do pool (uma conexão fica livre para a thread da interface);
+    workers=0 executa submit() de forma síncrona, útil para testes sem interface gráfica.
+    cache=ResultCache(...) ativa o cache de leituras, invalidado pelas escritas feitas por este gerenciador.
+    monitor=MonitorConsultas(...) registra duração, linhas e ponto de chamada de cada comando.
+    ao_erro(exceção) é chamado por execute_query em caso de erro (a interface mostra o diálogo);
+    sem ele, o erro é propagado. O módulo não depende de interface gráfica.
+    pool_em_segundo_plano=True retorna sem esperar o banco: o driver e o pool são abertos numa thread,
+    `conexao` (Future) resolve quando o pool fica pronto (ou em ErroConexao) e as consultas esperam por ele.
+    """
+
+    # intervalo mínimo (s) entre verificações de versão do catálogo
+    CATALOGO_INTERVALO = 60.0
+
+    def __init__(self, config, workers=None, cache=None, pool_config=None, monitor=None, ao_erro=None,
+                 pool_em_segundo_plano=False):
+        # chaves pool_* (formato antigo do DB_CONFIG) são aceitas e convertidas
+        self.config = {k: v for k, v in config.items() if not k.startswith('pool_')}
+        self.pool_config = dict(POOL_CONFIG, **(pool_config or {}))
+        if 'pool_size' in config:
+            self.pool_config['max_size'] = config['pool_size']
+        if 'pool_reset_session' in config:
+            self.pool_config['reset_session'] = config['pool_reset_session']
+        self.cache = cache
+        self.monitor = monitor
+        self.ao_erro = ao_erro
+        self._catalogo = {}  # tabela -> {'versao', 'itens', 'sql', 'verificado_em'}
+        self._catalogo_lock = threading.Lock()
         self._pool = None
-        self._init_pool()
+        self._fechado = False
+        self.conexao = Future()
+        self.tempos_inicio = {}  # segundos: 'driver' (import do mysql.connector), 'pool' (primeiras conexões)
+        if workers is None:
+            workers = max(1, self.pool_config['max_size'] - 1)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db_worker") if workers else None
+        if pool_em_segundo_plano:
+            threading.Thread(target=self._init_pool, name="db_pool", daemon=True).start()
+        else:
+            erro = self._init_pool()
+            if erro is not None:
+                self.close()
+                raise erro
 
     def _init_pool(self):
+        """Carrega o driver, abre o pool e resolve self.conexao. Retorna a exceção em caso de falha."""
+        inicio = time.perf_counter()
         try:
-            self._pool = mysql.connector.pooling.MySQLConnectionPool(
-                pool_name="club_pool", **self.config
-            )
-        except Error as e:
-            messagebox.showerror("Erro Crítico", f"Falha ao conectar ao banco:\n{e}")
-            raise
+            _driver()
+            self.tempos_inicio['driver'] = time.perf_counter() - inicio
+            pool = ConnectionPool(self.config, **self.pool_config)
+        except Exception as e:
+            erro = e
+            if isinstance(e, Error):
+                erro = ErroConexao(f"Falha ao conectar ao banco:\n{e}")
+                erro.__cause__ = e
+            self.conexao.set_exception(erro)
+            return erro
+        self.tempos_inicio['pool'] = time.perf_counter() - inicio - self.tempos_inicio['driver']
+        self._pool = pool
+        if self._fechado:  # close() chamado enquanto o pool abria
+            pool.close()
+        self.conexao.set_result(pool)
+        return None
+
+    def _pool_pronto(self):
+        # com o pool em segundo plano, a primeira consulta espera a abertura (ou recebe o ErroConexao)
+        return self.conexao.result()
 
     @contextmanager
     def get_connection(self):
-        conn = self._pool.get_connection()
+        with self._checkout(cronometrar=True) as conn:
+            yield conn
+
+    @contextmanager
+    def _checkout(self, cronometrar):
+        # run_query mede o comando inteiro (execute + fetch) por conta própria
+        conn = self._pool_pronto().get_connection()
+        if cronometrar and self.monitor is not None:
+            conn = ConexaoCronometrada(conn, self.monitor)
+        if self.cache is not None:
+            conn = ConexaoMonitorada(conn, self.cache)
         try:
             yield conn
         finally:
             conn.close()
 
-    def execute_query(self, query, params=None):
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+    def run_query(self, query, params=None, usar_cache=True):
+        """Executa a query e retorna (colunas, dados); erros são propagados (seguro fora da thread do Tk)."""
+        lidas = None
+        if usar_cache and self.cache is not None and not tabelas_escritas(query):
+            lidas = tabelas_lidas(query)
+            chave = ResultCache.chave(query, params)
+            resultado = self.cache.get(chave)
+            if resultado is not None:
+                return resultado
+            versao = self.cache.versao(lidas)
+
+        with self._checkout(cronometrar=False) as conn:
+            cursor = conn.cursor()
+            try:
+                inicio = time.perf_counter()
                 cursor.execute(query, params) if params else cursor.execute(query)
 
                 if cursor.description:
                     columns = [desc[0] for desc in cursor.description]
-                    data = cursor.fetchall()
-                    cursor.close()
-                    return columns, data
+                    resultado = columns, cursor.fetchall()
+                    self._medir(cursor, query, params, inicio, len(resultado[1]))
+                    if lidas:
+                        self.cache.put(chave, lidas, resultado, versao)
+                    return resultado
 
                 conn.commit()
-                cursor.close()
+                self._medir(cursor, query, params, inicio, cursor.rowcount)
                 return None, None
+            finally:
+                cursor.close()
+
+    def _medir(self, cursor, query, params, inicio, linhas):
+        """Registra o comando no monitor; leituras lentas levam o plano (EXPLAIN FORMAT=JSON)."""
+        if self.monitor is None:
+            return
+        duracao = time.perf_counter() - inicio
+        plano = None
+        if self.monitor.quer_plano(query, duracao):
+            try:
+                cursor.execute("EXPLAIN FORMAT=JSON " + query, params) if params \
+                    else cursor.execute("EXPLAIN FORMAT=JSON " + query)
+                linha = cursor.fetchone()
+                plano = linha[0] if linha else None
+            except Error:
+                plano = None
+        self.monitor.registrar(query, params, duracao, linhas, ponto_de_chamada(), plano)
+
+    def execute_query(self, query, params=None):
+        """Como run_query, mas entrega o erro a ao_erro (quando definido) e retorna (None, None)."""
+        try:
+            return self.run_query(query, params)
         except Error as e:
-            messagebox.showerror("Erro", f"Erro na consulta:\n{str(e)[:200]}")
+            if self.ao_erro is None:
+                raise
+            self.ao_erro(e)
             return None, None
 
+    # ==================== EXECUÇÃO EM SEGUNDO PLANO ====================
+
+    def submit(self, fn, *args, **kwargs):
+        """Agenda fn(*args, **kwargs) num worker e retorna um Future (já resolvido se workers=0)."""
+        if self._executor is not None:
+            return self._executor.submit(fn, *args, **kwargs)
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def submit_query(self, query, params=None):
+        """Versão assíncrona de run_query: o Future resolve em (colunas, dados) ou na exceção."""
+        return self.submit(self.run_query, query, params)
+
+    def cache_stats(self):
+        """Contadores do cache (hits, misses, hit_rate, entries, invalidations) ou None se desativado."""
+        return self.cache.stats() if self.cache is not None else None
+
+    def close(self):
+        """Encerra os workers (consultas ainda na fila são canceladas) e fecha as conexões livres do pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._fechado = True
+        if self._pool is not None:
+            self._pool.close()
+
+    def pool_stats(self):
+        """Contadores do pool: checkouts, esperas, tempo de espera, em uso, erros, reciclagens."""
+        return self._pool_pronto().stats()
+
+    def query_stats(self):
+        """p50/p95/p99 por impressão digital (ver MonitorConsultas.resumo) ou None se desativado."""
+        return self.monitor.resumo() if self.monitor is not None else None
+
+    # ==================== CATÁLOGO DE CONSULTAS/VIEWS ====================
+    # carregado inteiro numa única consulta e mantido em memória; a versão (quantidade, maior id e soma
+    # de CRC32 das linhas) vem na mesma consulta e é conferida no máximo a cada CATALOGO_INTERVALO
+
+    @staticmethod
+    def _colunas_catalogo(table):
+        if table not in CATALOGO:
+            raise ValueError(f"Tabela não suportada: {table}")
+        return CATALOGO[table]
+
+    @staticmethod
+    def _expr_versao(id_col, nome_col, sql_col):
+        return f"CRC32(CONCAT_WS('|', {id_col}, {nome_col}, {sql_col}))"
+
+    def _carregar_catalogo(self, table):
+        id_col, nome_col, sql_col = self._colunas_catalogo(table)
+        crc = self._expr_versao(id_col, nome_col, sql_col)
+        cols, data = self.run_query(f"""
+            SELECT {id_col}, {nome_col}, {sql_col},
+                   COUNT(*) OVER (), MAX({id_col}) OVER (), SUM({crc}) OVER ()
+            FROM {table}
+            ORDER BY {id_col}
+        """, usar_cache=False)
+        data = data or []
+        versao = tuple(data[0][3:]) if data else (0, None, None)
+        entrada = {
+            'versao': versao,
+            'itens': [(row[0], row[1]) for row in data],
+            'sql': {row[0]: row[2] for row in data},
+            'verificado_em': time.monotonic(),
+        }
+        with self._catalogo_lock:
+            self._catalogo[table] = entrada
+        return entrada
+
+    def _entrada_catalogo(self, table):
+        entrada = self._catalogo.get(table)
+        return entrada if entrada is not None else self._carregar_catalogo(table)
+
+    def catalogo_carregado(self, table):
+        return table in self._catalogo
+
+    def catalogo_vencido(self, table):
+        """True se o catálogo ainda não foi carregado ou se já passou CATALOGO_INTERVALO desde a última verificação."""
+        entrada = self._catalogo.get(table)
+        return entrada is None or time.monotonic() - entrada['verificado_em'] >= self.CATALOGO_INTERVALO
+
+    def verificar_catalogo(self, table, forcar=False):
+        """Confere a versão do catálogo (uma consulta agregada) e recarrega se mudou. Retorna True se recarregou."""
+        if not self.catalogo_carregado(table):
+            self._carregar_catalogo(table)
+            return True
+        if not forcar and not self.catalogo_vencido(table):
+            return False
+        id_col, nome_col, sql_col = self._colunas_catalogo(table)
+        cols, data = self.run_query(
+            f"SELECT COUNT(*), MAX({id_col}), SUM({self._expr_versao(id_col, nome_col, sql_col)}) FROM {table}",
+            usar_cache=False
+        )
+        versao = tuple(data[0]) if data else (0, None, None)
+        if versao != self._catalogo[table]['versao']:
+            self._carregar_catalogo(table)
+            return True
+        self._catalogo[table]['verificado_em'] = time.monotonic()
+        return False
+
     def get_items(self, table):
-        if table == "queries_sistema":
-            return self.execute_query("SELECT id_query, nome_query FROM queries_sistema ORDER BY id_query")
-        if table == "views_sistema":
-            return self.execute_query("SELECT id_view, nome_view FROM views_sistema ORDER BY id_view")
-        raise ValueError(f"Tabela não suportada: {table}")
+        """(colunas, [(id, nome)]) do catálogo em memória (só consulta o banco na primeira vez)."""
+        id_col, nome_col, _ = self._colunas_catalogo(table)
+        return [id_col, nome_col], list(self._entrada_catalogo(table)['itens'])
 
     def get_item_sql(self, table, item_id):
-        if table == "queries_sistema":
-            cols, data = self.execute_query("SELECT sql_query FROM queries_sistema WHERE id_query = %s", (item_id,))
-            return data[0][0] if data else None
-        if table == "views_sistema":
-            cols, data = self.execute_query("SELECT sql_view FROM views_sistema WHERE id_view = %s", (item_id,))
-            return data[0][0] if data else None
-        raise ValueError(f"Tabela não suportada: {table}")
+        self._colunas_catalogo(table)
+        return self._entrada_catalogo(table)['sql'].get(item_id)
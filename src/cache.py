@@ -0,0 +1,261 @@
+"""
+Cache de resultados de consultas (opcional) para o DatabaseManager.
+
+Entradas são chaveadas por (SQL, parâmetros), limitadas em quantidade (LRU) e em idade (TTL),
+e marcadas com as tabelas que a consulta lê (views são expandidas para as tabelas base).
+Escritas invalidam as entradas das tabelas afetadas, incluindo os efeitos dos triggers e procedures.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# tabelas lidas por cada view de Banco.sql (views aninhadas são expandidas recursivamente)
+VIEWS_TABELAS = {
+    'vw_item_folha_e_calculado': {'item_folha_e'},
+    'vw_item_folha_f_calculado': {'item_folha_f'},
+    'vw_folha_elenco_total': {'folha_elenco'},
+    'vw_folha_funcionarios_total': {'folha_funcionarios'},
+    'dados_publicos': {'plano_de_contas', 'resumo_mensal_conta'},
+    'dados_privados': {'direcao', 'lancamento', 'plano_de_contas'},
+    'resumo_elenco': {'elenco', 'folha_elenco', 'item_folha_e', 'vw_item_folha_e_calculado'},
+    'resumo_funcionarios': {'contratado', 'folha_funcionarios', 'funcionarios', 'item_folha_f',
+                            'terceirizado', 'vw_item_folha_f_calculado'},
+    'ativo_imobilizado_mensal': {'ativo_imobilizado'},
+    'detalhamento_bens': {'automoveis', 'bens', 'imoveis', 'moveis'},
+    'analise_orcamento_mensal': {'corpo_esportivo', 'folha_elenco', 'vw_folha_elenco_total'},
+    'media_folha_anual': {'vw_folha_elenco_total', 'vw_folha_funcionarios_total'},
+}
+
+# tabelas alteradas indiretamente ao escrever em uma tabela (triggers)
+EFEITOS_TRIGGERS = {
+    'lancamento': {'saldo_caixa', 'resumo_mensal_conta'},
+    'item_folha_e': {'folha_elenco'},
+    'item_folha_f': {'folha_funcionarios'},
+    'folha_elenco': {'alertas_orcamento'},
+    'folha_funcionarios': {'alertas_orcamento'},
+}
+
+# tabelas escritas por cada procedure
+EFEITOS_PROCEDURES = {
+    'sp_aprovar_bem': {'bens', 'lancamento'},
+    'sp_aprovar_folha_elenco': {'folha_elenco', 'lancamento'},
+    'sp_aprovar_folha_funcionarios': {'folha_funcionarios', 'lancamento'},
+    'sp_aprovar_folha_elenco_automatica': {'folha_elenco', 'lancamento'},
+    'sp_aprovar_folha_funcionarios_automatica': {'folha_funcionarios', 'lancamento'},
+    'sp_aprovar_folhas_elenco_lote': {'folha_elenco', 'lancamento'},
+    'sp_aprovar_folhas_funcionarios_lote': {'folha_funcionarios', 'lancamento'},
+    'sp_aprovar_lancamento_manual': {'lancamento'},
+    'sp_aprovar_lancamentos_lote': {'lancamento'},
+    'sp_reconstruir_saldo_caixa': {'saldo_caixa'},
+    'sp_reconstruir_resumo_mensal': {'resumo_mensal_conta'},
+    'sp_reconstruir_totais_folha': {'folha_elenco', 'folha_funcionarios'},
+    'sp_verificar_saldo_caixa': set(),
+    'sp_verificar_resumo_mensal': set(),
+}
+
+TODAS = '*'
+
+# espaços, comentários (-- ..., # ..., /* ... */) e parênteses antes da primeira palavra do comando
+_PREFIXO = re.compile(r'(?:\s+|(?:--|#)[^\n]*(?:\n|$)|/\*.*?\*/|\()*', re.DOTALL)
+_LEITURA = re.compile(r'\b(?:FROM|JOIN)\s+`?(\w+)`?', re.IGNORECASE)
+_SEM_ESCRITA = re.compile(r'\s*(SELECT|WITH|SHOW|EXPLAIN|DESCRIBE|SET|START|BEGIN|COMMIT|ROLLBACK)\b', re.IGNORECASE)
+_ESCRITAS = [
+    re.compile(r'\s*(?:INSERT|REPLACE)\s+(?:IGNORE\s+)?(?:INTO\s+)?`?(\w+)`?', re.IGNORECASE),
+    re.compile(r'\s*UPDATE\s+(?:IGNORE\s+)?`?(\w+)`?', re.IGNORECASE),
+    re.compile(r'\s*DELETE\s+(?:IGNORE\s+)?FROM\s+`?(\w+)`?', re.IGNORECASE),
+    re.compile(r'\s*TRUNCATE\s+(?:TABLE\s+)?`?(\w+)`?', re.IGNORECASE),
+]
+_CALL = re.compile(r'\s*CALL\s+`?(\w+)`?', re.IGNORECASE)
+
+
+def inicio_comando(sql):
+    """SQL a partir da primeira palavra do comando: '-- Consulta 1\n(SELECT ...' -> 'SELECT ...'."""
+    return sql[_PREFIXO.match(sql).end():]
+
+
+def tabelas_lidas(sql):
+    """Tabelas base lidas pelo SQL (views expandidas)."""
+    pendentes = [t.lower() for t in _LEITURA.findall(sql)]
+    tabelas = set()
+    while pendentes:
+        nome = pendentes.pop()
+        if nome in VIEWS_TABELAS:
+            pendentes.extend(VIEWS_TABELAS[nome])
+        else:
+            tabelas.add(nome)
+    return tabelas
+
+
+def _com_efeitos(tabelas):
+    resultado = set()
+    pendentes = list(tabelas)
+    while pendentes:
+        nome = pendentes.pop()
+        if nome not in resultado:
+            resultado.add(nome)
+            pendentes.extend(EFEITOS_TRIGGERS.get(nome, ()))
+    return resultado
+
+
+def tabelas_escritas(sql):
+    """Tabelas alteradas pelo SQL (com efeitos de triggers/procedures); {TODAS} se não for possível dizer."""
+    sql = inicio_comando(sql)
+    if _SEM_ESCRITA.match(sql):
+        return set()
+    m = _CALL.match(sql)
+    if m:
+        return tabelas_escritas_procedure(m.group(1))
+    for padrao in _ESCRITAS:
+        m = padrao.match(sql)
+        if m:
+            return _com_efeitos({m.group(1).lower()})
+    return {TODAS}
+
+
+def tabelas_escritas_procedure(nome):
+    efeitos = EFEITOS_PROCEDURES.get(nome.lower())
+    if efeitos is None:
+        return {TODAS}
+    return _com_efeitos(efeitos)
+
+
+class ResultCache:
+    """LRU + TTL de (colunas, linhas) por (SQL, parâmetros), com invalidação por tabela. Thread-safe."""
+
+    def __init__(self, max_entries=128, ttl=60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entradas = OrderedDict()  # chave -> (expira_em, tabelas, resultado)
+        self._versoes = {}               # tabela -> contador de escritas
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(sql, params):
+        return sql, tuple(params) if params else None
+
+    def versao(self, tabelas):
+        """Marca tomada antes de executar a leitura; put() descarta o resultado se alguma tabela mudou depois."""
+        with self._lock:
+            return tuple(self._versoes.get(t, 0) for t in sorted(tabelas)) + (self._versoes.get(TODAS, 0),)
+
+    def get(self, chave):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    del self._entradas[chave]
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.hits += 1
+            return entrada[2]
+
+    def put(self, chave, tabelas, resultado, versao):
+        if not tabelas:
+            return
+        with self._lock:
+            atual = tuple(self._versoes.get(t, 0) for t in sorted(tabelas)) + (self._versoes.get(TODAS, 0),)
+            if atual != versao:
+                return
+            self._entradas[chave] = (time.monotonic() + self.ttl, frozenset(tabelas), resultado)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+
+    def invalidate(self, tabelas):
+        """Remove as entradas que leem alguma das tabelas ({TODAS} limpa tudo)."""
+        if not tabelas:
+            return
+        with self._lock:
+            for t in tabelas:
+                self._versoes[t] = self._versoes.get(t, 0) + 1
+            if TODAS in tabelas:
+                removidas = list(self._entradas)
+            else:
+                removidas = [k for k, (_, lidas, _) in self._entradas.items() if lidas & tabelas]
+            for k in removidas:
+                del self._entradas[k]
+            self.invalidations += len(removidas)
+
+    def clear(self):
+        self.invalidate({TODAS})
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entradas),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'invalidations': self.invalidations,
+            }
+
+
+class _CursorMonitorado:
+    """Cursor que repassa tudo ao cursor real e registra as tabelas escritas."""
+
+    def __init__(self, cursor, conexao):
+        self._cursor = cursor
+        self._conexao = conexao
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._conexao._registrar(tabelas_escritas(operation))
+        return self._cursor.execute(operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._conexao._registrar(tabelas_escritas(operation))
+        return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+
+    def callproc(self, procname, args=(), *a, **kwargs):
+        self._conexao._registrar(tabelas_escritas_procedure(procname))
+        return self._cursor.callproc(procname, args, *a, **kwargs)
+
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class ConexaoMonitorada:
+    """Envolve a conexão do pool entregue por get_connection quando o cache está ativo: as tabelas
+    escritas são invalidadas já no execute e de novo no commit/rollback e na devolução ao pool
+    (para que leituras concorrentes não recoloquem no cache dados anteriores ao commit)."""
+
+    def __init__(self, conn, cache):
+        self._conn = conn
+        self._cache = cache
+        self._escritas = set()
+
+    def _registrar(self, tabelas):
+        if tabelas:
+            self._escritas |= tabelas
+            self._cache.invalidate(tabelas)
+
+    def _liberar(self):
+        if self._escritas:
+            self._cache.invalidate(self._escritas)
+            self._escritas = set()
+
+    def cursor(self, *args, **kwargs):
+        return _CursorMonitorado(self._conn.cursor(*args, **kwargs), self)
+
+    def commit(self):
+        self._conn.commit()
+        self._liberar()
+
+    def rollback(self):
+        self._conn.rollback()
+        self._liberar()
+
+    def close(self):
+        self._liberar()
+        self._conn.close()
+
+    def __getattr__(self, nome):
+        return getattr(self._conn, nome)
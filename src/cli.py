@@ -0,0 +1,254 @@
+"""
+Linha de comando para tarefas de manutenção do banco e jobs sem a interface gráfica.
+Uso: python -m src.cli <comando> <ação>
+"""
+import argparse
+import sys
+import time
+
+from .banco import DB_CONFIG, MONITOR_CONFIG, DatabaseManager
+from . import analitico, exportacao, folha_lote, manutencao, metricas, relatorios, servicos
+from .erros import ErroSistema
+
+
+def _cmd_resumo(db, args):
+    if args.acao == "reconstruir":
+        manutencao.reconstruir_resumo_mensal(db)
+        print("Resumo mensal reconstruído a partir do histórico.")
+
+    divergencias = manutencao.verificar_resumo_mensal(db)
+    if not divergencias:
+        print("Resumo mensal consistente com o histórico de lançamentos.")
+        return 0
+    for nome, detalhe in divergencias:
+        print(f"[{nome}] {detalhe}")
+    return 1
+
+
+def _cmd_saldo(db, args):
+    if args.acao == "reconstruir":
+        manutencao.reconstruir_saldo_caixa(db)
+        print("Saldo de caixa reconstruído a partir do histórico.")
+
+    mantido, historico, diferenca, situacao = manutencao.verificar_saldo_caixa(db)
+    print(f"Saldo mantido: {mantido} | histórico: {historico} | diferença: {diferenca} ({situacao})")
+    return 0 if diferenca == 0 else 1
+
+
+def _cmd_folha(db, args):
+    gerar = servicos.folha_mensal_elenco if args.tipo == "elenco" else servicos.folha_mensal_funcionarios
+    id_direcao = args.direcao
+    if id_direcao is None:
+        # o primeiro corpo com orçamento para o tipo (corpo_esportivo / corpo_financeiro)
+        encontrados = folha_lote.corpos(db, (args.tipo,))
+        if not encontrados:
+            print(f"Nenhum corpo com orçamento para folha de {args.tipo}.", file=sys.stderr)
+            return 1
+        id_direcao = encontrados[0][1]
+    id_folha, itens, total = gerar(db, id_direcao, args.competencia, args.pagamento)
+    print(f"Folha de {args.tipo} #{id_folha} gerada e aprovada: {itens} itens, total bruto R$ {total:,.2f}")
+    return 0
+
+
+def _cmd_folha_lote(db, args):
+    r = servicos.folhas_em_lote(db, args.inicio, args.meses, args.tipos, args.direcoes,
+                                folhas_por_transacao=args.bloco, simular=args.simular)
+    for problema in r['problemas']:
+        print(f"[recusaria] {problema}")
+    if r['problemas']:
+        print(f"Simulação: {r['folhas']} folhas planejadas, nada gravado ({len(r['problemas'])} problema(s)).")
+        return 1
+    acao = "gravadas e desfeitas (simulação)" if r['simulado'] else "geradas e aprovadas"
+    print(f"{r['folhas']} folhas {acao}: {r['itens']} itens, {r['alertas']} alertas, total bruto R$ {r['bruto']:,.2f}")
+    print(f"{r['segundos']:.2f} s | {r['folhas_s']:,.1f} folhas/s | {r['itens_s']:,.0f} itens/s")
+    return 0
+
+
+def _cmd_exportar(db, args):
+    if args.view:
+        sql = exportacao.sql_da_view(args.view)
+    elif args.consulta is not None:
+        sql = db.get_item_sql('queries_sistema', args.consulta)
+        if not sql:
+            print(f"Consulta {args.consulta} não encontrada em queries_sistema.", file=sys.stderr)
+            return 1
+    else:
+        sql = args.sql
+
+    def progresso(linhas):
+        print(f"\r{linhas:,} linhas", end='', file=sys.stderr, flush=True)
+
+    r = exportacao.exportar(db, sql, args.destino, lote=args.lote,
+                            ao_progresso=None if args.silencioso else progresso)
+    if not args.silencioso:
+        print(file=sys.stderr)
+    print(f"{r['linhas']:,} linhas em {r['segundos']:.2f}s ({r['linhas_s']:,.0f} linhas/s), "
+          f"{r['bytes']:,} bytes -> {args.destino}")
+    return 0
+
+
+def _cmd_importar(db, args):
+    r = servicos.importar_lancamentos(db, args.arquivo, args.direcao, tudo_ou_nada=args.tudo_ou_nada)
+    for linha, motivo in r['rejeitadas']:
+        print(f"linha {linha}: {motivo}")
+    for linha, valor, antes, depois in r['estouros']:
+        print(f"linha {linha}: saída de R$ {valor:,.2f} com saldo de R$ {antes:,.2f} (ficaria R$ {depois:,.2f})")
+    if r['estouros']:
+        print(f"Nada foi importado: {len(r['estouros'])} saída(s) deixariam o caixa negativo.")
+        return 1
+    print(f"{r['importados']:,} lançamento(s) importado(s), {len(r['rejeitadas'])} linha(s) rejeitada(s) "
+          f"em {r['segundos']:.2f}s ({r['linhas_s']:,.0f} linhas/s)")
+    return 1 if r['rejeitadas'] else 0
+
+
+def _cmd_analitico(db, args):
+    razao = analitico.Razao(db, args.cache)
+    carga = razao.atualizar()
+    print(f"{len(razao):,} lançamentos em memória ({carga['novos']:,} novos"
+          f"{', recarregado' if carga['recarregado'] else ''}) em {carga['segundos']:.2f}s", file=sys.stderr)
+    if args.relatorio == "conferir":
+        divergencias = razao.conferir()
+        if not divergencias:
+            print("Relatórios em memória iguais às consultas SQL.")
+            return 0
+        for nome, detalhe in divergencias:
+            print(f"[{nome}] {detalhe}")
+        return 1
+
+    relatorio = {
+        "balancete": razao.balancete,
+        "mensal": razao.balanco_mensal,
+        "trimestral": razao.resumo_trimestral,
+        "deficit": razao.deficit_mensal,
+    }[args.relatorio]
+    inicio = time.perf_counter()
+    colunas, linhas = relatorio()
+    print(f"{args.relatorio}: {len(linhas)} linha(s) em {(time.perf_counter() - inicio) * 1000:.1f} ms",
+          file=sys.stderr)
+    print("\t".join(colunas))
+    for linha in linhas:
+        print("\t".join("" if v is None else str(v) for v in linha))
+    return 0
+
+
+def _cmd_pacote(db, args):
+    if args.consultas is None and args.views is None:
+        itens = relatorios.itens_do_catalogo(db)
+    else:
+        itens = []
+        for tabela, ids in (('queries_sistema', args.consultas), ('views_sistema', args.views)):
+            if ids is not None:
+                nomes = dict(db.get_items(tabela)[1])
+                itens.extend((tabela, i, nomes.get(i, str(i))) for i in (ids or nomes))
+
+    def concluido(r):
+        situacao = f"ERRO: {r['erro']}" if r['erro'] else f"{len(r['linhas'] or []):,} linhas"
+        print(f"{r['segundos'] * 1000:>9.1f} ms  {r['tabela']} {r['id']} ({r['nome']}): {situacao}", file=sys.stderr)
+
+    pacote = relatorios.gerar_pacote(db, itens, args.concorrencia, concluido)
+    print(f"{len(pacote['itens'])} item(ns) com concorrência {pacote['concorrencia']}: "
+          f"{pacote['parede_s']:.2f}s de parede, {pacote['soma_itens_s']:.2f}s somando cada consulta "
+          f"(em média {pacote['paralelismo']:.1f} simultâneas)")
+    if args.serie:
+        serie = relatorios.gerar_pacote(db, itens, 1)
+        print(f"em série: {serie['parede_s']:.2f}s de parede (o pacote foi {serie['parede_s'] / pacote['parede_s']:.1f}x "
+              f"mais rápido)")
+    if args.saida:
+        arquivos = relatorios.salvar_pacote(pacote, args.saida, args.formato)
+        print(f"{len(arquivos)} arquivo(s) em {args.saida}")
+    return 1 if pacote['erros'] else 0
+
+
+def _cmd_lentas(args):
+    resumo = metricas.resumir_log(args.arquivo)
+    if not resumo:
+        print(f"Nenhuma consulta lenta registrada em {args.arquivo}.")
+        return 0
+    print(f"{'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'máx ms':>10}  consulta")
+    for r in resumo[:args.top]:
+        print(f"{r['execucoes']:>6} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f} {r['p99_ms']:>10.1f} "
+              f"{r['max_ms']:>10.1f}  {r['digital'][:args.largura]}")
+        for origem in r['origens']:
+            print(f"{'':>50}  ↳ {origem}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Manutenção do banco gestao_clube")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("resumo", help="resumo mensal por conta (resumo_mensal_conta)")
+    p.add_argument("acao", choices=["verificar", "reconstruir"])
+    p.set_defaults(func=_cmd_resumo)
+
+    p = sub.add_parser("saldo", help="saldo de caixa mantido (saldo_caixa)")
+    p.add_argument("acao", choices=["verificar", "reconstruir"])
+    p.set_defaults(func=_cmd_saldo)
+
+    p = sub.add_parser("folha", help="gera e aprova a folha do mês com o salário base (job do fim do mês)")
+    p.add_argument("tipo", choices=["elenco", "funcionarios"])
+    p.add_argument("--competencia", required=True, help="AAAA-MM-DD")
+    p.add_argument("--pagamento", help="AAAA-MM-DD (padrão: dia 5 do mês da competência)")
+    p.add_argument("--direcao", type=int, help="id do corpo (padrão: o de corpo_esportivo para elenco, o de corpo_financeiro para funcionários)")
+    p.set_defaults(func=_cmd_folha)
+
+    p = sub.add_parser("folha-lote", help="gera e aprova as folhas de vários meses e corpos de uma vez (planejamento, atrasados)")
+    p.add_argument("--inicio", required=True, help="primeiro mês, AAAA-MM")
+    p.add_argument("--meses", type=int, default=1, help="quantidade de meses (padrão: 1)")
+    p.add_argument("--tipos", nargs="+", choices=["elenco", "funcionarios"], default=["elenco", "funcionarios"])
+    p.add_argument("--direcoes", type=int, nargs="*", help="ids dos corpos (padrão: todos com orçamento)")
+    p.add_argument("--bloco", type=int, help="folhas por transação (padrão: o lote inteiro numa transação)")
+    p.add_argument("--simular", action="store_true", help="grava, aprova e desfaz: mede sem alterar o banco")
+    p.set_defaults(func=_cmd_folha_lote)
+
+    p = sub.add_parser("exportar", help="grava uma view ou consulta em CSV/JSONL (.gz opcional) sem carregar tudo na memória")
+    p.add_argument("destino", help="arquivo .csv, .jsonl, .csv.gz ou .jsonl.gz")
+    origem = p.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--view", help="nome da view (ex.: dados_privados)")
+    origem.add_argument("--consulta", type=int, help="id da consulta em queries_sistema")
+    origem.add_argument("--sql", help="SELECT arbitrário")
+    p.add_argument("--lote", type=int, default=exportacao.LOTE, help="linhas lidas do servidor por vez")
+    p.add_argument("--silencioso", action="store_true", help="não mostra o progresso")
+    p.set_defaults(func=_cmd_exportar)
+
+    p = sub.add_parser("importar", help="importa lançamentos manuais aprovados de um CSV (valor, tipo, conta, descricao, data)")
+    p.add_argument("arquivo")
+    p.add_argument("--direcao", type=int, default=3, help="id do corpo responsável (padrão: 3 financeiro)")
+    p.add_argument("--tudo-ou-nada", action="store_true", help="não grava nada se alguma linha for rejeitada")
+    p.set_defaults(func=_cmd_importar)
+
+    p = sub.add_parser("analitico", help="relatórios sobre a cópia colunar dos lançamentos aprovados")
+    p.add_argument("relatorio", choices=["balancete", "mensal", "trimestral", "deficit", "conferir"],
+                   help="mensal = Consulta 12, trimestral = Consulta 13, deficit = Consulta 14; "
+                        "conferir compara todos com o SQL")
+    p.add_argument("--cache", help="diretório para guardar as colunas entre execuções (requer numpy)")
+    p.set_defaults(func=_cmd_analitico)
+
+    p = sub.add_parser("pacote", help="executa consultas/views do catálogo em paralelo (fechamento do mês)")
+    p.add_argument("--consultas", type=int, nargs="*", help="ids de queries_sistema (sem ids: todas)")
+    p.add_argument("--views", type=int, nargs="*", help="ids de views_sistema (sem ids: todas)")
+    p.add_argument("--concorrencia", type=int, help="consultas simultâneas (padrão: max_size do pool - 1)")
+    p.add_argument("--serie", action="store_true", help="executa de novo em série para comparar")
+    p.add_argument("--saida", help="diretório onde gravar um arquivo por resultado")
+    p.add_argument("--formato", choices=exportacao.FORMATOS, default="csv")
+    p.set_defaults(func=_cmd_pacote)
+
+    p = sub.add_parser("lentas", help="p50/p95/p99 por consulta a partir do log de consultas lentas")
+    p.add_argument("--arquivo", default=MONITOR_CONFIG['arquivo'])
+    p.add_argument("--top", type=int, default=20, help="quantas consultas listar (maior tempo total primeiro)")
+    p.add_argument("--largura", type=int, default=120, help="caracteres do SQL exibidos")
+    p.set_defaults(func=_cmd_lentas, sem_banco=True)
+
+    args = parser.parse_args(argv)
+    if getattr(args, 'sem_banco', False):
+        return args.func(args)
+    try:
+        db = DatabaseManager(DB_CONFIG)
+        return args.func(db, args)
+    except (ErroSistema, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Tabela colunar em memória para ordenar e buscar nas grades sem voltar ao banco.
+
+Cada coluna é uma lista de valores com tipo inferido (número, data ou texto; texto que sempre
+representa número, como '1234.56', conta como número). A permutação ordenada de cada coluna é
+calculada na primeira ordenação por ela e reaproveitada; a decrescente é a mesma permutação invertida,
+com os vazios sempre no fim. A busca procura o termo (sem diferenciar maiúsculas nem acentos) no texto
+de cada linha, calculado uma única vez; um termo que estende o anterior só examina as linhas que já
+casavam. Filtros por coluna na busca ('valor>1000', 'conta:folha'; paginacao.separar_filtros) comparam
+pelo tipo da coluna, com a mesma sintaxe da filtragem no servidor (paginacao.FonteFiltrada).
+"""
+import re
+import unicodedata
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from .paginacao import FonteLista, separar_filtros, valor_digitado
+
+LIMITE = 200_000  # linhas lidas de uma fonte paginada para ordenar/buscar em memória
+LOTE = 10_000     # tamanho das páginas nessa leitura
+
+
+class ResultadoGrande(ValueError):
+    """Resultado maior que o limite para ordenar/buscar em memória."""
+
+
+NUMERO, DATA, TEXTO = 'numero', 'data', 'texto'
+
+_NUMERO_TEXTO = re.compile(r'[+-]?(\d[\d.,]*|[.,]\d+)')
+
+# letras latinas acentuadas -> sem acento, aplicado com str.translate (bem mais rápido que NFKD por valor)
+_SEM_ACENTO = {
+    c: ''.join(d for d in unicodedata.normalize('NFKD', chr(c)) if not unicodedata.combining(d))
+    for c in range(0xC0, 0x250)
+}
+
+
+def normalizar(valor):
+    """Texto em minúsculas e sem acentos, para comparação na busca."""
+    texto = str(valor)
+    if texto.isascii():
+        return texto.lower()
+    return texto.casefold().translate(_SEM_ACENTO)
+
+
+def _numero_texto(texto):
+    """'1234.56', '1.234,56', 'R$ 10' -> Decimal exato; None se o texto não for um número."""
+    t = texto.replace('R$', '').replace(' ', '').strip()
+    if not _NUMERO_TEXTO.fullmatch(t):
+        return None
+    if ',' in t:
+        t = t.replace('.', '').replace(',', '.')
+    try:
+        return Decimal(t)
+    except InvalidOperation:
+        return None
+
+
+def _vazio(valor):
+    return valor is None or valor == ''
+
+
+def _tipo(valores):
+    tipo = None
+    for v in valores:
+        if _vazio(v):
+            continue
+        if isinstance(v, (int, float, Decimal, timedelta)) and not isinstance(v, bool):
+            atual = NUMERO
+        elif isinstance(v, (date, datetime)):
+            atual = DATA
+        elif isinstance(v, str) and _numero_texto(v) is not None:
+            atual = NUMERO
+        else:
+            return TEXTO
+        if tipo is None:
+            tipo = atual
+        elif tipo != atual:
+            return TEXTO
+    return tipo or TEXTO
+
+
+def _chave_numero(v):
+    # Decimal/int exatos (como no MySQL): Decimal('10.10') == 10.1 seria falso com float
+    if isinstance(v, str):
+        return _numero_texto(v)
+    if isinstance(v, float):
+        return Decimal(repr(v))
+    if isinstance(v, timedelta):
+        return Decimal(v.days * 86400 + v.seconds) + Decimal(v.microseconds).scaleb(-6)
+    return v
+
+
+def _chave_data(v):
+    # date e datetime na mesma coluna: compara tudo como datetime
+    return v if isinstance(v, datetime) else datetime(v.year, v.month, v.day)
+
+
+_CHAVES = {NUMERO: _chave_numero, DATA: _chave_data, TEXTO: normalizar}
+
+_COMPARACOES = {
+    '=': lambda a, b: a == b, '!=': lambda a, b: a != b,
+    '>': lambda a, b: a > b, '<': lambda a, b: a < b,
+    '>=': lambda a, b: a >= b, '<=': lambda a, b: a <= b,
+}
+
+
+def _alvo(tipo, valor):
+    """Valor digitado num filtro convertido para a chave de ordenação da coluna (None se não converter)."""
+    valor = valor_digitado(valor)
+    if tipo == DATA:
+        try:
+            return _chave_data(datetime.fromisoformat(valor))
+        except ValueError:
+            return None
+    return _CHAVES[tipo](valor)
+
+
+class _Visao:
+    """Sequência das linhas da tabela na ordem de `indices` (materializadas só quando lidas)."""
+
+    def __init__(self, tabela, indices):
+        self._tabela = tabela
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, posicao):
+        if isinstance(posicao, slice):
+            return [self._tabela.linha(i) for i in self._indices[posicao]]
+        return self._tabela.linha(self._indices[posicao])
+
+
+class TabelaColunar:
+    """Linhas guardadas por coluna, com ordenação e busca. ordenar()/buscar() definem a visão atual;
+    indices() e fonte() a entregam (índices das linhas originais / fonte paginada para as grades)."""
+
+    def __init__(self, colunas, linhas):
+        self.colunas = list(colunas)
+        self.tamanho = len(linhas)
+        self._dados = [list(c) for c in zip(*linhas)] if linhas else [[] for _ in self.colunas]
+        self._tipos = {}
+        self._ordens = {}  # coluna -> (índices com valor em ordem crescente, índices vazios)
+        self._texto = None
+        self._filtros = []
+        self._base = None   # linhas que passam pelos filtros por coluna (None = todas)
+        self._termo = ''
+        self._casam = None  # linhas da base que contêm _termo (None = todas)
+        self.ordem = None   # (coluna, decrescente)
+
+    def linha(self, i):
+        return tuple(c[i] for c in self._dados)
+
+    def tipo(self, coluna):
+        """NUMERO, DATA ou TEXTO, inferido na primeira consulta."""
+        if coluna not in self._tipos:
+            self._tipos[coluna] = _tipo(self._dados[coluna])
+        return self._tipos[coluna]
+
+    def _permutacao(self, coluna):
+        if coluna not in self._ordens:
+            chave = _CHAVES[self.tipo(coluna)]
+            valores = self._dados[coluna]
+            cheios, vazios = [], []
+            chaves = [None] * self.tamanho
+            for i, v in enumerate(valores):
+                if _vazio(v):
+                    vazios.append(i)
+                else:
+                    cheios.append(i)
+                    chaves[i] = chave(v)
+            cheios.sort(key=chaves.__getitem__)
+            self._ordens[coluna] = (cheios, vazios)
+        return self._ordens[coluna]
+
+    def ordenar(self, coluna, decrescente=False):
+        """Ordena a visão pela coluna (índice ou nome); coluna None volta à ordem original."""
+        if coluna is None:
+            self.ordem = None
+            return
+        if isinstance(coluna, str):
+            coluna = self.colunas.index(coluna)
+        self._permutacao(coluna)
+        self.ordem = (coluna, decrescente)
+
+    def buscar(self, texto):
+        """Restringe a visão às linhas que passam pelos filtros por coluna e contêm o termo livre em
+        qualquer coluna ('' = todas)."""
+        filtros, termo = separar_filtros(texto, self.colunas)
+        if filtros != self._filtros:
+            self._filtros = filtros
+            self._base = self._filtrar(filtros) if filtros else None
+            self._termo = ''
+        termo = normalizar(termo.strip())
+        if not termo:
+            self._termo, self._casam = '', self._base
+            return
+        if self._texto is None:
+            self._texto = ['\x1f'.join(t) for t in zip(*map(self._texto_coluna, self._dados))]
+        if self._termo and termo.startswith(self._termo):
+            candidatas = self._casam
+        else:
+            candidatas = range(self.tamanho) if self._base is None else self._base
+        texto = self._texto
+        self._casam = [i for i in candidatas if termo in texto[i]]
+        self._termo = termo
+
+    def _filtrar(self, filtros):
+        linhas = range(self.tamanho)
+        for f in filtros:
+            coluna = self.colunas.index(f.coluna)
+            valores = self._dados[coluna]
+            if f.operador == ':':
+                trecho = normalizar(f.valor.strip())
+                texto = self._texto_coluna(valores)
+                linhas = [i for i in linhas if trecho in texto[i]]
+                continue
+            tipo = self.tipo(coluna)
+            alvo = _alvo(tipo, f.valor)
+            if alvo is None:
+                return []
+            chave, comparar = _CHAVES[tipo], _COMPARACOES[f.operador]
+            # vazios nunca passam (como NULL no SQL)
+            linhas = [i for i in linhas if not _vazio(valores[i]) and comparar(chave(valores[i]), alvo)]
+        return list(linhas)
+
+    @staticmethod
+    def _texto_coluna(valores):
+        if not isinstance(next((v for v in valores if v is not None), None), str):
+            # números e datas: o texto já está em minúsculas e sem acento
+            return ['' if v is None else normalizar(v) if isinstance(v, str) else str(v) for v in valores]
+        # cada texto distinto é normalizado uma vez (tipo, conta, direção se repetem muito)
+        memo = {None: '', '': ''}
+        return [memo[v] if v in memo else memo.setdefault(v, normalizar(v)) for v in valores]
+
+    def indices(self):
+        """Índices das linhas da visão atual, na ordem atual."""
+        if self.ordem is None:
+            return list(range(self.tamanho)) if self._casam is None else list(self._casam)
+        coluna, decrescente = self.ordem
+        cheios, vazios = self._ordens[coluna]
+        ordem = (cheios[::-1] if decrescente else cheios) + vazios
+        if self._casam is None:
+            return ordem
+        casam = bytearray(self.tamanho)
+        for i in self._casam:
+            casam[i] = 1
+        return [i for i in ordem if casam[i]]
+
+    def fonte(self):
+        """Fonte paginada (FonteLista) da visão atual."""
+        return FonteLista(self.colunas, _Visao(self, self.indices()))
+
+
+def tabela_da_fonte(fonte, limite=LIMITE, lote=LOTE):
+    """TabelaColunar com todas as linhas de uma fonte paginada (src/paginacao.py), lidas em páginas de
+    `lote`. ResultadoGrande se o resultado passar de `limite` linhas."""
+    pagina = fonte.primeira(lote)
+    linhas = list(pagina.linhas)
+    while pagina.tem_seguinte:
+        if len(linhas) > limite:
+            raise ResultadoGrande(f"Resultado com mais de {limite:,} linhas: ordene e filtre no servidor")
+        pagina = fonte.seguinte(pagina.fim, lote)
+        linhas.extend(pagina.linhas)
+    return TabelaColunar(fonte.colunas or [], linhas)
@@ -0,0 +1,141 @@
+"""
+Modelo do editor de folha (elenco e funcionários), sem interface e sem banco.
+
+Os valores ficam em centavos inteiros: a conversão arredonda como o MySQL ao gravar em DECIMAL(10,2)
+(meio centavo para longe do zero), então os totais batem com vw_item_folha_*_calculado e com os
+totais que os triggers tr_totais_item_folha_* mantêm no cabeçalho. Cada edição retira a contribuição
+antiga do item e soma a nova, como esses triggers: bruto, líquido, direitos de imagem e a utilização do
+orçamento do mês são atualizados em O(1), sem percorrer os demais itens.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from .erros import DadosInvalidos
+
+# campos de cada item e os que entram no valor bruto (o líquido desconta `descontos`)
+CAMPOS = {
+    'elenco': ('salario_base', 'bonus', 'direito_imagem', 'parcela_luvas', 'descontos'),
+    'funcionarios': ('salario_base', 'bonus', 'descontos', 'adicionais'),
+}
+BRUTO = {
+    'elenco': ('salario_base', 'bonus', 'direito_imagem', 'parcela_luvas'),
+    'funcionarios': ('salario_base', 'bonus', 'adicionais'),
+}
+CHAVE = {'elenco': 'id_elenco', 'funcionarios': 'id_funcionario'}
+
+ALERTA_PERCENTUAL = 80  # como tr_alerta_orcamento_critico_*
+
+_CENTAVO = Decimal('0.01')
+
+
+def centavos(valor, campo='valor'):
+    """Decimal, int, float ou texto ('1234.56', '1.234,56', '1234,5') -> centavos (int)."""
+    if isinstance(valor, str):
+        texto = valor.strip().replace('R$', '').replace(' ', '')
+        if ',' in texto:
+            texto = texto.replace('.', '').replace(',', '.')
+        valor = texto or '0'
+    elif isinstance(valor, float):
+        valor = repr(valor)  # o menor decimal que representa o float (0.1 -> '0.1')
+    elif valor is None:
+        valor = 0
+    try:
+        quantia = Decimal(valor).quantize(_CENTAVO, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError):
+        raise DadosInvalidos(f"{campo}: número inválido") from None
+    if not quantia.is_finite():
+        raise DadosInvalidos(f"{campo}: número inválido")
+    return int(quantia * 100)
+
+
+def reais(cents):
+    """Centavos -> Decimal com duas casas (o tipo que o conector grava em DECIMAL)."""
+    return Decimal(cents).scaleb(-2)
+
+
+def formatar(cents):
+    """'1234.56' (como a grade mostra os valores)."""
+    sinal = '-' if cents < 0 else ''
+    return f"{sinal}{abs(cents) // 100}.{abs(cents) % 100:02d}"
+
+
+class EditorFolha:
+    """Itens de uma folha em edição, com os totais correntes.
+
+    tipo: 'elenco' ou 'funcionarios'. itens: dicts com a chave do tipo (id_elenco / id_funcionario) e
+    os valores (ausentes = 0). orcamento, gasto_mes e saldo (centavos, ver definir_orcamento) vêm do
+    banco para o mês de competência; gasto_mes soma as folhas já aprovadas/pagas do corpo no mês.
+    """
+
+    def __init__(self, tipo, itens):
+        if tipo not in CAMPOS:
+            raise DadosInvalidos(f"tipo de folha: use {', '.join(CAMPOS)}")
+        self.tipo = tipo
+        self.campos = CAMPOS[tipo]
+        self._bruto_campos = BRUTO[tipo]
+        self.chave = CHAVE[tipo]
+        self.itens = {}
+        self.bruto = self.liquido = self.direitos = 0
+        self.orcamento = self.gasto_mes = self.saldo = None
+        for item in itens:
+            valores = {c: centavos(item.get(c, 0), c) for c in self.campos}
+            self.itens[item[self.chave]] = valores
+            self._somar(valores, 1)
+
+    def _somar(self, valores, sinal):
+        bruto = sum(valores[c] for c in self._bruto_campos)
+        self.bruto += sinal * bruto
+        self.liquido += sinal * (bruto - valores['descontos'])
+        self.direitos += sinal * valores.get('direito_imagem', 0)
+
+    def editar(self, id_item, valores):
+        """Troca os valores informados (campo -> número ou texto) de um item. Valida tudo antes de
+        alterar; DadosInvalidos se algum valor for inválido ou negativo."""
+        atual = self.itens[id_item]
+        novo = dict(atual)
+        for campo, valor in valores.items():
+            if campo not in novo:
+                raise DadosInvalidos(f"{campo}: campo inexistente na folha de {self.tipo}")
+            novo[campo] = centavos(valor, campo)
+            if novo[campo] < 0:
+                raise DadosInvalidos(f"{campo}: deve ser no mínimo 0")
+        self._somar(atual, -1)
+        self._somar(novo, 1)
+        self.itens[id_item] = novo
+        return novo
+
+    def definir_orcamento(self, orcamento, gasto_mes, saldo=None):
+        """Orçamento mensal do corpo, total já aprovado no mês e saldo de caixa (Decimal ou centavos)."""
+        self.orcamento = None if orcamento is None else centavos(orcamento, 'orçamento')
+        self.gasto_mes = centavos(gasto_mes or 0, 'gasto do mês')
+        self.saldo = None if saldo is None else centavos(saldo, 'saldo')
+
+    def utilizacao(self):
+        """Percentual do orçamento do mês usado com esta folha (como os triggers), ou None sem orçamento."""
+        if not self.orcamento:
+            return None
+        return float(Decimal((self.gasto_mes + self.bruto) * 100) / self.orcamento)
+
+    def disponivel(self):
+        """Orçamento do mês que sobra depois desta folha (centavos), ou None sem orçamento."""
+        if self.orcamento is None:
+            return None
+        return self.orcamento - self.gasto_mes - self.bruto
+
+    def problemas(self):
+        """Motivos pelos quais a aprovação seria recusada (tr_validar_orcamento_*), [] se nenhum."""
+        motivos = []
+        if self.orcamento is not None and self.disponivel() < 0:
+            motivos.append(f"orçamento do mês excedido em R$ {formatar(-self.disponivel())}")
+        if self.saldo is not None and self.saldo < self.bruto:
+            motivos.append(f"saldo em caixa insuficiente (R$ {formatar(self.saldo)})")
+        return motivos
+
+    def linha(self, id_item):
+        """Valores formatados do item, na ordem de `campos`."""
+        valores = self.itens[id_item]
+        return tuple(formatar(valores[c]) for c in self.campos)
+
+    def valores(self):
+        """Itens como dicts com Decimal (formato de folha.gerar_folha_*)."""
+        return [dict({c: reais(v[c]) for c in self.campos}, **{self.chave: id_item})
+                for id_item, v in self.itens.items()]
@@ -0,0 +1,66 @@
+"""
+Exceções do sistema, independentes da interface. Os serviços (src/servicos.py) só levantam estas;
+erros do MySQL são traduzidos por traduzir_erro.
+"""
+
+
+class ErroSistema(Exception):
+    """Base de todos os erros de regra de negócio e de banco levantados pelos serviços."""
+
+
+class DadosInvalidos(ErroSistema, ValueError):
+    """Entrada rejeitada antes de chegar ao banco (número, data, tipo ou campo obrigatório)."""
+
+
+class NaoEncontrado(ErroSistema):
+    """O registro pedido não existe (ou não está no estado esperado)."""
+
+
+class SaldoInsuficiente(ErroSistema):
+    """A operação deixaria o caixa negativo (validação dos triggers/procedures)."""
+
+
+class OrcamentoExcedido(ErroSistema):
+    """A folha ultrapassa o orçamento mensal do corpo (tr_validar_orcamento_*)."""
+
+
+class Duplicado(ErroSistema):
+    """Violação de chave única (contrato, placa, CPF, ...)."""
+
+
+class Referenciado(ErroSistema):
+    """Registro ainda referenciado por outro (chave estrangeira)."""
+
+
+class ErroBanco(ErroSistema):
+    """Qualquer outro erro do MySQL; o original fica em __cause__."""
+
+
+class ErroConexao(ErroBanco):
+    """Não foi possível abrir conexão com o banco."""
+
+
+def traduzir_erro(e):
+    """Exceção tipada equivalente a um mysql.connector.Error (o chamador faz `raise ... from e`)."""
+    # importado aqui: a interface usa este módulo antes de carregar o driver (ver banco._driver)
+    from mysql.connector import Error, errorcode
+    if not isinstance(e, Error):
+        return e
+    mensagem = e.msg if getattr(e, 'msg', None) else str(e)
+    if e.sqlstate == '45000':
+        texto = mensagem.lower()
+        if 'saldo insuficiente' in texto:
+            return SaldoInsuficiente(mensagem)
+        if 'orçamento' in texto or 'orcamento' in texto:
+            return OrcamentoExcedido(mensagem)
+        return ErroSistema(mensagem)
+    if e.errno == errorcode.ER_DUP_ENTRY:
+        return Duplicado(mensagem)
+    if e.errno in (errorcode.ER_ROW_IS_REFERENCED, errorcode.ER_ROW_IS_REFERENCED_2):
+        return Referenciado(mensagem)
+    if e.errno in (errorcode.ER_NO_REFERENCED_ROW, errorcode.ER_NO_REFERENCED_ROW_2):
+        return NaoEncontrado(mensagem)
+    if e.errno in (errorcode.CR_CONNECTION_ERROR, errorcode.CR_CONN_HOST_ERROR, errorcode.ER_ACCESS_DENIED_ERROR,
+                   errorcode.ER_BAD_DB_ERROR):
+        return ErroConexao(mensagem)
+    return ErroBanco(mensagem)
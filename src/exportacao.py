@@ -0,0 +1,148 @@
+"""
+Exportação de views e consultas para arquivo (CSV ou JSON por linha, opcionalmente .gz).
+
+As linhas vêm de um cursor não bufferizado (o servidor envia o resultado aos poucos) e são gravadas
+em blocos de `lote`; a memória usada não depende do tamanho do resultado.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import time
+
+from .paginacao import FonteConsulta, FonteKeyset
+from .snapshot import FonteSnapshot
+
+FORMATOS = ('csv', 'jsonl')
+LOTE = 5000
+
+_IDENTIFICADOR = re.compile(r'\w+')
+
+
+def formato_do_arquivo(destino):
+    """('csv' | 'jsonl', comprimir) pela extensão: .csv, .jsonl/.json, com .gz opcional no final."""
+    nome = destino.lower()
+    comprimir = nome.endswith('.gz')
+    if comprimir:
+        nome = nome[:-3]
+    if nome.endswith('.csv'):
+        return 'csv', comprimir
+    if nome.endswith('.jsonl') or nome.endswith('.json'):
+        return 'jsonl', comprimir
+    raise ValueError(f"Extensão não suportada: {destino} (use .csv, .jsonl, com .gz opcional)")
+
+
+def sql_da_view(view):
+    if not _IDENTIFICADOR.fullmatch(view or ''):
+        raise ValueError(f"Nome de view inválido: {view}")
+    return f"SELECT * FROM {view}"
+
+
+def _abrir(destino, comprimir):
+    if comprimir:
+        # compressão rápida: o gargalo deve continuar sendo o banco
+        return io.TextIOWrapper(gzip.open(destino, 'wb', compresslevel=1), encoding='utf-8', newline='')
+    return open(destino, 'w', encoding='utf-8', newline='')
+
+
+def _valor_json(valor):
+    # Decimal, date, datetime, timedelta -> texto (datas em ISO); bytes como texto utf-8
+    if isinstance(valor, (bytes, bytearray)):
+        return valor.decode('utf-8', 'replace')
+    return str(valor)
+
+
+def escrever(colunas, lotes, destino, formato=None, comprimir=None, ao_progresso=None):
+    """Grava `lotes` (iterável de listas de linhas) em `destino`. Retorna a quantidade de linhas.
+    ao_progresso(linhas) é chamado a cada lote gravado."""
+    if formato is None or comprimir is None:
+        detectado, gz = formato_do_arquivo(destino)
+        formato = formato or detectado
+        comprimir = gz if comprimir is None else comprimir
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato não suportado: {formato}")
+
+    total = 0
+    with _abrir(destino, comprimir) as f:
+        if formato == 'csv':
+            escritor = csv.writer(f)
+            escritor.writerow(colunas)
+            for linhas in lotes:
+                escritor.writerows(linhas)
+                total += len(linhas)
+                if ao_progresso:
+                    ao_progresso(total)
+        else:
+            codificar = json.JSONEncoder(ensure_ascii=False, default=_valor_json).encode
+            for linhas in lotes:
+                f.write(''.join(codificar(dict(zip(colunas, linha))) + '\n' for linha in linhas))
+                total += len(linhas)
+                if ao_progresso:
+                    ao_progresso(total)
+    return total
+
+
+def _estatisticas(linhas, inicio, destino):
+    segundos = time.perf_counter() - inicio
+    return {
+        'linhas': linhas,
+        'segundos': segundos,
+        'linhas_s': linhas / segundos if segundos > 0 else 0.0,
+        'bytes': os.path.getsize(destino),
+    }
+
+
+def exportar(db, sql, destino, params=None, formato=None, comprimir=None, lote=LOTE, ao_progresso=None):
+    """Executa `sql` num cursor não bufferizado e grava o resultado em `destino`.
+    Retorna {'linhas', 'segundos', 'linhas_s', 'bytes'}."""
+    inicio = time.perf_counter()
+    with db.get_connection() as conn:
+        cursor = conn.cursor(buffered=False)
+        try:
+            cursor.execute(sql, params) if params else cursor.execute(sql)
+            if not cursor.description:
+                raise ValueError("O comando não retorna linhas")
+            colunas = [d[0] for d in cursor.description]
+
+            def lotes():
+                while True:
+                    linhas = cursor.fetchmany(lote)
+                    if not linhas:
+                        return
+                    yield linhas
+
+            linhas = escrever(colunas, lotes(), destino, formato, comprimir, ao_progresso)
+        finally:
+            # resultado interrompido no meio: descarta o restante antes de devolver a conexão ao pool
+            try:
+                cursor.close()
+            except Exception:
+                conn.consume_results()
+    return _estatisticas(linhas, inicio, destino)
+
+
+def sql_da_fonte(fonte):
+    """(sql, params) equivalente a uma fonte paginada de src/paginacao.py, na mesma ordem da grade;
+    None para FonteLista (linhas já em memória)."""
+    if isinstance(fonte, FonteSnapshot):
+        # o snapshot guarda só o início da view: exporta pela fonte real, com todas as linhas
+        return sql_da_fonte(fonte.real)
+    if isinstance(fonte, FonteKeyset):
+        ordem = ", ".join(f"{k} DESC" for k in fonte.chaves)
+        return f"SELECT * FROM {fonte.tabela} ORDER BY {ordem}", None
+    if isinstance(fonte, FonteConsulta):
+        return fonte.sql, fonte.params
+    return None
+
+
+def exportar_fonte(db, fonte, destino, **kwargs):
+    """exportar() da consulta por trás de uma grade; fontes em memória são gravadas direto."""
+    consulta = sql_da_fonte(fonte)
+    if consulta is not None:
+        return exportar(db, consulta[0], destino, params=consulta[1], **kwargs)
+    inicio = time.perf_counter()
+    linhas = escrever(fonte.colunas, [fonte.primeira(fonte.contar()).linhas], destino,
+                      kwargs.get('formato'), kwargs.get('comprimir'))
+    return _estatisticas(linhas, inicio, destino)
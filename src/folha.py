@@ -0,0 +1,88 @@
+"""
+Geração de folhas de pagamento (elenco e funcionários): cabeçalho, itens e aprovação numa única transação.
+Os itens são gravados em lote com executemany, que o conector reescreve em INSERTs multi-linha.
+"""
+from mysql.connector import Error
+
+# linhas por INSERT multi-linha (mantém cada comando bem abaixo do max_allowed_packet)
+TAMANHO_LOTE = 500
+
+SQL_ITEM_ELENCO = """
+    INSERT INTO item_folha_e (salario_base, bonus, direito_imagem, parcela_luvas, descontos, id_folha_elenco, id_elenco)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+SQL_ITEM_FUNCIONARIOS = """
+    INSERT INTO item_folha_f (salario_base, bonus, descontos, adicionais, id_folha_funcionarios, id_funcionario)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+
+def _em_lotes(cursor, sql, linhas, tamanho=TAMANHO_LOTE):
+    for i in range(0, len(linhas), tamanho):
+        cursor.executemany(sql, linhas[i:i + tamanho])
+
+
+def linhas_itens_elenco(id_folha, itens):
+    """itens: dicts com id_elenco, salario_base, bonus, direito_imagem, parcela_luvas e descontos."""
+    return [(v['salario_base'], v['bonus'], v['direito_imagem'], v['parcela_luvas'], v['descontos'],
+             id_folha, v['id_elenco']) for v in itens]
+
+
+def linhas_itens_funcionarios(id_folha, itens):
+    """itens: dicts com id_funcionario, salario_base, bonus, descontos e adicionais."""
+    return [(v['salario_base'], v['bonus'], v['descontos'], v['adicionais'],
+             id_folha, v['id_funcionario']) for v in itens]
+
+
+def inserir_itens_elenco(cursor, id_folha, itens, tamanho_lote=TAMANHO_LOTE):
+    _em_lotes(cursor, SQL_ITEM_ELENCO, linhas_itens_elenco(id_folha, itens), tamanho_lote)
+
+
+def inserir_itens_funcionarios(cursor, id_folha, itens, tamanho_lote=TAMANHO_LOTE):
+    _em_lotes(cursor, SQL_ITEM_FUNCIONARIOS, linhas_itens_funcionarios(id_folha, itens), tamanho_lote)
+
+
+def gerar_folha_elenco(db, id_direcao, data_competencia, data_pagamento, itens, id_aprovador=1, id_conta=8):
+    """Cria a folha de elenco com os itens e aprova via sp_aprovar_folha_elenco. Retorna o id da folha."""
+    itens = list(itens)
+    valor_direitos = sum(v['direito_imagem'] for v in itens)
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO folha_elenco (data_competencia, data_pagamento, valor_direitos_imagem, status, id_direcao)
+                VALUES (%s, %s, %s, 'pendente', %s)
+            """, (data_competencia, data_pagamento, valor_direitos, id_direcao))
+            id_folha = cursor.lastrowid
+            inserir_itens_elenco(cursor, id_folha, itens)
+            cursor.execute("CALL sp_aprovar_folha_elenco(%s, %s, %s)", (id_folha, id_aprovador, id_conta))
+            conn.commit()
+            return id_folha
+        except Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def gerar_folha_funcionarios(db, id_direcao, data_competencia, data_pagamento, itens, id_aprovador=1, id_conta=9):
+    """Cria a folha de funcionários com os itens e aprova via sp_aprovar_folha_funcionarios. Retorna o id da folha."""
+    itens = list(itens)
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO folha_funcionarios (data_competencia, data_pagamento, status, id_direcao)
+                VALUES (%s, %s, 'pendente', %s)
+            """, (data_competencia, data_pagamento, id_direcao))
+            id_folha = cursor.lastrowid
+            inserir_itens_funcionarios(cursor, id_folha, itens)
+            cursor.execute("CALL sp_aprovar_folha_funcionarios(%s, %s, %s)", (id_folha, id_aprovador, id_conta))
+            conn.commit()
+            return id_folha
+        except Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
@@ -0,0 +1,231 @@
+"""
+Folhas em lote: N meses x M corpos (elenco e funcionários) numa execução, para o planejamento da
+temporada e para pôr em dia meses atrasados.
+
+Em vez de uma transação e um CALL sp_aprovar_folha_* por folha, o lote, em cada transação (o lote
+inteiro ou blocos de `folhas_por_transacao` folhas):
+1. grava os cabeçalhos pendentes e os itens com INSERTs multi-linha (totais calculados uma vez, em
+   centavos inteiros, por src/editor_folha.py);
+2. aprova as folhas de cada tipo com um único CALL sp_aprovar_folhas_*_lote (bd/Banco.sql), que
+   passa pelos mesmos triggers de orçamento, saldo e alerta de sp_aprovar_folha_*. As regras ficam
+   só no banco; um lote recusado é desfeito inteiro.
+
+Os triggers dos itens continuam mantendo valor_bruto/valor_liquido_total nos cabeçalhos, e os de
+lancamento, o saldo de caixa e o resumo mensal. Os itens vão com VALUES, nunca com INSERT ... SELECT
+que leia folha_*: o trigger do item atualiza o cabeçalho, e o MySQL recusaria o comando (erro 1442).
+"""
+import json
+import time
+from datetime import date
+
+from mysql.connector import Error
+
+from .editor_folha import EditorFolha, reais
+from .erros import ErroBanco, ErroSistema, traduzir_erro
+from .folha import (SQL_ITEM_ELENCO, SQL_ITEM_FUNCIONARIOS, TAMANHO_LOTE, linhas_itens_elenco,
+                    linhas_itens_funcionarios)
+
+DIA_PAGAMENTO = 5
+CONTAS = {'elenco': 8, 'funcionarios': 9}  # contas padrão de gerar_folha_* (folha.py)
+
+# por tipo: tabela do corpo (orçamento), tabela das folhas, chave e procedure de aprovação em lote
+TIPOS = {
+    'elenco': {
+        'corpo': 'corpo_esportivo', 'tabela': 'folha_elenco', 'chave': 'id_folha_elenco',
+        'aprovar': 'sp_aprovar_folhas_elenco_lote',
+    },
+    'funcionarios': {
+        'corpo': 'corpo_financeiro', 'tabela': 'folha_funcionarios', 'chave': 'id_folha_funcionarios',
+        'aprovar': 'sp_aprovar_folhas_funcionarios_lote',
+    },
+}
+
+
+# ==================== PLANO ====================
+
+def meses(inicio, quantidade):
+    """'AAAA-MM' ou data -> `quantidade` competências ('AAAA-MM-01') a partir do mês de `inicio`."""
+    texto = inicio.isoformat() if isinstance(inicio, date) else str(inicio).strip()
+    ano, mes = int(texto[:4]), int(texto[5:7])
+    competencias = []
+    for _ in range(quantidade):
+        competencias.append(f"{ano:04d}-{mes:02d}-01")
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return competencias
+
+
+def _mes_seguinte(competencia):
+    return meses(competencia, 2)[1]
+
+
+def corpos(db, tipos=tuple(TIPOS)):
+    """[(tipo, id_direcao)] de todos os corpos com orçamento para os tipos pedidos."""
+    encontrados = []
+    for tipo in tipos:
+        cols, rows = db.run_query(f"SELECT id_direcao FROM {TIPOS[tipo]['corpo']} ORDER BY id_direcao",
+                                  usar_cache=False)
+        encontrados.extend((tipo, r[0]) for r in rows or [])
+    return encontrados
+
+
+def _elenco(db, id_direcao):
+    # atletas do corpo com as datas do contrato e o último salário base pago (como jogadores_para_folha)
+    cols, rows = db.run_query("""
+        SELECT e.id_elenco, e.inicio_contrato, e.fim_contrato,
+            COALESCE((SELECT ife.salario_base FROM item_folha_e ife WHERE ife.id_elenco = e.id_elenco
+                      ORDER BY ife.id_folha_elenco DESC LIMIT 1), 0)
+        FROM elenco e WHERE e.id_direcao = %s ORDER BY e.id_elenco
+    """, (id_direcao,), usar_cache=False)
+    return [(r[0], r[1].isoformat(), r[2].isoformat(), r[3]) for r in rows or []]
+
+
+def _funcionarios(db, id_direcao):
+    cols, rows = db.run_query("SELECT id_funcionario, salario FROM funcionarios WHERE id_direcao = %s "
+                              "ORDER BY id_funcionario", (id_direcao,), usar_cache=False)
+    return rows or []
+
+
+def planejar(db, competencias, lista_corpos):
+    """Folhas do lote, uma por corpo e competência, só com o salário base: dicts com tipo, id_direcao,
+    competencia, pagamento e editor (EditorFolha com os itens e os totais). Os atletas entram nos
+    meses cobertos pelo contrato. Corpos/meses sem itens ficam de fora."""
+    folhas = []
+    for tipo, id_direcao in lista_corpos:
+        if tipo == 'elenco':
+            atletas = _elenco(db, id_direcao)
+        else:
+            pessoal = [{'id_funcionario': r[0], 'salario_base': r[1]} for r in _funcionarios(db, id_direcao)]
+        for competencia in competencias:
+            if tipo == 'elenco':
+                fim_mes = _mes_seguinte(competencia)
+                itens = [{'id_elenco': a[0], 'salario_base': a[3]} for a in atletas
+                         if a[1] < fim_mes and a[2] >= competencia]
+            else:
+                itens = pessoal
+            if not itens:
+                continue
+            folhas.append({
+                'tipo': tipo, 'id_direcao': id_direcao, 'competencia': competencia,
+                'pagamento': competencia[:8] + f"{DIA_PAGAMENTO:02d}", 'editor': EditorFolha(tipo, itens),
+            })
+    return folhas
+
+
+# ==================== GRAVAÇÃO ====================
+
+def _inserir_varias(cursor, sql_inicio, linhas, marcadores=None):
+    """INSERT multi-linha num único comando; retorna o id gerado para a primeira linha."""
+    marcadores = marcadores or "(" + ", ".join(["%s"] * len(linhas[0])) + ")"
+    cursor.execute(sql_inicio + ", ".join([marcadores] * len(linhas)), [v for linha in linhas for v in linha])
+    return cursor.lastrowid
+
+
+def _inserir_cabecalhos(cursor, tipo, folhas):
+    """Cabeçalhos pendentes; a aprovação fica com sp_aprovar_folhas_*_lote. Retorna os ids, na ordem
+    de `folhas`, conferidos com o que foi gravado."""
+    t = TIPOS[tipo]
+    ids = []
+    for i in range(0, len(folhas), TAMANHO_LOTE):
+        bloco = folhas[i:i + TAMANHO_LOTE]
+        if tipo == 'elenco':
+            linhas = [(f['competencia'], f['pagamento'], reais(f['editor'].direitos), f['id_direcao'])
+                      for f in bloco]
+            sql = ("INSERT INTO folha_elenco (data_competencia, data_pagamento, valor_direitos_imagem, "
+                   "id_direcao) VALUES ")
+        else:
+            linhas = [(f['competencia'], f['pagamento'], f['id_direcao']) for f in bloco]
+            sql = "INSERT INTO folha_funcionarios (data_competencia, data_pagamento, id_direcao) VALUES "
+        primeiro = _inserir_varias(cursor, sql, linhas)
+        # ids de um INSERT multi-linha simples são consecutivos; confere pela chave primária. Leitura com
+        # bloqueio (as linhas já são desta transação): uma leitura simples fixaria aqui o snapshot, antes
+        # de a procedure travar o saldo, e os triggers de orçamento não veriam aprovações concluídas depois
+        cursor.execute(f"SELECT {t['chave']}, id_direcao, data_competencia FROM {t['tabela']} "
+                       f"WHERE {t['chave']} BETWEEN %s AND %s ORDER BY {t['chave']} FOR UPDATE",
+                       (primeiro, primeiro + len(bloco) - 1))
+        gravados = [(r[1], r[2].isoformat()) for r in cursor.fetchall()]
+        if gravados != [(f['id_direcao'], f['competencia']) for f in bloco]:
+            raise ErroBanco(f"ids de {t['tabela']} não consecutivos a partir de {primeiro}; lote desfeito")
+        ids.extend(range(primeiro, primeiro + len(bloco)))
+    return ids
+
+
+def _gravar_bloco(cursor, folhas, id_aprovador, contas):
+    """Grava e aprova um bloco de folhas. Retorna (itens, alertas) gravados."""
+    itens = alertas = 0
+    for tipo, t in TIPOS.items():
+        do_tipo = [f for f in folhas if f['tipo'] == tipo]
+        if not do_tipo:
+            continue
+        ids = _inserir_cabecalhos(cursor, tipo, do_tipo)
+        # itens de todas as folhas do tipo nos mesmos INSERTs multi-linha
+        if tipo == 'elenco':
+            sql, linhas_itens = SQL_ITEM_ELENCO, linhas_itens_elenco
+        else:
+            sql, linhas_itens = SQL_ITEM_FUNCIONARIOS, linhas_itens_funcionarios
+        linhas = [linha for f, id_folha in zip(do_tipo, ids) for linha in linhas_itens(id_folha, f['editor'].valores())]
+        for i in range(0, len(linhas), TAMANHO_LOTE):
+            cursor.executemany(sql, linhas[i:i + TAMANHO_LOTE])
+        itens += len(linhas)
+        args = cursor.callproc(t['aprovar'], (json.dumps(ids), id_aprovador, contas[tipo], 0, 0))
+        alertas += args[4] or 0
+        for f, id_folha in zip(do_tipo, ids):
+            f['id_folha'] = id_folha
+    return itens, alertas
+
+
+def gravar(db, folhas, id_aprovador=1, contas=None, folhas_por_transacao=None, simular=False):
+    """Grava as folhas em transações de `folhas_por_transacao` folhas (None = todas numa só); cada
+    transação aprova as suas com sp_aprovar_folhas_*_lote. simular=True grava e desfaz cada transação
+    (mede sem alterar o banco). Retorna (itens, alertas). Se um bloco for recusado pelos triggers, ele
+    é desfeito, os anteriores continuam gravados e a mensagem diz quantas folhas foram."""
+    contas = dict(CONTAS, **(contas or {}))
+    tamanho = folhas_por_transacao or len(folhas) or 1
+    itens = alertas = gravadas = 0
+    for i in range(0, len(folhas), tamanho):
+        bloco = folhas[i:i + tamanho]
+        try:
+            with db.get_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    n_itens, n_alertas = _gravar_bloco(cursor, bloco, id_aprovador, contas)
+                    if simular:
+                        conn.rollback()
+                    else:
+                        conn.commit()
+                except (Error, ErroBanco):
+                    conn.rollback()
+                    raise
+                finally:
+                    cursor.close()
+        except Error as e:
+            if not gravadas or simular:
+                raise
+            raise ErroBanco(f"{traduzir_erro(e)} ({gravadas} folhas já gravadas antes do erro)") from e
+        itens, alertas, gravadas = itens + n_itens, alertas + n_alertas, gravadas + len(bloco)
+    return itens, alertas
+
+
+def gerar(db, competencias, lista_corpos=None, id_aprovador=1, contas=None, folhas_por_transacao=None,
+          simular=False):
+    """Planeja e grava as folhas de `competencias` x `lista_corpos` ([(tipo, id_direcao)]; None = todos
+    os corpos). Uma folha recusada pelos triggers (orçamento, saldo) desfaz a transação e o erro sobe;
+    com simular=True, a mensagem vai para os problemas do resultado. Retorna um dict com folhas, itens,
+    alertas, bruto (Decimal), segundos, folhas_s, itens_s, problemas e simulado."""
+    inicio = time.perf_counter()
+    folhas = planejar(db, competencias, corpos(db) if lista_corpos is None else lista_corpos)
+    itens = alertas = 0
+    problemas = []
+    if folhas:
+        try:
+            itens, alertas = gravar(db, folhas, id_aprovador, contas, folhas_por_transacao, simular)
+        except (Error, ErroSistema) as e:
+            if not simular:
+                raise
+            problemas.append(str(traduzir_erro(e) if isinstance(e, Error) else e))
+    segundos = time.perf_counter() - inicio
+    return {
+        'folhas': len(folhas), 'itens': itens, 'alertas': alertas,
+        'bruto': reais(sum(f['editor'].bruto for f in folhas)), 'segundos': segundos,
+        'folhas_s': len(folhas) / segundos if segundos else 0.0, 'itens_s': itens / segundos if segundos else 0.0,
+        'problemas': problemas, 'simulado': simular,
+    }
@@ -0,0 +1,208 @@
+"""
+Importação em massa de lançamentos manuais (bilheteria, patrocínio) a partir de CSV.
+
+As linhas válidas vão para uma tabela temporária em INSERTs multi-linha; contas e saldo são conferidos
+por consultas sobre o lote inteiro (saldo corrente com SUM() OVER, como em sp_aprovar_lancamentos_lote)
+e os lançamentos entram com um único INSERT ... SELECT, na mesma transação.
+
+Colunas do CSV (cabeçalho obrigatório, separador , ou ;): valor, tipo (entrada/saida), conta (id_conta ou
+codigo_conta, ex.: 3.1.01), descricao e, opcional, data (DD/MM/AAAA ou AAAA-MM-DD, com hora opcional).
+"""
+import csv
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from mysql.connector import Error
+
+from .folha import TAMANHO_LOTE
+
+COLUNAS = ('valor', 'tipo', 'conta', 'descricao')
+_CENTAVO = Decimal('0.01')
+_FORMATOS_DATA = ('%d/%m/%Y', '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S',
+                  '%Y-%m-%d', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S')
+
+SQL_STAGING = """
+    CREATE TEMPORARY TABLE tmp_importacao (
+        linha INT PRIMARY KEY,
+        data_registro DATETIME NULL,
+        valor DECIMAL(15,2) NOT NULL,
+        tipo ENUM('entrada', 'saida') NOT NULL,
+        conta VARCHAR(20) NOT NULL,
+        id_conta INT NULL,
+        descricao TEXT
+    )
+"""
+
+SQL_ITEM_STAGING = """
+    INSERT INTO tmp_importacao (linha, data_registro, valor, tipo, conta, descricao)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+# saídas que deixariam o caixa negativo, na ordem em que serão gravadas (mesma ordem do INSERT ... SELECT)
+SQL_ESTOUROS = """
+    SELECT linha, valor, saldo_apos + valor AS saldo_antes, saldo_apos
+    FROM (
+        SELECT linha, tipo, valor,
+               %s + SUM(CASE WHEN tipo = 'entrada' THEN valor ELSE -valor END)
+                   OVER (ORDER BY data_registro, linha) AS saldo_apos
+        FROM tmp_importacao
+    ) t
+    WHERE tipo = 'saida' AND saldo_apos < 0
+    ORDER BY data_registro, linha
+"""
+
+SQL_GRAVAR = """
+    INSERT INTO lancamento (data_registro, valor, tipo_de_movimentacao, status_aprovacao, id_direcao,
+                            id_conta, descricao, origem, id_aprovador, data_aprovacao)
+    SELECT data_registro, valor, tipo, 'aprovado', %s, id_conta, descricao, 'manual', %s, NOW()
+    FROM tmp_importacao
+    ORDER BY data_registro, linha
+"""
+
+
+def _valor(texto):
+    """'1234.56', '1234,56' ou '1.234,56' -> Decimal positivo com duas casas, arredondado como o MySQL
+    grava em DECIMAL (meio centavo para longe do zero: '2.675' -> 2.68)."""
+    texto = texto.strip().replace('R$', '').replace(' ', '')
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    try:
+        valor = Decimal(texto)
+    except InvalidOperation:
+        raise ValueError from None
+    if not valor.is_finite():
+        raise ValueError
+    valor = valor.quantize(_CENTAVO, rounding=ROUND_HALF_UP)
+    if valor <= 0:
+        raise ValueError
+    return valor
+
+
+def _data(texto):
+    texto = (texto or '').strip()
+    if not texto:
+        return None
+    for formato in _FORMATOS_DATA:
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            pass
+    raise ValueError
+
+
+def ler_csv(arquivo):
+    """(linhas válidas, rejeitadas). Válidas: (linha, data|None, valor, tipo, conta, descricao);
+    rejeitadas: (linha, motivo). A numeração conta o cabeçalho como linha 1."""
+    with open(arquivo, encoding='utf-8-sig', newline='') as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=',;')
+        except csv.Error:
+            dialeto = csv.excel
+        leitor = csv.DictReader(f, dialect=dialeto)
+        cabecalho = [c.strip().lower() for c in (leitor.fieldnames or [])]
+        faltando = [c for c in COLUNAS if c not in cabecalho]
+        if faltando:
+            raise ValueError(f"Colunas ausentes no CSV: {', '.join(faltando)}")
+        leitor.fieldnames = cabecalho
+
+        validas, rejeitadas = [], []
+        for n, registro in enumerate(leitor, start=2):
+            if not any((v or '').strip() for v in registro.values() if isinstance(v, str)):
+                continue
+            try:
+                valor = _valor(registro['valor'] or '')
+            except ValueError:
+                rejeitadas.append((n, f"valor inválido: {registro['valor']!r}"))
+                continue
+            tipo = (registro['tipo'] or '').strip().lower().replace('í', 'i')
+            if tipo not in ('entrada', 'saida'):
+                rejeitadas.append((n, f"tipo inválido: {registro['tipo']!r}"))
+                continue
+            conta = (registro['conta'] or '').strip()
+            if not conta:
+                rejeitadas.append((n, "conta vazia"))
+                continue
+            try:
+                data = _data(registro.get('data'))
+            except ValueError:
+                rejeitadas.append((n, f"data inválida: {registro.get('data')!r}"))
+                continue
+            validas.append((n, data, valor, tipo, conta, (registro['descricao'] or '').strip()))
+    return validas, rejeitadas
+
+
+def _concluir(resultado, inicio):
+    segundos = time.perf_counter() - inicio
+    resultado['segundos'] = segundos
+    resultado['linhas_s'] = resultado['importados'] / segundos if segundos > 0 else 0.0
+    return resultado
+
+
+def importar_lancamentos(db, arquivo, id_direcao, id_aprovador, tudo_ou_nada=False, tamanho_lote=TAMANHO_LOTE):
+    """Importa os lançamentos do CSV já aprovados, numa única transação.
+
+    Linhas com valor, tipo, data ou conta inválidos são rejeitadas (e, com tudo_ou_nada, nada é gravado).
+    Se alguma saída deixar o caixa negativo, nada é gravado e ela é listada em 'estouros' como
+    (linha, valor, saldo_antes, saldo_apos). Retorna dict com importados, rejeitadas, estouros,
+    segundos e linhas_s.
+    """
+    inicio = time.perf_counter()
+    validas, rejeitadas = ler_csv(arquivo)
+    resultado = {'importados': 0, 'rejeitadas': rejeitadas, 'estouros': []}
+    if not validas or (rejeitadas and tudo_ou_nada):
+        return _concluir(resultado, inicio)
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS tmp_importacao")
+            cursor.execute(SQL_STAGING)
+            for i in range(0, len(validas), tamanho_lote):
+                cursor.executemany(SQL_ITEM_STAGING, validas[i:i + tamanho_lote])
+
+            # contas: pelo código do plano de contas ou pelo id
+            cursor.execute("""
+                UPDATE tmp_importacao t
+                JOIN plano_de_contas pc ON pc.codigo_conta = t.conta
+                SET t.id_conta = pc.id_conta
+            """)
+            cursor.execute("""
+                UPDATE tmp_importacao t
+                JOIN plano_de_contas pc ON CAST(pc.id_conta AS CHAR) = t.conta
+                SET t.id_conta = pc.id_conta
+                WHERE t.id_conta IS NULL
+            """)
+            cursor.execute("SELECT linha, conta FROM tmp_importacao WHERE id_conta IS NULL ORDER BY linha")
+            sem_conta = cursor.fetchall()
+            if sem_conta:
+                rejeitadas.extend((linha, f"conta inexistente: {conta}") for linha, conta in sem_conta)
+                rejeitadas.sort()
+                if tudo_ou_nada:
+                    conn.rollback()
+                    return _concluir(resultado, inicio)
+                cursor.execute("DELETE FROM tmp_importacao WHERE id_conta IS NULL")
+            cursor.execute("UPDATE tmp_importacao SET data_registro = NOW() WHERE data_registro IS NULL")
+
+            # trava o saldo até o commit e confere o lote inteiro de uma vez
+            cursor.execute("SELECT fn_calcular_saldo_atual()")
+            saldo = cursor.fetchone()[0]
+            cursor.execute(SQL_ESTOUROS, (saldo,))
+            estouros = cursor.fetchall()
+            if estouros:
+                conn.rollback()
+                resultado['estouros'] = estouros
+                return _concluir(resultado, inicio)
+
+            cursor.execute(SQL_GRAVAR, (id_direcao, id_aprovador))
+            resultado['importados'] = cursor.rowcount
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS tmp_importacao")
+            conn.commit()
+            return _concluir(resultado, inicio)
+        except Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
@@ -0,0 +1,28 @@
+"""
+Aprovação de lançamentos pendentes em lote (sp_aprovar_lancamentos_lote).
+"""
+import json
+from mysql.connector import Error
+
+
+def aprovar_lancamentos_lote(db, ids, id_aprovador):
+    """Aprova o lote inteiro numa única transação, ou nada.
+
+    Retorna (aprovados, estouros): estouros lista as saídas que deixariam o caixa negativo, na ordem do lote,
+    como (id_lancamento, data_registro, valor, saldo_antes, saldo_apos); se não estiver vazia, nada foi aprovado.
+    """
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            args = cursor.callproc('sp_aprovar_lancamentos_lote', (json.dumps([int(i) for i in ids]), id_aprovador, 0))
+            estouros = [row for result in cursor.stored_results() for row in result.fetchall()]
+            if estouros:
+                conn.rollback()
+                return 0, estouros
+            conn.commit()
+            return args[2] or 0, []
+        except Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
@@ -0,0 +1,168 @@
+"""
+Manutenção das tabelas de totais mantidas por triggers (saldo de caixa e resumo mensal).
+Reconstrução a partir do histórico e conferência contra as consultas originais sobre lancamento.
+"""
+
+# pares (consulta atual sobre o resumo, consulta original agregando lancamento) conferidos linha a linha
+CONSULTAS_LEGADAS = {
+    "dados_publicos": (
+        "SELECT * FROM dados_publicos",
+        """
+        SELECT pc.codigo_conta, pc.descricao, pc.tipo_conta, l.mes_registro AS mes_ano,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) AS total_entradas,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END) AS total_saidas,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE -l.valor END) AS saldo_liquido
+        FROM lancamento l
+        INNER JOIN plano_de_contas pc ON l.id_conta = pc.id_conta
+        WHERE l.status_aprovacao = 'aprovado'
+        GROUP BY pc.id_conta, pc.codigo_conta, pc.descricao, pc.tipo_conta, l.mes_registro
+        ORDER BY mes_ano DESC, pc.codigo_conta
+        """,
+    ),
+    "consulta_10": (
+        """
+        SELECT pc.codigo_conta, pc.descricao, pc.tipo_conta, r.mes_registro AS mes_ano,
+               COALESCE(r.total_lancamentos, 0) AS total_lancamentos,
+               COALESCE(r.total_entradas, 0) AS total_entradas,
+               COALESCE(r.total_saidas, 0) AS total_saidas,
+               r.total_entradas - r.total_saidas AS saldo_periodo
+        FROM plano_de_contas pc
+        LEFT JOIN resumo_mensal_conta r ON pc.id_conta = r.id_conta
+        ORDER BY mes_ano DESC, pc.codigo_conta
+        """,
+        """
+        SELECT pc.codigo_conta, pc.descricao, pc.tipo_conta, l.mes_registro AS mes_ano,
+               COUNT(l.id_lancamento) AS total_lancamentos,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE 0 END) AS total_entradas,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'saida' THEN l.valor ELSE 0 END) AS total_saidas,
+               SUM(CASE WHEN l.tipo_de_movimentacao = 'entrada' THEN l.valor ELSE -l.valor END) AS saldo_periodo
+        FROM plano_de_contas pc
+        LEFT JOIN lancamento l ON pc.id_conta = l.id_conta AND l.status_aprovacao = 'aprovado'
+        GROUP BY pc.id_conta, pc.codigo_conta, pc.descricao, pc.tipo_conta, l.mes_registro
+        ORDER BY mes_ano DESC, pc.codigo_conta
+        """,
+    ),
+    "consulta_12": (
+        """
+        SELECT mes_registro AS mes_ano,
+               CAST(LEFT(mes_registro, 4) AS UNSIGNED) AS ano,
+               CAST(SUBSTRING(mes_registro, 6, 2) AS UNSIGNED) AS mes,
+               SUM(total_entradas) AS total_receitas,
+               SUM(total_saidas) AS total_despesas,
+               SUM(total_entradas - total_saidas) AS resultado_periodo
+        FROM resumo_mensal_conta
+        GROUP BY mes_registro
+        ORDER BY ano DESC, mes DESC
+        """,
+        """
+        SELECT mes_registro AS mes_ano,
+               YEAR(MIN(data_registro)) AS ano,
+               MONTH(MIN(data_registro)) AS mes,
+               SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE 0 END) AS total_receitas,
+               SUM(CASE WHEN tipo_de_movimentacao = 'saida' THEN valor ELSE 0 END) AS total_despesas,
+               SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE -valor END) AS resultado_periodo
+        FROM lancamento
+        WHERE status_aprovacao = 'aprovado'
+        GROUP BY mes_registro
+        ORDER BY ano DESC, mes DESC
+        """,
+    ),
+    "consulta_14": (
+        """
+        SELECT mes_registro AS mes_ano,
+               CAST(LEFT(mes_registro, 4) AS UNSIGNED) AS ano,
+               CAST(SUBSTRING(mes_registro, 6, 2) AS UNSIGNED) AS mes,
+               SUM(total_entradas) AS total_receitas,
+               SUM(total_saidas) AS total_despesas,
+               SUM(total_entradas - total_saidas) AS resultado_periodo,
+               ABS(SUM(total_entradas - total_saidas)) AS deficit,
+               CONCAT('R$ ', FORMAT(ABS(SUM(total_entradas - total_saidas)), 2, 'pt_BR')) AS deficit_formatado
+        FROM resumo_mensal_conta
+        GROUP BY mes_registro
+        HAVING resultado_periodo < 0
+        ORDER BY ano DESC, mes DESC
+        """,
+        """
+        SELECT mes_registro AS mes_ano,
+               YEAR(MIN(data_registro)) AS ano,
+               MONTH(MIN(data_registro)) AS mes,
+               SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE 0 END) AS total_receitas,
+               SUM(CASE WHEN tipo_de_movimentacao = 'saida' THEN valor ELSE 0 END) AS total_despesas,
+               SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE -valor END) AS resultado_periodo,
+               ABS(SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE -valor END)) AS deficit,
+               CONCAT('R$ ', FORMAT(ABS(SUM(CASE WHEN tipo_de_movimentacao = 'entrada' THEN valor ELSE -valor END)), 2, 'pt_BR')) AS deficit_formatado
+        FROM lancamento
+        WHERE status_aprovacao = 'aprovado'
+        GROUP BY mes_registro
+        HAVING resultado_periodo < 0
+        ORDER BY ano DESC, mes DESC
+        """,
+    ),
+}
+
+
+def _fetch(cursor, sql):
+    cursor.execute(sql)
+    return [desc[0] for desc in cursor.description], cursor.fetchall()
+
+
+def _call(conn, proc):
+    """Executa uma procedure e devolve (colunas, linhas) do primeiro result set, se houver."""
+    cursor = conn.cursor()
+    try:
+        cursor.callproc(proc)
+        for result in cursor.stored_results():
+            return [desc[0] for desc in result.description], result.fetchall()
+        return None, []
+    finally:
+        cursor.close()
+
+
+def reconstruir_resumo_mensal(db):
+    with db.get_connection() as conn:
+        _call(conn, "sp_reconstruir_resumo_mensal")
+        conn.commit()
+
+
+def reconstruir_saldo_caixa(db):
+    with db.get_connection() as conn:
+        _call(conn, "sp_reconstruir_saldo_caixa")
+        conn.commit()
+
+
+def verificar_saldo_caixa(db):
+    """Retorna (saldo_mantido, saldo_historico, diferenca, situacao)."""
+    with db.get_connection() as conn:
+        cols, rows = _call(conn, "sp_verificar_saldo_caixa")
+    return rows[0] if rows else None
+
+
+def verificar_resumo_mensal(db):
+    """
+    Compara o resumo mantido com o histórico de lancamento.
+    Retorna uma lista de (nome, descrição da divergência); lista vazia = consistente.
+    """
+    divergencias = []
+    with db.get_connection() as conn:
+        cols, rows = _call(conn, "sp_verificar_resumo_mensal")
+        for row in rows:
+            divergencias.append(("resumo_mensal_conta", dict(zip(cols, row))))
+
+        cursor = conn.cursor()
+        try:
+            for nome, (sql_atual, sql_legado) in CONSULTAS_LEGADAS.items():
+                cols_atual, atual = _fetch(cursor, sql_atual)
+                cols_legado, legado = _fetch(cursor, sql_legado)
+                if cols_atual != cols_legado:
+                    divergencias.append((nome, f"colunas diferentes: {cols_atual} != {cols_legado}"))
+                    continue
+                if len(atual) != len(legado):
+                    divergencias.append((nome, f"{len(atual)} linhas != {len(legado)} linhas no histórico"))
+                    continue
+                for i, (a, b) in enumerate(zip(atual, legado)):
+                    if tuple(a) != tuple(b):
+                        divergencias.append((nome, f"linha {i + 1}: {a} != {b}"))
+                        break
+        finally:
+            cursor.close()
+    return divergencias
@@ -0,0 +1,227 @@
+"""
+Métricas de execução das consultas (opcional) para o DatabaseManager.
+
+Cada comando é registrado com duração, linhas e ponto de chamada, agrupado pela sua impressão digital
+(o SQL com literais trocados por ?). Comandos acima de limite_lento vão para um log rotativo em JSON
+por linha, com o plano EXPLAIN FORMAT=JSON quando disponível. resumo() e resumir_log() dão
+p50/p95/p99 por impressão digital.
+"""
+import json
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+from .cache import inicio_comando
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# módulos de infraestrutura ignorados ao procurar o ponto de chamada
+_INTERNOS = {'banco.py', 'cache.py', 'metricas.py', 'paginacao.py'}
+
+_COMENTARIOS = re.compile(r'/\*.*?\*/|--[^\n]*', re.DOTALL)
+_TEXTOS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMEROS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_MARCADORES = re.compile(r'%s|%\(\w+\)s')
+_LISTAS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_ESPACOS = re.compile(r'\s+')
+_EXPLICAVEL = re.compile(r'\s*(SELECT|WITH)\b', re.IGNORECASE)
+
+
+def impressao_digital(sql):
+    """SQL normalizado: sem comentários, literais e marcadores viram ?, listas IN (?, ?, ...) viram (?+)."""
+    sql = _COMENTARIOS.sub(' ', sql)
+    sql = _TEXTOS.sub('?', sql)
+    sql = _MARCADORES.sub('?', sql)
+    sql = _NUMEROS.sub('?', sql)
+    sql = _LISTAS.sub('(?+)', sql)
+    return _ESPACOS.sub(' ', sql).strip().rstrip(';').strip()
+
+
+def ponto_de_chamada():
+    """'arquivo:linha (função)' do primeiro frame do projeto fora dos módulos de infraestrutura."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        arquivo = frame.f_code.co_filename
+        if arquivo.startswith(_RAIZ) and os.path.basename(arquivo) not in _INTERNOS:
+            return f"{os.path.relpath(arquivo, _RAIZ)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return None
+
+
+def percentil(ordenados, p):
+    """Percentil por posição mais próxima de uma lista já ordenada."""
+    if not ordenados:
+        return None
+    indice = max(0, min(len(ordenados), math.ceil(p / 100 * len(ordenados))) - 1)
+    return ordenados[indice]
+
+
+def _linha_resumo(digital, duracoes, total, execucoes, linhas, origens):
+    ordenadas = sorted(duracoes)
+    return {
+        'digital': digital,
+        'execucoes': execucoes,
+        'total_s': total,
+        'p50_ms': percentil(ordenadas, 50) * 1000,
+        'p95_ms': percentil(ordenadas, 95) * 1000,
+        'p99_ms': percentil(ordenadas, 99) * 1000,
+        'max_ms': ordenadas[-1] * 1000,
+        'linhas_media': linhas / execucoes if execucoes else 0.0,
+        'origens': sorted(o for o in origens if o),
+    }
+
+
+class MonitorConsultas:
+    """Acumula as durações por impressão digital (últimas `amostras` de cada) e grava os comandos lentos.
+    Thread-safe; arquivo=None desativa o log de lentas."""
+
+    def __init__(self, limite_lento=0.5, arquivo=None, max_bytes=5 * 1024 * 1024, backups=3,
+                 explain=True, amostras=1000):
+        self.limite_lento = limite_lento
+        self.explain = explain
+        self.amostras = amostras
+        self.lentas = 0
+        self._stats = {}  # digital -> {'duracoes', 'total', 'execucoes', 'linhas', 'origens'}
+        self._lock = threading.Lock()
+        self._log = None
+        if arquivo:
+            self._log = self._abrir_log(arquivo, max_bytes, backups)
+
+    @staticmethod
+    def _abrir_log(arquivo, max_bytes, backups):
+        pasta = os.path.dirname(os.path.abspath(arquivo))
+        os.makedirs(pasta, exist_ok=True)
+        log = logging.getLogger(f"gestao_clube.consultas_lentas.{os.path.abspath(arquivo)}")
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        if not log.handlers:
+            handler = RotatingFileHandler(arquivo, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            log.addHandler(handler)
+        return log
+
+    def lenta(self, duracao):
+        return self.limite_lento is not None and duracao >= self.limite_lento
+
+    def quer_plano(self, sql, duracao):
+        """Se vale rodar EXPLAIN para este comando (lento, SELECT/WITH e log ativo)."""
+        return self.explain and self._log is not None and self.lenta(duracao) and bool(_EXPLICAVEL.match(inicio_comando(sql)))
+
+    def registrar(self, sql, params, duracao, linhas, origem=None, plano=None):
+        digital = impressao_digital(sql)
+        with self._lock:
+            s = self._stats.get(digital)
+            if s is None:
+                s = self._stats[digital] = {'duracoes': deque(maxlen=self.amostras), 'total': 0.0,
+                                            'execucoes': 0, 'linhas': 0, 'origens': set()}
+            s['duracoes'].append(duracao)
+            s['total'] += duracao
+            s['execucoes'] += 1
+            s['linhas'] += max(0, linhas or 0)
+            s['origens'].add(origem)
+            lenta = self.lenta(duracao)
+            if lenta:
+                self.lentas += 1
+        if lenta and self._log is not None:
+            self._log.info(json.dumps({
+                'quando': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'duracao_ms': round(duracao * 1000, 3),
+                'linhas': linhas,
+                'origem': origem,
+                'digital': digital,
+                'sql': sql.strip(),
+                'params': None if params is None else [str(p) for p in params],
+                'plano': plano,
+            }, ensure_ascii=False))
+
+    def resumo(self):
+        """Uma linha por impressão digital, da que mais consumiu tempo para a que menos consumiu."""
+        with self._lock:
+            linhas = [_linha_resumo(d, list(s['duracoes']), s['total'], s['execucoes'], s['linhas'], s['origens'])
+                      for d, s in self._stats.items()]
+        return sorted(linhas, key=lambda r: r['total_s'], reverse=True)
+
+    def limpar(self):
+        with self._lock:
+            self._stats.clear()
+            self.lentas = 0
+
+
+def resumir_log(arquivo):
+    """resumo() a partir do log de lentas (inclui os arquivos rotacionados .1, .2, ...)."""
+    nomes = [arquivo]
+    n = 1
+    while os.path.exists(f"{arquivo}.{n}"):
+        nomes.append(f"{arquivo}.{n}")
+        n += 1
+    agrupado = {}  # digital -> {'duracoes', 'linhas', 'origens'}
+    for nome in nomes:
+        if not os.path.exists(nome):
+            continue
+        with open(nome, encoding='utf-8') as f:
+            for texto in f:
+                try:
+                    registro = json.loads(texto)
+                except ValueError:
+                    continue
+                g = agrupado.setdefault(registro['digital'], {'duracoes': [], 'linhas': 0, 'origens': set()})
+                g['duracoes'].append(registro['duracao_ms'] / 1000)
+                g['linhas'] += max(0, registro.get('linhas') or 0)
+                g['origens'].add(registro.get('origem'))
+    linhas = [_linha_resumo(d, g['duracoes'], sum(g['duracoes']), len(g['duracoes']), g['linhas'], g['origens'])
+              for d, g in agrupado.items()]
+    return sorted(linhas, key=lambda r: r['total_s'], reverse=True)
+
+
+class _CursorCronometrado:
+    """Cursor que repassa tudo ao cursor real e registra a duração de execute/executemany/callproc.
+    Em SELECT não bufferizado a duração cobre até o servidor começar a enviar as linhas, e as linhas
+    só são conhecidas (rowcount) depois da leitura; por isso o plano não é capturado aqui."""
+
+    def __init__(self, cursor, monitor):
+        self._cursor = cursor
+        self._monitor = monitor
+
+    def _medir(self, sql, params, fn, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            duracao = time.perf_counter() - inicio
+            linhas = getattr(self._cursor, 'rowcount', None)
+            self._monitor.registrar(sql, params, duracao, linhas if linhas is not None and linhas >= 0 else None,
+                                    ponto_de_chamada())
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._medir(operation, params, self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._medir(operation, None, self._cursor.executemany, operation, seq_params, *args, **kwargs)
+
+    def callproc(self, procname, args=(), *a, **kwargs):
+        return self._medir(f"CALL {procname}", args, self._cursor.callproc, procname, args, *a, **kwargs)
+
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class ConexaoCronometrada:
+    """Envolve a conexão entregue por get_connection quando o monitor está ativo."""
+
+    def __init__(self, conn, monitor):
+        self._conn = conn
+        self._monitor = monitor
+
+    def cursor(self, *args, **kwargs):
+        return _CursorCronometrado(self._conn.cursor(*args, **kwargs), self._monitor)
+
+    def __getattr__(self, nome):
+        return getattr(self._conn, nome)
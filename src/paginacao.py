@@ -0,0 +1,280 @@
+"""
+Fontes paginadas para as grades de resultados: entregam uma página de linhas por vez.
+
+- FonteKeyset: views com ordenação conhecida; pagina pela chave da última/primeira linha
+  (WHERE chave < última ... LIMIT n), custo constante em qualquer ponto do resultado.
+- FonteConsulta: SQL arbitrário (catálogo de consultas); pagina com LIMIT/OFFSET.
+- FonteFiltrada: o SQL de outra fonte como tabela derivada, com filtro e ordenação no servidor.
+- FonteLista: linhas já carregadas em memória.
+
+Cada página sabe se há linhas antes/depois e guarda os cursores (opacos) de início e fim,
+usados para pedir a página anterior ou a seguinte.
+"""
+import re
+from collections import namedtuple
+
+from .cache import inicio_comando
+
+Pagina = namedtuple('Pagina', 'linhas inicio fim tem_anterior tem_seguinte')
+
+# views com paginação por chave: (colunas da ordenação, todas decrescentes)
+CHAVES_VIEWS = {
+    'dados_privados': ('data_registro', 'id_lancamento'),
+}
+
+_LIMIT_FINAL = re.compile(r'\bLIMIT\s+\d+\s*(,\s*\d+|OFFSET\s+\d+)?\s*$', re.IGNORECASE)
+
+
+# ==================== FILTROS ====================
+
+Filtro = namedtuple('Filtro', 'coluna operador valor')
+
+OPERADORES = ('>=', '<=', '!=', '=', '>', '<', ':')  # ':' = contém
+
+_TOKEN = re.compile(r'(?:[^\s"]+|"[^"]*")+')
+_FILTRO = re.compile(r'(\w+)(>=|<=|!=|=|>|<|:)(.+)', re.DOTALL)
+_DATA_BR = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+_NUMERO_BR = re.compile(r'-?\d{1,3}(\.\d{3})*(,\d+)?|-?\d+,\d+')
+
+
+def separar_filtros(texto, colunas):
+    """Separa da busca digitada os filtros por coluna ('valor>1000', 'conta:salario',
+    'nome="Ana Souza"'; só para nomes de `colunas`, sem diferenciar maiúsculas). Retorna
+    (filtros, termo livre com o restante do texto)."""
+    nomes = {str(c).lower(): c for c in colunas}
+    filtros, livres = [], []
+    for token in _TOKEN.findall(texto or ''):
+        m = _FILTRO.fullmatch(token)
+        if m and m.group(1).lower() in nomes:
+            filtros.append(Filtro(nomes[m.group(1).lower()], m.group(2), m.group(3).replace('"', '')))
+        else:
+            livres.append(token.replace('"', ''))
+    return filtros, ' '.join(livres)
+
+
+def valor_digitado(valor):
+    """Valor de filtro no formato do MySQL: '31/12/2024' -> '2024-12-31', '1.234,56' -> '1234.56'."""
+    valor = valor.strip()
+    m = _DATA_BR.fullmatch(valor)
+    if m:
+        return f"{m.group(3)}-{int(m.group(2)):02d}-{int(m.group(1)):02d}"
+    if _NUMERO_BR.fullmatch(valor) and (',' in valor or valor.count('.') > 1):
+        return valor.replace('.', '').replace(',', '.')
+    return valor
+
+
+def _citar(coluna):
+    return "`" + str(coluna).replace("`", "``") + "`"
+
+
+def _like(valor):
+    return "%" + valor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+class FonteLista:
+    """Linhas já em memória, fatiadas em páginas."""
+
+    def __init__(self, colunas, linhas):
+        self.colunas = list(colunas)
+        self._linhas = linhas
+
+    def _fatia(self, inicio, limite):
+        inicio = max(0, inicio)
+        fim = min(len(self._linhas), inicio + limite)
+        return Pagina(self._linhas[inicio:fim], inicio, fim, inicio > 0, fim < len(self._linhas))
+
+    def primeira(self, limite):
+        return self._fatia(0, limite)
+
+    def seguinte(self, fim, limite):
+        return self._fatia(fim, limite)
+
+    def anterior(self, inicio, limite):
+        return self._fatia(inicio - limite, min(limite, inicio))
+
+    def contar(self):
+        return len(self._linhas)
+
+
+class FonteConsulta:
+    """SQL arbitrário paginado com LIMIT/OFFSET. Consultas que não são SELECT ou já terminam em
+    LIMIT são lidas inteiras uma única vez (FonteLista)."""
+
+    def __init__(self, db, sql, params=None):
+        self.db = db
+        self.sql = sql.strip().rstrip(';').strip()
+        self.params = params
+        self.colunas = None
+        self._lista = None
+        self._paginavel = (re.match(r'(SELECT|WITH)\b', inicio_comando(self.sql), re.IGNORECASE) is not None
+                           and not _LIMIT_FINAL.search(self.sql))
+
+    def _fatia(self, offset, limite):
+        # pede uma linha a mais para saber se há página seguinte
+        cols, linhas = self.db.run_query(f"{self.sql}\nLIMIT {int(limite) + 1} OFFSET {int(offset)}", self.params)
+        self.colunas = cols
+        linhas = linhas or []
+        tem_seguinte = len(linhas) > limite
+        linhas = linhas[:limite]
+        return Pagina(linhas, offset, offset + len(linhas), offset > 0, tem_seguinte)
+
+    def primeira(self, limite):
+        if not self._paginavel:
+            cols, linhas = self.db.run_query(self.sql, self.params)
+            self._lista = FonteLista(cols or [], linhas or [])
+            self.colunas = self._lista.colunas
+            return self._lista.primeira(limite)
+        return self._fatia(0, limite)
+
+    def seguinte(self, fim, limite):
+        if self._lista:
+            return self._lista.seguinte(fim, limite)
+        return self._fatia(fim, limite)
+
+    def anterior(self, inicio, limite):
+        if self._lista:
+            return self._lista.anterior(inicio, limite)
+        offset = max(0, inicio - limite)
+        return self._fatia(offset, inicio - offset)
+
+    def contar(self):
+        if self._lista:
+            return self._lista.contar()
+        cols, linhas = self.db.run_query(f"SELECT COUNT(*) FROM ({self.sql}) AS _consulta", self.params)
+        return linhas[0][0] if linhas else 0
+
+    def filtrada(self, filtros=(), termo='', ordem=None):
+        """FonteFiltrada sobre este SQL; None se ele não pode virar tabela derivada."""
+        if not self._paginavel:
+            return None
+        return FonteFiltrada(self.db, self.sql, self.params, self.colunas, filtros, termo, ordem)
+
+
+class FonteFiltrada(FonteConsulta):
+    """Filtro e ordenação no servidor: SELECT * FROM (<sql>) AS _consulta WHERE ... ORDER BY ...,
+    paginado com LIMIT/OFFSET; só a página pedida trafega.
+
+    Os nomes de coluna vêm da descrição do cursor da fonte original (`colunas`) e só entram no SQL depois
+    de conferidos com ela; os valores vão sempre como parâmetros. O MySQL 8 funde a tabela derivada na
+    consulta externa (ou empurra o WHERE para dentro dela quando precisa materializá-la), então filtros
+    de igualdade/faixa e ordenações sobre colunas indexadas usam os índices das tabelas de base. A busca
+    livre é um LIKE em cada coluna, sem índice. Empates na ordenação são desfeitos pela primeira coluna.
+    """
+
+    def __init__(self, db, sql, params, colunas, filtros=(), termo='', ordem=None):
+        colunas = list(colunas or [])
+        if not colunas:
+            raise ValueError("Colunas da consulta desconhecidas: leia a primeira página antes de filtrar")
+        if len(set(colunas)) != len(colunas):
+            raise ValueError("A consulta tem colunas com o mesmo nome; não dá para filtrá-la no servidor")
+        condicoes, valores = [], list(params or ())
+        for f in filtros:
+            if f.coluna not in colunas or f.operador not in OPERADORES:
+                raise ValueError(f"Filtro inválido: {f.coluna}{f.operador}")
+            if f.operador == ':':
+                condicoes.append(f"{_citar(f.coluna)} LIKE %s")
+                valores.append(_like(f.valor.strip()))
+            else:
+                condicoes.append(f"{_citar(f.coluna)} {'<>' if f.operador == '!=' else f.operador} %s")
+                valores.append(valor_digitado(f.valor))
+        termo = (termo or '').strip()
+        if termo:
+            condicoes.append("(" + " OR ".join(f"{_citar(c)} LIKE %s" for c in colunas) + ")")
+            valores.extend([_like(termo)] * len(colunas))
+
+        base = sql.strip().rstrip(';').strip()
+        consulta = f"SELECT * FROM (\n{base}\n) AS _consulta"
+        if condicoes:
+            consulta += "\nWHERE " + " AND ".join(condicoes)
+        if ordem is not None:
+            coluna, decrescente = ordem
+            coluna = colunas[coluna] if isinstance(coluna, int) else coluna
+            if coluna not in colunas:
+                raise ValueError(f"Coluna inexistente: {coluna}")
+            direcao = "DESC" if decrescente else "ASC"
+            consulta += f"\nORDER BY {_citar(coluna)} {direcao}"
+            if coluna != colunas[0]:
+                consulta += f", {_citar(colunas[0])} {direcao}"
+        super().__init__(db, consulta, tuple(valores) or None)
+        self.colunas = colunas
+
+
+class FonteKeyset:
+    """Tabela/view ordenada de forma decrescente por `chaves` (a última deve ser única).
+    Cada página é um range scan a partir da chave da linha de borda, sem OFFSET."""
+
+    def __init__(self, db, tabela, chaves):
+        self.db = db
+        self.tabela = tabela
+        self.chaves = tuple(chaves)
+        self.colunas = None
+        self._idx = None
+
+    def _condicao(self, op):
+        """(k1 op v1) OR (k1 = v1 AND k2 op v2) ... — forma expandida da comparação de tuplas."""
+        termos = []
+        for i, chave in enumerate(self.chaves):
+            iguais = [f"{k} = %s" for k in self.chaves[:i]]
+            termos.append("(" + " AND ".join(iguais + [f"{chave} {op} %s"]) + ")")
+        return " OR ".join(termos)
+
+    def _valores(self, chave):
+        valores = []
+        for i in range(len(self.chaves)):
+            valores.extend(chave[:i + 1])
+        return tuple(valores)
+
+    def _chave(self, linha):
+        return tuple(linha[i] for i in self._idx)
+
+    def _buscar(self, where, params, direcao, limite):
+        ordem = ", ".join(f"{k} {direcao}" for k in self.chaves)
+        sql = f"SELECT * FROM {self.tabela}{where} ORDER BY {ordem} LIMIT {int(limite) + 1}"
+        cols, linhas = self.db.run_query(sql, params)
+        if self.colunas is None:
+            self.colunas = cols
+            self._idx = [cols.index(k) for k in self.chaves]
+        linhas = linhas or []
+        return linhas[:limite], len(linhas) > limite
+
+    def _pagina(self, linhas, tem_anterior, tem_seguinte):
+        if not linhas:
+            return Pagina([], None, None, tem_anterior, tem_seguinte)
+        return Pagina(linhas, self._chave(linhas[0]), self._chave(linhas[-1]), tem_anterior, tem_seguinte)
+
+    def primeira(self, limite):
+        linhas, mais = self._buscar("", None, "DESC", limite)
+        return self._pagina(linhas, False, mais)
+
+    def seguinte(self, fim, limite):
+        linhas, mais = self._buscar(f" WHERE {self._condicao('<')}", self._valores(fim), "DESC", limite)
+        return self._pagina(linhas, True, mais)
+
+    def anterior(self, inicio, limite):
+        # percorre no sentido inverso a partir da primeira linha carregada e desfaz a inversão
+        linhas, mais = self._buscar(f" WHERE {self._condicao('>')}", self._valores(inicio), "ASC", limite)
+        linhas.reverse()
+        return self._pagina(linhas, mais, True)
+
+    def contar(self):
+        cols, linhas = self.db.run_query(f"SELECT COUNT(*) FROM {self.tabela}")
+        return linhas[0][0] if linhas else 0
+
+    def filtrada(self, filtros=(), termo='', ordem=None):
+        return FonteFiltrada(self.db, f"SELECT * FROM {self.tabela}", None, self.colunas, filtros, termo, ordem)
+
+
+def fonte_para_view(db, view_name):
+    """Fonte com paginação por chave quando a ordenação da view é conhecida; caso contrário, OFFSET."""
+    chaves = CHAVES_VIEWS.get(view_name)
+    if chaves:
+        return FonteKeyset(db, view_name, chaves)
+    return FonteConsulta(db, f"SELECT * FROM {view_name}")
+
+
+def fonte_para_sql(db, sql, params=None):
+    """Como fonte_para_view quando o SQL é só `SELECT * FROM <view>`; senão, FonteConsulta."""
+    m = re.fullmatch(r'SELECT\s+\*\s+FROM\s+(\w+)\s*;?\s*', inicio_comando(sql), re.IGNORECASE)
+    if m and not params:
+        return fonte_para_view(db, m.group(1))
+    return FonteConsulta(db, sql, params)
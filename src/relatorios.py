@@ -0,0 +1,98 @@
+"""
+Pacote de relatórios: executa várias consultas/views do catálogo ao mesmo tempo, cada uma numa
+conexão do pool, com limite de concorrência. Os resultados são entregues à medida que terminam.
+"""
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import exportacao
+
+
+def itens_do_catalogo(db, tabelas=('queries_sistema', 'views_sistema')):
+    """[(tabela, id, nome)] de todos os itens dos catálogos, na ordem do catálogo."""
+    itens = []
+    for tabela in tabelas:
+        cols, linhas = db.get_items(tabela)
+        itens.extend((tabela, id_item, nome) for id_item, nome in linhas)
+    return itens
+
+
+def concorrencia_padrao(db):
+    # uma conexão fica livre para a interface, como nos workers do DatabaseManager
+    return max(1, db.pool_config['max_size'] - 1)
+
+
+def _executar(db, tabela, id_item, nome):
+    resultado = {'tabela': tabela, 'id': id_item, 'nome': nome, 'colunas': None, 'linhas': None,
+                 'segundos': 0.0, 'erro': None}
+    inicio = time.perf_counter()
+    try:
+        sql = db.get_item_sql(tabela, id_item)
+        if not sql:
+            raise LookupError(f"{tabela} {id_item} não encontrado")
+        resultado['colunas'], resultado['linhas'] = db.run_query(sql, usar_cache=False)
+    except Exception as e:
+        resultado['erro'] = str(e)
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+
+def gerar_pacote(db, itens, concorrencia=None, ao_concluir=None, cancelar=None):
+    """Executa `itens` ([(tabela, id, nome)]) com até `concorrencia` consultas simultâneas.
+
+    ao_concluir(resultado) é chamado (na thread do pacote) a cada item terminado; cancelar é um
+    threading.Event opcional que impede o início dos itens ainda não iniciados. Um erro num item não
+    interrompe os demais. Retorna {'itens' (na ordem pedida), 'parede_s', 'soma_itens_s', 'paralelismo',
+    'concorrencia', 'erros'}. soma_itens_s soma os tempos individuais medidos sob concorrência: com o servidor
+    disputado cada consulta demora mais, então não é o tempo de uma execução em série (para esse, rode de novo
+    com concorrencia=1). paralelismo = soma_itens_s / parede_s, a média de consultas em andamento.
+    """
+    itens = list(itens)
+    concorrencia = max(1, min(concorrencia or concorrencia_padrao(db), len(itens) or 1))
+    cancelar = cancelar or threading.Event()
+
+    def tarefa(item):
+        if cancelar.is_set():
+            return None
+        return _executar(db, *item)
+
+    inicio = time.perf_counter()
+    resultados = [None] * len(itens)
+    with ThreadPoolExecutor(max_workers=concorrencia, thread_name_prefix="pacote") as executor:
+        futuros = {executor.submit(tarefa, item): i for i, item in enumerate(itens)}
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            if resultado is None:
+                continue
+            resultados[futuros[futuro]] = resultado
+            if ao_concluir:
+                ao_concluir(resultado)
+    parede = time.perf_counter() - inicio
+
+    concluidos = [r for r in resultados if r is not None]
+    soma = sum(r['segundos'] for r in concluidos)
+    return {
+        'itens': concluidos,
+        'parede_s': parede,
+        'soma_itens_s': soma,
+        'paralelismo': soma / parede if parede > 0 else 0.0,
+        'concorrencia': concorrencia,
+        'erros': sum(1 for r in concluidos if r['erro']),
+    }
+
+
+def salvar_pacote(pacote, pasta, formato='csv'):
+    """Grava cada resultado do pacote em `pasta` (um arquivo por item). Retorna a lista de arquivos."""
+    os.makedirs(pasta, exist_ok=True)
+    arquivos = []
+    for r in pacote['itens']:
+        if r['erro'] or r['colunas'] is None:
+            continue
+        nome = re.sub(r'[^\w-]+', '_', f"{r['tabela']}_{r['id']}_{r['nome']}").strip('_')
+        destino = os.path.join(pasta, f"{nome}.{formato}")
+        exportacao.escrever(r['colunas'], [r['linhas']], destino, formato, False)
+        arquivos.append(destino)
+    return arquivos
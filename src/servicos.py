@@ -0,0 +1,402 @@
+"""
+Operações do sistema sem interface: funções simples sobre um DatabaseManager que levantam as exceções
+de src/erros.py. A interface (src/GUI.py) e a linha de comando (src/cli.py) só coletam os dados e chamam
+estas funções, que também podem rodar em jobs sem tela (folha do fim do mês, importações).
+"""
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from mysql.connector import Error
+
+from . import folha, folha_lote, importacao, lancamentos
+from .editor_folha import centavos, reais
+from .erros import DadosInvalidos, NaoEncontrado, traduzir_erro
+
+# aprovador automático (vice-presidente, corpo diretivo)
+ID_APROVADOR = 1
+
+# conta do plano de contas debitada na aquisição de cada tipo de bem
+CONTAS_BENS = {'imovel': 2, 'automovel': 3, 'movel': 4}
+CONTA_FOLHA_ELENCO = 8
+CONTA_FOLHA_FUNCIONARIOS = 9
+
+TIPOS_LANCAMENTO = ('entrada', 'saida')
+TIPOS_FUNCIONARIO = ('contratado', 'terceirizado')
+
+
+# ==================== VALIDAÇÃO DE ENTRADA ====================
+
+def data_br(texto, campo='data'):
+    """DD/MM/AAAA -> 'AAAA-MM-DD'; DadosInvalidos se não for uma data real."""
+    try:
+        return datetime.strptime(str(texto).strip(), '%d/%m/%Y').date().isoformat()
+    except ValueError:
+        raise DadosInvalidos(f"{campo}: data inválida, use DD/MM/AAAA") from None
+
+
+def data_iso(valor, campo='data'):
+    """date, datetime ou 'AAAA-MM-DD' -> 'AAAA-MM-DD'."""
+    if isinstance(valor, datetime):
+        return valor.date().isoformat()
+    if isinstance(valor, date):
+        return valor.isoformat()
+    try:
+        return date.fromisoformat(str(valor).strip()).isoformat()
+    except ValueError:
+        raise DadosInvalidos(f"{campo}: data inválida, use AAAA-MM-DD") from None
+
+
+def numero(valor, campo, inteiro=False, minimo=None):
+    """Converte para Decimal/int (aceita vírgula decimal); DadosInvalidos se inválido ou abaixo do mínimo."""
+    try:
+        texto = str(valor).strip().replace(',', '.') if isinstance(valor, str) else valor
+        if isinstance(texto, float) and not inteiro:
+            texto = repr(texto)
+        convertido = int(texto) if inteiro else Decimal(texto)
+    except (TypeError, ValueError, InvalidOperation):
+        raise DadosInvalidos(f"{campo}: número inválido") from None
+    if not inteiro and not convertido.is_finite():
+        raise DadosInvalidos(f"{campo}: número inválido")
+    if minimo is not None and convertido < Decimal(str(minimo)):
+        raise DadosInvalidos(f"{campo}: deve ser no mínimo {minimo}")
+    return convertido
+
+
+def dinheiro(valor, campo, minimo=None):
+    """Valor em reais -> Decimal com duas casas, arredondado como o MySQL grava em DECIMAL
+    (editor_folha.centavos: aceita '1234,56' e '1.234,56'); DadosInvalidos se vazio, inválido ou abaixo do mínimo."""
+    if valor is None or (isinstance(valor, str) and not valor.strip()):
+        raise DadosInvalidos(f"{campo}: número inválido")
+    quantia = reais(centavos(valor, campo))
+    if minimo is not None and quantia < Decimal(str(minimo)):
+        raise DadosInvalidos(f"{campo}: deve ser no mínimo {minimo}")
+    return quantia
+
+
+def _obrigatorio(valor, campo):
+    valor = (valor or '').strip()
+    if not valor:
+        raise DadosInvalidos(f"{campo}: campo obrigatório")
+    return valor
+
+
+def _opcao(valor, opcoes, campo):
+    if valor not in opcoes:
+        raise DadosInvalidos(f"{campo}: use {', '.join(opcoes)}")
+    return valor
+
+
+# ==================== ACESSO AO BANCO ====================
+
+@contextmanager
+def _transacao(db):
+    """Cursor numa transação: commit ao sair, rollback e exceção tipada em caso de erro."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Error as e:
+            conn.rollback()
+            raise traduzir_erro(e) from e
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def _consulta(db, sql, params=None):
+    try:
+        return db.run_query(sql, params)
+    except Error as e:
+        raise traduzir_erro(e) from e
+
+
+# ==================== LANÇAMENTOS ====================
+
+def criar_lancamento_manual(db, valor, tipo, id_conta, descricao, id_direcao, id_aprovador=ID_APROVADOR):
+    """Lançamento manual já aprovado. Retorna o id."""
+    valor = dinheiro(valor, 'valor', minimo='0.01')
+    tipo = _opcao(tipo, TIPOS_LANCAMENTO, 'tipo')
+    id_conta = numero(id_conta, 'conta', inteiro=True)
+    with _transacao(db) as cursor:
+        cursor.execute("""
+            INSERT INTO lancamento (valor, tipo_de_movimentacao, status_aprovacao,
+                                    id_direcao, id_conta, descricao, origem, id_aprovador, data_aprovacao)
+            VALUES (%s, %s, 'aprovado', %s, %s, %s, 'manual', %s, NOW())
+        """, (valor, tipo, id_direcao, id_conta, (descricao or '').strip(), id_aprovador))
+        return cursor.lastrowid
+
+
+def aprovar_lancamentos(db, ids, id_aprovador):
+    """Ver lancamentos.aprovar_lancamentos_lote: (aprovados, estouros)."""
+    try:
+        return lancamentos.aprovar_lancamentos_lote(db, ids, id_aprovador)
+    except Error as e:
+        raise traduzir_erro(e) from e
+
+
+def importar_lancamentos(db, arquivo, id_direcao, id_aprovador=ID_APROVADOR, tudo_ou_nada=False):
+    """Importação em massa de lançamentos manuais aprovados a partir de CSV (ver importacao.importar_lancamentos)."""
+    try:
+        return importacao.importar_lancamentos(db, arquivo, id_direcao, id_aprovador, tudo_ou_nada)
+    except ValueError as e:
+        raise DadosInvalidos(str(e)) from e
+    except OSError as e:
+        raise DadosInvalidos(f"arquivo: {e}") from e
+    except Error as e:
+        raise traduzir_erro(e) from e
+
+
+# ==================== ELENCO ====================
+
+def adicionar_jogador(db, nome, funcao, multa, luvas, inicio_contrato, fim_contrato, id_direcao):
+    """Cadastra o atleta (datas em AAAA-MM-DD ou date). Retorna o id."""
+    nome = _obrigatorio(nome, 'nome')
+    funcao = _obrigatorio(funcao, 'função')
+    inicio = data_iso(inicio_contrato, 'início do contrato')
+    fim = data_iso(fim_contrato, 'fim do contrato')
+    if fim < inicio:
+        raise DadosInvalidos("fim do contrato: anterior ao início")
+    with _transacao(db) as cursor:
+        cursor.execute("""
+            INSERT INTO elenco (nome_jogador, funcao, multa, luvas,
+                                inicio_contrato, fim_contrato, passe_data_contrato, id_direcao)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, (nome, funcao, dinheiro(multa, 'multa', minimo=0), dinheiro(luvas, 'luvas', minimo=0),
+              inicio, fim, inicio, id_direcao))
+        return cursor.lastrowid
+
+
+def encerrar_contrato_jogador(db, id_elenco):
+    """Remove o atleta e os itens de folha dele."""
+    with _transacao(db) as cursor:
+        cursor.execute("DELETE FROM item_folha_e WHERE id_elenco = %s", (id_elenco,))
+        cursor.execute("DELETE FROM elenco WHERE id_elenco = %s", (id_elenco,))
+        if cursor.rowcount == 0:
+            raise NaoEncontrado(f"Atleta {id_elenco} não encontrado")
+
+
+def jogadores_para_folha(db, id_direcao):
+    """Atletas com contrato ativo e o último salário base pago: dicts com id_elenco, nome_jogador, funcao, salario_base."""
+    cols, rows = _consulta(db, """
+        SELECT e.id_elenco, e.nome_jogador, e.funcao,
+            COALESCE((SELECT ife.salario_base FROM item_folha_e ife WHERE ife.id_elenco = e.id_elenco ORDER BY ife.id_folha_elenco DESC LIMIT 1), 0) AS salario_base
+        FROM elenco e
+        WHERE e.id_direcao = %s AND e.fim_contrato >= CURDATE()
+        ORDER BY e.id_elenco
+    """, (id_direcao,))
+    return [{'id_elenco': r[0], 'nome_jogador': r[1], 'funcao': r[2], 'salario_base': r[3]} for r in rows or []]
+
+
+def gerar_folha_elenco(db, id_direcao, data_competencia, data_pagamento, itens, id_aprovador=ID_APROVADOR):
+    """Folha de elenco com os itens, aprovada na mesma transação (ver folha.gerar_folha_elenco). Retorna o id."""
+    itens = list(itens)
+    if not itens:
+        raise DadosInvalidos("folha sem itens")
+    try:
+        return folha.gerar_folha_elenco(db, id_direcao, data_iso(data_competencia, 'competência'),
+                                        data_iso(data_pagamento, 'pagamento'), itens, id_aprovador,
+                                        CONTA_FOLHA_ELENCO)
+    except Error as e:
+        raise traduzir_erro(e) from e
+
+
+# ==================== FUNCIONÁRIOS ====================
+
+def contratar_funcionario(db, id_contrato, salario, cargo, setor, tipo, id_direcao, data_admissao=None):
+    """Cadastra o funcionário (e o registro de contratado, com admissão hoje por padrão). Retorna o id."""
+    id_contrato = _obrigatorio(id_contrato, 'ID do contrato')
+    tipo = _opcao(tipo, TIPOS_FUNCIONARIO, 'tipo')
+    salario = dinheiro(salario, 'salário', minimo=0)
+    admissao = data_iso(data_admissao or date.today(), 'admissão')
+    # mesma conexão para os dois INSERTs (lastrowid é por conexão)
+    with _transacao(db) as cursor:
+        cursor.execute("""
+            INSERT INTO funcionarios (id_contrato, salario, cargo, setor, tipo_funcionario, id_direcao)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, (id_contrato, salario, (cargo or '').strip(), (setor or '').strip(), tipo, id_direcao))
+        id_func = cursor.lastrowid
+        if tipo == 'contratado':
+            cursor.execute("INSERT INTO contratado (id_funcionario, data_admissao) VALUES (%s, %s)",
+                           (id_func, admissao))
+        return id_func
+
+
+def demitir_funcionario(db, id_funcionario):
+    """Remove o funcionário, os subtipos e os itens de folha dele."""
+    with _transacao(db) as cursor:
+        cursor.execute("DELETE FROM item_folha_f WHERE id_funcionario = %s", (id_funcionario,))
+        cursor.execute("DELETE FROM contratado WHERE id_funcionario = %s", (id_funcionario,))
+        cursor.execute("DELETE FROM terceirizado WHERE id_funcionario = %s", (id_funcionario,))
+        cursor.execute("DELETE FROM funcionarios WHERE id_funcionario = %s", (id_funcionario,))
+        if cursor.rowcount == 0:
+            raise NaoEncontrado(f"Funcionário {id_funcionario} não encontrado")
+
+
+def funcionarios_para_folha(db, id_direcao):
+    """Funcionários do corpo: dicts com id_funcionario, id_contrato, cargo, setor, salario_base."""
+    cols, rows = _consulta(db, """
+        SELECT id_funcionario, id_contrato, cargo, setor, salario
+        FROM funcionarios WHERE id_direcao = %s ORDER BY id_funcionario
+    """, (id_direcao,))
+    return [{'id_funcionario': r[0], 'id_contrato': r[1], 'cargo': r[2], 'setor': r[3], 'salario_base': r[4]}
+            for r in rows or []]
+
+
+def gerar_folha_funcionarios(db, id_direcao, data_competencia, data_pagamento, itens, id_aprovador=ID_APROVADOR):
+    """Folha de funcionários com os itens, aprovada na mesma transação. Retorna o id."""
+    itens = list(itens)
+    if not itens:
+        raise DadosInvalidos("folha sem itens")
+    try:
+        return folha.gerar_folha_funcionarios(db, id_direcao, data_iso(data_competencia, 'competência'),
+                                              data_iso(data_pagamento, 'pagamento'), itens, id_aprovador,
+                                              CONTA_FOLHA_FUNCIONARIOS)
+    except Error as e:
+        raise traduzir_erro(e) from e
+
+
+# ==================== ORÇAMENTO DA FOLHA ====================
+
+# (tabela do corpo com o orçamento, tabela das folhas) de cada tipo de folha
+TABELAS_ORCAMENTO = {
+    'elenco': ('corpo_esportivo', 'folha_elenco'),
+    'funcionarios': ('corpo_financeiro', 'folha_funcionarios'),
+}
+
+
+def inicio_do_mes(data_competencia):
+    """(primeiro dia do mês, primeiro dia do mês seguinte), como os triggers de orçamento."""
+    inicio = date.fromisoformat(data_iso(data_competencia, 'competência')).replace(day=1)
+    fim = inicio.replace(year=inicio.year + 1, month=1) if inicio.month == 12 else inicio.replace(month=inicio.month + 1)
+    return inicio.isoformat(), fim.isoformat()
+
+
+def orcamento_folha(db, tipo, id_direcao, data_competencia):
+    """(orçamento mensal do corpo, total bruto já aprovado/pago no mês, saldo de caixa), em Decimal.
+    A soma usa o índice (id_direcao, data_competencia, status) das folhas."""
+    if tipo not in TABELAS_ORCAMENTO:
+        raise DadosInvalidos(f"tipo de folha: use {', '.join(TABELAS_ORCAMENTO)}")
+    corpo, tabela = TABELAS_ORCAMENTO[tipo]
+    inicio, fim = inicio_do_mes(data_competencia)
+    cols, rows = _consulta(db, f"""
+        SELECT c.orcamento,
+            (SELECT COALESCE(SUM(f.valor_bruto), 0) FROM {tabela} f
+             WHERE f.id_direcao = c.id_direcao AND f.data_competencia >= %s AND f.data_competencia < %s
+               AND f.status IN ('aprovado', 'pago')),
+            (SELECT saldo FROM saldo_caixa WHERE id_saldo = 1)
+        FROM {corpo} c WHERE c.id_direcao = %s
+    """, (inicio, fim, id_direcao))
+    if not rows:
+        raise NaoEncontrado(f"Corpo {id_direcao} sem orçamento em {corpo}")
+    return tuple(rows[0])
+
+
+# ==================== FOLHA DO MÊS (jobs) ====================
+
+_ZERO = Decimal('0.00')
+
+
+def _pagamento_padrao(competencia):
+    return date.fromisoformat(competencia).replace(day=5).isoformat()
+
+
+def folha_mensal_elenco(db, id_direcao, data_competencia, data_pagamento=None):
+    """Folha de elenco do mês só com o salário base de cada atleta ativo (pagamento no dia 5 por padrão).
+    Retorna (id_folha, quantidade de itens, total bruto): sem bônus nem descontos, a soma dos salários base."""
+    competencia = data_iso(data_competencia, 'competência')
+    itens = [{'id_elenco': j['id_elenco'], 'salario_base': j['salario_base'], 'bonus': _ZERO,
+              'direito_imagem': _ZERO, 'parcela_luvas': _ZERO, 'descontos': _ZERO}
+             for j in jogadores_para_folha(db, id_direcao)]
+    if not itens:
+        raise NaoEncontrado("Não há jogadores com contrato ativo")
+    id_folha = gerar_folha_elenco(db, id_direcao, competencia, data_pagamento or _pagamento_padrao(competencia), itens)
+    return id_folha, len(itens), sum((i['salario_base'] for i in itens), _ZERO)
+
+
+def folha_mensal_funcionarios(db, id_direcao, data_competencia, data_pagamento=None):
+    """Folha de funcionários do mês com o salário de cadastro. Retorna (id_folha, itens, total bruto), a soma
+    dos salários (sem bônus, descontos nem adicionais)."""
+    competencia = data_iso(data_competencia, 'competência')
+    itens = [{'id_funcionario': f['id_funcionario'], 'salario_base': f['salario_base'], 'bonus': _ZERO,
+              'descontos': _ZERO, 'adicionais': _ZERO}
+             for f in funcionarios_para_folha(db, id_direcao)]
+    if not itens:
+        raise NaoEncontrado("Não há funcionários cadastrados")
+    id_folha = gerar_folha_funcionarios(db, id_direcao, competencia, data_pagamento or _pagamento_padrao(competencia), itens)
+    return id_folha, len(itens), sum((i['salario_base'] for i in itens), _ZERO)
+
+
+def folhas_em_lote(db, inicio, meses, tipos=('elenco', 'funcionarios'), direcoes=None, id_aprovador=ID_APROVADOR,
+                   folhas_por_transacao=None, simular=False):
+    """Folhas de `meses` meses a partir de `inicio` ('AAAA-MM') para os corpos dos `tipos` (ou só os de
+    `direcoes`), gravadas e aprovadas em lote (src/folha_lote.py). Retorna o dict de
+    folha_lote.gerar."""
+    inicio = _obrigatorio(inicio, 'início')
+    inicio = data_iso(inicio if len(inicio) > 7 else inicio + '-01', 'início (AAAA-MM)')
+    meses = numero(meses, 'meses', inteiro=True, minimo=1)
+    if folhas_por_transacao is not None:
+        folhas_por_transacao = numero(folhas_por_transacao, 'folhas por transação', inteiro=True, minimo=1)
+    for tipo in tipos:
+        _opcao(tipo, folha_lote.TIPOS, 'tipo de folha')
+    contas = {'elenco': CONTA_FOLHA_ELENCO, 'funcionarios': CONTA_FOLHA_FUNCIONARIOS}
+    try:
+        lista = folha_lote.corpos(db, tipos)
+        if direcoes:
+            lista = [c for c in lista if c[1] in set(direcoes)]
+        if not lista:
+            raise NaoEncontrado("Nenhum corpo com orçamento para os tipos/direções informados")
+        return folha_lote.gerar(db, folha_lote.meses(inicio, int(meses)), lista, id_aprovador, contas,
+                                folhas_por_transacao, simular)
+    except Error as e:
+        raise traduzir_erro(e) from e
+
+
+# ==================== BENS ====================
+
+def registrar_bem(db, tipo, nome, valor, localizacao, data_aquisicao, id_direcao, detalhes,
+                  id_aprovador=ID_APROVADOR):
+    """Cadastra o bem com o subtipo e aprova por sp_aprovar_bem (gera o lançamento de saída). Retorna o id.
+
+    detalhes por tipo: imovel {endereco, area, tipo_propriedade, depreciacao_ano};
+    automovel {tipo, placa, ano, modelo}; movel {depreciacao_ano}.
+    """
+    tipo = _opcao(tipo, tuple(CONTAS_BENS), 'tipo de bem')
+    nome = _obrigatorio(nome, 'nome do item')
+    valor = dinheiro(valor, 'valor', minimo='0.01')
+    aquisicao = data_iso(data_aquisicao, 'data de aquisição')
+    if tipo == 'imovel':
+        sql_subtipo = """
+            INSERT INTO imoveis (id_bem, endereco, area, tipo_propriedade, depreciacao_ano)
+            VALUES (%s, %s, %s, %s, %s)
+        """
+        valores = (_obrigatorio(detalhes.get('endereco'), 'endereço'), numero(detalhes.get('area'), 'área', minimo=0),
+                   _obrigatorio(detalhes.get('tipo_propriedade'), 'tipo de propriedade'),
+                   numero(detalhes.get('depreciacao_ano', 2.0), 'depreciação', minimo=0))
+    elif tipo == 'automovel':
+        sql_subtipo = "INSERT INTO automoveis (id_bem, tipo, placa, ano, modelo) VALUES (%s, %s, %s, %s, %s)"
+        valores = (_obrigatorio(detalhes.get('tipo'), 'tipo de veículo'), _obrigatorio(detalhes.get('placa'), 'placa'),
+                   numero(detalhes.get('ano'), 'ano', inteiro=True), _obrigatorio(detalhes.get('modelo'), 'modelo'))
+    else:
+        sql_subtipo = "INSERT INTO moveis (id_bem, depreciacao_ano) VALUES (%s, %s)"
+        valores = (numero(detalhes.get('depreciacao_ano'), 'depreciação', minimo=0),)
+
+    with _transacao(db) as cursor:
+        cursor.execute("""
+            INSERT INTO bens (data_aquisicao, nome_item, valor_aquisicao, localizacao, id_direcao, status_aprovacao)
+            VALUES (%s, %s, %s, %s, %s, 'pendente')
+        """, (aquisicao, nome, valor, (localizacao or '').strip(), id_direcao))
+        id_bem = cursor.lastrowid
+        cursor.execute(sql_subtipo, (id_bem,) + valores)
+        cursor.execute("CALL sp_aprovar_bem(%s, %s, %s)", (id_bem, id_aprovador, CONTAS_BENS[tipo]))
+        return id_bem
+
+
+def dar_baixa_bem(db, id_bem):
+    with _transacao(db) as cursor:
+        cursor.execute("UPDATE bens SET status_aprovacao = 'baixado' WHERE id_bem = %s", (id_bem,))
+        if cursor.rowcount == 0:
+            raise NaoEncontrado(f"Bem {id_bem} não encontrado ou já baixado")
@@ -1,23 +1,106 @@
 """
 Sistema de Gestão de Clube Esportivo - Ponto de entrada.
-Main e lógica de inicialização: conecta ao banco e inicia a interface.
+Main e lógica de inicialização: abre a interface e conecta ao banco em segundo plano.
+
+`python run.py --medir-inicio` mede importações, criação do Tk, tela de login e primeira conexão,
+imprime os tempos e encerra. `--medir-telas` compara a navegação entre as telas reconstruindo-as
+e reaproveitando as já construídas (ClubManagementApp.medir_telas), sem consultar o banco.
 """
+import time
+
+_INICIO = time.perf_counter()
+
+import argparse
+import sys
 import tkinter as tk
-from .banco import DB_CONFIG, DatabaseManager
-from .GUI import ClubManagementApp
+from tkinter import messagebox
+from .banco import CACHE_CONFIG, DB_CONFIG, MONITOR_CONFIG, DatabaseManager
+from .cache import ResultCache
+from .erros import ErroConexao
+from .metricas import MonitorConsultas
+from .GUI import ClubManagementApp, mostrar_erro
+
+_IMPORTACOES = time.perf_counter() - _INICIO
+
+POLL_MS = 50
+
+
+def _relatar_inicio(tempos, db):
+    linhas = [
+        ("importações", tempos['importacoes']),
+        ("Tk", tempos['tk']),
+        ("tela de login", tempos['login']),
+        ("driver MySQL (em segundo plano)", db.tempos_inicio.get('driver')),
+        ("primeira conexão (em segundo plano)", db.tempos_inicio.get('pool')),
+    ]
+    for nome, segundos in linhas:
+        valor = f"{segundos * 1000:8.1f} ms" if segundos is not None else "       —"
+        print(f"{nome:<38}{valor}", file=sys.stderr)
+    print(f"{'login visível após':<38}{tempos['login_visivel'] * 1000:8.1f} ms", file=sys.stderr)
+    print(f"{'banco pronto após':<38}{tempos['banco_pronto'] * 1000:8.1f} ms", file=sys.stderr)
+
 
+def _relatar_telas(tempos):
+    print(f"{'tela':<22}{'construção':>12}{'antes':>10}{'depois':>10}   (ms, medianas)", file=sys.stderr)
+    for nome, (construcao, antes, depois) in tempos.items():
+        print(f"{nome:<22}{construcao:12.1f}{antes:10.1f}{depois:10.1f}", file=sys.stderr)
 
-def main():
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de Gestão de Clube Esportivo")
+    parser.add_argument("--medir-inicio", action="store_true",
+                        help="mede os tempos de inicialização, imprime e encerra")
+    parser.add_argument("--medir-telas", action="store_true",
+                        help="mede a troca de telas com e sem reaproveitamento, imprime e encerra")
+    args = parser.parse_args(argv)
+    tempos = {'importacoes': _IMPORTACOES}
+
+    t = time.perf_counter()
     root = tk.Tk()
+    tempos['tk'] = time.perf_counter() - t
 
-    try:
-        db = DatabaseManager(DB_CONFIG)
-    except Exception:
+    # o pool abre numa thread: a tela de login aparece sem esperar o banco
+    db = DatabaseManager(DB_CONFIG, cache=ResultCache(**CACHE_CONFIG),
+                         monitor=MonitorConsultas(**MONITOR_CONFIG), ao_erro=mostrar_erro,
+                         pool_em_segundo_plano=True)
+    t = time.perf_counter()
+    app = ClubManagementApp(root, db)
+    root.update()
+    tempos['login'] = time.perf_counter() - t
+    tempos['login_visivel'] = time.perf_counter() - _INICIO
+
+    if args.medir_telas:
+        _relatar_telas(app.medir_telas())
         root.destroy()
+        db.close()
         return
 
-    app = ClubManagementApp(root, db)
-    root.mainloop()
+    def aguardar_conexao():
+        if not db.conexao.done():
+            root.after(POLL_MS, aguardar_conexao)
+            return
+        tempos['banco_pronto'] = time.perf_counter() - _INICIO
+        if args.medir_inicio:
+            _relatar_inicio(tempos, db)
+        try:
+            db.conexao.result()
+        except ErroConexao as e:
+            messagebox.showerror("Erro Crítico", str(e))
+            root.destroy()
+            return
+        except Exception as e:
+            # falha inesperada (ex.: driver MySQL não importa): avisa e deixa o traceback no terminal
+            messagebox.showerror("Erro Crítico", f"Falha ao iniciar a conexão:\n{type(e).__name__}: {e}")
+            root.destroy()
+            raise
+        if args.medir_inicio:
+            root.destroy()
+
+    aguardar_conexao()
+    try:
+        root.mainloop()
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
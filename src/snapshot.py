@@ -0,0 +1,223 @@
+"""
+Cópia local em disco do início das views dos perfis (dados_privados, dados_publicos), servida no login
+sem ir ao banco e revalidada em segundo plano por um token de mudança barato.
+
+Formato do arquivo: cabeçalho 'GCS1' seguido de JSON compactado com zlib, em colunas (uma lista de
+valores por coluna, com o tipo da coluna para reconstruir Decimal/datetime/date). O token combina
+MAX(id_lancamento), MAX(data_aprovacao) dos aprovados (índice idx_lancamento_status_aprovacao),
+a contagem mantida em resumo_mensal_conta e o saldo de caixa; a view só é consultada de novo quando
+ele muda.
+
+Só as views de PERSISTIDAS vão para o disco, na pasta de cache do usuário (pasta 0700, arquivos 0600).
+dados_privados (perfil conselheiro) fica só em memória, durante a sessão: não é gravado em disco.
+"""
+import json
+import os
+import re
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+
+from .paginacao import CHAVES_VIEWS, FonteKeyset, Pagina, fonte_para_view
+
+CABECALHO = b'GCS1'
+PERSISTIDAS = frozenset({'dados_publicos'})
+LIMITE = 5000  # linhas guardadas por view (as seguintes vêm do banco ao rolar)
+
+SQL_TOKEN = """
+    SELECT (SELECT MAX(id_lancamento) FROM lancamento),
+           (SELECT MAX(data_aprovacao) FROM lancamento WHERE status_aprovacao = 'aprovado'),
+           (SELECT COALESCE(SUM(total_lancamentos), 0) FROM resumo_mensal_conta),
+           (SELECT saldo FROM saldo_caixa WHERE id_saldo = 1)
+"""
+
+_NOME = re.compile(r'\w+')
+
+
+# ==================== CODIFICAÇÃO ====================
+
+def _tipo(valores):
+    for v in valores:
+        if v is None:
+            continue
+        if isinstance(v, Decimal):
+            return 'decimal'
+        if isinstance(v, datetime):
+            return 'datetime'
+        if isinstance(v, date):
+            return 'date'
+        return 'json'
+    return 'json'
+
+
+_PARA_TEXTO = {'decimal': str, 'datetime': datetime.isoformat, 'date': date.isoformat}
+_DE_TEXTO = {'decimal': Decimal, 'datetime': datetime.fromisoformat, 'date': date.fromisoformat}
+
+
+def codificar(colunas, linhas, token):
+    por_coluna = list(zip(*linhas)) if linhas else [() for _ in colunas]
+    tipos, valores = [], []
+    for coluna in por_coluna:
+        tipo = _tipo(coluna)
+        converter = _PARA_TEXTO.get(tipo)
+        tipos.append(tipo)
+        valores.append([v if v is None or converter is None else converter(v) for v in coluna])
+    corpo = json.dumps({'colunas': list(colunas), 'tipos': tipos, 'valores': valores, 'linhas': len(linhas),
+                        'token': _token_texto(token)}, ensure_ascii=False, separators=(',', ':'))
+    return CABECALHO + zlib.compress(corpo.encode('utf-8'), 6)
+
+
+def decodificar(dados):
+    """(colunas, linhas, token); ValueError se o arquivo não for um snapshot válido."""
+    if not dados.startswith(CABECALHO):
+        raise ValueError("Cabeçalho de snapshot inválido")
+    try:
+        corpo = json.loads(zlib.decompress(dados[len(CABECALHO):]).decode('utf-8'))
+    except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Snapshot corrompido: {e}") from e
+    colunas = []
+    for tipo, valores in zip(corpo['tipos'], corpo['valores']):
+        converter = _DE_TEXTO.get(tipo)
+        colunas.append(valores if converter is None else [None if v is None else converter(v) for v in valores])
+    linhas = list(zip(*colunas)) if corpo['linhas'] else []
+    return corpo['colunas'], linhas, corpo['token']
+
+
+def _token_texto(token):
+    return None if token is None else [None if v is None else str(v) for v in token]
+
+
+# ==================== ARMAZENAMENTO ====================
+
+def pasta_padrao():
+    """Pasta de cache do usuário: %LOCALAPPDATA% no Windows, $XDG_CACHE_HOME ou ~/.cache nos demais."""
+    base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else os.environ.get('XDG_CACHE_HOME')
+    return os.path.join(base or os.path.join(os.path.expanduser('~'), '.cache'), 'gestao_clube', 'snapshots')
+
+
+class Snapshots:
+    """Snapshots das views: um arquivo por view em `pasta` para as de `persistidas`, memória para as demais."""
+
+    def __init__(self, db, pasta=None, limite=LIMITE, persistidas=PERSISTIDAS):
+        self.db = db
+        self.pasta = pasta or pasta_padrao()
+        self.limite = limite
+        self.persistidas = frozenset(persistidas)
+        self._memoria = {}
+
+    def _arquivo(self, view):
+        if not _NOME.fullmatch(view):
+            raise ValueError(f"Nome de view inválido: {view}")
+        return os.path.join(self.pasta, f"{view}.snap")
+
+    def ler(self, view):
+        """(colunas, linhas, token) guardados, ou None se não houver snapshot utilizável."""
+        arquivo = self._arquivo(view)
+        if view not in self.persistidas:
+            return self._memoria.get(view)
+        try:
+            with open(arquivo, 'rb') as f:
+                return decodificar(f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def gravar(self, view, colunas, linhas, token):
+        destino = self._arquivo(view)
+        if view not in self.persistidas:
+            self._memoria[view] = (list(colunas), list(linhas), _token_texto(token))
+            return
+        os.makedirs(self.pasta, mode=0o700, exist_ok=True)
+        fd = os.open(destino + '.tmp', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, 'wb') as f:
+            if hasattr(os, 'fchmod'):
+                os.fchmod(f.fileno(), 0o600)  # .tmp que sobrou de uma versão anterior mantém o modo antigo
+            f.write(codificar(colunas, linhas, token))
+        os.replace(destino + '.tmp', destino)
+
+    def token(self):
+        """Token de mudança atual do banco (quatro leituras por índice ou de linha única)."""
+        cols, linhas = self.db.run_query(SQL_TOKEN, usar_cache=False)
+        return _token_texto(linhas[0]) if linhas else None
+
+    def buscar(self, view, token=None):
+        """Consulta as primeiras `limite` linhas da view e grava o snapshot. Retorna (colunas, linhas, token)."""
+        token = token if token is not None else self.token()
+        chaves = CHAVES_VIEWS.get(view)
+        ordem = f" ORDER BY {', '.join(f'{k} DESC' for k in chaves)}" if chaves else ""
+        sql = f"SELECT * FROM {view}{ordem} LIMIT {int(self.limite) + 1}"
+        self._arquivo(view)
+        colunas, linhas = self.db.run_query(sql, usar_cache=False)
+        linhas = linhas or []
+        self.gravar(view, colunas, linhas, token)
+        return colunas, linhas, token
+
+    def revalidar(self, view, token_local):
+        """(colunas, linhas, token) novos se o token do banco mudou; None se o snapshot continua válido."""
+        token = self.token()
+        if token == token_local:
+            return None
+        return self.buscar(view, token)
+
+
+# ==================== FONTE PAGINADA ====================
+
+class FonteSnapshot:
+    """Fonte paginada (src/paginacao.py) que entrega as linhas do snapshot e, depois da última linha
+    guardada, continua pela fonte real da view (paginação por chave ou por OFFSET)."""
+
+    def __init__(self, db, view, colunas, linhas, limite=LIMITE):
+        self.real = fonte_para_view(db, view)
+        self.colunas = list(colunas)
+        self.completo = len(linhas) <= limite
+        self._linhas = linhas[:limite]
+        self._keyset = isinstance(self.real, FonteKeyset)
+        self.real.colunas = self.colunas
+        if self._keyset:
+            self.real._idx = [self.colunas.index(k) for k in self.real.chaves]
+            self._posicao = {self._cursor(i): i for i in range(len(self._linhas))}
+
+    def _cursor(self, i):
+        """Cursor da linha i no formato da fonte real: chave (keyset) ou posição (OFFSET)."""
+        if self._keyset:
+            return self.real._chave(self._linhas[i])
+        return i
+
+    def _fatia(self, inicio, fim):
+        inicio, fim = max(0, inicio), min(len(self._linhas), fim)
+        linhas = self._linhas[inicio:fim]
+        if not linhas:
+            return Pagina([], None, None, inicio > 0, not self.completo)
+        tem_seguinte = fim < len(self._linhas) or not self.completo
+        if self._keyset:
+            return Pagina(linhas, self._cursor(inicio), self._cursor(fim - 1), inicio > 0, tem_seguinte)
+        return Pagina(linhas, inicio, fim, inicio > 0, tem_seguinte)
+
+    def _indice(self, cursor):
+        if self._keyset:
+            return self._posicao.get(tuple(cursor))
+        return cursor if 0 <= cursor <= len(self._linhas) else None
+
+    def primeira(self, limite):
+        return self._fatia(0, limite)
+
+    def seguinte(self, fim, limite):
+        i = self._indice(fim)
+        if self._keyset:
+            if i is not None and i + 1 < len(self._linhas):
+                return self._fatia(i + 1, i + 1 + limite)
+        elif i is not None and i < len(self._linhas):
+            return self._fatia(i, i + limite)
+        return self.real.seguinte(fim, limite)
+
+    def anterior(self, inicio, limite):
+        i = self._indice(inicio)
+        if i is not None:
+            return self._fatia(i - limite, i)
+        return self.real.anterior(inicio, limite)
+
+    def contar(self):
+        return len(self._linhas) if self.completo else self.real.contar()
+
+    def filtrada(self, filtros=(), termo='', ordem=None):
+        """Filtro/ordenação no servidor, sobre a view inteira (não só sobre o snapshot)."""
+        return self.real.filtrada(filtros, termo, ordem)
@@ -0,0 +1,234 @@
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+from src import banco
+from src.banco import DatabaseManager
+from src.cache import ResultCache, inicio_comando
+from src import GUI as gui
+from src.GUI import ClubManagementApp
+
+
+class CursorFalso:
+    def __init__(self, pool):
+        self.pool = pool
+        self.description = None
+        self.rowcount = 0
+        self._linhas = []
+
+    def execute(self, sql, params=None):
+        self.pool.comandos.append((sql, params))
+        if sql.startswith('FALHA'):
+            raise ValueError("comando recusado")
+        if inicio_comando(sql).upper().startswith('SELECT'):
+            self.description = [('id',), ('nome',)]
+            self._linhas = [(1, 'Ana'), (2, 'Bruno')]
+        else:
+            self.description, self.rowcount = None, 1
+
+    def fetchall(self):
+        return self._linhas
+
+    def close(self):
+        pass
+
+
+class ConexaoFalsa:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self, *args, **kwargs):
+        return CursorFalso(self.pool)
+
+    def commit(self):
+        self.pool.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.pool.devolvidas += 1
+
+
+class PoolFalso:
+    """No lugar de banco.ConnectionPool: conexões em memória, registra os comandos."""
+
+    def __init__(self, config, **kwargs):
+        self.comandos, self.commits, self.devolvidas = [], 0, 0
+
+    def get_connection(self):
+        return ConexaoFalsa(self)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(banco, 'ConnectionPool', PoolFalso)
+    gerenciador = DatabaseManager({}, workers=0, cache=ResultCache())
+    yield gerenciador
+    gerenciador.close()
+
+
+def test_run_query_usa_o_cache_e_devolve_a_conexao(db):
+    assert db.run_query("-- Consulta 1\nSELECT * FROM bens") == (['id', 'nome'], [(1, 'Ana'), (2, 'Bruno')])
+    db.run_query("-- Consulta 1\nSELECT * FROM bens")
+    assert len(db._pool.comandos) == 1 and db._pool.devolvidas == 1
+    assert db.cache_stats()['hits'] == 1
+
+
+def test_escrita_invalida_o_cache(db):
+    db.run_query("SELECT * FROM bens")
+    assert db.run_query("UPDATE bens SET nome = 'x'") == (None, None)
+    assert db._pool.commits == 1
+    db.run_query("SELECT * FROM bens")
+    assert len(db._pool.comandos) == 3
+
+
+def test_submit_sincrono(db):
+    future = db.submit_query("SELECT * FROM bens")
+    assert future.done() and future.result()[1][0] == (1, 'Ana')
+    falhou = db.submit(db.run_query, "FALHA")
+    assert isinstance(falhou.exception(), ValueError)
+
+
+def test_submit_em_worker(monkeypatch):
+    monkeypatch.setattr(banco, 'ConnectionPool', PoolFalso)
+    db = DatabaseManager({}, workers=2)
+    try:
+        futures = [db.submit_query("SELECT * FROM bens") for _ in range(5)]
+        assert all(f.result(timeout=5)[0] == ['id', 'nome'] for f in futures)
+    finally:
+        db.close()
+
+
+class RaizFalsa:
+    """root do Tk: after() guarda os callbacks e rodar() os executa em ordem, como o mainloop."""
+
+    def __init__(self):
+        self.agendados = []
+
+    def after(self, ms, fn):
+        self.agendados.append(fn)
+
+    def rodar(self):
+        while self.agendados:
+            self.agendados.pop(0)()
+
+
+def _app(tela='inicio'):
+    app = SimpleNamespace(root=RaizFalsa(), POLL_MS=0, _tela=tela, ocupado=0)
+    app._set_busy = lambda delta: setattr(app, 'ocupado', app.ocupado + delta)
+    return app
+
+
+def test_aguardar_entrega_o_resultado(db):
+    app, recebidos = _app(), []
+    ClubManagementApp._aguardar(app, db.submit_query("SELECT * FROM bens"), recebidos.append)
+    app.root.rodar()
+    assert recebidos == [(['id', 'nome'], [(1, 'Ana'), (2, 'Bruno')])] and app.ocupado == 0
+
+
+def test_aguardar_espera_o_worker():
+    app, recebidos, future = _app(), [], Future()
+    ClubManagementApp._aguardar(app, future, recebidos.append)
+    assert app.ocupado == 1 and len(app.root.agendados) == 1
+    app.root.agendados.pop(0)()  # ainda pendente: reagenda
+    assert recebidos == [] and len(app.root.agendados) == 1
+    future.set_result(42)
+    app.root.rodar()
+    assert recebidos == [42] and app.ocupado == 0
+
+
+def test_aguardar_entrega_o_erro(db):
+    app, erros = _app(), []
+    ClubManagementApp._aguardar(app, db.submit(db.run_query, "FALHA"), lambda r: None, erros.append)
+    app.root.rodar()
+    assert len(erros) == 1 and isinstance(erros[0], ValueError)
+
+
+def test_aguardar_descarta_se_a_tela_mudou():
+    app, recebidos, future = _app(), [], Future()
+    ClubManagementApp._aguardar(app, future, recebidos.append)
+    app._tela = 'outra'
+    future.set_result('velho')
+    app.root.rodar()
+    assert recebidos == [] and app.ocupado == 0
+
+
+class DriverFalso:
+    def connect(self, **config):
+        return SimpleNamespace(close=lambda: None, ping=lambda reconnect: None,
+                               reset_session=lambda: None, in_transaction=False)
+
+
+def test_pool_conta_criadas_e_recicladas_em_threads(monkeypatch):
+    monkeypatch.setattr(banco, '_driver', DriverFalso)
+    pool = banco.ConnectionPool({}, min_size=0, max_size=8, max_age=0.0)
+
+    def usar():
+        for _ in range(50):
+            pool.get_connection().close()
+
+    threads = [threading.Thread(target=usar) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = pool.stats()
+    assert stats['checkouts'] == 400 and stats['em_uso'] == 0
+    # max_age=0: toda conexão reaproveitada é reciclada, então criadas = novas + recicladas
+    assert stats['criadas'] == stats['recicladas'] + stats['total']
+    pool.close()
+
+
+class DialogFalso:
+    def __init__(self):
+        self.aberto = True
+
+    def winfo_exists(self):
+        return self.aberto
+
+    def destroy(self):
+        self.aberto = False
+
+
+class BotaoFalso:
+    def __init__(self):
+        self.estados = []
+
+    def config(self, state):
+        self.estados.append(state)
+
+
+def _app_com_worker(db):
+    app = _app()
+    app.db = db
+    app._em_worker = lambda fn, on_done, on_error=None, widget=None: ClubManagementApp._em_worker(
+        app, fn, on_done, on_error, widget)
+    app._aguardar = lambda *a, **k: ClubManagementApp._aguardar(app, *a, **k)
+    return app
+
+
+def test_gravar_fecha_o_dialog_ao_concluir(db):
+    app, dialog, botao, gravados = _app_com_worker(db), DialogFalso(), BotaoFalso(), []
+    ClubManagementApp._gravar(app, lambda: gravados.append(1), dialog, "Erro: ", botao=botao)
+    app.root.rodar()
+    assert gravados == [1] and botao.estados == ['disabled'] and not dialog.aberto and app.ocupado == 0
+
+
+def test_gravar_reabilita_o_botao_se_falhar(db, monkeypatch):
+    erros = []
+    monkeypatch.setattr(gui.messagebox, 'showerror', lambda titulo, texto: erros.append(texto))
+    app, dialog, botao = _app_com_worker(db), DialogFalso(), BotaoFalso()
+
+    def falhar():
+        raise ValueError("saldo insuficiente")
+
+    ClubManagementApp._gravar(app, falhar, dialog, "Erro ao salvar: ", botao=botao)
+    app.root.rodar()
+    assert erros == ["Erro ao salvar: saldo insuficiente"]
+    assert botao.estados == ['disabled', 'normal'] and dialog.aberto
@@ -0,0 +1,60 @@
+import pytest
+
+from src.cache import TODAS, ResultCache, inicio_comando, tabelas_escritas, tabelas_lidas
+
+LEITURAS = [
+    "SELECT * FROM lancamento",
+    "-- Consulta 1\nSELECT * FROM lancamento",
+    "# comentário\nSELECT 1",
+    "/* x */ SELECT 1",
+    "/* várias\nlinhas */\n  SELECT 1",
+    "(SELECT 1)",
+    "((SELECT 1) UNION (SELECT 2))",
+    "-- Consulta 12\n-- Balanço mensal\nWITH m AS (SELECT 1) SELECT * FROM m",
+]
+
+
+@pytest.mark.parametrize("sql", LEITURAS)
+def test_leituras_nao_escrevem(sql):
+    assert tabelas_escritas(sql) == set()
+
+
+def test_inicio_comando():
+    assert inicio_comando("-- a\n/* b */ (SELECT 1)") == "SELECT 1)"
+    assert inicio_comando("SELECT 1") == "SELECT 1"
+
+
+def test_escritas_com_efeitos_dos_triggers():
+    assert tabelas_escritas("-- ajuste\nUPDATE lancamento SET valor = 1") == \
+        {'lancamento', 'saldo_caixa', 'resumo_mensal_conta'}
+    assert tabelas_escritas("INSERT INTO item_folha_e VALUES (1)") == {'item_folha_e', 'folha_elenco', 'alertas_orcamento'}
+    assert tabelas_escritas("/* lote */ CALL sp_aprovar_bem(1, 1)") == \
+        {'bens', 'lancamento', 'saldo_caixa', 'resumo_mensal_conta'}
+
+
+def test_comando_desconhecido_invalida_tudo():
+    assert tabelas_escritas("DROP TABLE lancamento") == {TODAS}
+    assert tabelas_escritas("CALL sp_desconhecida()") == {TODAS}
+
+
+def test_tabelas_lidas_expande_views():
+    assert tabelas_lidas("-- x\nSELECT * FROM dados_publicos") == {'plano_de_contas', 'resumo_mensal_conta'}
+
+
+def test_cache_invalida_por_tabela():
+    cache = ResultCache(max_entries=4, ttl=60)
+    lanc, bens = ResultCache.chave("SELECT * FROM lancamento", None), ResultCache.chave("SELECT * FROM bens", None)
+    cache.put(lanc, {'lancamento'}, (['a'], [(1,)]), cache.versao({'lancamento'}))
+    cache.put(bens, {'bens'}, (['b'], [(2,)]), cache.versao({'bens'}))
+    cache.invalidate({'lancamento'})
+    assert cache.get(lanc) is None
+    assert cache.get(bens) == (['b'], [(2,)])
+
+
+def test_resultado_lido_antes_de_uma_escrita_nao_entra():
+    cache = ResultCache()
+    chave = ResultCache.chave("SELECT * FROM bens", None)
+    versao = cache.versao({'bens'})
+    cache.invalidate({'bens'})
+    cache.put(chave, {'bens'}, (['b'], []), versao)
+    assert cache.get(chave) is None
@@ -0,0 +1,59 @@
+from datetime import date
+from decimal import Decimal
+
+from src.colunas import TabelaColunar
+
+LINHAS = [
+    (1, Decimal('1234.56'), 1234, '1.234,56', date(2024, 1, 31)),
+    (2, Decimal('10.10'), 10, '10,10', date(2024, 12, 31)),
+    (3, Decimal('0.30'), 0, '0,30', None),
+]
+COLUNAS = ['id', 'valor', 'inteiro', 'texto', 'data']
+
+
+def _busca(texto):
+    tabela = TabelaColunar(COLUNAS, LINHAS)
+    tabela.buscar(texto)
+    return [LINHAS[i][0] for i in tabela.indices()]
+
+
+def test_filtro_decimal_exato():
+    assert _busca('valor=1234.56') == [1]
+    assert _busca('valor=1.234,56') == [1]
+    assert _busca('valor=10.10') == [2]
+    assert _busca('valor=10.1') == [2]
+    assert _busca('valor=0.3') == [3]
+    assert _busca('valor!=10.1') == [1, 3]
+
+
+def test_filtro_decimal_limites():
+    assert _busca('valor<=10.1') == [2, 3]
+    assert _busca('valor>=10.10') == [1, 2]
+    assert _busca('valor<10.1') == [3]
+    assert _busca('valor>0,3') == [1, 2]
+
+
+def test_filtro_inteiro_e_texto_numerico():
+    assert _busca('inteiro=10.0') == [2]
+    assert _busca('inteiro>=1.234') == [1, 2]
+    assert _busca('texto=10.1') == [2]
+    assert _busca('texto<=10,10') == [2, 3]
+    assert _busca('texto>1000') == [1]
+
+
+def test_filtro_data_e_vazios():
+    assert _busca('data>=31/12/2024') == [2]
+    assert _busca('data<2025-01-01') == [1, 2]
+
+
+def test_filtro_combinado_com_termo_livre():
+    assert _busca('valor>1 1.234') == [1]
+    assert _busca('texto:0,30') == [3]
+
+
+def test_ordenacao_numerica_com_vazios_no_fim():
+    tabela = TabelaColunar(COLUNAS, LINHAS)
+    tabela.ordenar('texto')
+    assert tabela.indices() == [2, 1, 0]
+    tabela.ordenar('data', decrescente=True)
+    assert tabela.indices() == [1, 0, 2]
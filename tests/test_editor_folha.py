@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+
+from src.editor_folha import EditorFolha, centavos, formatar, reais
+from src.erros import DadosInvalidos
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ('1.234,56', 123456), ('1234.56', 123456), ('1234,5', 123450), ('R$ 10', 1000),
+    (Decimal('2.675'), 268), (0.1, 10), (2.675, 268), (Decimal('-0.005'), -1), (None, 0), ('', 0), (7, 700),
+])
+def test_centavos(valor, esperado):
+    assert centavos(valor) == esperado
+
+
+def test_centavos_invalido():
+    with pytest.raises(DadosInvalidos):
+        centavos('abc', 'bonus')
+
+
+def test_reais_e_formatar():
+    assert reais(123456) == Decimal('1234.56') and str(reais(5)) == '0.05'
+    assert formatar(123456) == '1234.56' and formatar(-5) == '-0.05'
+
+
+def _editor():
+    return EditorFolha('elenco', [
+        {'id_elenco': 1, 'salario_base': '10000.10', 'bonus': 0.2, 'direito_imagem': '500', 'descontos': 100},
+        {'id_elenco': 2, 'salario_base': Decimal('2000.005')},
+    ])
+
+
+def test_totais_iniciais():
+    editor = _editor()
+    assert editor.bruto == 1000010 + 20 + 50000 + 200001
+    assert editor.liquido == editor.bruto - 10000
+    assert editor.direitos == 50000
+
+
+def test_edicao_atualiza_os_totais_exatos():
+    editor = _editor()
+    for _ in range(1000):
+        editor.editar(2, {'bonus': '0,10'})
+        editor.editar(2, {'bonus': 0})
+    editor.editar(2, {'bonus': '0.1', 'descontos': '0.3'})
+    soma = sum(sum(v[c] for c in ('salario_base', 'bonus', 'direito_imagem', 'parcela_luvas'))
+               for v in editor.itens.values())
+    assert editor.bruto == soma == 1250041
+    assert editor.liquido == soma - 10000 - 30
+    assert editor.linha(2) == ('2000.01', '0.10', '0.00', '0.00', '0.30')
+
+
+def test_edicao_invalida_nao_altera_nada():
+    editor = _editor()
+    antes = (editor.bruto, editor.liquido, dict(editor.itens[1]))
+    for valores in ({'bonus': '5', 'descontos': '-1'}, {'bonus': 'x'}, {'adicionais': 1}):
+        with pytest.raises(DadosInvalidos):
+            editor.editar(1, valores)
+    assert (editor.bruto, editor.liquido, editor.itens[1]) == antes
+
+
+def test_orcamento_e_problemas():
+    editor = EditorFolha('funcionarios', [{'id_funcionario': 5, 'salario_base': '800', 'adicionais': '100'}])
+    assert editor.utilizacao() is None and editor.problemas() == []
+    editor.definir_orcamento(Decimal('1000.00'), Decimal('50.00'), Decimal('500.00'))
+    assert editor.utilizacao() == 95.0
+    assert editor.disponivel() == 5000
+    assert editor.problemas() == ["saldo em caixa insuficiente (R$ 500.00)"]
+    editor.editar(5, {'bonus': '60'})
+    assert editor.problemas()[0] == "orçamento do mês excedido em R$ 10.00"
+
+
+def test_valores_para_gravacao():
+    editor = _editor()
+    valores = {v['id_elenco']: v for v in editor.valores()}
+    assert valores[2]['salario_base'] == Decimal('2000.01')
+    assert valores[1]['bonus'] == Decimal('0.20')
+
+
+def test_tipo_invalido():
+    with pytest.raises(DadosInvalidos):
+        EditorFolha('diretoria', [])
@@ -0,0 +1,24 @@
+import os
+import re
+
+import pytest
+
+from benchmarks import gerador
+from benchmarks.escala import BD, dividir_script, trocar_banco
+
+
+@pytest.mark.parametrize('script', ['Banco.sql', 'Dados.sql'])
+def test_scripts_rodam_no_banco_dos_benchmarks(script):
+    with open(os.path.join(BD, script), encoding='utf-8') as f:
+        comandos = dividir_script(trocar_banco(f.read(), 'gestao_clube_bench'))
+    alvos = [c for c in comandos if re.match(r'(DROP|CREATE)\s+DATABASE|USE\b', c, re.IGNORECASE)]
+    assert alvos and all(re.search(r'\bgestao_clube_bench\b', c) for c in alvos)
+    assert not any(re.search(r'\bgestao_clube\b', c) for c in alvos)
+
+
+def test_config_bench_recusa_o_banco_da_aplicacao():
+    assert gerador.config_bench()['database'] == gerador.BANCO_BENCH
+    with pytest.raises(SystemExit):
+        gerador.config_bench('gestao_clube')
+    with pytest.raises(SystemExit):
+        gerador.config_bench('x; DROP DATABASE y')
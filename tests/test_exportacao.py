@@ -0,0 +1,23 @@
+from src.exportacao import sql_da_fonte
+from src.paginacao import FonteConsulta, FonteLista
+from src.snapshot import FonteSnapshot
+
+
+def test_snapshot_exporta_a_view_inteira():
+    colunas = ['id_lancamento', 'data_registro', 'valor']
+    linhas = [(i, f"2024-01-{i:02d}", i) for i in range(10, 0, -1)]
+    fonte = FonteSnapshot(None, 'dados_privados', colunas, linhas, limite=5)
+    assert not fonte.completo
+    sql, params = sql_da_fonte(fonte)
+    assert sql == "SELECT * FROM dados_privados ORDER BY data_registro DESC, id_lancamento DESC"
+    assert params is None
+
+
+def test_snapshot_de_view_sem_chave_usa_a_consulta():
+    fonte = FonteSnapshot(None, 'dados_publicos', ['a'], [(1,)])
+    assert sql_da_fonte(fonte) == sql_da_fonte(fonte.real)
+    assert isinstance(fonte.real, FonteConsulta)
+
+
+def test_fonte_em_memoria_sem_sql():
+    assert sql_da_fonte(FonteLista(['a'], [(1,)])) is None
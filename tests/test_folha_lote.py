@@ -0,0 +1,121 @@
+import json
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from mysql.connector import Error
+
+from src import folha_lote
+from src.erros import ErroBanco
+
+RECUSA = Error(msg='ERRO: Orçamento mensal do Corpo Esportivo excedido!', errno=1644, sqlstate='45000')
+
+
+class BancoFalso:
+    """Corpo 2 (elenco) com um atleta de 50.000. A aprovação fica com sp_aprovar_folhas_elenco_lote:
+    `recusar` é o número da chamada (1, 2, ...) em que os triggers recusariam o lote."""
+
+    def __init__(self, alertas=0, recusar=None):
+        self.alertas, self.recusar = alertas, recusar
+        self.comandos, self.chamadas, self.commits, self.rollbacks = [], [], 0, 0
+        self._id = 100
+
+    def run_query(self, sql, params=None, usar_cache=True):
+        if 'FROM elenco' in sql:
+            return [], [(10, date(2020, 1, 1), date(2030, 12, 31), Decimal('50000.00'))]
+        if 'FROM corpo_esportivo' in sql:
+            return [], [(2,)]
+        raise AssertionError(sql)
+
+    @contextmanager
+    def get_connection(self):
+        yield ConexaoFalsa(self)
+
+
+class ConexaoFalsa:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return CursorFalso(self.db)
+
+    def commit(self):
+        self.db.commits += 1
+
+    def rollback(self):
+        self.db.rollbacks += 1
+
+
+class CursorFalso:
+    def __init__(self, db):
+        self.db, self.lastrowid, self._resultado = db, None, []
+
+    def execute(self, sql, params=()):
+        assert sql.count('%s') == len(params)
+        self.db.comandos.append(sql)
+        if sql.lstrip().startswith('INSERT'):
+            self.lastrowid = self.db._id
+            if 'INTO folha_elenco' in sql:
+                self.db.cabecalhos = [(params[i + 3], params[i]) for i in range(0, len(params), 4)]
+            self.db._id += 1000
+        elif 'BETWEEN' in sql:
+            self._resultado = [(params[0] + i, d, date.fromisoformat(c))
+                               for i, (d, c) in enumerate(self.db.cabecalhos)]
+        else:
+            raise AssertionError(sql)
+
+    def executemany(self, sql, linhas):
+        self.db.comandos.append(sql)
+
+    def callproc(self, nome, args):
+        self.db.chamadas.append((nome, args))
+        if len(self.db.chamadas) == self.db.recusar:
+            raise RECUSA
+        ids = json.loads(args[0])
+        return (*args[:3], len(ids), self.db.alertas)
+
+    def fetchall(self):
+        return self._resultado
+
+    def close(self):
+        pass
+
+
+def test_lote_aprovado_pela_procedure():
+    db = BancoFalso(alertas=1)
+    r = folha_lote.gerar(db, folha_lote.meses('2026-01', 2), [('elenco', 2)])
+    assert (r['folhas'], r['itens'], r['alertas'], db.commits) == (2, 2, 1, 1)
+    assert r['bruto'] == Decimal('100000.00')
+    assert db.chamadas == [('sp_aprovar_folhas_elenco_lote', ('[100, 101]', 1, 8, 0, 0))]
+    # cabeçalhos pendentes: orçamento, saldo e alertas ficam com os triggers chamados pela procedure
+    cabecalho = next(c for c in db.comandos if 'INTO folha_elenco' in c)
+    assert 'status' not in cabecalho and 'alertas_orcamento' not in ' '.join(db.comandos)
+
+
+def test_conferencia_dos_ids_nao_fixa_o_snapshot():
+    db = BancoFalso()
+    folha_lote.gerar(db, folha_lote.meses('2026-01', 1), [('elenco', 2)])
+    leituras = [c for c in db.comandos if c.lstrip().startswith('SELECT')]
+    assert len(leituras) == 1 and leituras[0].rstrip().endswith('FOR UPDATE')
+
+
+def test_recusa_dos_triggers_desfaz_o_lote():
+    db = BancoFalso(recusar=1)
+    with pytest.raises(Error):
+        folha_lote.gerar(db, folha_lote.meses('2026-01', 1), [('elenco', 2)])
+    assert db.commits == 0 and db.rollbacks == 1
+
+
+def test_recusa_em_bloco_posterior_informa_as_gravadas():
+    db = BancoFalso(recusar=2)
+    with pytest.raises(ErroBanco, match='1 folhas já gravadas'):
+        folha_lote.gerar(db, folha_lote.meses('2026-01', 2), [('elenco', 2)], folhas_por_transacao=1)
+    assert db.commits == 1 and db.rollbacks == 1
+
+
+def test_simular_retorna_a_recusa_sem_gravar():
+    db = BancoFalso(recusar=1)
+    r = folha_lote.gerar(db, folha_lote.meses('2026-01', 2), [('elenco', 2)], simular=True)
+    assert r['problemas'] == ['ERRO: Orçamento mensal do Corpo Esportivo excedido!'] and r['itens'] == 0
+    assert db.commits == 0 and db.rollbacks == 1
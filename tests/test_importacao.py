@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+import pytest
+
+from src.importacao import _valor, ler_csv
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ('2.675', Decimal('2.68')),
+    ('2,675', Decimal('2.68')),
+    ('1.234,56', Decimal('1234.56')),
+    ('R$ 1.234,5', Decimal('1234.50')),
+    ('0.005', Decimal('0.01')),
+    ('10', Decimal('10.00')),
+])
+def test_valor_arredonda_como_decimal_do_mysql(texto, esperado):
+    valor = _valor(texto)
+    assert valor == esperado and isinstance(valor, Decimal)
+    assert valor.as_tuple().exponent == -2
+
+
+@pytest.mark.parametrize("texto", ['', 'abc', '0', '-5', '0.004', 'NaN', 'Infinity', '1.2.3'])
+def test_valor_invalido(texto):
+    with pytest.raises(ValueError):
+        _valor(texto)
+
+
+def test_ler_csv(tmp_path):
+    arquivo = tmp_path / "lancamentos.csv"
+    arquivo.write_text("valor;tipo;conta;descricao;data\n"
+                       "2,675;entrada;3.1.01;Bilheteria;01/02/2025\n"
+                       "x;saida;3.1.01;Erro;\n"
+                       "10;saída;4;Material;\n", encoding='utf-8')
+    validas, rejeitadas = ler_csv(str(arquivo))
+    assert [v[2] for v in validas] == [Decimal('2.68'), Decimal('10.00')]
+    assert validas[1][3] == 'saida'
+    assert rejeitadas == [(3, "valor inválido: 'x'")]
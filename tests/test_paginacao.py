@@ -0,0 +1,102 @@
+import pytest
+
+from src.paginacao import (Filtro, FonteConsulta, FonteFiltrada, FonteKeyset, fonte_para_sql, separar_filtros,
+                           valor_digitado)
+
+
+class BancoFalso:
+    """run_query sobre uma lista de linhas, entendendo só o LIMIT/OFFSET acrescentado pela fonte."""
+
+    def __init__(self, linhas):
+        self.linhas = linhas
+        self.comandos = []
+
+    def run_query(self, sql, params=None, usar_cache=True):
+        self.comandos.append(sql)
+        linhas = self.linhas
+        if '\nLIMIT ' in sql:
+            limite, offset = sql.rsplit('\nLIMIT ', 1)[1].split(' OFFSET ')
+            linhas = linhas[int(offset):int(offset) + int(limite)]
+        return ['id'], linhas
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM lancamento",
+    "-- Consulta 1\nSELECT * FROM lancamento",
+    "/* catálogo */\n(SELECT 1)",
+    "# x\nWITH a AS (SELECT 1) SELECT * FROM a;",
+])
+def test_consulta_paginavel(sql):
+    db = BancoFalso([(i,) for i in range(25)])
+    fonte = FonteConsulta(db, sql)
+    pagina = fonte.primeira(10)
+    assert pagina.linhas == [(i,) for i in range(10)] and pagina.tem_seguinte
+    assert db.comandos[-1].endswith("\nLIMIT 11 OFFSET 0")
+    pagina = fonte.seguinte(pagina.fim, 10)
+    assert pagina.linhas[0] == (10,)
+
+
+@pytest.mark.parametrize("sql", ["SELECT * FROM lancamento LIMIT 5", "-- x\nCALL sp_verificar_saldo_caixa()"])
+def test_consulta_lida_inteira(sql):
+    db = BancoFalso([(i,) for i in range(5)])
+    fonte = FonteConsulta(db, sql)
+    assert len(fonte.primeira(2).linhas) == 2
+    assert db.comandos == [sql]
+
+
+def test_view_com_comentario_usa_keyset():
+    fonte = fonte_para_sql(None, "-- Dados privados\nSELECT * FROM dados_privados;")
+    assert isinstance(fonte, FonteKeyset)
+
+
+COLUNAS = ['id', 'valor', 'conta', 'nome', 'data']
+
+
+def test_separar_filtros():
+    filtros, termo = separar_filtros('VALOR>=1.234,56 conta:folha ana nome="Ana Souza" data<31/12/2024 xx=1',
+                                     COLUNAS)
+    assert filtros == [Filtro('valor', '>=', '1.234,56'), Filtro('conta', ':', 'folha'),
+                       Filtro('nome', '=', 'Ana Souza'), Filtro('data', '<', '31/12/2024')]
+    assert termo == 'ana xx=1'
+
+
+@pytest.mark.parametrize("digitado, esperado", [
+    ('31/12/2024', '2024-12-31'), ('1/2/2025', '2025-02-01'), ('1.234,56', '1234.56'),
+    ('1.234.567', '1234567'), ('10,5', '10.5'), ('1234.56', '1234.56'), ('folha', 'folha'),
+])
+def test_valor_digitado(digitado, esperado):
+    assert valor_digitado(digitado) == esperado
+
+
+def test_fonte_filtrada_sql():
+    filtros = [Filtro('valor', '>=', '1.234,56'), Filtro('conta', ':', '50%_off'), Filtro('nome', '!=', 'Ana')]
+    fonte = FonteFiltrada(None, "SELECT * FROM lancamento WHERE id_conta = %s;", (3,), COLUNAS,
+                          filtros, 'x', (1, True))
+    assert fonte.sql == (
+        "SELECT * FROM (\nSELECT * FROM lancamento WHERE id_conta = %s\n) AS _consulta\n"
+        "WHERE `valor` >= %s AND `conta` LIKE %s AND `nome` <> %s AND "
+        "(`id` LIKE %s OR `valor` LIKE %s OR `conta` LIKE %s OR `nome` LIKE %s OR `data` LIKE %s)\n"
+        "ORDER BY `valor` DESC, `id` DESC")
+    assert fonte.params == (3, '1234.56', '%50\\%\\_off%', 'Ana') + ('%x%',) * 5
+    assert fonte.colunas == COLUNAS and fonte._paginavel
+
+
+def test_fonte_filtrada_sem_filtros_ordena_pela_primeira_coluna():
+    fonte = FonteFiltrada(None, "-- Consulta 1\nSELECT * FROM bens", None, COLUNAS, ordem=('id', False))
+    assert fonte.sql.endswith(") AS _consulta\nORDER BY `id` ASC")
+    assert fonte.params is None
+
+
+@pytest.mark.parametrize("filtros, ordem", [
+    ([Filtro('inexistente', '=', '1')], None),
+    ([Filtro('id', '~', '1')], None),
+    ([], ('inexistente', False)),
+])
+def test_fonte_filtrada_recusa_colunas_desconhecidas(filtros, ordem):
+    with pytest.raises(ValueError):
+        FonteFiltrada(None, "SELECT * FROM bens", None, COLUNAS, filtros, '', ordem)
+
+
+def test_fonte_filtrada_recusa_colunas_repetidas():
+    with pytest.raises(ValueError):
+        FonteFiltrada(None, "SELECT * FROM bens", None, ['id', 'id'])
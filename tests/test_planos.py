@@ -0,0 +1,20 @@
+from benchmarks.planos import blocos, divergencias
+
+
+def _linha(tabela, tipo, chave=None, extra=None):
+    return {'table': tabela, 'type': tipo, 'key': chave, 'Extra': extra}
+
+
+def test_todos_os_blocos_tem_esperado_e_explain():
+    lidos = blocos()
+    assert len(lidos) >= 9
+    assert all(esperado and comandos for _, esperado, comandos in lidos)
+
+
+def test_divergencias():
+    esperado = "l type=range key=idx_lancamento_status_data (sem filesort)"
+    assert divergencias(esperado, [_linha('l', 'range', 'idx_lancamento_status_data')]) == []
+    assert divergencias(esperado, [_linha('l', 'ALL')])
+    assert divergencias(esperado, [_linha('l', 'range', 'idx_lancamento_status_data', 'Using filesort')]) == \
+        ["plano usa filesort"]
+    assert divergencias("type=const key=PRIMARY", [_linha('folha_elenco', 'const', 'PRIMARY')]) == []
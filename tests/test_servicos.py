@@ -0,0 +1,35 @@
+from decimal import Decimal
+
+import pytest
+
+from src.erros import DadosInvalidos
+from src.servicos import dinheiro, numero
+
+
+def test_dinheiro_em_decimal_com_centavos():
+    assert dinheiro('1.234,56', 'valor') == Decimal('1234.56')
+    assert dinheiro('2.675', 'valor') == Decimal('2.68')  # meio centavo para longe do zero, como o MySQL
+    assert dinheiro(0.1, 'valor') == Decimal('0.10')
+    assert dinheiro(Decimal('1500'), 'salário') == Decimal('1500.00')
+
+
+@pytest.mark.parametrize('valor', ['', '  ', None, 'abc', 'nan', 'inf'])
+def test_dinheiro_invalido(valor):
+    with pytest.raises(DadosInvalidos):
+        dinheiro(valor, 'valor')
+
+
+def test_dinheiro_minimo():
+    assert dinheiro('0,01', 'valor', minimo='0.01') == Decimal('0.01')
+    with pytest.raises(DadosInvalidos):
+        dinheiro('0,004', 'valor', minimo='0.01')
+    with pytest.raises(DadosInvalidos):
+        dinheiro('-1', 'multa', minimo=0)
+
+
+def test_numero_sem_float():
+    assert numero('2,5', 'área') == Decimal('2.5')
+    assert numero(2.0, 'depreciação') == Decimal('2.0')
+    assert numero('12', 'conta', inteiro=True) == 12
+    with pytest.raises(DadosInvalidos):
+        numero('1,5', 'meses', inteiro=True, minimo=1)
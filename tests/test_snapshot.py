@@ -0,0 +1,71 @@
+import os
+import stat
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from src.snapshot import FonteSnapshot, Snapshots, codificar, decodificar, pasta_padrao
+
+COLUNAS = ['id_lancamento', 'data_registro', 'valor', 'conta', 'vencimento']
+LINHAS = [
+    (3, datetime(2025, 3, 1, 10, 30, 5), Decimal('1234.56'), 'Bilheteria', date(2025, 3, 31)),
+    (2, datetime(2025, 2, 1), Decimal('-0.10'), 'Folha de Elenco — março', None),
+    (1, None, None, None, date(2024, 12, 31)),
+]
+TOKEN = (3, datetime(2025, 3, 1), 10, Decimal('99.90'))
+
+
+def test_ida_e_volta_preserva_tipos():
+    colunas, linhas, token = decodificar(codificar(COLUNAS, LINHAS, TOKEN))
+    assert colunas == COLUNAS and linhas == LINHAS
+    assert [type(v) for v in linhas[0]] == [int, datetime, Decimal, str, date]
+    assert token == ['3', '2025-03-01 00:00:00', '10', '99.90']
+
+
+def test_ida_e_volta_sem_linhas():
+    assert decodificar(codificar(COLUNAS, [], None)) == (COLUNAS, [], None)
+
+
+@pytest.mark.parametrize("dados", [b'XXXX', b'GCS1' + b'lixo', codificar(COLUNAS, LINHAS, TOKEN)[:-5]])
+def test_arquivo_invalido(dados):
+    with pytest.raises(ValueError):
+        decodificar(dados)
+
+
+def test_gravar_e_ler(tmp_path):
+    pasta = tmp_path / 'snapshots'
+    snapshots = Snapshots(None, pasta=str(pasta))
+    assert snapshots.ler('dados_publicos') is None
+    snapshots.gravar('dados_publicos', COLUNAS, LINHAS, TOKEN)
+    assert snapshots.ler('dados_publicos')[1] == LINHAS
+    assert stat.S_IMODE(os.stat(pasta / 'dados_publicos.snap').st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(pasta).st_mode) == 0o700
+    with pytest.raises(ValueError):
+        snapshots.gravar('../fora', COLUNAS, LINHAS, TOKEN)
+
+
+def test_dados_privados_nao_vao_para_o_disco(tmp_path):
+    snapshots = Snapshots(None, pasta=str(tmp_path))
+    snapshots.gravar('dados_privados', COLUNAS, LINHAS, TOKEN)
+    assert list(tmp_path.iterdir()) == []
+    colunas, linhas, token = snapshots.ler('dados_privados')
+    assert linhas == LINHAS and token == ['3', '2025-03-01 00:00:00', '10', '99.90']
+    assert Snapshots(None, pasta=str(tmp_path)).ler('dados_privados') is None
+
+
+def test_pasta_padrao_do_usuario(monkeypatch, tmp_path):
+    monkeypatch.setattr(os, 'name', 'posix')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert pasta_padrao() == os.path.join(str(tmp_path), 'gestao_clube', 'snapshots')
+
+
+def test_fonte_snapshot_pagina_as_linhas_guardadas():
+    linhas = [(i, datetime(2025, 1, i), Decimal(i), 'c', None) for i in range(9, 0, -1)]
+    fonte = FonteSnapshot(None, 'dados_privados', COLUNAS, linhas)
+    pagina = fonte.primeira(4)
+    assert [l[0] for l in pagina.linhas] == [9, 8, 7, 6] and pagina.tem_seguinte
+    pagina = fonte.seguinte(pagina.fim, 4)
+    assert [l[0] for l in pagina.linhas] == [5, 4, 3, 2]
+    assert [l[0] for l in fonte.anterior(pagina.inicio, 4).linhas] == [9, 8, 7, 6]
+    assert fonte.contar() == 9